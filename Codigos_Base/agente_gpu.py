@@ -1,124 +1,214 @@
 import numpy as np
 from numba import cuda, types
 import math
+import time
 import random
 import copy
 from logica import JogoTruco2v2, Carta
-from gpu_utils import achatar_estado_para_gpu 
-from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_uniform_float32
+from simulador_lote import determinizar_lote
+from config_desempenho import carregar_config
+from politica_rollout import CODIGO_POLITICA, RUIDO_PADRAO, validar_politica
+from crenca import CrencaMaos
+from aquecimento import jogo_de_aquecimento
+from calibracao import CalibracaoPorFase
+from numba.cuda.random import create_xoroshiro128p_states, init_xoroshiro128p_states, xoroshiro128p_uniform_float32
 
 # ======================================================================
 # Seção 1: Funções da GPU (Device e Kernel)
+# ----------------------------------------------------------------------
+# O kernel recebe o mesmo lote de simulador_lote.py (mãos, mesa, resultado
+# das rodadas, vira, jogador da vez, rodada, vencedor_turno) e segue as
+# regras de logica.py linha a linha como o kernel Numba de CPU
+# (simulador_numba.py): valor_da_carta, desempate de _finalizar_turno e
+# _checar_vencedor_da_mao. conformidade.py confere os motores entre si.
 # ======================================================================
 
 @cuda.jit(device=True)
 def valor_da_carta_gpu(carta_int, rank_manilha):
     """Calcula o valor de uma carta para fins de comparação (roda na GPU)."""
-    if carta_int == -1:
+    if carta_int < 0:
         return -1
     rank_carta = carta_int // 4
     if rank_carta == rank_manilha:
-        naipe = carta_int % 4
-        return 10 + (3 - naipe)
-    else:
-        return rank_carta
-
-@cuda.jit
-def simular_rollouts_gpu(
-    maos_iniciais,
-    viras,
-    jogadores_iniciais,
-    rng_states,
-    resultados
-):
-    """Kernel CUDA: Simula uma mão completa de Truco para cada thread."""
+        # Manilhas: Ouros < Espadas < Copas < Paus, como Carta.NAIPES
+        return 10 + carta_int % 4
+    return rank_carta
+
+@cuda.jit(device=True)
+def checar_vencedor_gpu(resultado, rodada):
+    """ Mesma ordem de testes de JogoTruco2v2._checar_vencedor_da_mao; -1 = mão continua. """
+    t1 = 0; t2 = 0; empates = 0
+    for t in range(3):
+        if resultado[t] == 1: t1 += 1
+        elif resultado[t] == 2: t2 += 1
+        else: empates += 1
+    if t1 >= 2: return 1
+    if t2 >= 2: return 2
+    if rodada > 3:
+        if t1 == 1 and t2 == 1: return resultado[2]
+        if empates == 2: return resultado[2]
+        if empates == 3: return 0
+    if empates == 1 and rodada > 2:
+        if t1 == 1: return 1
+        if t2 == 1: return 2
+    return -1
+
+@cuda.jit(device=True)
+def escolher_heuristica_gpu(mao, mesa, jogador, rank_manilha):
+    """Posição da carta escolhida pela política heurística (ver politica_rollout.py)."""
+    parceiro = valor_da_carta_gpu(mesa[(jogador + 2) % 4], rank_manilha)
+    adversario = max(valor_da_carta_gpu(mesa[(jogador + 1) % 4], rank_manilha),
+                     valor_da_carta_gpu(mesa[(jogador + 3) % 4], rank_manilha))
+    abrindo = parceiro < 0 and adversario < 0 and mesa[jogador] < 0
+    forte = -1; fraca = -1; barata = -1
+    v_forte = -2; v_fraca = 99; v_barata = 99
+    for k in range(3):
+        if mao[jogador, k] < 0:
+            continue
+        v = valor_da_carta_gpu(mao[jogador, k], rank_manilha)
+        if v > v_forte:
+            v_forte = v; forte = k
+        if v < v_fraca:
+            v_fraca = v; fraca = k
+        if v > adversario and v < v_barata:
+            v_barata = v; barata = k
+    if abrindo:
+        return forte
+    if parceiro > adversario or barata < 0:
+        return fraca
+    return barata
+
+# cache=True: o kernel compilado fica em disco e as próximas execuções só o carregam
+@cuda.jit(cache=True)
+def simular_rollouts_gpu(maos, mesas, resultados, viras, jogadores, rodadas, vencedores_turno,
+                         rng_states, vencedores, politica, ruido):
+    """
+    Kernel CUDA: cada thread joga até o fim a mão de uma linha do lote e grava o time
+    vencedor (1, 2 ou 0 para empate) em `vencedores`; `resultados` termina com o
+    resultado de cada rodada.
+    politica: 0 = cartas sorteadas, 1 = heurística (sorteada com probabilidade `ruido`),
+    2 = roteiro (a primeira carta que resta na mão, usada por conformidade.py).
+    """
     i = cuda.grid(1)
-    if i >= maos_iniciais.shape[0]:
+    if i >= maos.shape[0]:
         return
 
-    mao_thread = cuda.local.array((4, 3), dtype=types.int8)
+    mao = cuda.local.array((4, 3), dtype=types.int8)
+    mesa = cuda.local.array(4, dtype=types.int8)
     for j in range(4):
+        mesa[j] = mesas[i, j]
+        for k in range(3):
+            mao[j, k] = maos[i, j, k]
+    resultado = resultados[i]
+    jogador = jogadores[i]
+    rodada = rodadas[i]
+    vencedor_turno = vencedores_turno[i]
+    rank_manilha = (viras[i] // 4 + 1) % 10
+
+    vencedor = -1
+    while vencedor < 0:
+        validas = 0
         for k in range(3):
-            mao_thread[j, k] = maos_iniciais[i, j, k]
-
-    vira = viras[i]
-    jogador_atual = jogadores_iniciais[i]
-    rank_manilha = (vira // 4 + 1) % 10
-    vitorias_turno = cuda.local.array(3, dtype=types.int8)
-    vencedor_primeiro_turno = -1
-    
-    for turno in range(3):
-        mesa = cuda.local.array(4, dtype=types.int8)
-        jogadores_na_mesa = cuda.local.array(4, dtype=types.int8)
-        
+            if mao[jogador, k] >= 0:
+                validas += 1
+        if validas == 0:
+            vencedor = 0
+            break
+        if politica == 1 and xoroshiro128p_uniform_float32(rng_states, i) >= ruido:
+            k = escolher_heuristica_gpu(mao, mesa, jogador, rank_manilha)
+        elif politica == 2:
+            k = 0
+            while mao[jogador, k] < 0:
+                k += 1
+        else:
+            escolha = min(int(xoroshiro128p_uniform_float32(rng_states, i) * validas), validas - 1)
+            vistas = 0
+            k = 0
+            for posicao in range(3):
+                if mao[jogador, posicao] >= 0:
+                    if vistas == escolha:
+                        k = posicao
+                        break
+                    vistas += 1
+        mesa[jogador] = mao[jogador, k]
+        mao[jogador, k] = -1
+        jogador = (jogador + 1) % 4
+
+        completa = True
         for j in range(4):
-            jogador_idx = (jogador_atual + j) % 4
-            cartas_validas_count = 0
-            for k in range(3):
-                if mao_thread[jogador_idx, k] != -1:
-                    cartas_validas_count += 1
-            
-            if cartas_validas_count > 0:
-                rand_float = xoroshiro128p_uniform_float32(rng_states, i)
-                escolha_aleatoria = int(rand_float * cartas_validas_count)
-                cartas_vistas = 0
-                for k in range(3):
-                    if mao_thread[jogador_idx, k] != -1:
-                        if cartas_vistas == escolha_aleatoria:
-                            mesa[j] = mao_thread[jogador_idx, k]
-                            mao_thread[jogador_idx, k] = -1
-                            break
-                        cartas_vistas += 1
-            else:
-                mesa[j] = -1
-            jogadores_na_mesa[j] = jogador_idx
-        
-        maior_valor = -1
-        vencedor_temp_idx = -1
+            if mesa[j] < 0:
+                completa = False
+        if not completa:
+            continue
+
+        maior = -1; ganhador = -1; contagem = 0
         for j in range(4):
-            valor_carta = valor_da_carta_gpu(mesa[j], rank_manilha)
-            if valor_carta > maior_valor:
-                maior_valor = valor_carta
-                vencedor_temp_idx = jogadores_na_mesa[j]
-        empate = False
-        if maior_valor > -1:
-            contagem_maior_valor = 0
-            for j in range(4):
-                if valor_da_carta_gpu(mesa[j], rank_manilha) == maior_valor:
-                    contagem_maior_valor += 1
-            if contagem_maior_valor > 1:
-                empate = True
-        if empate:
-            vitorias_turno[turno] = 0
+            v = valor_da_carta_gpu(mesa[j], rank_manilha)
+            if v > maior:
+                maior = v; ganhador = j; contagem = 1
+            elif v == maior:
+                contagem += 1
+        if contagem > 1:
+            resultado[rodada - 1] = 0
         else:
-            time_vencedor = (vencedor_temp_idx % 2) + 1
-            vitorias_turno[turno] = time_vencedor
-            jogador_atual = vencedor_temp_idx
-            if turno == 0:
-                vencedor_primeiro_turno = time_vencedor
-
-    vitorias_time_1 = 0
-    vitorias_time_2 = 0
-    for t in range(3):
-        if vitorias_turno[t] == 1: vitorias_time_1 += 1
-        elif vitorias_turno[t] == 2: vitorias_time_2 += 1
-    vencedor_final = 0
-    if vitorias_time_1 == 1 and vitorias_time_2 == 0 and vitorias_turno[0] == 0:
-        vencedor_final = 1
-    elif vitorias_time_2 == 1 and vitorias_time_1 == 0 and vitorias_turno[0] == 0:
-        vencedor_final = 2
-    elif vitorias_time_1 >= 2:
-        vencedor_final = 1
-    elif vitorias_time_2 >= 2:
-        vencedor_final = 2
-    elif vitorias_time_1 == 1 and vitorias_time_2 == 1:
-        if vitorias_turno[0] != 0:
-            vencedor_final = vitorias_turno[0]
-
-    if vencedor_final == 1:
-        resultados[i] = 1
+            resultado[rodada - 1] = ganhador % 2 + 1
+            vencedor_turno = ganhador
+        jogador = vencedor_turno
+        for j in range(4):
+            mesa[j] = -1
+        rodada += 1
+        vencedor = checar_vencedor_gpu(resultado, rodada)
+
+    vencedores[i] = vencedor
+
+
+class EstadosRNG:
+    """
+    Estados xoroshiro128+ de até `n` threads, criados uma vez e reaproveitados: cada kernel
+    avança os estados que usa, então lotes seguidos continuam as mesmas sequências. Criar os
+    estados a cada lote custava ~1,8 ms para 4096 threads (a inicialização roda na CPU), mais
+    a cópia para a GPU. semear() reinicia os mesmos estados, sem alocar de novo.
+    """
+    def __init__(self, n, semente=None):
+        self.n = n
+        self.dispositivo = None
+        self.semear(semente)
+
+    def semear(self, semente=None):
+        self.semente = semente if semente is not None else random.getrandbits(63)
+        if self.dispositivo is None:
+            self.dispositivo = create_xoroshiro128p_states(self.n, seed=self.semente)
+        else:
+            init_xoroshiro128p_states(self.dispositivo, self.semente)
+
+
+def simular_maos_cuda(lote, rng=None, politica='aleatoria', ruido=RUIDO_PADRAO, threads_por_bloco=256,
+                      retornar_rodadas=False, estados_rng=None):
+    """
+    Mesma interface de simulador_lote.simular_maos_lote, rodando o kernel CUDA.
+    Com retornar_rodadas=True retorna (vencedores, resultado de cada rodada).
+    Com um EstadosRNG de ao menos len(lote) estados, usa (e avança) esses estados em vez de
+    criar novos a partir de `rng`.
+    """
+    codigo = CODIGO_POLITICA[validar_politica(politica, permitir_roteiro=True)]
+    n = len(lote['jogador'])
+    d_resultados = cuda.to_device(lote['resultado'])
+    d_vencedores = cuda.device_array(n, dtype=np.int8)
+    if estados_rng is not None and estados_rng.n >= n:
+        d_rng_states = estados_rng.dispositivo
     else:
-        resultados[i] = 0
+        semente = int(rng.integers(2**63)) if rng is not None else random.getrandbits(63)
+        d_rng_states = create_xoroshiro128p_states(n, seed=semente)
+    blocos_por_grid = math.ceil(n / threads_por_bloco)
+    simular_rollouts_gpu[blocos_por_grid, threads_por_bloco](
+        cuda.to_device(lote['maos']), cuda.to_device(lote['mesa']), d_resultados,
+        cuda.to_device(lote['vira']), cuda.to_device(lote['jogador']), cuda.to_device(lote['rodada']),
+        cuda.to_device(lote['vencedor_turno']), d_rng_states, d_vencedores, codigo, np.float32(ruido))
+    cuda.synchronize()
+    vencedores = d_vencedores.copy_to_host()
+    if retornar_rodadas:
+        return vencedores, d_resultados.copy_to_host()
+    return vencedores
 
 # ======================================================================
 # Seção 2: A Classe Principal do Agente GPU
@@ -161,16 +251,39 @@ class MCTSNode: # Classe Nó necessária para o MCTS na CPU
             no_atual = no_atual.parente
 
 class GPUAgenteMCTS:
-    def __init__(self, n_simulacoes=20000):
+    def __init__(self, n_simulacoes=20000, politica_rollout='aleatoria', n_particulas=None, aleatorio=None):
+        config = carregar_config()
         self.n_simulacoes = n_simulacoes
-        self.n_rollouts_por_decisao = 4096
-        self.log_previsoes = []
+        # 'aleatoria' ou 'heuristica' (politica_rollout.py), aplicada dentro do kernel
+        self.politica_rollout = validar_politica(politica_rollout)
+        # Opcional: crença com n_particulas (crenca.py) sobre as mãos ocultas, mantida pela mão inteira
+        self.crenca = CrencaMaos(n_particulas) if n_particulas else None
+        self.n_rollouts_por_decisao = config['rollouts_por_lote_gpu']
+        self.threads_por_bloco = config['threads_por_bloco']
+        self.calibracao = CalibracaoPorFase()
+        # Estados do gerador da GPU, criados no primeiro lote e reaproveitados (EstadosRNG)
+        self._estados_rng = None
+        # Opcional: ServicoAleatorio (aleatorio.py); cada decisão semeia as determinizações e os
+        # estados da GPU com o seu fluxo e pode ser reproduzida (sem crença: as partículas
+        # dependem da mão inteira)
+        self.aleatorio = aleatorio
+        self.indice_decisao = 0
+        self.ultima_semente = None
+        self._rng_decisao = None
 
     # --- O Coração do MCTS (executado na CPU) ---
     def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
         raiz = MCTSNode(estado_jogo=estado_jogo)
         if not raiz.jogadas_nao_exploradas:
             return None, 0.0
+        if self.crenca is not None:
+            self.crenca.sincronizar(estado_jogo, jogador_bot)
+        if self.aleatorio is not None:
+            k = self.indice_decisao
+            self.indice_decisao += 1
+            self.ultima_semente = self.aleatorio.identificador(k)
+            self._rng_decisao = self.aleatorio.gerador(k, 'determinizacao')
+            self._obter_estados_rng().semear(self.aleatorio.inteiro(k, 'cuda'))
 
         # O MCTS roda um número fixo de vezes para construir a árvore
         for _ in range(self.n_simulacoes // self.n_rollouts_por_decisao):
@@ -193,37 +306,41 @@ class GPUAgenteMCTS:
         return melhor_filho.jogada, taxa_vitoria_estimada
 
     # --- O Orquestrador da GPU ---
+    def _obter_estados_rng(self):
+        if self._estados_rng is None:
+            self._estados_rng = EstadosRNG(self.n_rollouts_por_decisao)
+        return self._estados_rng
+
     def _gpu_rollout(self, estado_jogo: JogoTruco2v2, bot_id: int):
-        maos_iniciais, viras, jogadores_iniciais = achatar_estado_para_gpu(
-            estado_jogo, bot_id, self.n_rollouts_por_decisao)
-        rng_states = create_xoroshiro128p_states(self.n_rollouts_por_decisao, seed=random.randint(0, 2**32-1))
-
-        d_maos = cuda.to_device(maos_iniciais)
-        d_viras = cuda.to_device(viras)
-        d_jogadores = cuda.to_device(jogadores_iniciais)
-        d_rng_states = cuda.to_device(rng_states)
-        d_resultados = cuda.device_array(self.n_rollouts_por_decisao, dtype=np.int8)
-
-        threads_por_bloco = 128
-        blocos_por_grid = math.ceil(self.n_rollouts_por_decisao / threads_por_bloco)
-        
-        simular_rollouts_gpu[blocos_por_grid, threads_por_bloco](
-            d_maos, d_viras, d_jogadores, d_rng_states, d_resultados)
-        cuda.synchronize() 
-
-        resultados_host = d_resultados.copy_to_host()
-        return np.mean(resultados_host)
+        lote = determinizar_lote(estado_jogo, self.n_rollouts_por_decisao, bot_id, rng=self._rng_decisao,
+                                 crenca=self.crenca)
+        vencedores = simular_maos_cuda(lote, None, self.politica_rollout, RUIDO_PADRAO, self.threads_por_bloco,
+                                       estados_rng=self._obter_estados_rng())
+        # Taxa de vitória do time do bot (o kernel retorna o time vencedor de cada rollout)
+        time_bot = next(p.time_id for p in estado_jogo.jogadores if p.id == bot_id)
+        return np.mean(vencedores == time_bot)
 
     # --- Métodos de Benchmark e Decisões Estratégicas (CPU) ---
-    def registrar_resultado_da_mao(self, previsao, resultado_real):
+    def aquecer(self):
+        """ Compila (ou carrega do cache em disco) o kernel e o gerador de números aleatórios rodando um lote. Retorna os segundos gastos. """
+        inicio = time.perf_counter()
+        jogo, jogador = jogo_de_aquecimento()
+        # Sem a crença: ela acompanha a mão real e não deve ver o jogo de aquecimento
+        crenca, self.crenca = self.crenca, None
+        try:
+            self._gpu_rollout(jogo, jogador.id)
+        finally:
+            self.crenca = crenca
+        return time.perf_counter() - inicio
+
+    def registrar_resultado_da_mao(self, previsao, resultado_real, fase=None):
+        """ Acumula a previsão e o resultado real da mão (fase: calibracao.fase_do_jogo na hora da previsão). """
         if previsao is not None:
-            self.log_previsoes.append((previsao, resultado_real))
+            self.calibracao.registrar(previsao, resultado_real, fase)
 
     def calcular_precisao_mse(self):
-        if not self.log_previsoes: return 0.0
-        previsoes = np.array([p[0] for p in self.log_previsoes])
-        resultados_reais = np.array([p[1] for p in self.log_previsoes])
-        return np.mean((previsoes - resultados_reais)**2)
+        """ Brier (MSE) das previsões registradas; 0 sem registros. Ver self.calibracao para o resto. """
+        return self.calibracao.mse
 
     def _simular_jogo_completo(self, estado_jogo):
         jogo_simulado = copy.deepcopy(estado_jogo)
@@ -1,37 +1,89 @@
 import random
 import copy
-import numpy as np # Usaremos numpy para o cálculo do MSE
+import time
+import argparse
+import math
+from statistics import NormalDist
+import numpy as np
 from logica import JogoTruco2v2, Carta, Jogador
+from crenca import CrencaMaos
+from aquecimento import jogo_de_aquecimento
+from calibracao import CalibracaoPorFase
+from gpu_utils import CARTA_PARA_INT
+from simulador_lote import achatar_estado_lote, aplicar_jogada_lote, concatenar_lotes, simular_maos_lote
+
+ALOCACOES = ('plana', 'halving', 'lucb')
+MOTORES = ('python', 'numpy', 'numba')
 
 class MonteCarloBot:
-    def __init__(self, n_simulacoes=1000):
+    def __init__(self, n_simulacoes=1000, n_particulas=None, pareado=False, alocacao='plana',
+                 confianca=0.95, tolerancia=0.02, tempo_limite=None, lote_alocacao=16, motor='python'):
         self.n_simulacoes = n_simulacoes
-        # Lista para guardar tuplas de (previsão, resultado_real)
-        self.log_previsoes = []
+        # Motor das simulações: 'python' (cópias de JogoTruco2v2, uma por simulação) ou
+        # 'numpy'/'numba', que montam todas as (cartas x simulações) mãos em um lote e
+        # jogam o lote inteiro no simulador_lote / simulador_numba
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconhecido: {motor} (use um de {MOTORES})")
+        self.motor = motor
+        # Alocação das simulações entre as cartas: 'plana' (n_simulacoes para cada uma),
+        # 'halving' (successive halving) ou 'lucb' (identificação da melhor carta). As duas
+        # adaptativas gastam no máximo n_simulacoes x cartas (ou tempo_limite segundos) e
+        # param assim que a melhor carta está separada das outras com a `confianca` pedida,
+        # a menos de `tolerancia` na taxa de vitória.
+        if alocacao not in ALOCACOES:
+            raise ValueError(f"Alocação desconhecida: {alocacao} (use uma de {ALOCACOES})")
+        self.alocacao = alocacao
+        self.confianca = confianca
+        self.tolerancia = tolerancia
+        self.tempo_limite = tempo_limite
+        self.lote_alocacao = lote_alocacao
+        self.ultima_alocacao = None
+        # Opcional: crença com n_particulas (crenca.py) que vive pela mão inteira e fornece
+        # as determinizações; sem ela, as mãos ocultas são completadas ao acaso a cada simulação
+        self.crenca = CrencaMaos(n_particulas) if n_particulas else None
+        # Avaliação pareada (números aleatórios comuns): cada simulação usa a mesma
+        # determinização e a mesma semente de rollout para todas as cartas candidatas
+        self.pareado = pareado
+        # Última decisão por amostragem: [(carta, simulações, vitórias)] e, no modo pareado,
+        # [(carta, diferença para a melhor, erro padrão da diferença)]
+        self.ultimas_estatisticas = None
+        self.ultima_comparacao = None
+        # Brier, log-loss e curva de confiabilidade das previsões, por fase (calibracao.py)
+        self.calibracao = CalibracaoPorFase()
+
+    def aquecer(self):
+        """ Roda uma matriz pequena no motor escolhido (no 'numba', compila ou carrega os kernels). Retorna os segundos gastos. """
+        inicio = time.perf_counter()
+        if self.motor == 'numba':
+            from simulador_numba import aquecer
+            aquecer()
+        jogo, jogador = jogo_de_aquecimento()
+        # Sem a crença: ela acompanha a mão real e não deve ver o jogo de aquecimento
+        crenca, self.crenca = self.crenca, None
+        try:
+            self.matriz_resultados(jogo, jogador, jogador.mao[:], 4)
+        finally:
+            self.crenca = crenca
+        return time.perf_counter() - inicio
 
-    def registrar_resultado_da_mao(self, previsao, resultado_real):
+    def registrar_resultado_da_mao(self, previsao, resultado_real, fase=None):
         """
         Registra a previsão feita e o resultado real da mão.
         Args:
             previsao (float): A probabilidade de vitória que o bot calculou.
             resultado_real (int): 1 se o time do bot venceu a mão, 0 caso contrário.
+            fase (str): calibracao.fase_do_jogo no momento da previsão (opcional).
         """
         if previsao is not None:
-            self.log_previsoes.append((previsao, resultado_real))
+            self.calibracao.registrar(previsao, resultado_real, fase)
 
     def calcular_precisao_mse(self):
         """
-        Calcula o Erro Quadrático Médio (MSE) das previsões do bot.
-        Retorna o MSE, ou 0 se nenhum registro foi feito.
+        Calcula o Erro Quadrático Médio (Brier) das previsões do bot.
+        Retorna o MSE, ou 0 se nenhum registro foi feito; log-loss e curva de
+        confiabilidade ficam em self.calibracao.
         """
-        if not self.log_previsoes:
-            return 0.0
-        
-        previsoes = np.array([p[0] for p in self.log_previsoes])
-        resultados_reais = np.array([p[1] for p in self.log_previsoes])
-        
-        mse = np.mean((previsoes - resultados_reais)**2)
-        return mse
+        return self.calibracao.mse
 
     def decidir_melhor_jogada(self, estado_jogo_atual, jogador_bot):
         """
@@ -41,6 +93,11 @@ class MonteCarloBot:
         if not jogadas_possiveis:
             return None, None
 
+        if self.alocacao != 'plana':
+            return self._decidir_adaptativo(estado_jogo_atual, jogador_bot)
+        if self.crenca is not None or self.pareado or self.motor != 'python':
+            return self._decidir_por_matriz(estado_jogo_atual, jogador_bot)
+
         maior_taxa_vitoria = -1.0
         melhor_jogada = None
         
@@ -61,6 +118,170 @@ class MonteCarloBot:
 
         # Retorna a jogada e a previsão de vitória
         return melhor_jogada, maior_taxa_vitoria
+
+    def _decidir_por_matriz(self, estado_jogo_atual, jogador_bot):
+        """ Escolhe a carta pela matriz simulações x cartas (pareada ou não). """
+        jogadas_possiveis = jogador_bot.mao[:]
+        resultados = self.matriz_resultados(estado_jogo_atual, jogador_bot, jogadas_possiveis,
+                                            self.n_simulacoes, self.pareado)
+        taxas = resultados.mean(axis=0)
+        melhor = int(taxas.argmax())
+        self.ultimas_estatisticas = [(j, len(resultados), int(v)) for j, v in zip(jogadas_possiveis, resultados.sum(axis=0))]
+        if self.pareado:
+            diferencas = resultados - resultados[:, [melhor]]
+            erros = diferencas.std(axis=0, ddof=1) / np.sqrt(len(resultados)) if len(resultados) > 1 else np.zeros(len(taxas))
+            self.ultima_comparacao = list(zip(jogadas_possiveis, diferencas.mean(axis=0), erros))
+        return jogadas_possiveis[melhor], float(taxas[melhor])
+
+    def _decidir_adaptativo(self, estado_jogo_atual, jogador_bot):
+        """
+        Successive halving ou LUCB sobre as cartas. As cartas sorteadas juntas usam amostras
+        pareadas, e a parada compara a melhor carta com cada rival pela diferença pareada:
+        para quando o limite inferior de (melhor - rival) passa de -tolerancia para todas,
+        com o nível de confiança dividido entre as rivais e as rodadas (delta / (t (t + 1))).
+        """
+        jogadas = jogador_bot.mao[:]
+        k = len(jogadas)
+        orcamento = self.n_simulacoes * k
+        prazo = None if self.tempo_limite is None else time.monotonic() + self.tempo_limite
+        delta = 1.0 - self.confianca
+        visitas = np.zeros(k)
+        vitorias = np.zeros(k)
+        blocos = []  # (índices das cartas, matriz de resultados pareada)
+
+        def amostrar(indices):
+            # Lotes crescentes (metade do que a carta mais vista já tem) mantêm poucas
+            # verificações de parada, e o último lote não passa do orçamento
+            restante = int(orcamento - visitas.sum()) // len(indices)
+            n = max(1, min(max(self.lote_alocacao, int(visitas[indices].max()) // 2), restante))
+            r = self.matriz_resultados(estado_jogo_atual, jogador_bot, [jogadas[i] for i in indices], n, pareado=True)
+            blocos.append((indices, r))
+            visitas[indices] += n
+            vitorias[indices] += r.sum(axis=0)
+
+        def limite_inferior(melhor, rival):
+            # Diferenças pareadas melhor - rival, nos blocos em que as duas foram sorteadas juntas
+            d = np.concatenate([r[:, ind.index(melhor)].astype(float) - r[:, ind.index(rival)]
+                                for ind, r in blocos if melhor in ind and rival in ind])
+            t = len(blocos)
+            z = NormalDist().inv_cdf(1.0 - delta / ((k - 1) * t * (t + 1)))
+            # Piso de 1/n na variância: poucas amostras iguais não bastam para parar
+            return d.mean() - z * math.sqrt(max(d.var(), 1.0 / len(d)) / len(d))
+
+        def estado_da_busca(candidatos):
+            """ (melhor, rival mais perigosa, motivo de parada ou None) """
+            melhor = max(candidatos, key=lambda i: vitorias[i] / visitas[i])
+            limites = {i: limite_inferior(melhor, i) for i in candidatos if i != melhor}
+            rival = min(limites, key=limites.get) if limites else None
+            if rival is None or limites[rival] > -self.tolerancia:
+                return melhor, rival, 'confianca'
+            if visitas.sum() >= orcamento:
+                return melhor, rival, 'orcamento'
+            if prazo is not None and time.monotonic() >= prazo:
+                return melhor, rival, 'tempo'
+            return melhor, rival, None
+
+        amostrar(list(range(k)))
+        vivos = list(range(k))
+        melhor, rival, parada = estado_da_busca(vivos)
+        if self.alocacao == 'lucb':
+            # Amostra a melhor empírica junto com a rival de limite inferior mais baixo
+            while parada is None:
+                amostrar([melhor, rival])
+                melhor, rival, parada = estado_da_busca(vivos)
+        else:
+            # Successive halving: o orçamento é dividido em log2(k) rodadas e a metade pior sai a cada rodada
+            por_rodada = orcamento / max(1, math.ceil(math.log2(k)))
+            while parada is None:
+                alvo = visitas[vivos[0]] + por_rodada / len(vivos)
+                while parada is None and visitas[vivos[0]] < alvo:
+                    amostrar(vivos)
+                    melhor, rival, parada = estado_da_busca(vivos)
+                if parada is None:
+                    vivos = sorted(vivos, key=lambda i: -vitorias[i] / visitas[i])[:math.ceil(len(vivos) / 2)]
+                    melhor, rival, parada = estado_da_busca(vivos)
+
+        self.ultimas_estatisticas = [(j, int(v), int(w)) for j, v, w in zip(jogadas, visitas, vitorias)]
+        self.ultima_alocacao = {'simulacoes': int(visitas.sum()), 'lotes': len(blocos), 'parada': parada}
+        return jogadas[melhor], float(vitorias[melhor] / visitas[melhor])
+
+    def matriz_resultados(self, estado_jogo_atual, jogador_bot, jogadas, n_simulacoes, pareado=True):
+        """
+        Matriz (n_simulacoes, len(jogadas)) de vitórias (0/1) do time do bot.
+        Pareada: a linha i usa, para todas as jogadas, a mesma determinização e a
+        mesma semente de rollout, e a diferença entre duas colunas é medida nos pares.
+        Não pareada: cada célula tem a sua determinização e a sua semente.
+        """
+        if self.motor != 'python':
+            return self._matriz_em_lote(estado_jogo_atual, jogador_bot, jogadas, n_simulacoes, pareado)
+        n_amostras = n_simulacoes if pareado else n_simulacoes * len(jogadas)
+        determinizacoes = self._determinizacoes(estado_jogo_atual, jogador_bot, n_amostras)
+        sementes = [random.getrandbits(32) for _ in range(n_amostras)]
+        sorteio = random.Random()
+        resultados = np.zeros((n_simulacoes, len(jogadas)), dtype=np.int8)
+        for i in range(n_simulacoes):
+            for m, jogada in enumerate(jogadas):
+                k = i if pareado else m * n_simulacoes + i
+                estado_copia = copy.deepcopy(determinizacoes[k]) if pareado else determinizacoes[k]
+                estado_copia.jogar_carta(jogador_bot.id, jogada)
+                sorteio.seed(sementes[k])
+                resultados[i, m] = self._run_single_simulation(estado_copia, sorteio) == jogador_bot.time_id
+        return resultados
+
+    def _matriz_em_lote(self, estado_jogo_atual, jogador_bot, jogadas, n_simulacoes, pareado):
+        """
+        matriz_resultados com o simulador em lote: as determinizações saem todas de uma vez
+        (crença ou sorteio vetorizado), cada carta é aplicada na sua fatia do lote e as mãos
+        que não acabaram com a jogada são simuladas juntas. No modo pareado as cartas
+        compartilham as determinizações, mas não os sorteios do rollout.
+        """
+        k = len(jogadas)
+        # Sorteado do `random` global, para as sementes de random.seed valerem também aqui
+        rng = np.random.default_rng(random.getrandbits(64))
+        n_amostras = n_simulacoes if pareado else n_simulacoes * k
+        if self.crenca is not None:
+            self.crenca.sincronizar(estado_jogo_atual, jogador_bot)
+            lote = achatar_estado_lote(estado_jogo_atual, n_amostras)
+            lote['maos'] = self.crenca.amostrar_maos(estado_jogo_atual, n_amostras, rng)
+        else:
+            lote = achatar_estado_lote(estado_jogo_atual, n_amostras, jogador_bot.id, rng)
+        if pareado:
+            lote = concatenar_lotes([lote] * k)
+        # Linhas em ordem carta-major: a fatia m * n_simulacoes .. (m + 1) * n_simulacoes é da carta m
+        lote, vencedor = aplicar_jogada_lote(lote, np.repeat([CARTA_PARA_INT[j] for j in jogadas], n_simulacoes))
+        pendentes = np.flatnonzero(vencedor < 0)
+        if pendentes.size:
+            if self.motor == 'numba':
+                from simulador_numba import simular_maos_numba as simular
+            else:
+                simular = simular_maos_lote
+            vencedor[pendentes] = simular({campo: v[pendentes] for campo, v in lote.items()}, rng)
+        return (vencedor == jogador_bot.time_id).reshape(k, n_simulacoes).T.astype(np.int8)
+
+    def _determinizacoes(self, estado_jogo_atual, jogador_bot, n):
+        """ n cópias do estado com as mãos ocultas sorteadas (da crença, se houver). """
+        if self.crenca is not None:
+            self.crenca.sincronizar(estado_jogo_atual, jogador_bot)
+            maos = self.crenca.amostrar_maos(estado_jogo_atual, n)
+            copias = [self.crenca.determinizar(estado_jogo_atual, linha) for linha in maos]
+        else:
+            # O conjunto de cartas conhecidas é montado uma vez só para as n cópias
+            conhecidas = set(jogador_bot.mao) | set(estado_jogo_atual.cartas_jogadas) | {estado_jogo_atual.vira}
+            desconhecidas = [c for c in estado_jogo_atual.baralho_completo if c not in conhecidas]
+            outros = [i for i, p in enumerate(estado_jogo_atual.jogadores) if p.id != jogador_bot.id]
+            copias = []
+            for _ in range(n):
+                copia = copy.deepcopy(estado_jogo_atual)
+                random.shuffle(desconhecidas)
+                inicio = 0
+                for i in outros:
+                    tamanho = len(copia.jogadores[i].mao)
+                    copia.jogadores[i].mao = desconhecidas[inicio:inicio + tamanho]
+                    inicio += tamanho
+                copias.append(copia)
+        for copia in copias:
+            copia.simulacao = True
+        return copias
         
     def decidir_mao_de_onze_com_mc(self, estado_jogo_inicial, jogador_bot, n_simulacoes_mao_onze=200):
         # A lógica interna permanece a mesma, mas sem os prints
@@ -92,13 +313,13 @@ class MonteCarloBot:
 
     # As funções _run_single_simulation, _determinize_and_simulate e _simular_jogo_completo
     # continuam as mesmas, pois já são silenciosas.
-    def _run_single_simulation(self, estado_jogo_determinizado):
+    def _run_single_simulation(self, estado_jogo_determinizado, sorteio=random):
         jogo_simulado = estado_jogo_determinizado
         while jogo_simulado.estado_jogo == "EM_ANDAMENTO":
             jogador_da_vez = jogo_simulado.jogadores[jogo_simulado.jogador_atual_idx]
             if not jogador_da_vez.mao:
                 jogo_simulado._checar_vencedor_da_mao(); continue
-            carta_aleatoria = random.choice(jogador_da_vez.mao)
+            carta_aleatoria = sorteio.choice(jogador_da_vez.mao)
             jogo_simulado.jogar_carta(jogador_da_vez.id, carta_aleatoria)
         return jogo_simulado.vencedor_mao
 
@@ -138,4 +359,142 @@ class MonteCarloBot:
                 jogo_simulado.jogar_carta(jogador_da_vez.id, carta_aleatoria)
         if jogo_simulado.pontos_time1 >= 12: return 1
         elif jogo_simulado.pontos_time2 >= 12: return 2
-        else: return 0
\ No newline at end of file
+        else: return 0
+
+
+# ======================================================================
+# Benchmark: avaliação independente x pareada (números aleatórios comuns)
+#
+#   python agente_mc.py --estados 100 --simulacoes 200
+# ======================================================================
+
+def benchmark_pareado(n_estados=100, n_simulacoes=200, semente=0):
+    """
+    Em cada estado (o jogador da vez com 2 ou 3 cartas), mede a variância do estimador
+    da diferença de taxa de vitória entre cada par de cartas nos dois modos, e em quantos
+    estados a melhor carta se separa da segunda com 95% de confiança.
+    """
+    from politica_rollout import estados_de_teste
+    estados = [e for e, _ in estados_de_teste(3 * n_estados, semente)
+               if len(e.jogadores[e.jogador_atual_idx].mao) >= 2][:n_estados]
+    bot = MonteCarloBot(n_simulacoes)
+    resumo = {}
+    for pareado in (False, True):
+        random.seed(semente)
+        variancias, decididos, tempo = [], 0, 0.0
+        for estado in estados:
+            jogador = estado.jogadores[estado.jogador_atual_idx]
+            inicio = time.perf_counter()
+            r = bot.matriz_resultados(estado, jogador, jogador.mao[:], n_simulacoes, pareado).astype(float)
+            tempo += time.perf_counter() - inicio
+            pares = [(a, b) for a in range(r.shape[1]) for b in range(a + 1, r.shape[1])]
+            if pareado:
+                var = [np.var(r[:, a] - r[:, b], ddof=1) / n_simulacoes for a, b in pares]
+            else:
+                var = [(np.var(r[:, a], ddof=1) + np.var(r[:, b], ddof=1)) / n_simulacoes for a, b in pares]
+            variancias.append(np.mean(var))
+            ordem = np.argsort(-r.mean(axis=0))
+            par = pares.index(tuple(sorted(ordem[:2])))
+            decididos += r[:, ordem[0]].mean() - r[:, ordem[1]].mean() > 1.96 * np.sqrt(var[par])
+        modo = 'pareado' if pareado else 'independente'
+        resumo[modo] = float(np.mean(variancias))
+        print(f"  {modo:<12} var(diferença) {resumo[modo]:.5f} | {100 * decididos / len(estados):5.1f}% dos estados "
+              f"decididos com 95% | {1000 * tempo / len(estados):7.1f} ms/decisão")
+    print(f"  Redução de variância: {resumo['independente'] / resumo['pareado']:.1f}x "
+          f"(simulações pareadas equivalem a esse múltiplo de simulações independentes)")
+    return resumo
+
+
+# ======================================================================
+# Benchmark: orçamento plano x successive halving x LUCB
+#
+#   python agente_mc.py --alocacao --estados 60 --simulacoes 1000
+#
+# A carta de referência de cada estado vem de uma avaliação pareada grande;
+# uma decisão conta como certa se a carta escolhida fica a menos de
+# `tolerancia` da melhor nessa referência.
+# ======================================================================
+
+def benchmark_alocacao(n_estados=60, n_simulacoes=1000, n_referencia=4000, tolerancia=0.02, semente=0):
+    from politica_rollout import estados_de_teste
+    estados = [e for e, _ in estados_de_teste(3 * n_estados, semente)
+               if len(e.jogadores[e.jogador_atual_idx].mao) >= 2][:n_estados]
+    random.seed(semente)
+    referencias = []
+    for estado in estados:
+        jogador = estado.jogadores[estado.jogador_atual_idx]
+        taxas = MonteCarloBot().matriz_resultados(estado, jogador, jogador.mao[:], n_referencia).mean(axis=0)
+        referencias.append(dict(zip(map(str, jogador.mao), taxas)))
+
+    resumo = {}
+    # A linha de base é o bot plano original (avaliação independente); as adaptativas são pareadas
+    for nome, alocacao, pareado in (('plana', 'plana', False), ('plana-par', 'plana', True),
+                                    ('halving', 'halving', True), ('lucb', 'lucb', True)):
+        bot = MonteCarloBot(n_simulacoes, pareado=pareado, alocacao=alocacao, tolerancia=tolerancia)
+        random.seed(semente)
+        certos, simulacoes, tempo = 0, 0, 0.0
+        for estado, referencia in zip(estados, referencias):
+            jogador = estado.jogadores[estado.jogador_atual_idx]
+            inicio = time.perf_counter()
+            carta, _ = bot.decidir_melhor_jogada(estado, jogador)
+            tempo += time.perf_counter() - inicio
+            certos += referencia[str(carta)] >= max(referencia.values()) - tolerancia
+            simulacoes += bot.ultima_alocacao['simulacoes'] if alocacao != 'plana' else n_simulacoes * len(jogador.mao)
+        resumo[nome] = {'acerto': certos / len(estados), 'simulacoes': simulacoes / len(estados),
+                            'ms': 1000 * tempo / len(estados)}
+        r = resumo[nome]
+        print(f"  {nome:<9} acerto {100 * r['acerto']:5.1f}% | {r['simulacoes']:7.0f} simulações/decisão | "
+              f"{r['ms']:7.1f} ms/decisão")
+    return resumo
+
+
+# ======================================================================
+# Benchmark: motor em Python x motor em lote (NumPy / Numba)
+#
+#   python agente_mc.py --motores --estados 20 --simulacoes 1000
+# ======================================================================
+
+def benchmark_motores(n_estados=20, n_simulacoes=1000, motores=MOTORES, semente=0):
+    """ ms por decisão do bot plano em cada motor, nos mesmos estados. """
+    from politica_rollout import estados_de_teste
+    estados = [e for e, _ in estados_de_teste(3 * n_estados, semente)
+               if len(e.jogadores[e.jogador_atual_idx].mao) >= 2][:n_estados]
+    resumo = {}
+    for motor in motores:
+        bot = MonteCarloBot(n_simulacoes, motor=motor)
+        # Compila o kernel (numba) e aquece os caches antes de medir
+        bot.decidir_melhor_jogada(estados[0], estados[0].jogadores[estados[0].jogador_atual_idx])
+        random.seed(semente)
+        inicio = time.perf_counter()
+        for estado in estados:
+            bot.decidir_melhor_jogada(estado, estado.jogadores[estado.jogador_atual_idx])
+        resumo[motor] = 1000 * (time.perf_counter() - inicio) / len(estados)
+        print(f"  {motor:<7} {resumo[motor]:8.1f} ms/decisão | {resumo.get('python', resumo[motor]) / resumo[motor]:5.1f}x")
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a avaliação independente e a pareada do MonteCarloBot.")
+    parser.add_argument('--estados', type=int, default=100)
+    parser.add_argument('--simulacoes', type=int, default=200)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--alocacao', action='store_true',
+                        help="Compara o orçamento plano com successive halving e LUCB (padrão: 1000 simulações por carta).")
+    parser.add_argument('--motores', nargs='*', choices=MOTORES,
+                        help="Compara os motores de simulação (padrão: todos, com 1000 simulações por carta).")
+    args = parser.parse_args()
+    if args.motores is not None:
+        n = args.simulacoes if args.simulacoes != 200 else 1000
+        print(f"Motores em {args.estados} estados, {n} simulações por carta:")
+        benchmark_motores(args.estados, n, args.motores or MOTORES, args.semente)
+        return
+    if args.alocacao:
+        n = args.simulacoes if args.simulacoes != 200 else 1000
+        print(f"Alocação do orçamento em {args.estados} estados, {n} simulações por carta:")
+        benchmark_alocacao(args.estados, n, semente=args.semente)
+        return
+    print(f"Avaliação de {args.estados} estados com {args.simulacoes} simulações por carta:")
+    benchmark_pareado(args.estados, args.simulacoes, args.semente)
+
+if __name__ == '__main__':
+    main()
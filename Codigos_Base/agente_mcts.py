@@ -1,8 +1,10 @@
 import random
 import math
 import copy
-import numpy as np
+import time
 from logica import JogoTruco2v2
+from instrumentacao import EstatisticasBusca, intervalo_de_progresso
+from calibracao import CalibracaoPorFase
 
 # A classe MCTSNode permanece a mesma
 class MCTSNode:
@@ -53,13 +55,24 @@ class MCTSNode:
 
 class MCTSAgente:
     """ O agente que usa MCTS para tomar decisões. """
-    def __init__(self, n_simulacoes=1000):
+    def __init__(self, n_simulacoes=1000, instrumentar=False, progresso=None):
         self.n_simulacoes = n_simulacoes
-        self.log_previsoes = []
+        self.calibracao = CalibracaoPorFase()
+        # Tempos por fase e tamanho da árvore em ultima_busca (instrumentacao.py)
+        self.instrumentar = instrumentar
+        # Callback chamado a cada 2% da busca com o EstatisticasBusca parcial (ex.: barra_de_progresso)
+        self.progresso = progresso
+        self.ultima_busca = None
 
     def _simular_rollout(self, estado_jogo, time_bot_id):
+        return self._jogar_rollout(self._copiar_para_rollout(estado_jogo), time_bot_id)
+
+    def _copiar_para_rollout(self, estado_jogo):
         jogo_simulado = copy.deepcopy(estado_jogo)
         jogo_simulado.simulacao = True
+        return jogo_simulado
+
+    def _jogar_rollout(self, jogo_simulado, time_bot_id):
         while jogo_simulado.estado_jogo == "EM_ANDAMENTO":
             jogador_da_vez = jogo_simulado.jogadores[jogo_simulado.jogador_atual_idx]
             if not jogador_da_vez.mao:
@@ -69,17 +82,45 @@ class MCTSAgente:
             jogo_simulado.jogar_carta(jogador_da_vez.id, carta_aleatoria)
         return 1 if jogo_simulado.vencedor_mao == time_bot_id else 0
 
-    # ### MÉTODO ATUALIZADO com a barra de progresso ###
     def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
         """ Executa o algoritmo MCTS e retorna a melhor jogada. """
         time_bot_id = jogador_bot.time_id
         raiz = MCTSNode(estado_jogo=estado_jogo)
+        estatisticas = EstatisticasBusca(self.__class__.__name__, self.n_simulacoes, self.instrumentar)
+        self.ultima_busca = estatisticas
 
         if not raiz.jogadas_nao_exploradas:
             return None, 0.0
 
-        # Loop principal do MCTS
-        for i in range(self.n_simulacoes):
+        inicio = time.perf_counter()
+        iteracao = self._iteracao_instrumentada if self.instrumentar else self._iteracao
+        # Sem callback a busca roda em um bloco só; com callback, em blocos de 2%
+        passo = intervalo_de_progresso(self.n_simulacoes) if self.progresso is not None else self.n_simulacoes
+        while estatisticas.iteracoes < self.n_simulacoes:
+            bloco = min(passo, self.n_simulacoes - estatisticas.iteracoes)
+            iteracao(raiz, time_bot_id, bloco, estatisticas)
+            estatisticas.iteracoes += bloco
+            estatisticas.tempo_total = time.perf_counter() - inicio
+            if self.progresso is not None and estatisticas.iteracoes < self.n_simulacoes:
+                self.progresso(estatisticas)
+
+        if self.instrumentar:
+            estatisticas.medir_arvore(raiz)
+        estatisticas.concluida = True
+        if self.progresso is not None:
+            self.progresso(estatisticas)
+
+        if not raiz.filhos:
+             return random.choice(estado_jogo.jogadores[estado_jogo.jogador_atual_idx].mao), 0.5
+
+        melhor_filho = max(raiz.filhos, key=lambda c: c.visitas)
+        taxa_vitoria_estimada = melhor_filho.vitorias / melhor_filho.visitas if melhor_filho.visitas > 0 else 0.0
+        
+        return melhor_filho.jogada, taxa_vitoria_estimada
+
+    def _iteracao(self, raiz, time_bot_id, n, estatisticas):
+        """ n iterações do MCTS sem medir nada. """
+        for _ in range(n):
             no_atual = raiz
             
             # 1. Seleção
@@ -96,36 +137,46 @@ class MCTSAgente:
                 # 4. Retropropagação
                 no_atual.retropropagar(resultado_rollout)
 
-            # Lógica da Barra de Progresso
-            # A cada 2% de progresso (ou na última iteração), atualiza a barra
-            if (i + 1) % (self.n_simulacoes // 50) == 0 or (i + 1) == self.n_simulacoes:
-                percentual = (i + 1) / self.n_simulacoes
-                tamanho_barra = 30
-                blocos_cheios = int(tamanho_barra * percentual)
-                barra = "█" * blocos_cheios + "░" * (tamanho_barra - blocos_cheios)
-                print(f"\rAnalisando... [{barra}] {percentual:.1%}", end="", flush=True)
-        
-        print() # Pula uma linha após a conclusão da barra
-
-        if not raiz.filhos:
-             return random.choice(estado_jogo.jogadores[estado_jogo.jogador_atual_idx].mao), 0.5
-
-        melhor_filho = max(raiz.filhos, key=lambda c: c.visitas)
-        taxa_vitoria_estimada = melhor_filho.vitorias / melhor_filho.visitas if melhor_filho.visitas > 0 else 0.0
-        
-        return melhor_filho.jogada, taxa_vitoria_estimada
+    def _iteracao_instrumentada(self, raiz, time_bot_id, n, estatisticas):
+        """ Igual a _iteracao, acumulando o tempo e a contagem de cada fase. """
+        tempos, contagens = estatisticas.tempos, estatisticas.contagens
+        relogio = time.perf_counter
+        for _ in range(n):
+            t0 = relogio()
+            no_atual = raiz
+            while not no_atual.jogadas_nao_exploradas and no_atual.filhos:
+                no_atual = no_atual.selecionar_filho_ucb()
+            t1 = relogio()
+            tempos['selecao'] += t1 - t0
+            contagens['selecao'] += 1
+            if no_atual.jogadas_nao_exploradas:
+                no_atual = no_atual.expandir()
+                t2 = relogio()
+                tempos['expansao'] += t2 - t1
+                contagens['expansao'] += 1
+                t1 = t2
+            # A cópia do estado que o rollout vai jogar conta como determinização
+            jogo_simulado = self._copiar_para_rollout(no_atual.estado_jogo)
+            t2 = relogio()
+            tempos['determinizacao'] += t2 - t1
+            contagens['determinizacao'] += 1
+            resultado_rollout = self._jogar_rollout(jogo_simulado, time_bot_id)
+            t3 = relogio()
+            tempos['rollout'] += t3 - t2
+            contagens['rollout'] += 1
+            no_atual.retropropagar(resultado_rollout)
+            tempos['retropropagacao'] += relogio() - t3
+            contagens['retropropagacao'] += 1
     
     # Os outros métodos (registrar_resultado_da_mao, calcular_precisao_mse, etc.) permanecem os mesmos.
-    def registrar_resultado_da_mao(self, previsao, resultado_real):
+    def registrar_resultado_da_mao(self, previsao, resultado_real, fase=None):
+        """ Acumula a previsão e o resultado real da mão (fase: calibracao.fase_do_jogo na hora da previsão). """
         if previsao is not None:
-            self.log_previsoes.append((previsao, resultado_real))
+            self.calibracao.registrar(previsao, resultado_real, fase)
 
     def calcular_precisao_mse(self):
-        if not self.log_previsoes:
-            return 0.0
-        previsoes = np.array([p[0] for p in self.log_previsoes])
-        resultados_reais = np.array([p[1] for p in self.log_previsoes])
-        return np.mean((previsoes - resultados_reais)**2)
+        """ Brier (MSE) das previsões registradas; 0 sem registros. Ver self.calibracao para o resto. """
+        return self.calibracao.mse
 
     def _simular_jogo_completo(self, estado_jogo):
         jogo_simulado = estado_jogo
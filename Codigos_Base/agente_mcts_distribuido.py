@@ -0,0 +1,83 @@
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from agente_mcts_multi import MCTSAgente
+from protocolo_rede import codificar_estado, consultar_worker
+from gpu_utils import INT_PARA_CARTA
+
+
+def ler_hosts(texto):
+    """ Converte "host1:5555,host2:5556" em [("host1", 5555), ("host2", 5556)]. """
+    hosts = []
+    for item in texto.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, porta = item.rpartition(':')
+        hosts.append((host or 'localhost', int(porta)))
+    return hosts
+
+
+def hosts_do_ambiente(variavel='TRUCO_WORKERS'):
+    """ Lista de workers configurada na variável de ambiente (vazia se não houver). """
+    return ler_hosts(os.environ.get(variavel, ''))
+
+
+class MCTSAgenteDistribuido(MCTSAgente):
+    """
+    MCTS root-parallel espalhado por vários workers remotos (worker_rollout.py).
+    Cada worker recebe uma fração do orçamento, devolve visitas/vitórias por filho
+    da raiz e o agente soma tudo antes de escolher a jogada mais visitada.
+    Os métodos de Mão de Onze e de log são herdados do agente multi-core.
+    """
+    def __init__(self, hosts, n_simulacoes=20000, time_limit_por_jogada=None, timeout=60.0, max_nos=None,
+                 limite_memoria_mb=None):
+        # max_nos / limite_memoria_mb valem para cada árvore dos workers e vão no pedido
+        super().__init__(n_simulacoes=n_simulacoes, n_jobs=1, max_nos=max_nos, limite_memoria_mb=limite_memoria_mb)
+        self.hosts = ler_hosts(hosts) if isinstance(hosts, str) else list(hosts)
+        if not self.hosts:
+            raise ValueError("MCTSAgenteDistribuido precisa de pelo menos um worker.")
+        self.time_limit = time_limit_por_jogada
+        self.timeout = timeout
+        self.ultimas_sims = 0
+        self.ultimas_estatisticas = None
+
+    def _pedidos(self, estado_jogo, jogador_bot):
+        estado = codificar_estado(estado_jogo)
+        n_hosts = len(self.hosts)
+        for i in range(n_hosts):
+            n_sims = None
+            if self.time_limit is None:
+                # Distribui o resto da divisão pelos primeiros workers
+                n_sims = self.n_simulacoes // n_hosts + (1 if i < self.n_simulacoes % n_hosts else 0)
+            yield {'estado': estado, 'bot_id': jogador_bot.id, 'n_simulacoes': n_sims, 'tempo': self.time_limit,
+                   'max_nos': self.max_nos}
+
+    def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
+        if not jogador_bot.mao:
+            return None, 0.0
+
+        pedidos = list(self._pedidos(estado_jogo, jogador_bot))
+        with ThreadPoolExecutor(max_workers=len(self.hosts)) as executor:
+            futuros = [executor.submit(consultar_worker, host, porta, pedido, self.timeout)
+                       for (host, porta), pedido in zip(self.hosts, pedidos)]
+
+        visitas, vitorias = {}, {}
+        self.ultimas_sims = 0
+        for (host, porta), futuro in zip(self.hosts, futuros):
+            try:
+                resposta = futuro.result()
+            except (OSError, RuntimeError, ValueError) as e:
+                print(f"    > Worker {host}:{porta} indisponível: {e}")
+                continue
+            for jogada, v, w in zip(resposta['jogadas'], resposta['visitas'], resposta['vitorias']):
+                visitas[jogada] = visitas.get(jogada, 0) + v
+                vitorias[jogada] = vitorias.get(jogada, 0) + w
+            self.ultimas_sims += resposta['sims']
+
+        if not visitas:
+            return random.choice(jogador_bot.mao), 0.5
+
+        self.ultimas_estatisticas = [(INT_PARA_CARTA[j], visitas[j], vitorias[j]) for j in visitas]
+        melhor = max(visitas, key=visitas.get)
+        return INT_PARA_CARTA[melhor], vitorias[melhor] / visitas[melhor]
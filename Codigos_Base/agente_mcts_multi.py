@@ -1,15 +1,23 @@
 import random
 import math
 import copy
-import numpy as np
+import time
 import os  # <<< ADICIONADO: Importação necessária
 from collections import Counter
 from joblib import Parallel, delayed
 from logica import JogoTruco2v2
+from prazo import Prazo
+from config_desempenho import carregar_config
+from avaliador_folha import simular_com_avaliador
+from politica_rollout import simular_rollout, validar_politica
+from aquecimento import jogo_de_aquecimento
+from instrumentacao import EstatisticasBusca, tamanho_da_arvore
+from calibracao import CalibracaoPorFase
 
-# A classe MCTSNode não muda
 class MCTSNode:
     """ Representa um nó na árvore de busca do Monte Carlo. """
+    __slots__ = ('estado_jogo', 'parente', 'jogada', 'filhos', 'vitorias', 'visitas', 'jogadas_nao_exploradas')
+
     def __init__(self, estado_jogo, parente=None, jogada=None):
         self.estado_jogo = estado_jogo
         self.parente = parente
@@ -54,38 +62,209 @@ class MCTSNode:
             no_atual.vitorias += resultado
             no_atual = no_atual.parente
 
-# A função run_single_mcts_search não muda
-def run_single_mcts_search(estado_jogo, jogador_bot, n_simulacoes):
-    agente_temporario = MCTSAgente(n_simulacoes=n_simulacoes)
-    time_bot_id = jogador_bot.time_id
-    raiz = MCTSNode(estado_jogo=estado_jogo)
-    if not raiz.jogadas_nao_exploradas:
-        return None, 0.0
-    for _ in range(n_simulacoes):
+    def colapsar(self):
+        """
+        Descarta a subárvore abaixo do nó, que volta a ser uma folha não expandida (as visitas e
+        vitórias acumuladas ficam). Retorna quantos nós saíram da árvore.
+        """
+        removidos = tamanho_da_arvore(self)[0] - 1
+        self.filhos = []
+        self.jogadas_nao_exploradas = self.estado_jogo.jogadores[self.estado_jogo.jogador_atual_idx].mao[:]
+        return removidos
+
+# Ao bater no limite de nós, a poda colapsa subárvores até sobrar esta fração do limite
+FRACAO_APOS_PODA = 0.75
+# Estimativa de bytes por nó (nó + JogoTruco2v2 copiado), medida com `python memoria.py`
+BYTES_POR_NO = 1900
+
+
+def podar_arvore(raiz, n_nos, alvo):
+    """
+    Colapsa as subárvores menos visitadas (nunca a raiz) até a árvore ter no máximo `alvo`
+    nós, ou até não sobrar o que colapsar. Retorna o novo número de nós.
+    """
+    internos = []
+    pilha = list(raiz.filhos)
+    while pilha:
+        no = pilha.pop()
+        if no.filhos:
+            internos.append(no)
+            pilha.extend(no.filhos)
+    internos.sort(key=lambda no: no.visitas)
+    colapsados = set()
+    for no in internos:
+        if n_nos <= alvo:
+            break
+        ancestral = no.parente
+        while ancestral is not None and id(ancestral) not in colapsados:
+            ancestral = ancestral.parente
+        if ancestral is not None:
+            continue  # já saiu junto com um ancestral colapsado
+        n_nos -= no.colapsar()
+        colapsados.add(id(no))
+    return n_nos
+
+
+def iteracao_instrumentada(raiz, time_bot_id, valor_folha, estatisticas):
+    """
+    Uma iteração do MCTS acumulando o tempo e a contagem de cada fase em estatisticas
+    (EstatisticasBusca). A cópia do estado feita pelo rollout conta como rollout.
+    Retorna True se a iteração criou um nó.
+    """
+    tempos, contagens = estatisticas.tempos, estatisticas.contagens
+    t0 = time.perf_counter()
+    no_atual = raiz
+    while not no_atual.jogadas_nao_exploradas and no_atual.filhos:
+        no_atual = no_atual.selecionar_filho_ucb()
+    t1 = time.perf_counter()
+    tempos['selecao'] += t1 - t0
+    contagens['selecao'] += 1
+    expandiu = bool(no_atual.jogadas_nao_exploradas)
+    if expandiu:
+        no_atual = no_atual.expandir()
+        t2 = time.perf_counter()
+        tempos['expansao'] += t2 - t1
+        contagens['expansao'] += 1
+        t1 = t2
+    resultado_rollout = valor_folha(no_atual.estado_jogo, time_bot_id)
+    t2 = time.perf_counter()
+    tempos['rollout'] += t2 - t1
+    contagens['rollout'] += 1
+    no_atual.retropropagar(resultado_rollout)
+    tempos['retropropagacao'] += time.perf_counter() - t2
+    contagens['retropropagacao'] += 1
+    return expandiu
+
+
+def iteracoes_da_busca(n_simulacoes=None, prazo=None):
+    """ Conta as iterações da busca até n_simulacoes ou até o Prazo expirar, o que vier primeiro (None: sem esse limite). """
+    feitas = 0
+    while (n_simulacoes is None or feitas < n_simulacoes) and (prazo is None or not prazo.expirou()):
+        yield feitas
+        feitas += 1
+
+
+def expandir_arvore(raiz, time_bot_id, n_simulacoes, valor_folha, max_nos=None, estatisticas=None, prazo=None):
+    """
+    Roda o MCTS a partir da raiz por n_simulacoes iterações e/ou até o Prazo (iteracoes_da_busca).
+    Com max_nos, a árvore nunca passa desse número de nós: ao atingi-lo, podar_arvore colapsa
+    as subárvores menos visitadas. Com um EstatisticasBusca, mede as fases
+    (iteracao_instrumentada) e a árvore final. As iterações feitas ficam em raiz.visitas.
+    Retorna (nós na árvore, podas feitas).
+    """
+    n_nos, podas, visitas_antes = 1, 0, raiz.visitas
+    alvo = int(max_nos * FRACAO_APOS_PODA) if max_nos is not None else None
+    for _ in iteracoes_da_busca(n_simulacoes, prazo):
+        if max_nos is not None and n_nos >= max_nos:
+            n_nos = podar_arvore(raiz, n_nos, alvo)
+            podas += 1
+        if estatisticas is not None:
+            n_nos += iteracao_instrumentada(raiz, time_bot_id, valor_folha, estatisticas)
+            continue
         no_atual = raiz
         while not no_atual.jogadas_nao_exploradas and no_atual.filhos:
             no_atual = no_atual.selecionar_filho_ucb()
         if no_atual.jogadas_nao_exploradas:
             no_atual = no_atual.expandir()
+            n_nos += 1
         if no_atual is not None:
-            resultado_rollout = agente_temporario._simular_rollout(no_atual.estado_jogo, time_bot_id)
+            resultado_rollout = valor_folha(no_atual.estado_jogo, time_bot_id)
             no_atual.retropropagar(resultado_rollout)
+    if estatisticas is not None:
+        estatisticas.iteracoes += raiz.visitas - visitas_antes
+        estatisticas.medir_arvore(raiz)
+    return n_nos, podas
+
+
+def run_single_mcts_search(estado_jogo, jogador_bot, n_simulacoes, avaliador=None, profundidade_rollout=0,
+                           politica_rollout='aleatoria', max_nos=None, semente=None, estatisticas=None):
+    agente_temporario = MCTSAgente(n_simulacoes=n_simulacoes, avaliador=avaliador, profundidade_rollout=profundidade_rollout,
+                                   politica_rollout=politica_rollout)
+    if semente is not None:
+        # Fluxo próprio do pacote (aleatorio.py), em vez do estado do random herdado pelo worker
+        agente_temporario.rng = random.Random(semente)
+    time_bot_id = jogador_bot.time_id
+    raiz = MCTSNode(estado_jogo=estado_jogo)
+    if not raiz.jogadas_nao_exploradas:
+        return None, 0.0
+    expandir_arvore(raiz, time_bot_id, n_simulacoes, agente_temporario._valor_folha, max_nos, estatisticas)
     if not raiz.filhos:
-        return random.choice(estado_jogo.jogadores[estado_jogo.jogador_atual_idx].mao), 0.5
+        return agente_temporario.rng.choice(estado_jogo.jogadores[estado_jogo.jogador_atual_idx].mao), 0.5
     melhor_filho = max(raiz.filhos, key=lambda c: c.visitas)
     taxa_vitoria_estimada = melhor_filho.vitorias / melhor_filho.visitas if melhor_filho.visitas > 0 else 0.0
     return melhor_filho.jogada, taxa_vitoria_estimada
 
+def _pacote_cronometrado(*args, instrumentar=False):
+    """
+    run_single_mcts_search, os segundos que o worker passou nela (utilização dos workers) e,
+    com instrumentar, o EstatisticasBusca do pacote (None sem instrumentação).
+    """
+    estatisticas = EstatisticasBusca(instrumentada=True) if instrumentar else None
+    inicio = time.perf_counter()
+    resultado = run_single_mcts_search(*args, estatisticas=estatisticas)
+    return resultado, time.perf_counter() - inicio, estatisticas
+
+def run_single_mcts_search_estatisticas(estado_jogo, jogador_bot, n_simulacoes=None, time_limit=None, max_nos=None):
+    """
+    Igual a run_single_mcts_search, mas para por número de simulações OU por tempo e
+    devolve as estatísticas de cada filho da raiz: lista de (jogada, visitas, vitorias).
+    Usada pelos workers remotos, que precisam somar árvores de várias máquinas.
+    Com max_nos, a árvore é podada como em expandir_arvore (por tempo, ela não tem outro limite).
+    """
+    if n_simulacoes is None and time_limit is None:
+        raise ValueError("Informe n_simulacoes ou time_limit.")
+    agente_temporario = MCTSAgente(n_simulacoes=n_simulacoes or 0)
+    raiz = MCTSNode(estado_jogo=estado_jogo)
+    if not raiz.jogadas_nao_exploradas:
+        return []
+    prazo = Prazo.em(time_limit) if time_limit is not None else None
+    expandir_arvore(raiz, jogador_bot.time_id, n_simulacoes, agente_temporario._simular_rollout, max_nos, prazo=prazo)
+    return [(f.jogada, f.visitas, f.vitorias) for f in raiz.filhos]
+
 class MCTSAgente:
-    def __init__(self, n_simulacoes=20000, n_jobs=-1):
+    def __init__(self, n_simulacoes=20000, n_jobs=-1, tabela_abertura=None, avaliador=None, profundidade_rollout=0,
+                 politica_rollout='aleatoria', progresso=None, max_nos=None, limite_memoria_mb=None, aleatorio=None,
+                 instrumentar=False):
+        config = carregar_config()
+        # Como os jogadores escolhem as cartas nos rollouts: 'aleatoria' ou 'heuristica' (politica_rollout.py)
+        self.politica_rollout = validar_politica(politica_rollout)
+        # Opcional: AvaliadorFolha (avaliador_folha.py) no lugar dos rollouts completos;
+        # as folhas jogam profundidade_rollout cartas ao acaso e o avaliador estima o resto
+        self.avaliador = avaliador
+        self.profundidade_rollout = profundidade_rollout
+        # Opcional: TabelaAbertura (tabela_abertura.py) para a primeira carta e a Mão de Onze
+        self.tabela_abertura = tabela_abertura
         self.n_simulacoes = n_simulacoes
-        self.log_previsoes = []
-        self.n_jobs = n_jobs
+        self.calibracao = CalibracaoPorFase()
+        # Opcional: ServicoAleatorio (aleatorio.py) que dá a cada decisão e a cada pacote o seu fluxo,
+        # para a decisão poder ser reproduzida; sem ele, os rollouts usam o random de cada worker
+        self.aleatorio = aleatorio
+        self.indice_decisao = 0
+        self.ultima_semente = None
+        self.rng = random
+        # "-1" (todos os núcleos) vira o número de workers medido pelo autotuning, se houver
+        self.n_jobs = config['n_jobs'] if n_jobs == -1 else n_jobs
+        self.pacotes_por_nucleo = config['pacotes_por_nucleo']
+        # Callback chamado a cada pacote concluído com o EstatisticasBusca parcial (instrumentacao.py)
+        self.progresso = progresso
+        self.ultima_busca = None
+        # Tempos por fase e tamanho das árvores (somados entre os pacotes) em ultima_busca
+        self.instrumentar = instrumentar
+        # Opcional: limite de nós de cada árvore (uma por pacote, em cada worker); limite_memoria_mb
+        # é convertido em nós por BYTES_POR_NO. Ao atingir o limite, as subárvores menos visitadas são colapsadas
+        if limite_memoria_mb is not None:
+            max_nos = max(64, int(limite_memoria_mb * 2**20 / BYTES_POR_NO))
+        self.max_nos = max_nos
 
     # ### MÉTODO CORRIGIDO ###
     def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
         if not jogador_bot.mao:
             return None, 0.0
+        if self.tabela_abertura is not None:
+            # Primeira carta da mão: resposta pré-computada, sem busca
+            abertura = self.tabela_abertura.jogada_de_abertura(estado_jogo, jogador_bot)
+            if abertura is not None:
+                return abertura
 
         # --- LÓGICA CORRIGIDA PARA DETERMINAR O NÚMERO DE NÚCLEOS ---
         if self.n_jobs == -1:
@@ -95,17 +274,43 @@ class MCTSAgente:
             n_cores = self.n_jobs
         
         # Define o tamanho dos pacotes de trabalho
-        n_pacotes = n_cores * 4 # Uma boa heurística é ter alguns pacotes por núcleo
+        n_pacotes = n_cores * self.pacotes_por_nucleo # Alguns pacotes por núcleo (ajustado pelo autotuning)
         sims_por_pacote = self.n_simulacoes // n_pacotes
         if sims_por_pacote == 0:
             n_pacotes = n_cores
             sims_por_pacote = self.n_simulacoes // n_pacotes
 
-        print(f"Iniciando análise paralela em {n_cores} núcleos com {n_pacotes} pacotes...")
-
-        resultados_paralelos = Parallel(n_jobs=self.n_jobs)(
-            delayed(run_single_mcts_search)(copy.deepcopy(estado_jogo), jogador_bot, sims_por_pacote) for _ in range(n_pacotes)
+        estatisticas = EstatisticasBusca(self.__class__.__name__, sims_por_pacote * n_pacotes, self.instrumentar)
+        estatisticas.workers = n_cores
+        self.ultima_busca = estatisticas
+        inicio = time.perf_counter()
+        tarefas = (
+            delayed(_pacote_cronometrado)(copy.deepcopy(estado_jogo), jogador_bot, sims_por_pacote,
+                                          self.avaliador, self.profundidade_rollout, self.politica_rollout,
+                                          self.max_nos, semente, instrumentar=self.instrumentar)
+            for semente in self._sementes_da_decisao(n_pacotes)
         )
+        if self.progresso is None:
+            resultados_paralelos = Parallel(n_jobs=self.n_jobs)(tarefas)
+        else:
+            # Recebe os pacotes à medida que terminam para poder reportar o andamento
+            resultados_paralelos = []
+            for resultado in Parallel(n_jobs=self.n_jobs, return_as='generator')(tarefas):
+                resultados_paralelos.append(resultado)
+                if len(resultados_paralelos) < n_pacotes:
+                    estatisticas.iteracoes += sims_por_pacote
+                    estatisticas.tempo_total = time.perf_counter() - inicio
+                    self.progresso(estatisticas)
+        estatisticas.iteracoes = sims_por_pacote * n_pacotes
+        estatisticas.tempo_total = time.perf_counter() - inicio
+        estatisticas.tempo_workers = sum(segundos for _, segundos, _ in resultados_paralelos)
+        for _, _, do_pacote in resultados_paralelos:
+            if do_pacote is not None:
+                estatisticas.somar(do_pacote)
+        resultados_paralelos = [resultado for resultado, _, _ in resultados_paralelos]
+        estatisticas.concluida = True
+        if self.progresso is not None:
+            self.progresso(estatisticas)
 
         jogadas_recomendadas = [res[0] for res in resultados_paralelos if res and res[0]]
         
@@ -117,30 +322,48 @@ class MCTSAgente:
 
         taxa_vitoria_estimada = next((res[1] for res in resultados_paralelos if res and res[0] == melhor_jogada), 0.5)
 
-        print("Análise paralela concluída.")
         return melhor_jogada, taxa_vitoria_estimada
         
     # O resto da classe permanece igual
+    def _sementes_da_decisao(self, n_pacotes):
+        """ Semente de cada pacote desta decisão (None sem serviço de aleatoriedade). """
+        if self.aleatorio is None:
+            return [None] * n_pacotes
+        k = self.indice_decisao
+        self.indice_decisao += 1
+        self.ultima_semente = self.aleatorio.identificador(k)
+        return [self.aleatorio.inteiro(k, j) for j in range(n_pacotes)]
+
+    def _valor_folha(self, estado_jogo, time_bot_id):
+        """ Rollout completo ou, com um avaliador, rollout truncado em profundidade_rollout jogadas. """
+        if self.avaliador is None:
+            return self._simular_rollout(estado_jogo, time_bot_id)
+        return simular_com_avaliador(estado_jogo, time_bot_id, self.avaliador, self.profundidade_rollout,
+                                     self.politica_rollout, self.rng)
+
     def _simular_rollout(self, estado_jogo, time_bot_id):
-        jogo_simulado = copy.deepcopy(estado_jogo)
-        jogo_simulado.simulacao = True
-        while jogo_simulado.estado_jogo == "EM_ANDAMENTO":
-            jogador_da_vez = jogo_simulado.jogadores[jogo_simulado.jogador_atual_idx]
-            if not jogador_da_vez.mao:
-                jogo_simulado._checar_vencedor_da_mao(); continue
-            carta_aleatoria = random.choice(jogador_da_vez.mao)
-            jogo_simulado.jogar_carta(jogador_da_vez.id, carta_aleatoria)
-        return 1 if jogo_simulado.vencedor_mao == time_bot_id else 0
-
-    def registrar_resultado_da_mao(self, previsao, resultado_real):
+        return simular_rollout(estado_jogo, time_bot_id, self.politica_rollout, rng=self.rng)
+
+    def aquecer(self):
+        """ Sobe o pool de processos do joblib e importa os módulos nos workers com uma busca curta. Retorna os segundos gastos. """
+        inicio = time.perf_counter()
+        jogo, jogador = jogo_de_aquecimento()
+        n_cores = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        Parallel(n_jobs=self.n_jobs)(
+            delayed(run_single_mcts_search)(copy.deepcopy(jogo), jogador, 8, self.avaliador,
+                                            self.profundidade_rollout, self.politica_rollout)
+            for _ in range(n_cores)
+        )
+        return time.perf_counter() - inicio
+
+    def registrar_resultado_da_mao(self, previsao, resultado_real, fase=None):
+        """ Acumula a previsão e o resultado real da mão (fase: calibracao.fase_do_jogo na hora da previsão). """
         if previsao is not None:
-            self.log_previsoes.append((previsao, resultado_real))
+            self.calibracao.registrar(previsao, resultado_real, fase)
 
     def calcular_precisao_mse(self):
-        if not self.log_previsoes: return 0.0
-        previsoes = np.array([p[0] for p in self.log_previsoes])
-        resultados_reais = np.array([p[1] for p in self.log_previsoes])
-        return np.mean((previsoes - resultados_reais)**2)
+        """ Brier (MSE) das previsões registradas; 0 sem registros. Ver self.calibracao para o resto. """
+        return self.calibracao.mse
 
     def _simular_jogo_completo(self, estado_jogo):
         jogo_simulado = estado_jogo
@@ -167,6 +390,10 @@ class MCTSAgente:
         else: return 0
         
     def decidir_mao_de_onze_com_mc(self, estado_jogo_inicial, jogador_bot, n_simulacoes_mao_onze=200):
+        if self.tabela_abertura is not None:
+            aceitar = self.tabela_abertura.aceitar_mao_de_onze(estado_jogo_inicial, jogador_bot)
+            if aceitar is not None:
+                return aceitar
         time_bot_id = jogador_bot.time_id
         vitorias_se_jogar = 0
         for _ in range(n_simulacoes_mao_onze):
@@ -0,0 +1,101 @@
+import random
+import zlib
+import numpy as np
+
+# ======================================================================
+# Serviço de números aleatórios reprodutível
+# ----------------------------------------------------------------------
+# Toda a aleatoriedade de uma execução sai de uma semente só (um inteiro,
+# sorteado e guardado se não for dada) e de uma chave, com SeedSequence e
+# PCG64 do NumPy:
+#   servico = ServicoAleatorio(1234)
+#   servico.gerador('partida', 7)      -> Generator (PCG64) da partida 7
+#   servico.inteiro(3, 0)              -> semente de 63 bits (random.Random,
+#                                         Numba, estados xoroshiro da GPU)
+#   servico.derivar('agente', 'multi') -> outro serviço, sob essa chave
+# Chaves diferentes dão fluxos independentes (SeedSequence.spawn_key), e a
+# mesma (semente, chave) dá sempre o mesmo fluxo, em qualquer processo:
+# os workers recebem só o inteiro da sua chave, nada do estado do pai.
+#
+# Os agentes de número fixo de simulações (agente_mcts_multi.MCTSAgente e
+# agente_gpu.GPUAgenteMCTS) aceitam `aleatorio=ServicoAleatorio(...)`: a
+# decisão k usa a chave (k,) — o pacote j de um worker, (k, j) — e deixa
+# em `agente.ultima_semente` o identificador [semente, chave]. Com o mesmo
+# estado de jogo e a mesma configuração do agente (simulações, núcleos),
+# reproduzir_decisao refaz a decisão exatamente. Nos agentes por tempo o
+# número de iterações depende do relógio, então não há reprodução exata.
+#
+# Os motores em lote já sorteiam em blocos (simulador_lote pede arrays
+# inteiros ao Generator; o kernel Numba recebe uma semente por lote e
+# dá a cada linha um gerador derivado dela e do índice da linha, então o
+# resultado não depende do número de threads); na
+# GPU os estados xoroshiro são criados uma vez por agente e reaproveitados
+# (agente_gpu.EstadosRNG). Nos rollouts em Python, um buffer de números
+# pré-sorteados não ficou mais rápido que random.choice (a chamada do
+# método domina), então os workers usam um random.Random semeado.
+#
+#   servico = ServicoAleatorio(1234)
+#   agente = MCTSAgente(n_simulacoes=2000, n_jobs=2, aleatorio=servico)
+#   carta, _ = agente.decidir_melhor_jogada(jogo, jogador)
+#   reproduzir_decisao(MCTSAgente(n_simulacoes=2000, n_jobs=2), jogo, jogador, agente.ultima_semente)
+# ======================================================================
+
+
+def _parte_da_chave(parte):
+    """ Inteiro não negativo para a spawn_key; textos viram o seu CRC32 (estável entre execuções). """
+    if isinstance(parte, str):
+        return zlib.crc32(parte.encode('utf-8'))
+    parte = int(parte)
+    if parte < 0:
+        raise ValueError(f"Partes numéricas da chave não podem ser negativas: {parte}")
+    return parte
+
+
+class ServicoAleatorio:
+    """ Fluxos independentes e reprodutíveis a partir de (semente, chave); ver o cabeçalho do módulo. """
+
+    def __init__(self, semente=None, chave=()):
+        # Sem semente, sorteia uma (128 bits do sistema) e a guarda, para a execução poder ser refeita
+        self.semente = int(semente) if semente is not None else int(np.random.SeedSequence().entropy)
+        self.chave = tuple(_parte_da_chave(p) for p in chave)
+
+    def sequencia(self, *chave):
+        return np.random.SeedSequence(self.semente, spawn_key=self.chave + tuple(_parte_da_chave(p) for p in chave))
+
+    def derivar(self, *chave):
+        """ Serviço com a chave estendida: o que ele sortear não se repete em nenhuma outra chave. """
+        return ServicoAleatorio(self.semente, self.chave + tuple(_parte_da_chave(p) for p in chave))
+
+    def gerador(self, *chave):
+        return np.random.Generator(np.random.PCG64(self.sequencia(*chave)))
+
+    def inteiro(self, *chave):
+        """ Semente de 63 bits da chave (cabe em int64 e em uint64). """
+        return int(self.sequencia(*chave).generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+    def python(self, *chave):
+        return random.Random(self.inteiro(*chave))
+
+    def semear_processo(self, *chave):
+        """ Semeia os geradores globais (random e np.random) deste processo com a chave; usado para o baralho. """
+        semente = self.inteiro(*chave)
+        random.seed(semente)
+        np.random.seed(semente % 2**32)
+
+    def identificador(self, *chave):
+        """ [semente, chave] em forma de JSON, para registrar e depois reproduzir. """
+        return [self.semente, list(self.chave + tuple(_parte_da_chave(p) for p in chave))]
+
+    def __repr__(self):
+        return f"ServicoAleatorio({self.semente}, chave={self.chave})"
+
+
+def reproduzir_decisao(agente, jogo, jogador, identificador):
+    """
+    Refaz a decisão identificada por [semente, chave] (agente.ultima_semente) com um agente
+    de mesma configuração. Retorna o que decidir_melhor_jogada retornar.
+    """
+    semente, chave = identificador
+    agente.aleatorio = ServicoAleatorio(semente, chave[:-1])
+    agente.indice_decisao = chave[-1]
+    return agente.decidir_melhor_jogada(jogo, jogador)
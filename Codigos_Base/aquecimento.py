@@ -0,0 +1,93 @@
+import os
+import time
+import random
+import argparse
+import subprocess
+import sys
+import tempfile
+from logica import JogoTruco2v2
+
+# ======================================================================
+# Aquecimento dos agentes
+# ----------------------------------------------------------------------
+# A primeira decisão de um agente paga custos que não são da busca: a
+# compilação dos kernels (CUDA e Numba), a subida do pool de processos do
+# joblib e a importação dos módulos nos workers. Dentro de uma partida com
+# tempo limite isso cai em uma jogada cronometrada.
+#
+# Os agentes têm `aquecer()`, que paga esses custos antes do relógio e
+# retorna os segundos gastos; benchmark_runner.py e os torneios chamam
+# aquecer_agente() ao criar cada agente e mostram esse tempo à parte.
+#
+# Os kernels são compilados com cache=True: a compilação fica em disco
+# (no __pycache__ ao lado do código, ou em NUMBA_CACHE_DIR) e as próximas
+# execuções só carregam o kernel.
+#
+#   python aquecimento.py --backend numba --cache-vazio
+#
+# Mede o aquecimento em dois processos novos seguidos: o primeiro compila
+# (se o cache estiver vazio; --cache-vazio usa um NUMBA_CACHE_DIR novo) e o
+# segundo só carrega do disco.
+# ======================================================================
+
+BACKENDS = ('numba', 'gpu', 'cpu')
+
+
+def jogo_de_aquecimento(semente=0):
+    """ Uma mão recém-distribuída e o jogador da vez, sempre a mesma para a semente. """
+    estado = random.getstate()
+    random.seed(semente)
+    jogo = JogoTruco2v2(simulacao=True)
+    jogo.distribuir_cartas()
+    random.setstate(estado)
+    return jogo, jogo.jogadores[jogo.jogador_atual_idx]
+
+
+def aquecer_agente(agente):
+    """ Chama agente.aquecer() se o agente tiver um; retorna os segundos gastos (0 sem aquecimento). """
+    aquecer = getattr(agente, 'aquecer', None)
+    return aquecer() if aquecer is not None else 0.0
+
+
+def _aquecer_backend(backend):
+    """ Executado no processo filho: aquece o backend e imprime os segundos. """
+    if backend == 'numba':
+        from simulador_numba import aquecer
+        segundos = aquecer()
+    elif backend == 'gpu':
+        from agente_gpu import GPUAgenteMCTS
+        segundos = GPUAgenteMCTS().aquecer()
+    else:
+        from agente_mcts_multi import MCTSAgente
+        segundos = MCTSAgente().aquecer()
+    print(segundos)
+
+
+def medir_aquecimento(backend, ambiente=None):
+    """ Segundos de aquecimento em um processo novo (sem o tempo de subir o interpretador). """
+    processo = subprocess.run([sys.executable, os.path.abspath(__file__), '--filho', backend],
+                              cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+                              check=True, env=ambiente)
+    return float(processo.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o aquecimento (compilação, pool de processos) dos agentes.")
+    parser.add_argument('--backend', choices=BACKENDS, default='numba')
+    parser.add_argument('--cache-vazio', action='store_true', help="Começa com um diretório de cache do Numba novo.")
+    parser.add_argument('--filho', choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.filho:
+        _aquecer_backend(args.filho)
+        return
+    ambiente = None
+    if args.cache_vazio:
+        ambiente = dict(os.environ, NUMBA_CACHE_DIR=tempfile.mkdtemp(prefix='truco_numba_'))
+    inicio = time.perf_counter()
+    primeiro = medir_aquecimento(args.backend, ambiente)
+    segundo = medir_aquecimento(args.backend, ambiente)
+    print(f"  {args.backend}: 1º processo {primeiro:.2f}s | 2º processo (cache em disco) {segundo:.2f}s "
+          f"| total com os interpretadores {time.perf_counter() - inicio:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import io
+import os
+import time
+import random
+import argparse
+import contextlib
+import numpy as np
+from logica import JogoTruco2v2
+from config_desempenho import carregar_config, salvar_config, caminho_config
+
+# ======================================================================
+# Autotuning dos parâmetros de vazão (n_jobs, pacotes por núcleo, tamanho
+# do lote da GPU e threads por bloco). Mede os backends disponíveis nesta
+# máquina e grava o resultado em config_desempenho.json.
+#
+#   python autotuning.py --latencia-alvo 1.0
+# ======================================================================
+
+def _estado_de_referencia(semente=0):
+    """ Uma primeira jogada fixa, para que todas as medições usem o mesmo estado. """
+    random.seed(semente)
+    jogo = JogoTruco2v2(simulacao=True)
+    jogo.iniciar_nova_mao()
+    return jogo, jogo.jogadores[jogo.jogador_atual_idx]
+
+
+def _candidatos_workers():
+    n_cpus = os.cpu_count() or 1
+    candidatos = {n_cpus}
+    n = 1
+    while n < n_cpus:
+        candidatos.add(n)
+        n *= 2
+    return sorted(candidatos)
+
+
+def medir_cpu(n_jobs, pacotes_por_nucleo, n_simulacoes, repeticoes):
+    """ Retorna a mediana de simulações por segundo de uma decisão do agente multi-core. """
+    from agente_mcts_multi import MCTSAgente
+    jogo, jogador = _estado_de_referencia()
+    agente = MCTSAgente(n_simulacoes=n_simulacoes, n_jobs=n_jobs)
+    agente.pacotes_por_nucleo = pacotes_por_nucleo
+    vazoes = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        agente.decidir_melhor_jogada(jogo, jogador)  # aquece o pool de processos
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            agente.decidir_melhor_jogada(jogo, jogador)
+            vazoes.append(n_simulacoes / (time.perf_counter() - inicio))
+    return float(np.median(vazoes))
+
+
+def ajustar_cpu(n_simulacoes, repeticoes, sims_por_decisao, latencia_alvo):
+    medicoes = []
+    for n_jobs in _candidatos_workers():
+        for pacotes in (1, 2, 4, 8):
+            vazao = medir_cpu(n_jobs, pacotes, n_simulacoes, repeticoes)
+            medicoes.append({'n_jobs': n_jobs, 'pacotes_por_nucleo': pacotes, 'sims_por_s': vazao})
+            print(f"  CPU n_jobs={n_jobs:<3} pacotes/núcleo={pacotes}: {vazao:10.0f} sims/s")
+    # Com um número fixo de simulações por decisão, mais vazão é sempre menos latência
+    melhor = max(medicoes, key=lambda m: m['sims_por_s'])
+    latencia = sims_por_decisao / melhor['sims_por_s']
+    if latencia > latencia_alvo:
+        print(f"  Aviso: nem a melhor configuração faz {sims_por_decisao} sims em {latencia_alvo:.2f}s "
+              f"(estimado: {latencia:.2f}s).")
+    return {'n_jobs': melhor['n_jobs'], 'pacotes_por_nucleo': melhor['pacotes_por_nucleo']}, medicoes
+
+
+def medir_gpu(agente, lote, threads, repeticoes):
+    """ Retorna (segundos por lançamento, rollouts por segundo), incluindo o achatamento na CPU. """
+    jogo, jogador = _estado_de_referencia()
+    agente.n_rollouts_por_decisao = lote
+    agente.threads_por_bloco = threads
+    agente._gpu_rollout(jogo, jogador.id)  # compila/aquece esta configuração
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        agente._gpu_rollout(jogo, jogador.id)
+        tempos.append(time.perf_counter() - inicio)
+    segundos = float(np.median(tempos))
+    return segundos, lote / segundos
+
+
+def ajustar_gpu(repeticoes, latencia_lote, latencia_lote_tempo):
+    try:
+        from numba import cuda
+        if not cuda.is_available():
+            print("  GPU CUDA não disponível: mantendo os valores atuais.")
+            return {}, []
+        from agente_gpu import GPUAgenteMCTS
+    except Exception as e:
+        print(f"  Backend GPU indisponível ({e}): mantendo os valores atuais.")
+        return {}, []
+
+    agente = GPUAgenteMCTS()
+    medicoes = []
+    for threads in (64, 128, 256, 512):
+        for lote in (1024, 2048, 4096, 8192, 16384, 32768, 65536):
+            segundos, vazao = medir_gpu(agente, lote, threads, repeticoes)
+            medicoes.append({'lote': lote, 'threads_por_bloco': threads, 'segundos': segundos, 'rollouts_por_s': vazao})
+            print(f"  GPU threads={threads:<4} lote={lote:<6}: {segundos*1000:8.1f} ms/lote {vazao:12.0f} rollouts/s")
+
+    def _melhor(limite):
+        dentro = [m for m in medicoes if m['segundos'] <= limite]
+        if not dentro:
+            # Nada cabe na latência pedida: o menor lote é o que chega mais perto
+            return min(medicoes, key=lambda m: m['segundos'])
+        return max(dentro, key=lambda m: m['rollouts_por_s'])
+
+    melhor = _melhor(latencia_lote)
+    melhor_tempo = _melhor(latencia_lote_tempo)
+    return {
+        'rollouts_por_lote_gpu': melhor['lote'],
+        'threads_por_bloco': melhor['threads_por_bloco'],
+        'rollouts_por_lote_gpu_tempo': melhor_tempo['lote'],
+    }, medicoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede os backends nesta máquina e grava config_desempenho.json.")
+    parser.add_argument('--latencia-alvo', type=float, default=1.0,
+                        help="Tempo alvo (s) de uma decisão; o lote da GPU com limite de tempo usa 1/8 disso.")
+    parser.add_argument('--latencia-lote', type=float, default=0.05,
+                        help="Latência máxima (s) de um lançamento do kernel no agente GPU por simulações.")
+    parser.add_argument('--sims-cpu', type=int, default=2000, help="Simulações por medição na CPU.")
+    parser.add_argument('--sims-por-decisao', type=int, default=20000,
+                        help="Orçamento típico de uma decisão, para checar a latência alvo na CPU.")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--sem-gpu', action='store_true')
+    parser.add_argument('--saida', default=None, help=f"Arquivo de saída (padrão: {caminho_config()}).")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    parametros = carregar_config(args.saida)
+
+    print("Medindo CPU (joblib)...")
+    ajuste_cpu, medicoes_cpu = ajustar_cpu(args.sims_cpu, args.repeticoes, args.sims_por_decisao, args.latencia_alvo)
+    parametros.update(ajuste_cpu)
+
+    medicoes_gpu = []
+    if not args.sem_gpu:
+        print("Medindo GPU (Numba CUDA)...")
+        ajuste_gpu, medicoes_gpu = ajustar_gpu(args.repeticoes, args.latencia_lote, args.latencia_alvo / 8)
+        parametros.update(ajuste_gpu)
+
+    caminho = salvar_config(parametros, {'cpu': medicoes_cpu, 'gpu': medicoes_gpu,
+                                         'host': os.uname().nodename if hasattr(os, 'uname') else '',
+                                         'n_cpus': os.cpu_count()}, args.saida)
+    print(f"\nConfiguração gravada em {caminho} ({time.perf_counter() - inicio:.1f}s):")
+    for chave, valor in parametros.items():
+        print(f"  {chave:<28} = {valor}")
+
+if __name__ == '__main__':
+    main()
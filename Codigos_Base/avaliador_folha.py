@@ -0,0 +1,271 @@
+import os
+import copy
+import time
+import random
+import argparse
+import numpy as np
+from logica import JogoTruco2v2
+from gpu_utils import CARTA_PARA_INT
+from politica_rollout import escolher_carta
+
+# ======================================================================
+# Avaliador de folhas aprendido
+# ----------------------------------------------------------------------
+# Regressão logística (só NumPy) que estima a chance de um time ganhar a
+# mão a partir de um estado, usando características de força das cartas.
+# Ela é treinada com partidas de autojogo em que todos jogam ao acaso, o
+# mesmo modelo dos rollouts: o avaliador aprende o valor esperado de um
+# rollout e pode substituí-lo (profundidade 0) ou completá-lo depois de
+# algumas jogadas aleatórias (rollout truncado).
+#
+#   python avaliador_folha.py gerar --maos 20000
+#   python avaliador_folha.py treinar
+#   python avaliador_folha.py benchmark --maos 200
+# ======================================================================
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_LOGS = os.path.join(PASTA, 'autojogo_logs.npz')
+ARQUIVO_PESOS = os.path.join(PASTA, 'avaliador_pesos.npz')
+
+NOMES_CARACTERISTICAS = (
+    'vitorias_nos', 'vitorias_eles', 'empates', 'rodadas_jogadas',
+    'forca_nos', 'forca_eles', 'maior_nos', 'maior_eles', 'manilhas_nos', 'manilhas_eles',
+    'dominio', 'mesa_saldo', 'mesa_ganhando', 'nossa_vez', 'cartas_saldo',
+)
+VALOR_MAXIMO = 13.0  # manilha de Paus
+
+
+def _valor(codigo, rank_manilha):
+    rank = codigo // 4
+    return 10 + codigo % 4 if rank == rank_manilha else rank
+
+
+def extrair_caracteristicas(jogo, time_id):
+    """ Vetor de características do estado visto pelo time `time_id` (usa as mãos de todos, como os rollouts). """
+    rank_manilha = (CARTA_PARA_INT[jogo.vira] // 4 + 1) % 10
+    nos, eles = [], []
+    for p in jogo.jogadores:
+        valores = [_valor(CARTA_PARA_INT[c], rank_manilha) for c in p.mao]
+        (nos if p.time_id == time_id else eles).extend(valores)
+
+    rodadas_jogadas = jogo.rodada_atual - 1
+    resultados = jogo.resultado_rodada[:rodadas_jogadas]
+    vitorias_nos = resultados.count(time_id)
+    empates = resultados.count(0)
+
+    # Confrontos carta a carta entre as mãos restantes dos dois times
+    dominio = 0.0
+    if nos and eles:
+        dominio = sum((a > b) - (a < b) for a in nos for b in eles) / (len(nos) * len(eles))
+
+    mesa_nos = [_valor(CARTA_PARA_INT[c], rank_manilha) for p, c in jogo.cartas_na_mesa if p.time_id == time_id]
+    mesa_eles = [_valor(CARTA_PARA_INT[c], rank_manilha) for p, c in jogo.cartas_na_mesa if p.time_id != time_id]
+    melhor_nos = max(mesa_nos, default=-1)
+    melhor_eles = max(mesa_eles, default=-1)
+    mesa_ganhando = 0 if melhor_nos == melhor_eles else (1 if melhor_nos > melhor_eles else -1)
+
+    return np.array([
+        vitorias_nos,
+        len(resultados) - vitorias_nos - empates,
+        empates,
+        rodadas_jogadas,
+        sum(nos) / VALOR_MAXIMO,
+        sum(eles) / VALOR_MAXIMO,
+        max(nos, default=-1) / VALOR_MAXIMO,
+        max(eles, default=-1) / VALOR_MAXIMO,
+        sum(v >= 10 for v in nos),
+        sum(v >= 10 for v in eles),
+        dominio,
+        (melhor_nos - melhor_eles) / VALOR_MAXIMO,
+        mesa_ganhando,
+        1.0 if jogo.jogadores[jogo.jogador_atual_idx].time_id == time_id else 0.0,
+        len(nos) - len(eles),
+    ], dtype=np.float64)
+
+
+class AvaliadorFolha:
+    """ Regressão logística carregada de um arquivo de pesos (.npz com pesos, média e desvio). """
+    def __init__(self, pesos, media, desvio):
+        self.pesos = np.asarray(pesos, dtype=np.float64)
+        self.media = np.asarray(media, dtype=np.float64)
+        self.desvio = np.asarray(desvio, dtype=np.float64)
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_PESOS):
+        dados = np.load(caminho)
+        if tuple(dados['nomes']) != NOMES_CARACTERISTICAS:
+            raise ValueError(f"{caminho} foi treinado com outras características; treine de novo.")
+        return cls(dados['pesos'], dados['media'], dados['desvio'])
+
+    def salvar(self, caminho=ARQUIVO_PESOS):
+        np.savez(caminho, pesos=self.pesos.astype(np.float32), media=self.media.astype(np.float32),
+                 desvio=self.desvio.astype(np.float32), nomes=np.array(NOMES_CARACTERISTICAS))
+
+    def probabilidades(self, X):
+        z = ((X - self.media) / self.desvio) @ self.pesos[1:] + self.pesos[0]
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def avaliar(self, jogo, time_id):
+        """ Chance estimada de `time_id` ganhar a mão a partir deste estado. """
+        if jogo.estado_jogo != "EM_ANDAMENTO":
+            return 1.0 if jogo.vencedor_mao == time_id else 0.0
+        x = (extrair_caracteristicas(jogo, time_id) - self.media) / self.desvio
+        return 1.0 / (1.0 + np.exp(-(x @ self.pesos[1:] + self.pesos[0])))
+
+
+def simular_com_avaliador(estado_jogo, time_bot_id, avaliador, profundidade, politica='aleatoria', rng=random):
+    """
+    Rollout truncado: até `profundidade` jogadas da política de rollout e, se a mão não
+    terminou, o valor do avaliador. Com profundidade 0 o avaliador substitui o rollout.
+    """
+    jogo_simulado = estado_jogo
+    jogadas = 0
+    while jogo_simulado.estado_jogo == "EM_ANDAMENTO" and jogadas < profundidade:
+        if jogadas == 0:
+            jogo_simulado = copy.deepcopy(estado_jogo)
+            jogo_simulado.simulacao = True
+        jogador_da_vez = jogo_simulado.jogadores[jogo_simulado.jogador_atual_idx]
+        if not jogador_da_vez.mao:
+            jogo_simulado._checar_vencedor_da_mao(); continue
+        jogo_simulado.jogar_carta(jogador_da_vez.id, escolher_carta(jogo_simulado, jogador_da_vez, politica, rng=rng))
+        jogadas += 1
+    return avaliador.avaliar(jogo_simulado, time_bot_id)
+
+
+# ======================================================================
+# Autojogo e treino
+# ======================================================================
+
+def gerar_logs(n_maos, semente=None):
+    """ Joga n_maos ao acaso e registra, antes de cada carta, as características dos dois times e o resultado. """
+    random.seed(semente)
+    X, y = [], []
+    for _ in range(n_maos):
+        jogo = JogoTruco2v2(simulacao=True)
+        jogo.jogador_iniciou_rodada_idx = random.randrange(4) - 1
+        jogo.distribuir_cartas()
+        estados = []
+        while jogo.estado_jogo == "EM_ANDAMENTO":
+            jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
+            if not jogador_da_vez.mao:
+                jogo._checar_vencedor_da_mao(); continue
+            estados.append((extrair_caracteristicas(jogo, 1), extrair_caracteristicas(jogo, 2)))
+            jogo.jogar_carta(jogador_da_vez.id, random.choice(jogador_da_vez.mao))
+        for x1, x2 in estados:
+            X.extend((x1, x2))
+            y.extend((1.0 if jogo.vencedor_mao == 1 else 0.0, 1.0 if jogo.vencedor_mao == 2 else 0.0))
+    return np.array(X), np.array(y)
+
+
+def treinar(X, y, l2=1e-3, iteracoes=25):
+    """ Regressão logística por Newton-Raphson (IRLS) com regularização L2, em características padronizadas. """
+    media = X.mean(axis=0)
+    desvio = X.std(axis=0)
+    desvio[desvio == 0] = 1.0
+    Z = np.hstack([np.ones((len(X), 1)), (X - media) / desvio])
+    w = np.zeros(Z.shape[1])
+    regularizacao = l2 * np.eye(Z.shape[1])
+    regularizacao[0, 0] = 0.0
+    for _ in range(iteracoes):
+        p = 1.0 / (1.0 + np.exp(-(Z @ w)))
+        gradiente = Z.T @ (p - y) / len(y) + regularizacao @ w
+        hessiana = (Z * (p * (1 - p))[:, None]).T @ Z / len(y) + regularizacao
+        passo = np.linalg.solve(hessiana, gradiente)
+        w -= passo
+        if np.abs(passo).max() < 1e-8:
+            break
+    return AvaliadorFolha(w, media, desvio)
+
+
+def metricas(avaliador, X, y):
+    p = np.clip(avaliador.probabilidades(X), 1e-9, 1 - 1e-9)
+    return {
+        'log_loss': float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+        'brier': float(np.mean((p - y) ** 2)),
+        'brier_constante': float(np.mean((y.mean() - y) ** 2)),
+    }
+
+
+# ======================================================================
+# Benchmark: força x tempo, rollouts puros contra o avaliador
+# ======================================================================
+
+def benchmark(avaliador, n_maos, orcamentos, profundidades, semente=0):
+    """
+    Para cada (profundidade, simulações por jogada), o jogador 1 decide com MCTS contra
+    três jogadores aleatórios nas mesmas n_maos (mesmas cartas e sementes). Retorna a
+    taxa de mãos vencidas e o tempo médio por decisão.
+    """
+    from agente_mcts_multi import run_single_mcts_search
+    resultados = []
+    for profundidade in profundidades:
+        for n_sims in orcamentos:
+            vitorias, tempo, decisoes = 0, 0.0, 0
+            for mao in range(n_maos):
+                random.seed(semente * 100003 + mao)
+                jogo = JogoTruco2v2(simulacao=True)
+                jogo.jogador_iniciou_rodada_idx = mao % 4 - 1
+                jogo.distribuir_cartas()
+                sorteio = random.Random(mao)
+                while jogo.estado_jogo == "EM_ANDAMENTO":
+                    jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
+                    if not jogador_da_vez.mao:
+                        jogo._checar_vencedor_da_mao(); continue
+                    if jogador_da_vez.id == 1 and len(jogador_da_vez.mao) > 1:
+                        inicio = time.perf_counter()
+                        carta, _ = run_single_mcts_search(jogo, jogador_da_vez, n_sims,
+                                                          avaliador if profundidade is not None else None, profundidade)
+                        tempo += time.perf_counter() - inicio
+                        decisoes += 1
+                    else:
+                        carta = sorteio.choice(jogador_da_vez.mao)
+                    jogo.jogar_carta(jogador_da_vez.id, carta)
+                vitorias += jogo.vencedor_mao == 1
+            rotulo = 'rollout' if profundidade is None else f'avaliador (prof. {profundidade})'
+            resultados.append({'folha': rotulo, 'simulacoes': n_sims, 'vitorias': vitorias / n_maos,
+                               'ms_por_decisao': 1000 * tempo / max(1, decisoes)})
+            r = resultados[-1]
+            print(f"  {rotulo:<22} {n_sims:>6} sims: {100 * r['vitorias']:5.1f}% das mãos | {r['ms_por_decisao']:8.2f} ms/decisão")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Avaliador de folhas: autojogo, treino e benchmark.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_gerar = sub.add_parser('gerar', help="Gera os logs de autojogo.")
+    p_gerar.add_argument('--maos', type=int, default=20000)
+    p_gerar.add_argument('--semente', type=int, default=None)
+    p_gerar.add_argument('--saida', default=ARQUIVO_LOGS)
+    p_treinar = sub.add_parser('treinar', help="Treina a regressão logística e grava os pesos.")
+    p_treinar.add_argument('--logs', default=ARQUIVO_LOGS)
+    p_treinar.add_argument('--l2', type=float, default=1e-3)
+    p_treinar.add_argument('--saida', default=ARQUIVO_PESOS)
+    p_bench = sub.add_parser('benchmark', help="Compara força x tempo com rollouts puros.")
+    p_bench.add_argument('--pesos', default=ARQUIVO_PESOS)
+    p_bench.add_argument('--maos', type=int, default=200)
+    p_bench.add_argument('--simulacoes', type=int, nargs='+', default=[25, 100, 400])
+    p_bench.add_argument('--profundidades', type=int, nargs='+', default=[0, 4])
+    args = parser.parse_args()
+
+    if args.comando == 'gerar':
+        inicio = time.perf_counter()
+        X, y = gerar_logs(args.maos, args.semente)
+        np.savez_compressed(args.saida, X=X, y=y)
+        print(f"{len(y)} estados de {args.maos} mãos gravados em {args.saida} ({time.perf_counter() - inicio:.1f}s).")
+    elif args.comando == 'treinar':
+        dados = np.load(args.logs)
+        X, y = dados['X'], dados['y']
+        # Os estados vêm aos pares (time 1, time 2) e em ordem de mão: separa pelas últimas mãos
+        corte = int(0.8 * len(y)) // 2 * 2
+        avaliador = treinar(X[:corte], y[:corte], args.l2)
+        print(f"Treino: {metricas(avaliador, X[:corte], y[:corte])}")
+        print(f"Teste:  {metricas(avaliador, X[corte:], y[corte:])}")
+        avaliador.salvar(args.saida)
+        print(f"Pesos gravados em {args.saida} ({os.path.getsize(args.saida)} bytes).")
+    else:
+        avaliador = AvaliadorFolha.carregar(args.pesos)
+        print(f"Benchmark em {args.maos} mãos (jogador 1 com MCTS contra três aleatórios):")
+        benchmark(avaliador, args.maos, args.simulacoes, [None] + args.profundidades)
+
+if __name__ == '__main__':
+    main()
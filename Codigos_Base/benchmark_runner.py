@@ -1,30 +1,89 @@
+import os
+import csv
+import json
 import time
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import multiprocessing
 import numpy as np
 import random
 import copy
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-# Importa as classes dos nossos diferentes agentes e a lógica do jogo
+# Os agentes (joblib, numba.cuda) e as bibliotecas de análise (pandas, matplotlib,
+# seaborn) são importados só quando um tipo de agente ou o relatório precisa deles
 from logica import JogoTruco2v2
-from agente_mcts_multi import MCTSAgente as AgenteCPU  # Agente de CPU para single e multi-core
-from agente_gpu import GPUAgenteMCTS as AgenteGPU
+from calibracao import fase_do_jogo, mesclar_todas
+from config_desempenho import carregar_config
+from gpu_utils import gpu_disponivel
+from aquecimento import aquecer_agente
+from metricas import ColetorMetricas, adicionar_argumentos
+from aleatorio import ServicoAleatorio
 
-def run_single_game(tipo_agente, n_simulacoes_mcts):
+# ======================================================================
+# Benchmark dos tipos de agente, em paralelo e retomável
+# ----------------------------------------------------------------------
+# Cada partida é uma tarefa (tipo de agente, índice) com a sua semente,
+# derivada da semente da execução (aleatorio.py). As partidas dos agentes
+# de CPU rodam em --processos processos; o orçamento é --nucleos: o agente
+# 'multi' de cada processo usa nucleos // processos núcleos (n_jobs), e o
+# 'single' um só. 'gpu' e 'distribuido' dividem um recurso (a placa, os
+# workers remotos), então as suas partidas rodam uma de cada vez, no
+# processo principal.
+#
+# Cada partida terminada vira na hora uma linha do CSV de --resultados.
+# Rodar de novo com o mesmo arquivo retoma: as partidas já gravadas são
+# puladas (a semente e as simulações vêm do arquivo, e --nucleos e
+# --processos têm de dar o mesmo n_jobs). Se uma partida falha, as que já
+# terminaram são gravadas antes de o erro subir. O relatório (tabela,
+# calibração e gráfico) é outra etapa, que só lê o arquivo:
+#
+#   python benchmark_runner.py --partidas 100 --processos 4 --resultados bench.csv
+#   python benchmark_runner.py --relatorio --resultados bench.csv
+# ======================================================================
+
+TIPOS_DE_AGENTE = ('single', 'multi', 'gpu', 'distribuido')
+
+# Tipos cujas partidas não vão para o pool de processos (recurso compartilhado)
+TIPOS_SEQUENCIAIS = ('gpu', 'distribuido')
+
+# Colunas do arquivo de resultados; 'calibracao' é o como_dict da calibração, em JSON
+COLUNAS = ('semente', 'tipo_agente', 'partida', 'n_simulacoes', 'n_jobs', 'tempo_execucao', 'tempo_aquecimento',
+           'pontos_feitos', 'pontos_tomados', 'total_maos', 'vitoria', 'precisao_mse', 'log_loss', 'calibracao')
+COLUNAS_INTEIRAS = ('semente', 'partida', 'n_simulacoes', 'n_jobs', 'pontos_feitos', 'pontos_tomados',
+                    'total_maos', 'vitoria')
+COLUNAS_REAIS = ('tempo_execucao', 'tempo_aquecimento', 'precisao_mse', 'log_loss')
+
+def run_single_game(tipo_agente, n_simulacoes_mcts, coletor=None, aleatorio=None, n_jobs=None):
     """
     Executa uma única partida de Truco do início ao fim e retorna um dicionário com as métricas.
+    As decisões do bot passam pelo ColetorMetricas dado (metricas.py), se houver.
+    Com um ServicoAleatorio (aleatorio.py), o baralho, o adversário e as buscas do bot
+    saem dele, e a partida se repete igual com a mesma semente e configuração.
+    n_jobs: núcleos do agente 'multi' (padrão: todos).
     """
+    coletor = coletor if coletor is not None else ColetorMetricas()
+    aleatorio_bot = aleatorio.derivar('agente') if aleatorio is not None else None
     # 1. Instancia o agente correto baseado no tipo
-    if tipo_agente == 'single':
-        bot_team1 = AgenteCPU(n_simulacoes=n_simulacoes_mcts, n_jobs=1)
-    elif tipo_agente == 'multi':
-        bot_team1 = AgenteCPU(n_simulacoes=n_simulacoes_mcts, n_jobs=-1)
+    if tipo_agente in ('single', 'multi'):
+        from agente_mcts_multi import MCTSAgente as AgenteCPU  # Agente de CPU para single e multi-core
+        bot_team1 = AgenteCPU(n_simulacoes=n_simulacoes_mcts, n_jobs=1 if tipo_agente == 'single' else (n_jobs or -1),
+                              aleatorio=aleatorio_bot)
+    elif tipo_agente == 'distribuido':
+        from agente_mcts_distribuido import MCTSAgenteDistribuido as AgenteDistribuido, hosts_do_ambiente
+        # Workers remotos definidos em TRUCO_WORKERS="host1:5555,host2:5555"
+        bot_team1 = AgenteDistribuido(hosts_do_ambiente(), n_simulacoes=n_simulacoes_mcts)
     else: # 'gpu'
+        from agente_gpu import GPUAgenteMCTS as AgenteGPU
         # Convertemos o número total de simulações para "passos" do MCTS na GPU
-        n_mcts_steps = n_simulacoes_mcts // 4096 
+        n_mcts_steps = n_simulacoes_mcts // carregar_config()['rollouts_por_lote_gpu']
         if n_mcts_steps == 0: n_mcts_steps = 1 # Garante pelo menos 1 passo
-        bot_team1 = AgenteGPU(n_simulacoes=n_mcts_steps)
+        bot_team1 = AgenteGPU(n_simulacoes=n_mcts_steps, aleatorio=aleatorio_bot)
+
+    # Compilação dos kernels e subida dos workers ficam fora do tempo da partida
+    tempo_aquecimento = aquecer_agente(bot_team1)
+    if aleatorio is not None:
+        # Baralho e adversário usam os geradores globais: semeados depois do aquecimento
+        aleatorio.semear_processo('partida')
     
     jogo = JogoTruco2v2(simulacao=True)
     
@@ -41,7 +100,7 @@ def run_single_game(tipo_agente, n_simulacoes_mcts):
         if jogo.estado_jogo == "MAO_FINALIZADA":
             if ultima_previsao_t1 is not None:
                 resultado_real = 1 if jogo.vencedor_mao == TIME_BOT_T1_ID else 0
-                bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real)
+                bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real, fase_t1)
                 ultima_previsao_t1 = None
         estado_atual = jogo.estado_jogo
         if estado_atual in ["NOVA_MAO", "MAO_FINALIZADA"]:
@@ -67,7 +126,8 @@ def run_single_game(tipo_agente, n_simulacoes_mcts):
                 continue
             carta_jogada = None
             if jogador_da_vez.id == JOGADOR_BOT_T1_ID:
-                carta_jogada, ultima_previsao_t1 = bot_team1.decidir_melhor_jogada(jogo, jogador_da_vez)
+                carta_jogada, ultima_previsao_t1 = coletor.decidir(tipo_agente, bot_team1, jogo, jogador_da_vez)
+                fase_t1 = fase_do_jogo(jogo)
             else:
                 carta_jogada = random.choice(jogador_da_vez.mao)
             if carta_jogada:
@@ -75,7 +135,7 @@ def run_single_game(tipo_agente, n_simulacoes_mcts):
             if jogo.estado_jogo == "JOGO_FINALIZADO":
                 if ultima_previsao_t1 is not None:
                     resultado_real = 1 if jogo.vencedor_mao == TIME_BOT_T1_ID else 0
-                    bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real)
+                    bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real, fase_t1)
                 break
     
     end_time = time.time()
@@ -83,42 +143,221 @@ def run_single_game(tipo_agente, n_simulacoes_mcts):
     # 4. Coleta e retorna as métricas da partida
     tempo_total = end_time - start_time
     venceu = 1 if jogo.pontos_time1 >= 12 else 0
+    coletor.registrar_partida(agente=tipo_agente, tempo_execucao=tempo_total, pontos_feitos=jogo.pontos_time1,
+                              pontos_tomados=jogo.pontos_time2, total_maos=jogo.mao_atual, vitoria=venceu,
+                              precisao_mse=bot_team1.calcular_precisao_mse())
     return {
         "tipo_agente": tipo_agente,
         "tempo_execucao": tempo_total,
+        "tempo_aquecimento": tempo_aquecimento,
         "pontos_feitos": jogo.pontos_time1,
         "pontos_tomados": jogo.pontos_time2,
         "total_maos": jogo.mao_atual,
         "vitoria": venceu,
-        "precisao_mse": bot_team1.calcular_precisao_mse()
+        "precisao_mse": bot_team1.calcular_precisao_mse(),
+        "log_loss": bot_team1.calibracao.total.log_loss,
+        # Somas da calibração (poucas dezenas de números): o relatório as junta por tipo de agente
+        "calibracao": bot_team1.calibracao.como_dict()
     }
 
+def tipos_padrao():
+    """ single e multi sempre; gpu só com CUDA (ou o simulador); distribuido com TRUCO_WORKERS. """
+    tipos = ['single', 'multi']
+    if gpu_disponivel():
+        tipos.append('gpu')
+    else:
+        print("GPU CUDA não encontrada: o agente 'gpu' fica fora do benchmark.")
+    from agente_mcts_distribuido import hosts_do_ambiente
+    if hosts_do_ambiente():
+        # Mede a escala entre máquinas quando há workers remotos configurados
+        tipos.append('distribuido')
+    return tipos
+
+def jogar_partida(tipo_agente, partida, n_simulacoes, n_jobs, semente, eventos=None):
+    """
+    Uma tarefa do benchmark (roda num worker ou no processo principal): joga a partida com a
+    semente derivada de (tipo_agente, partida) e retorna (linha do arquivo de resultados,
+    ColetorMetricas da partida, para o processo principal mesclar).
+    """
+    coletor = ColetorMetricas(eventos, execucao='benchmark', anunciar=False)
+    aleatorio = ServicoAleatorio(semente).derivar(tipo_agente, partida)
+    resultado = run_single_game(tipo_agente, n_simulacoes, coletor, aleatorio, n_jobs)
+    coletor.fechar()
+    resultado['calibracao'] = json.dumps(resultado['calibracao'])
+    resultado.update(semente=semente, partida=partida, n_simulacoes=n_simulacoes,
+                     n_jobs=1 if tipo_agente == 'single' else n_jobs)
+    return resultado, coletor
+
+def carregar_resultados(caminho):
+    """
+    Linhas já gravadas no arquivo de resultados (lista vazia se ele não existe). Uma última
+    linha pela metade (a execução caiu no meio da escrita) é cortada do arquivo.
+    """
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, 'rb+') as f:
+        conteudo = f.read()
+        if conteudo and not conteudo.endswith(b'\n'):
+            f.truncate(conteudo.rfind(b'\n') + 1)
+    with open(caminho, newline='', encoding='utf-8') as f:
+        linhas = list(csv.DictReader(f))
+    for linha in linhas:
+        for coluna in COLUNAS_INTEIRAS:
+            linha[coluna] = int(linha[coluna])
+        for coluna in COLUNAS_REAIS:
+            linha[coluna] = float(linha[coluna])
+    return linhas
+
+def anexar_resultado(caminho, resultado):
+    """ Acrescenta a linha da partida ao arquivo (com o cabeçalho, se ele for novo) e a manda para o disco. """
+    novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+    with open(caminho, 'a', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUNAS, extrasaction='ignore')
+        if novo:
+            escritor.writeheader()
+        escritor.writerow(resultado)
+        f.flush()
+        os.fsync(f.fileno())
+
+def executar(tarefas, n_simulacoes, n_jobs, semente, processos, caminho, coletor, eventos=None):
+    """
+    Joga as tarefas (tipo de agente, partida), gravando cada resultado ao terminar. As dos
+    TIPOS_SEQUENCIAIS rodam aqui, uma de cada vez; as outras, em `processos` processos.
+    """
+    total, feitas = len(tarefas), 0
+
+    def concluir(resultado, coletor_partida):
+        nonlocal feitas
+        anexar_resultado(caminho, resultado)
+        coletor.mesclar(coletor_partida)
+        feitas += 1
+        print(f"  [{feitas}/{total}] {resultado['tipo_agente']} #{resultado['partida']}: "
+              f"{resultado['tempo_execucao']:.2f}s (+{resultado['tempo_aquecimento']:.2f}s de aquecimento). "
+              f"Placar: {resultado['pontos_feitos']} a {resultado['pontos_tomados']}.")
+
+    paralelas = [t for t in tarefas if t[0] not in TIPOS_SEQUENCIAIS]
+    if processos > 1 and paralelas:
+        # spawn: processos novos, sem herdar CUDA nem o estado do joblib; os workers do
+        # agente 'multi' (joblib) podem subir dentro deles
+        contexto = multiprocessing.get_context('spawn')
+        pool = ProcessPoolExecutor(processos, mp_context=contexto)
+        futuros, gravados = [], set()
+        try:
+            futuros = [pool.submit(jogar_partida, tipo, i, n_simulacoes, n_jobs, semente, eventos)
+                       for tipo, i in paralelas]
+            for futuro in as_completed(futuros):
+                gravados.add(futuro)
+                concluir(*futuro.result())
+        finally:
+            # Numa falha (ou Ctrl+C), as partidas ainda na fila são canceladas; as que já
+            # estavam rodando terminam e são gravadas antes de o erro subir
+            pool.shutdown(cancel_futures=True)
+            for futuro in futuros:
+                if futuro not in gravados and not futuro.cancelled() and futuro.exception() is None:
+                    concluir(*futuro.result())
+    else:
+        for tipo, i in paralelas:
+            concluir(*jogar_partida(tipo, i, n_simulacoes, n_jobs, semente, eventos))
+    for tipo, i in tarefas:
+        if tipo in TIPOS_SEQUENCIAIS:
+            concluir(*jogar_partida(tipo, i, n_simulacoes, n_jobs, semente, eventos))
+
 def main():
-    # NOTA: Para um teste rápido, comece com N_PARTIDAS = 5.
-    # Para o resultado final, use N_PARTIDAS = 100.
-    N_PARTIDAS = 5
-    N_SIMULACOES = 50000
+    # NOTA: Para um teste rápido, comece com 5 partidas.
+    # Para o resultado final, use --partidas 100.
+    parser = argparse.ArgumentParser(description="Compara a performance dos tipos de agente.")
+    parser.add_argument('--partidas', type=int, default=5)
+    parser.add_argument('--simulacoes', type=int, default=50000)
+    parser.add_argument('--agentes', nargs='+', choices=TIPOS_DE_AGENTE,
+                        help="Tipos de agente (padrão: single, multi e, se houver, gpu e distribuido).")
+    parser.add_argument('--resultados', default='benchmark_resultados.csv',
+                        help="CSV onde cada partida é gravada ao terminar; se já existir, a execução é retomada.")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="Partidas dos agentes de CPU jogadas ao mesmo tempo.")
+    parser.add_argument('--nucleos', type=int, default=os.cpu_count() or 1,
+                        help="Núcleos da execução, divididos entre os processos (n_jobs do agente 'multi').")
+    parser.add_argument('--relatorio', action='store_true',
+                        help="Só gera o relatório a partir do arquivo de resultados, sem jogar.")
+    parser.add_argument('--sem-relatorio', action='store_true',
+                        help="Não gera o relatório ao terminar (não importa pandas).")
+    parser.add_argument('--sem-grafico', action='store_true',
+                        help="Não gera o gráfico (não importa matplotlib nem seaborn).")
+    parser.add_argument('--semente', type=int,
+                        help="Semente da execução (padrão: a do arquivo de resultados, ou sorteada e mostrada).")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    if args.processos < 1 or args.nucleos < 1:
+        parser.error("--processos e --nucleos precisam ser pelo menos 1.")
 
-    todos_os_resultados = []
-    tipos_de_agente = ['single', 'multi', 'gpu']
+    if args.relatorio:
+        gerar_relatorio(args.resultados, args.agentes, args.sem_grafico)
+        return
 
-    for agente_tipo in tipos_de_agente:
-        print(f"\n{'='*40}\nINICIANDO BENCHMARK PARA O AGENTE: {agente_tipo.upper()}\n{'='*40}")
-        for i in range(N_PARTIDAS):
-            print(f"  -> Rodando partida {i+1}/{N_PARTIDAS}...")
-            resultado = run_single_game(agente_tipo, N_SIMULACOES)
-            todos_os_resultados.append(resultado)
-            print(f"     ...concluído em {resultado['tempo_execucao']:.2f}s. Placar: {resultado['pontos_feitos']} a {resultado['pontos_tomados']}.")
-
-    df = pd.DataFrame(todos_os_resultados)
+    gravados = carregar_resultados(args.resultados)
+    semente = args.semente
+    n_jobs = max(1, args.nucleos // args.processos)
+    if gravados:
+        # Retomada: a semente, as simulações e os núcleos do 'multi' têm de ser os da
+        # execução que gravou o arquivo
+        if semente is not None and semente != gravados[0]['semente']:
+            parser.error(f"{args.resultados} foi gravado com a semente {gravados[0]['semente']}; "
+                         "use outro arquivo para outra semente.")
+        if gravados[0]['n_simulacoes'] != args.simulacoes:
+            parser.error(f"{args.resultados} foi gravado com {gravados[0]['n_simulacoes']} simulações; "
+                         "use outro arquivo para outro número de simulações.")
+        n_jobs_gravados = {r['n_jobs'] for r in gravados if r['tipo_agente'] != 'single'}
+        if n_jobs_gravados and n_jobs_gravados != {n_jobs}:
+            parser.error(f"{args.resultados} foi gravado com n_jobs {min(n_jobs_gravados)} "
+                         f"(--nucleos // --processos); esta execução daria {n_jobs}. "
+                         "Use os mesmos valores ou outro arquivo.")
+        semente = gravados[0]['semente']
+    servico = ServicoAleatorio(semente)
+    print(f"Semente da execução: {servico.semente}")
+
+    tipos_de_agente = args.agentes or tipos_padrao()
+    feitas = {(r['tipo_agente'], r['partida']) for r in gravados}
+    tarefas = [(tipo, i) for tipo in tipos_de_agente for i in range(args.partidas) if (tipo, i) not in feitas]
+    if args.processos > args.nucleos:
+        print(f"Aviso: {args.processos} processos para {args.nucleos} núcleos; as partidas vão disputar os núcleos.")
+    print(f"{len(feitas)} partidas já gravadas em {args.resultados}; {len(tarefas)} a jogar "
+          f"({args.processos} processo(s), agente 'multi' com {n_jobs} núcleo(s) cada).")
+
+    coletor = ColetorMetricas(args.eventos, args.prometheus, args.intervalo_snapshot, execucao='benchmark')
+    coletor.evento('semente', semente=servico.semente)
+    try:
+        executar(tarefas, args.simulacoes, n_jobs, servico.semente, args.processos, args.resultados,
+                 coletor, args.eventos)
+    finally:
+        coletor.fechar()
+    print(f"\nMétricas das decisões:\n{coletor.resumo()}")
+
+    if not args.sem_relatorio:
+        gerar_relatorio(args.resultados, tipos_de_agente, args.sem_grafico)
+
+def gerar_relatorio(caminho, tipos_de_agente=None, sem_grafico=False):
+    """ Médias, calibração e gráfico por tipo de agente, lidos do arquivo de resultados. """
+    resultados = carregar_resultados(caminho)
+    if not resultados:
+        print(f"Nenhum resultado em {caminho}.")
+        return
+    presentes = {r['tipo_agente'] for r in resultados}
+    tipos_de_agente = [t for t in (tipos_de_agente or TIPOS_DE_AGENTE) if t in presentes]
+    N_PARTIDAS = max(sum(r['tipo_agente'] == t for r in resultados) for t in tipos_de_agente)
+
+    import pandas as pd
+    df = pd.DataFrame([{k: v for k, v in r.items() if k != 'calibracao'} for r in resultados])
+    df = df[df['tipo_agente'].isin(tipos_de_agente)]
     df_summary = df.groupby('tipo_agente').agg(
+        partidas=('partida', 'count'),
         tempo_medio=('tempo_execucao', 'mean'),
+        aquecimento_medio=('tempo_aquecimento', 'mean'),
         winrate=('vitoria', 'mean'),
         maos_por_partida=('total_maos', 'mean'),
         pontos_feitos_medio=('pontos_feitos', 'mean'),
         pontos_tomados_medio=('pontos_tomados', 'mean'),
-        mse_medio=('precisao_mse', 'mean')
-    ).reindex(['single', 'multi', 'gpu']) # Garante a ordem no gráfico
+        mse_medio=('precisao_mse', 'mean'),
+        log_loss_medio=('log_loss', 'mean')
+    ).reindex(tipos_de_agente) # Garante a ordem no gráfico
 
     df_summary['winrate'] = df_summary['winrate'] * 100
 
@@ -127,8 +366,19 @@ def main():
     print("="*50)
     print(df_summary.to_string())
     print("="*50)
+    # Calibração de todas as mãos de cada tipo juntas (não a média por partida)
+    for agente_tipo in tipos_de_agente:
+        calibracao = mesclar_todas(json.loads(r['calibracao']) for r in resultados if r['tipo_agente'] == agente_tipo)
+        print(f"\nCalibração {agente_tipo}:\n{calibracao.resumo()}")
+
+    if not sem_grafico:
+        salvar_grafico(df_summary, N_PARTIDAS)
+
+def salvar_grafico(df_summary, N_PARTIDAS):
+    """ Gráfico de tempo médio (barras) e taxa de vitória (linha) por tipo de agente. """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-    # Geração do Gráfico
     sns.set_theme(style="whitegrid")
     fig, ax1 = plt.subplots(figsize=(12, 8))
     
@@ -0,0 +1,165 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from canonizacao import chave_canonica, codigo_canonico, rank_da_manilha, carta_da_jogada
+
+# ======================================================================
+# Cache de decisões por conjunto de informação canônico
+# ----------------------------------------------------------------------
+# Cada entrada guarda, para uma chave de canonizacao.chave_canonica, quantas
+# buscas foram somadas e as estatísticas da raiz por jogada canônica:
+# {'buscas': n, 'jogadas': {codigo: [visitas, vitorias]}}. Como no MCTS
+# root-parallel, buscas diferentes da mesma posição são somadas, então uma
+# posição repetida pode ser respondida na hora ou servir de ponto de partida
+# para uma busca nova.
+#
+# Camadas: memória (LRU com capacidade fixa) e, opcionalmente, um arquivo
+# SQLite que sobrevive entre execuções.
+# ======================================================================
+
+class CamadaSqlite:
+    """ Camada em disco: uma tabela chave -> estatísticas, ambas em JSON. """
+    def __init__(self, caminho, escritas_por_commit=100):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("CREATE TABLE IF NOT EXISTS decisoes (chave TEXT PRIMARY KEY, estatisticas TEXT NOT NULL)")
+        self.escritas_por_commit = escritas_por_commit
+        self._pendentes = 0
+
+    @staticmethod
+    def _serializar_chave(chave):
+        return json.dumps(chave, separators=(',', ':'))
+
+    def obter(self, chave):
+        linha = self.conexao.execute("SELECT estatisticas FROM decisoes WHERE chave = ?",
+                                     (self._serializar_chave(chave),)).fetchone()
+        if linha is None:
+            return None
+        dados = json.loads(linha[0])
+        if 'jogadas' not in dados:
+            dados = {'buscas': 0, 'jogadas': dados}  # arquivo antigo, sem a contagem de buscas
+        return {'buscas': dados['buscas'], 'jogadas': {int(c): valor for c, valor in dados['jogadas'].items()}}
+
+    def guardar(self, chave, estatisticas):
+        self.conexao.execute("INSERT OR REPLACE INTO decisoes VALUES (?, ?)",
+                             (self._serializar_chave(chave), json.dumps(estatisticas)))
+        self._pendentes += 1
+        if self._pendentes >= self.escritas_por_commit:
+            self.sincronizar()
+
+    def __len__(self):
+        return self.conexao.execute("SELECT COUNT(*) FROM decisoes").fetchone()[0]
+
+    def sincronizar(self):
+        self.conexao.commit()
+        self._pendentes = 0
+
+    def fechar(self):
+        self.sincronizar()
+        self.conexao.close()
+
+
+class CacheDecisoes:
+    """ LRU em memória com `capacidade` entradas, opcionalmente apoiado em um arquivo SQLite. """
+    def __init__(self, capacidade=10000, caminho_disco=None):
+        self.capacidade = capacidade
+        self.memoria = OrderedDict()
+        self.disco = CamadaSqlite(caminho_disco) if caminho_disco else None
+        self.estatisticas = {'acertos_memoria': 0, 'acertos_disco': 0, 'faltas': 0, 'despejos': 0}
+
+    def obter(self, chave):
+        """ Entrada da chave ({'buscas': n, 'jogadas': {codigo: [visitas, vitorias]}}) ou None. """
+        if chave in self.memoria:
+            self.memoria.move_to_end(chave)
+            self.estatisticas['acertos_memoria'] += 1
+            return self.memoria[chave]
+        if self.disco is not None:
+            entrada = self.disco.obter(chave)
+            if entrada is not None:
+                self.estatisticas['acertos_disco'] += 1
+                self._colocar_na_memoria(chave, entrada)
+                return entrada
+        self.estatisticas['faltas'] += 1
+        return None
+
+    def somar(self, chave, estatisticas):
+        """ Soma as estatísticas de uma busca ({codigo: (visitas, vitorias)}) às já guardadas e devolve a entrada. """
+        anterior = self.memoria.get(chave)
+        if anterior is None and self.disco is not None:
+            anterior = self.disco.obter(chave)
+        anterior = anterior or {'buscas': 0, 'jogadas': {}}
+        entrada = {'buscas': anterior['buscas'] + 1, 'jogadas': dict(anterior['jogadas'])}
+        for codigo, (visitas, vitorias) in estatisticas.items():
+            v, w = entrada['jogadas'].get(codigo, (0, 0))
+            entrada['jogadas'][codigo] = [v + visitas, w + vitorias]
+        self._colocar_na_memoria(chave, entrada)
+        if self.disco is not None:
+            self.disco.guardar(chave, entrada)
+        return entrada
+
+    def _colocar_na_memoria(self, chave, entrada):
+        self.memoria[chave] = entrada
+        self.memoria.move_to_end(chave)
+        while len(self.memoria) > self.capacidade:
+            self.memoria.popitem(last=False)
+            self.estatisticas['despejos'] += 1
+
+    def __len__(self):
+        return len(self.memoria)
+
+    def fechar(self):
+        if self.disco is not None:
+            self.disco.fechar()
+
+    def resumo(self):
+        e = self.estatisticas
+        consultas = e['acertos_memoria'] + e['acertos_disco'] + e['faltas']
+        acertos = e['acertos_memoria'] + e['acertos_disco']
+        return (f"cache: {len(self.memoria)} entradas | acertos {acertos}/{consultas} "
+                f"({100 * acertos / max(1, consultas):.1f}%, {e['acertos_disco']} do disco) | despejos {e['despejos']}")
+
+
+class AgenteComCache:
+    """
+    Envolve qualquer agente (decidir_melhor_jogada -> (carta, taxa)) com um CacheDecisoes.
+
+    Enquanto a posição canônica tem menos de `buscas_minimas` buscas somadas, o agente
+    busca normalmente e o resultado é somado ao que já havia (as buscas anteriores contam
+    como workers extras); depois disso a jogada sai direto do cache. Agentes que expõem
+    `ultimas_estatisticas` ([(carta, visitas, vitorias)] da raiz) contribuem com as visitas
+    reais; os outros contam como uma visita com a taxa estimada.
+
+    Os agentes de CPU buscam com as mãos verdadeiras de todos, então cada busca responde
+    por uma distribuição das cartas escondidas. A chave só usa o que o bot vê: a resposta
+    guardada é a soma das `buscas_minimas` primeiras distribuições em que a posição
+    apareceu, e fica congelada a partir daí. Com buscas_minimas=1 ela seria a jogada
+    certa para uma única distribuição.
+    """
+    def __init__(self, agente, cache=None, buscas_minimas=8):
+        self.agente = agente
+        self.cache = cache if cache is not None else CacheDecisoes()
+        self.buscas_minimas = buscas_minimas
+
+    def __getattr__(self, nome):
+        # Mão de Onze, registro de previsões etc. continuam sendo do agente envolvido
+        if nome == 'agente':
+            raise AttributeError(nome)
+        return getattr(self.agente, nome)
+
+    def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
+        if not jogador_bot.mao:
+            return None, 0.0
+        chave = chave_canonica(estado_jogo, jogador_bot)
+        entrada = self.cache.obter(chave)
+        if entrada is None or entrada['buscas'] < self.buscas_minimas:
+            self.agente.ultimas_estatisticas = None
+            carta, taxa = self.agente.decidir_melhor_jogada(estado_jogo, jogador_bot)
+            rank_manilha = rank_da_manilha(estado_jogo)
+            novas = {}
+            for c, visitas, vitorias in getattr(self.agente, 'ultimas_estatisticas', None) or [(carta, 1, taxa)]:
+                v, w = novas.get(codigo_canonico(c, rank_manilha), (0, 0))
+                novas[codigo_canonico(c, rank_manilha)] = (v + visitas, w + vitorias)
+            entrada = self.cache.somar(chave, novas)
+
+        codigo, (visitas, vitorias) = max(entrada['jogadas'].items(), key=lambda item: item[1][0])
+        return carta_da_jogada(codigo, estado_jogo, jogador_bot), vitorias / visitas if visitas else 0.5
@@ -0,0 +1,178 @@
+import math
+
+# ======================================================================
+# Calibração das previsões, em memória constante
+# ----------------------------------------------------------------------
+# A cada mão os agentes devolvem uma previsão (a taxa de vitória estimada
+# da jogada escolhida) que depois é comparada com o resultado real. Em
+# vez de guardar a lista de pares (previsão, resultado), cada agente
+# acumula só somas e contagens:
+#   - Brier (o MSE das previsões) e log-loss;
+#   - curva de confiabilidade: em N_FAIXAS faixas de previsão, quantas
+#     previsões caíram ali, a previsão média e a frequência real de
+#     vitória (e dela o erro de calibração esperado, ECE).
+# Tudo é separado por fase do jogo (fase_do_jogo: rodada da mão em que a
+# previsão foi feita, ou Mão de Onze), além do total.
+#
+# Acumuladores de processos diferentes (workers, partidas, agentes do
+# mesmo tipo) se juntam com mesclar() ou somando; como_dict/de_dict
+# levam um acumulador entre processos ou para um JSON.
+#
+#   calibracao = CalibracaoPorFase()
+#   calibracao.registrar(0.7, 1, fase_do_jogo(jogo))
+#   print(calibracao.resumo())
+# ======================================================================
+
+N_FAIXAS = 10
+
+# O log-loss de uma previsão 0 ou 1 que erra é infinito: as previsões são limitadas a [EPS, 1 - EPS]
+EPS = 1e-6
+
+
+def fase_do_jogo(jogo):
+    """ Fase em que uma previsão é feita: 'mao_de_onze' ou 'rodada_1'..'rodada_3'. """
+    if jogo.valor_mao >= 3:
+        return 'mao_de_onze'
+    return f'rodada_{jogo.rodada_atual}'
+
+
+class Calibracao:
+    """ Brier, log-loss e curva de confiabilidade de uma sequência de previsões, sem guardá-las. """
+    __slots__ = ('n', 'soma_quadrados', 'soma_log_loss', 'contagens', 'soma_previsoes', 'soma_resultados')
+
+    def __init__(self, n_faixas=N_FAIXAS):
+        self.n = 0
+        self.soma_quadrados = 0.0
+        self.soma_log_loss = 0.0
+        self.contagens = [0] * n_faixas
+        self.soma_previsoes = [0.0] * n_faixas
+        self.soma_resultados = [0] * n_faixas
+
+    def registrar(self, previsao, resultado):
+        previsao = float(previsao)
+        self.n += 1
+        self.soma_quadrados += (previsao - resultado) ** 2
+        p = min(max(previsao, EPS), 1 - EPS)
+        self.soma_log_loss -= math.log(p) if resultado else math.log(1 - p)
+        faixa = min(int(previsao * len(self.contagens)), len(self.contagens) - 1)
+        self.contagens[faixa] += 1
+        self.soma_previsoes[faixa] += previsao
+        self.soma_resultados[faixa] += resultado
+
+    def mesclar(self, outra):
+        """ Soma outro acumulador (com o mesmo número de faixas) a este. Retorna self. """
+        if len(outra.contagens) != len(self.contagens):
+            raise ValueError("Calibrações com números de faixas diferentes não podem ser mescladas.")
+        self.n += outra.n
+        self.soma_quadrados += outra.soma_quadrados
+        self.soma_log_loss += outra.soma_log_loss
+        for i in range(len(self.contagens)):
+            self.contagens[i] += outra.contagens[i]
+            self.soma_previsoes[i] += outra.soma_previsoes[i]
+            self.soma_resultados[i] += outra.soma_resultados[i]
+        return self
+
+    def __add__(self, outra):
+        return Calibracao(len(self.contagens)).mesclar(self).mesclar(outra)
+
+    @property
+    def brier(self):
+        """ Erro quadrático médio das previsões (0 sem registros). """
+        return self.soma_quadrados / self.n if self.n else 0.0
+
+    @property
+    def log_loss(self):
+        return self.soma_log_loss / self.n if self.n else 0.0
+
+    def curva_confiabilidade(self):
+        """ [(início, fim, previsões, previsão média, frequência real)] das faixas com previsões. """
+        largura = 1 / len(self.contagens)
+        return [(i * largura, (i + 1) * largura, n, self.soma_previsoes[i] / n, self.soma_resultados[i] / n)
+                for i, n in enumerate(self.contagens) if n]
+
+    @property
+    def erro_calibracao(self):
+        """ ECE: distância média entre previsão e frequência real nas faixas, ponderada pelas contagens. """
+        if not self.n:
+            return 0.0
+        return sum(n * abs(media - frequencia) for _, _, n, media, frequencia in self.curva_confiabilidade()) / self.n
+
+    def como_dict(self):
+        return {'n': self.n, 'soma_quadrados': self.soma_quadrados, 'soma_log_loss': self.soma_log_loss,
+                'contagens': list(self.contagens), 'soma_previsoes': list(self.soma_previsoes),
+                'soma_resultados': list(self.soma_resultados)}
+
+    @classmethod
+    def de_dict(cls, dados):
+        calibracao = cls(len(dados['contagens']))
+        calibracao.n = dados['n']
+        calibracao.soma_quadrados = dados['soma_quadrados']
+        calibracao.soma_log_loss = dados['soma_log_loss']
+        calibracao.contagens = list(dados['contagens'])
+        calibracao.soma_previsoes = list(dados['soma_previsoes'])
+        calibracao.soma_resultados = list(dados['soma_resultados'])
+        return calibracao
+
+    def resumo(self):
+        return f"{self.n} previsões | Brier {self.brier:.4f} | log-loss {self.log_loss:.4f} | ECE {self.erro_calibracao:.4f}"
+
+
+class CalibracaoPorFase:
+    """ Uma Calibracao do total e uma por fase do jogo (criada no primeiro registro da fase). """
+
+    def __init__(self, n_faixas=N_FAIXAS):
+        self.n_faixas = n_faixas
+        self.total = Calibracao(n_faixas)
+        self.fases = {}
+
+    def registrar(self, previsao, resultado, fase=None):
+        self.total.registrar(previsao, resultado)
+        if fase is not None:
+            if fase not in self.fases:
+                self.fases[fase] = Calibracao(self.n_faixas)
+            self.fases[fase].registrar(previsao, resultado)
+
+    def mesclar(self, outra):
+        self.total.mesclar(outra.total)
+        for fase, calibracao in outra.fases.items():
+            if fase not in self.fases:
+                self.fases[fase] = Calibracao(self.n_faixas)
+            self.fases[fase].mesclar(calibracao)
+        return self
+
+    def __add__(self, outra):
+        return CalibracaoPorFase(self.n_faixas).mesclar(self).mesclar(outra)
+
+    @property
+    def n(self):
+        return self.total.n
+
+    @property
+    def mse(self):
+        return self.total.brier
+
+    def como_dict(self):
+        return {'total': self.total.como_dict(), 'fases': {f: c.como_dict() for f, c in self.fases.items()}}
+
+    @classmethod
+    def de_dict(cls, dados):
+        total = Calibracao.de_dict(dados['total'])
+        calibracao = cls(len(total.contagens))
+        calibracao.total = total
+        calibracao.fases = {f: Calibracao.de_dict(c) for f, c in dados['fases'].items()}
+        return calibracao
+
+    def resumo(self):
+        linhas = [f"  {'total':<12} {self.total.resumo()}"]
+        linhas += [f"  {fase:<12} {self.fases[fase].resumo()}" for fase in sorted(self.fases)]
+        return "\n".join(linhas)
+
+
+def mesclar_todas(calibracoes):
+    """ Junta uma sequência de CalibracaoPorFase (ou os seus como_dict) em uma só. """
+    resultado = CalibracaoPorFase()
+    for calibracao in calibracoes:
+        if isinstance(calibracao, dict):
+            calibracao = CalibracaoPorFase.de_dict(calibracao)
+        resultado.mesclar(calibracao)
+    return resultado
@@ -0,0 +1,44 @@
+from gpu_utils import CARTA_PARA_INT
+
+# ======================================================================
+# Forma canônica do conjunto de informação do bot
+# ----------------------------------------------------------------------
+# Em logica.py o naipe só pesa nas manilhas (valor_da_carta); fora delas
+# duas cartas do mesmo rank são indistinguíveis. Por isso:
+#   - cartas comuns viram só o rank (rank_idx * 4) e manilhas mantêm o naipe;
+#   - a ordem das cartas na mão não importa (a mão é ordenada);
+#   - os assentos são contados a partir do bot e os times viram
+#     "nós" (1) / "eles" (2), de modo que a mesma situação vista de qualquer
+#     cadeira gera a mesma chave.
+# A chave usa apenas o que o bot sabe: a própria mão, a vira, as cartas já
+# reveladas (em ordem), os resultados das rodadas e quem começou a mão.
+# ======================================================================
+
+def rank_da_manilha(jogo):
+    return (CARTA_PARA_INT[jogo.vira] // 4 + 1) % 10
+
+
+def codigo_canonico(carta, rank_manilha):
+    """ Inteiro da carta sem o naipe, exceto se ela for manilha. """
+    codigo = CARTA_PARA_INT[carta]
+    return codigo if codigo // 4 == rank_manilha else codigo - codigo % 4
+
+
+def chave_canonica(jogo, jogador_bot):
+    """ Tupla (hashável) que identifica a decisão do bot a menos de simetrias. """
+    idx_bot = next(i for i, p in enumerate(jogo.jogadores) if p.id == jogador_bot.id)
+    rank_manilha = rank_da_manilha(jogo)
+    nosso_time = jogador_bot.time_id
+    return (
+        rank_manilha,
+        (jogo.jogador_iniciou_rodada_idx - idx_bot) % 4,
+        tuple(codigo_canonico(c, rank_manilha) for c in jogo.cartas_jogadas),
+        tuple(0 if r == 0 else (1 if r == nosso_time else 2) for r in jogo.resultado_rodada),
+        tuple(sorted(codigo_canonico(c, rank_manilha) for c in jogador_bot.mao)),
+    )
+
+
+def carta_da_jogada(codigo, jogo, jogador_bot):
+    """ Traduz um código canônico de volta para uma carta da mão real do bot (ou None). """
+    rank_manilha = rank_da_manilha(jogo)
+    return next((c for c in jogador_bot.mao if codigo_canonico(c, rank_manilha) == codigo), None)
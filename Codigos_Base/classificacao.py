@@ -0,0 +1,110 @@
+import math
+import numpy as np
+
+# ======================================================================
+# Classificação de Bradley–Terry, na escala Elo, com intervalos
+# ----------------------------------------------------------------------
+# Cada competidor i tem uma força b_i e vence j com probabilidade
+# 1 / (1 + exp(b_j - b_i)). As forças são ajustadas por máxima
+# verossimilhança (Newton) sobre a matriz de vitórias, com uma priori
+# normal fraca (desvio PRIORI_ELO): sem ela, quem nunca venceu (ou nunca
+# perdeu) teria força infinita. O resultado não depende da ordem das
+# partidas, ao contrário do Elo incremental.
+#
+# A covariância sai da inversa da Hessiana (informação de Fisher). Dela:
+#   - o intervalo de 95% de cada rating;
+#   - a diferença entre dois competidores e o p-valor (teste z) de ela
+#     ser zero, que diz se a ordem entre os dois já é significativa.
+# Os ratings são mostrados na escala Elo (400 pontos de diferença = 10
+# para 1 nas chances), centrados em 0 (a média do grupo).
+#
+#   classificacao = ajustar_bradley_terry(nomes, vitorias)
+#   print(classificacao.tabela())
+# ======================================================================
+
+ESCALA_ELO = 400 / math.log(10)
+
+# Desvio da priori dos ratings, em pontos Elo
+PRIORI_ELO = 400.0
+
+Z_95 = 1.959963984540054
+
+
+def matriz_vitorias(nomes, partidas):
+    """ vitorias[i, j] = vitórias de nomes[i] sobre nomes[j], a partir de pares (vencedor, perdedor). """
+    indice = {nome: i for i, nome in enumerate(nomes)}
+    vitorias = np.zeros((len(nomes), len(nomes)))
+    for vencedor, perdedor in partidas:
+        vitorias[indice[vencedor], indice[perdedor]] += 1
+    return vitorias
+
+
+class Classificacao:
+    """ Ratings (Elo, média 0) e covariância de um ajuste de Bradley–Terry. """
+
+    def __init__(self, nomes, ratings, covariancia, vitorias):
+        self.nomes = list(nomes)
+        self.ratings = ratings
+        self.covariancia = covariancia
+        self.vitorias = vitorias
+
+    def intervalo(self, i):
+        """ Meia largura do intervalo de 95% do rating de i. """
+        return Z_95 * math.sqrt(max(self.covariancia[i, i], 0.0))
+
+    def diferenca(self, i, j):
+        """ (rating de i - rating de j, p-valor bilateral de a diferença ser zero). """
+        diferenca = self.ratings[i] - self.ratings[j]
+        variancia = self.covariancia[i, i] + self.covariancia[j, j] - 2 * self.covariancia[i, j]
+        if variancia <= 0:
+            return diferenca, 1.0
+        return diferenca, math.erfc(abs(diferenca) / math.sqrt(2 * variancia))
+
+    def ordem(self):
+        """ Índices do maior para o menor rating. """
+        return [int(i) for i in np.argsort(-self.ratings, kind='stable')]
+
+    def separados(self, alfa=0.05):
+        """ Para cada vizinho na ordem (1º e 2º, 2º e 3º...), se a diferença é significativa. """
+        ordem = self.ordem()
+        return [self.diferenca(a, b)[1] < alfa for a, b in zip(ordem, ordem[1:])]
+
+    def tabela(self, alfa=0.05, tipos=None):
+        """ Texto com a classificação; '>' marca quem está significativamente à frente do seguinte. """
+        ordem = self.ordem()
+        separados = self.separados(alfa) + [False]
+        largura = max(len('competidor'), *(len(nome) for nome in self.nomes))
+        linhas = [f"  {'#':>3} {'competidor':<{largura}} {'tipo':<10} {'rating':>7} {'IC 95%':>8} "
+                  f"{'V':>5} {'D':>5}"]
+        for posicao, (i, separado) in enumerate(zip(ordem, separados), 1):
+            tipo = tipos.get(self.nomes[i], '') if tipos else ''
+            linhas.append(f"  {posicao:>3} {self.nomes[i]:<{largura}} {tipo:<10} {self.ratings[i]:>7.0f} "
+                          f"{'±' + format(self.intervalo(i), '.0f'):>8} {self.vitorias[i].sum():>5.0f} "
+                          f"{self.vitorias[:, i].sum():>5.0f} {'>' if separado else ''}")
+        return '\n'.join(linhas)
+
+
+def ajustar_bradley_terry(nomes, vitorias, priori_elo=PRIORI_ELO, tolerancia=1e-10, max_iteracoes=100):
+    """ Ajusta as forças à matriz de vitórias (matriz_vitorias) e retorna a Classificacao. """
+    vitorias = np.asarray(vitorias, dtype=float)
+    n = len(nomes)
+    jogos = vitorias + vitorias.T
+    precisao_priori = (ESCALA_ELO / priori_elo) ** 2
+    forcas = np.zeros(n)
+    for _ in range(max_iteracoes):
+        p = 1 / (1 + np.exp(forcas[None, :] - forcas[:, None]))   # p[i, j]: i vence j
+        gradiente = (vitorias - jogos * p).sum(axis=1) - precisao_priori * forcas
+        peso = jogos * p * (1 - p)
+        informacao = np.diag(peso.sum(axis=1) + precisao_priori) - peso
+        passo = np.linalg.solve(informacao, gradiente)
+        forcas += passo
+        if np.max(np.abs(passo)) < tolerancia:
+            break
+    p = 1 / (1 + np.exp(forcas[None, :] - forcas[:, None]))
+    peso = jogos * p * (1 - p)
+    covariancia = np.linalg.inv(np.diag(peso.sum(axis=1) + precisao_priori) - peso)
+    # Centra na média do grupo: ratings e covariância de (I - 1/n) b
+    centro = np.eye(n) - 1 / n
+    ratings = ESCALA_ELO * (centro @ forcas)
+    covariancia = ESCALA_ELO ** 2 * (centro @ covariancia @ centro)
+    return Classificacao(nomes, ratings, covariancia, vitorias)
@@ -0,0 +1,45 @@
+import os
+import json
+
+# Valores padrão (os "chutes" originais). O autotuning.py mede a máquina atual e
+# grava valores melhores em config_desempenho.json, que os agentes carregam ao iniciar.
+PADROES = {
+    'n_jobs': -1,                          # workers do joblib quando o agente pede "todos" (-1)
+    'pacotes_por_nucleo': 4,               # pacotes de trabalho por núcleo no agente multi-core
+    'rollouts_por_lote_gpu': 4096,         # rollouts por lançamento do kernel (agente_gpu)
+    'rollouts_por_lote_gpu_tempo': 16384,  # idem para o agente GPU com limite de tempo
+    'threads_por_bloco': 128,              # threads por bloco CUDA
+}
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config_desempenho.json')
+
+_cache = {}
+
+
+def caminho_config():
+    """ O arquivo pode ser trocado pela variável de ambiente TRUCO_CONFIG. """
+    return os.environ.get('TRUCO_CONFIG', ARQUIVO_PADRAO)
+
+
+def carregar_config(caminho=None):
+    """ Retorna os padrões sobrescritos pelo que estiver no arquivo de configuração. """
+    caminho = caminho or caminho_config()
+    if caminho not in _cache:
+        config = dict(PADROES)
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as f:
+                dados = json.load(f)
+            config.update({k: v for k, v in dados.get('parametros', {}).items() if k in PADROES})
+        _cache[caminho] = config
+    return dict(_cache[caminho])
+
+
+def salvar_config(parametros, medicoes=None, caminho=None):
+    caminho = caminho or caminho_config()
+    desconhecidos = set(parametros) - set(PADROES)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(desconhecidos)}")
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({'parametros': parametros, 'medicoes': medicoes or {}}, f, indent=2, ensure_ascii=False)
+    _cache.pop(caminho, None)
+    return caminho
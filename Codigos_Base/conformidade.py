@@ -0,0 +1,192 @@
+import os
+import sys
+import copy
+import time
+import random
+import argparse
+import warnings
+import numpy as np
+from politica_rollout import POLITICA_ROTEIRO, escolher_carta, estados_de_teste
+from simulador_lote import achatar_estados_lote
+
+# ======================================================================
+# Conformidade entre os motores de simulação
+# ----------------------------------------------------------------------
+# As regras de uma mão existem em quatro lugares: logica.py (Python),
+# simulador_lote.py (NumPy), simulador_numba.py (Numba, CPU) e o kernel
+# CUDA de agente_gpu.py. Este script dá aos quatro os mesmos estados
+# (mãos de sementes fixas, do início da mão e de pontos variados dela) e
+# as mesmas jogadas, e exige resultados idênticos, rodada a rodada e da
+# mão:
+#   - roteiro: cada jogador joga as cartas na ordem da mão, e cada
+#     estado é repetido com as mãos em ordens diferentes (roteiros);
+#   - heurística sem ruído: a política de rollout determinística.
+# Com cartas sorteadas não há como casar os geradores aleatórios; nesse
+# caso a taxa de vitória de cada estado é comparada à do NumPy com muitas
+# amostras (maior |z| entre os estados, limite --z-maximo).
+#
+# Ao lado da conformidade, a vazão de cada motor (rollouts/s, cartas
+# sorteadas). No simulador CUDA do Numba (--simulador-cuda, sem GPU) a
+# vazão não representa uma GPU; só a conformidade vale.
+#
+#   python conformidade.py --estados 200 --roteiros 4 --simulador-cuda
+#
+# Sai com código 1 se algum motor divergir.
+# ======================================================================
+
+MOTORES = ('python', 'numpy', 'numba', 'cuda')
+CONFERENCIAS = (POLITICA_ROTEIRO, 'heuristica')
+
+
+def casos_de_teste(n_estados, roteiros=4, semente=0):
+    """ Estados de teste repetidos com as cartas de cada mão em `roteiros` ordens diferentes. """
+    rng = random.Random(semente)
+    casos = []
+    for jogo, _ in estados_de_teste(n_estados, semente):
+        for r in range(roteiros):
+            caso = copy.deepcopy(jogo)
+            if r > 0:
+                for jogador in caso.jogadores:
+                    rng.shuffle(jogador.mao)
+            casos.append(caso)
+    return casos
+
+
+def jogar_python(jogos, politica, ruido=0.0):
+    """ (vencedores, resultado de cada rodada) jogando cada estado com logica.py. """
+    vencedores = np.empty(len(jogos), dtype=np.int8)
+    rodadas = np.empty((len(jogos), 3), dtype=np.int8)
+    for i, jogo in enumerate(jogos):
+        jogo = copy.deepcopy(jogo)
+        jogo.simulacao = True
+        while jogo.estado_jogo == "EM_ANDAMENTO":
+            jogador = jogo.jogadores[jogo.jogador_atual_idx]
+            jogo.jogar_carta(jogador.id, escolher_carta(jogo, jogador, politica, ruido))
+        vencedores[i] = jogo.vencedor_mao
+        rodadas[i] = jogo.resultado_rodada
+    return vencedores, rodadas
+
+
+def simulador(motor):
+    """ Função com a interface de simulador_lote.simular_maos_lote para o motor (ImportError se faltar). """
+    if motor == 'numpy':
+        from simulador_lote import simular_maos_lote
+        return simular_maos_lote
+    if motor == 'numba':
+        from simulador_numba import simular_maos_numba
+        return simular_maos_numba
+    if motor == 'cuda':
+        from gpu_utils import gpu_disponivel
+        if not gpu_disponivel():
+            raise ImportError("sem GPU CUDA (use --simulador-cuda)")
+        from agente_gpu import simular_maos_cuda
+        return simular_maos_cuda
+    raise ValueError(f"Motor desconhecido: {motor}")
+
+
+def jogar_motor(motor, jogos, politica, ruido=0.0, n=1, rng=None):
+    """ (vencedores, rodadas) de n linhas por estado no motor dado. """
+    if motor == 'python':
+        return jogar_python([j for j in jogos for _ in range(n)], politica, ruido)
+    lote = achatar_estados_lote(jogos, n)
+    with warnings.catch_warnings():
+        # O simulador CUDA avisa de overflow nas contas de 64 bits do xoroshiro, que são esperados
+        warnings.simplefilter('ignore')
+        return simulador(motor)(lote, rng, politica, ruido, retornar_rodadas=True)
+
+
+def conferir(motor, jogos, referencia, politica):
+    """ Linhas em que o motor diverge da referência (Python): [(índice, esperado, obtido)]. """
+    vencedores, rodadas = jogar_motor(motor, jogos, politica)
+    esperado_v, esperado_r = referencia
+    divergentes = np.flatnonzero((vencedores != esperado_v) | (rodadas != esperado_r).any(axis=1))
+    return [(int(i), (int(esperado_v[i]), esperado_r[i].tolist()), (int(vencedores[i]), rodadas[i].tolist()))
+            for i in divergentes]
+
+
+def maior_z(motor, jogos, n, taxas_referencia, n_referencia, semente=0):
+    """ Maior |z| entre a taxa de vitória do time 1 no motor (n rollouts) e a referência, por estado. """
+    vencedores, _ = jogar_motor(motor, jogos, 'aleatoria', n=n, rng=np.random.default_rng(semente))
+    random.seed(semente)
+    taxas = (vencedores.reshape(len(jogos), n) == 1).mean(axis=1)
+    combinada = (taxas * n + taxas_referencia * n_referencia) / (n + n_referencia)
+    erro = np.sqrt(np.maximum(combinada * (1 - combinada), 1e-12) * (1 / n + 1 / n_referencia))
+    return float(np.max(np.abs(taxas - taxas_referencia) / erro))
+
+
+def medir_vazao(motor, jogo, n):
+    """ Rollouts por segundo (cartas sorteadas) a partir de um estado, sem contar a compilação. """
+    jogar_motor(motor, [jogo], 'aleatoria', n=min(n, 64), rng=np.random.default_rng(0))  # compila/aquece
+    inicio = time.perf_counter()
+    jogar_motor(motor, [jogo], 'aleatoria', n=n, rng=np.random.default_rng(1))
+    return n / (time.perf_counter() - inicio)
+
+
+def rodar(motores=MOTORES, n_estados=100, roteiros=4, semente=0, n_aleatorio=200, n_vazao=4096, z_maximo=4.5):
+    """ Confere os motores contra o Python; um dicionário por motor (ou com 'erro' se indisponível). """
+    casos = casos_de_teste(n_estados, roteiros, semente)
+    referencias = {politica: jogar_python(casos, politica) for politica in CONFERENCIAS}
+    # Referência das taxas com cartas sorteadas: NumPy com muitas amostras, um estado por roteiro
+    estados = casos[::roteiros]
+    n_referencia = 20 * n_aleatorio
+    vencedores, _ = jogar_motor('numpy', estados, 'aleatoria', n=n_referencia, rng=np.random.default_rng(semente + 1))
+    taxas_referencia = (vencedores.reshape(len(estados), n_referencia) == 1).mean(axis=1)
+
+    relatorio = {}
+    for motor in motores:
+        try:
+            if motor != 'python':
+                simulador(motor)
+        except ImportError as erro:
+            relatorio[motor] = {'erro': str(erro)}
+            continue
+        r = {'casos': len(casos)}
+        for politica in CONFERENCIAS:
+            r[politica] = [] if motor == 'python' else conferir(motor, casos, referencias[politica], politica)
+        # O Python é ~100x mais lento: menos amostras por estado
+        n = n_aleatorio if motor != 'python' else max(50, n_aleatorio // 4)
+        r['z_aleatoria'] = maior_z(motor, estados, n, taxas_referencia, n_referencia, semente)
+        r['rollouts_por_s'] = medir_vazao(motor, casos[0], n_vazao if motor != 'python' else n_vazao // 10)
+        r['conforme'] = not r[POLITICA_ROTEIRO] and not r['heuristica'] and r['z_aleatoria'] <= z_maximo
+        relatorio[motor] = r
+    return relatorio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Confere os motores de simulação entre si e mede a vazão de cada um.")
+    parser.add_argument('--motores', nargs='+', choices=MOTORES, default=list(MOTORES))
+    parser.add_argument('--estados', type=int, default=100)
+    parser.add_argument('--roteiros', type=int, default=4, help="Ordens das mãos por estado.")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--rollouts', type=int, default=200, help="Rollouts por estado na comparação com cartas sorteadas.")
+    parser.add_argument('--vazao', type=int, default=4096, help="Rollouts na medida de vazão.")
+    parser.add_argument('--z-maximo', type=float, default=4.5)
+    parser.add_argument('--simulador-cuda', action='store_true', help="Roda o kernel CUDA no simulador do Numba.")
+    args = parser.parse_args()
+    if args.simulador_cuda:
+        # Precisa valer antes de o numba.cuda ser importado
+        os.environ['NUMBA_ENABLE_CUDASIM'] = '1'
+        if 'cuda' in args.motores:
+            # O simulador roda cada thread em Python: lotes pequenos
+            args.vazao = min(args.vazao, 512)
+
+    relatorio = rodar(args.motores, args.estados, args.roteiros, args.semente, args.rollouts, args.vazao, args.z_maximo)
+    n_casos = args.estados * args.roteiros
+    print(f"Conformidade em {n_casos} casos ({args.estados} estados x {args.roteiros} roteiros):")
+    print(f"  {'motor':<7} {'roteiro':>12} {'heurística':>12} {'|z| sorteio':>12} {'rollouts/s':>12}")
+    divergiu = False
+    for motor, r in relatorio.items():
+        if 'erro' in r:
+            print(f"  {motor:<7} indisponível: {r['erro']}")
+            continue
+        divergiu |= not r['conforme']
+        colunas = [f"{n_casos - len(r[p])}/{n_casos}" for p in CONFERENCIAS]
+        print(f"  {motor:<7} {colunas[0]:>12} {colunas[1]:>12} {r['z_aleatoria']:12.2f} {r['rollouts_por_s']:12,.0f}"
+              f"{'' if r['conforme'] else '  DIVERGE'}")
+        for politica in CONFERENCIAS:
+            for i, esperado, obtido in r[politica][:3]:
+                print(f"      {politica} caso {i}: logica.py {esperado} x {motor} {obtido}")
+    sys.exit(1 if divergiu else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+import copy
+import numpy as np
+from gpu_utils import CARTA_PARA_INT, INT_PARA_CARTA
+from simulador_lote import valor_cartas, posicao_heuristica
+
+# ======================================================================
+# Crença sobre as mãos ocultas (filtro de partículas)
+# ----------------------------------------------------------------------
+# Para o bot, as cartas dos outros três jogadores são desconhecidas. Em vez
+# de sortear essas mãos do zero a cada simulação, a CrencaMaos guarda, pela
+# mão inteira, um conjunto de partículas com peso. Cada partícula é uma
+# distribuição completa das 36 cartas que o bot não vê no início da mão
+# (40 - vira - mão do bot): posições 0..8 são as mãos dos outros três
+# jogadores (3 cartas cada, na ordem dos assentos) e o resto fica no monte.
+#
+# A cada carta revelada (sincronizar):
+#   - partículas em que o dono não tinha a carta são consertadas, trocando
+#     a carta de lugar com uma carta ainda não jogada da mão dele;
+#   - os pesos são multiplicados pela chance de o jogador escolher aquela
+#     carta com aquela mão, segundo a política heurística de rollout com
+#     ruído `ruido_modelo` (1.0 = jogadas sem informação, só consistência);
+#   - se o tamanho efetivo da amostra cai abaixo de `limiar_reamostragem`,
+#     reamostra (sistemática) e rejuvenesce com passos de Metropolis que
+#     trocam cartas ocultas entre donos, aceitos pela verossimilhança de
+#     todo o histórico da mão.
+#
+# As buscas pedem determinizações prontas com amostrar_maos (lote de mãos
+# no formato de simulador_lote / gpu_utils) ou determinizar (um
+# JogoTruco2v2 com as mãos ocultas trocadas).
+#
+#   crenca = CrencaMaos(n_particulas=512)
+#   crenca.sincronizar(jogo, jogador_bot)     # a cada decisão
+#   maos = crenca.amostrar_maos(jogo, 4096)   # (4096, 4, 3) int8
+# ======================================================================
+
+NAO_JOGADA = 99  # "ordem" das cartas que ainda não saíram
+
+
+def historico_da_mao(jogo):
+    """
+    Reconstrói quem jogou cada carta da mão atual: lista de (idx_jogador, codigo, mesa_antes),
+    em que mesa_antes é a carta (código) de cada assento na rodada antes da jogada, -1 = não jogou.
+    """
+    rank_manilha = (CARTA_PARA_INT[jogo.vira] // 4 + 1) % 10
+    historico = []
+    lider = vencedor_turno = jogo.jogador_iniciou_rodada_idx
+    mesa = [-1] * 4
+    for n, carta in enumerate(jogo.cartas_jogadas):
+        if n % 4 == 0:
+            mesa = [-1] * 4
+            lider = vencedor_turno
+        idx = (lider + n % 4) % 4
+        codigo = CARTA_PARA_INT[carta]
+        historico.append((idx, codigo, tuple(mesa)))
+        mesa[idx] = codigo
+        if n % 4 == 3:
+            # Mesmo desempate de _finalizar_turno: empate mantém quem puxa
+            valores = valor_cartas(np.array(mesa), rank_manilha)
+            if (valores == valores.max()).sum() == 1:
+                vencedor_turno = int(valores.argmax())
+    return historico
+
+
+class CrencaMaos:
+    """ Partículas com peso sobre as mãos ocultas, atualizadas carta a carta durante a mão. """
+    def __init__(self, n_particulas=512, ruido_modelo=0.5, limiar_reamostragem=0.5, passos_mcmc=2, semente=None):
+        self.n_particulas = n_particulas
+        self.ruido_modelo = ruido_modelo
+        self.limiar_reamostragem = limiar_reamostragem
+        self.passos_mcmc = passos_mcmc
+        self.rng = np.random.default_rng(semente)
+        self.estatisticas = {'maos': 0, 'observacoes': 0, 'consertos': 0, 'reamostragens': 0,
+                             'propostas_mcmc': 0, 'aceitas_mcmc': 0}
+        self._identidade = None
+
+    # ------------------------------------------------------------------
+    # Atualização
+    # ------------------------------------------------------------------
+    def sincronizar(self, jogo, jogador_bot):
+        """
+        Atualiza a crença com as cartas reveladas desde a última chamada. Numa mão nova
+        (ou se o histórico não continua o que já foi visto) a crença recomeça do zero.
+        """
+        idx_bot = next(i for i, p in enumerate(jogo.jogadores) if p.id == jogador_bot.id)
+        historico = historico_da_mao(jogo)
+        identidade = (idx_bot, CARTA_PARA_INT[jogo.vira], jogo.jogador_iniciou_rodada_idx)
+        vistas = [codigo for _, codigo, _ in self._historico] if self._identidade is not None else []
+        if identidade != self._identidade or [codigo for _, codigo, _ in historico[:len(vistas)]] != vistas:
+            self._iniciar(jogo, idx_bot, historico)
+            vistas = []
+        for idx, codigo, mesa in historico[len(vistas):]:
+            self._observar(idx, codigo, mesa)
+
+    def _iniciar(self, jogo, idx_bot, historico):
+        self._identidade = (idx_bot, CARTA_PARA_INT[jogo.vira], jogo.jogador_iniciou_rodada_idx)
+        self.idx_bot = idx_bot
+        self.rank_manilha = (CARTA_PARA_INT[jogo.vira] // 4 + 1) % 10
+        self.donos = [i for i in range(4) if i != idx_bot]  # assento de cada trio de posições 0..8
+        mao_inicial = [CARTA_PARA_INT[c] for c in jogo.jogadores[idx_bot].mao]
+        mao_inicial += [codigo for idx, codigo, _ in historico if idx == idx_bot]
+        vistas = set(mao_inicial) | {CARTA_PARA_INT[jogo.vira]}
+        universo = np.array([c for c in range(40) if c not in vistas], dtype=np.int8)
+
+        chaves = self.rng.random((self.n_particulas, len(universo)))
+        self.particulas = universo[np.argsort(chaves, axis=1)]
+        self.log_pesos = np.zeros(self.n_particulas)
+        self.ordem = np.full(40, NAO_JOGADA, dtype=np.int16)
+        self._historico = []
+        self._observacoes = []  # (passo, trio, codigo, mesa) das cartas dos outros jogadores
+        self.estatisticas['maos'] += 1
+
+    def _observar(self, idx, codigo, mesa):
+        passo = len(self._historico)
+        self._historico.append((idx, codigo, mesa))
+        self.ordem[codigo] = passo
+        if idx == self.idx_bot:
+            return
+        trio = self.donos.index(idx)
+        self.estatisticas['observacoes'] += 1
+        self.estatisticas['consertos'] += self._consertar(self.particulas, trio, codigo, self.ordem, self.rng)
+        self._observacoes.append((passo, trio, codigo, np.array(mesa, dtype=np.int8)))
+        self.log_pesos += self._log_verossimilhanca(self.particulas, *self._observacoes[-1])
+
+        pesos = np.exp(self.log_pesos - self.log_pesos.max())
+        tamanho_efetivo = pesos.sum() ** 2 / (pesos ** 2).sum()
+        if tamanho_efetivo < self.limiar_reamostragem * self.n_particulas:
+            self._reamostrar(pesos / pesos.sum())
+
+    @staticmethod
+    def _consertar(particulas, trio, codigo, ordem, rng):
+        """ Nas partículas em que o dono não tinha `codigo`, troca a carta com uma não jogada da mão dele. """
+        onde = (particulas == codigo).argmax(axis=1)
+        erradas = np.flatnonzero(onde // 3 != trio)
+        if erradas.size:
+            posicoes = 3 * trio + np.arange(3)
+            cartas = particulas[erradas][:, posicoes]
+            livres = ordem[cartas] == NAO_JOGADA
+            escolha = posicoes[np.where(livres, rng.random(livres.shape), -1.0).argmax(axis=1)]
+            particulas[erradas, onde[erradas]] = particulas[erradas, escolha]
+            particulas[erradas, escolha] = codigo
+        return erradas.size
+
+    def _log_verossimilhanca(self, particulas, passo, trio, codigo, mesa):
+        """ Log da chance de o dono do trio jogar `codigo` com a mão que tinha em cada partícula. """
+        cartas = particulas[:, 3 * trio:3 * trio + 3]
+        na_mao = self.ordem[cartas] >= passo
+        mao = np.where(na_mao, cartas, -1)
+        n = len(particulas)
+        k = posicao_heuristica(mao, np.broadcast_to(mesa, (n, 4)), np.full(n, self.donos[trio]),
+                               np.full(n, self.rank_manilha))
+        heuristica = mao[np.arange(n), k] == codigo
+        return np.log((1 - self.ruido_modelo) * heuristica + self.ruido_modelo / na_mao.sum(axis=1))
+
+    def _log_verossimilhanca_total(self, particulas):
+        total = np.zeros(len(particulas))
+        for observacao in self._observacoes:
+            total += self._log_verossimilhanca(particulas, *observacao)
+        return total
+
+    def _reamostrar(self, pesos):
+        """ Reamostragem sistemática seguida de passos de Metropolis para desfazer as cópias. """
+        self.estatisticas['reamostragens'] += 1
+        n = self.n_particulas
+        pontos = (self.rng.random() + np.arange(n)) / n
+        indices = np.minimum(np.searchsorted(np.cumsum(pesos), pontos), n - 1)
+        self.particulas = self.particulas[indices]
+        self.log_pesos = np.zeros(n)
+        if self.ruido_modelo >= 1.0:
+            return
+        atual = self._log_verossimilhanca_total(self.particulas)
+        linhas = np.arange(n)
+        for _ in range(self.passos_mcmc):
+            # Troca uma carta de uma mão oculta com outra de outro dono (ou do monte), ambas não jogadas
+            a = self.rng.integers(0, 9, n)
+            b = self.rng.integers(0, self.particulas.shape[1], n)
+            validas = ((a // 3 != np.minimum(b // 3, 3))
+                       & (self.ordem[self.particulas[linhas, a]] == NAO_JOGADA)
+                       & (self.ordem[self.particulas[linhas, b]] == NAO_JOGADA))
+            proposta = self.particulas.copy()
+            proposta[linhas, a], proposta[linhas, b] = self.particulas[linhas, b], self.particulas[linhas, a]
+            nova = self._log_verossimilhanca_total(proposta)
+            aceitas = validas & (np.log(self.rng.random(n)) < nova - atual)
+            self.particulas[aceitas] = proposta[aceitas]
+            atual = np.where(aceitas, nova, atual)
+            self.estatisticas['propostas_mcmc'] += int(validas.sum())
+            self.estatisticas['aceitas_mcmc'] += int(aceitas.sum())
+
+    # ------------------------------------------------------------------
+    # Amostragem
+    # ------------------------------------------------------------------
+    def amostrar_maos(self, jogo, n, rng=None):
+        """
+        n determinizações de `jogo` (que pode estar adiante da última sincronização, como os
+        nós da árvore de busca): array (n, 4, 3) int8 com as cartas ainda na mão de cada
+        jogador, -1 = vazio. A mão do bot é sempre a verdadeira.
+        """
+        rng = rng if rng is not None else self.rng
+        pesos = np.exp(self.log_pesos - self.log_pesos.max())
+        particulas = self.particulas[rng.choice(self.n_particulas, n, p=pesos / pesos.sum())]
+
+        # Cartas jogadas depois da sincronização (jogadas hipotéticas da busca): só consistência
+        ordem = self.ordem.copy()
+        for passo, (idx, codigo, _) in enumerate(historico_da_mao(jogo)[len(self._historico):], len(self._historico)):
+            ordem[codigo] = passo
+            if idx != self.idx_bot:
+                self._consertar(particulas, self.donos.index(idx), codigo, ordem, rng)
+
+        maos = np.full((n, 4, 3), -1, dtype=np.int8)
+        mao_bot = [CARTA_PARA_INT[c] for c in jogo.jogadores[self.idx_bot].mao]
+        maos[:, self.idx_bot, :len(mao_bot)] = mao_bot
+        for trio, idx in enumerate(self.donos):
+            cartas = particulas[:, 3 * trio:3 * trio + 3]
+            na_mao = ordem[cartas] == NAO_JOGADA
+            # Empurra as cartas já jogadas para o fim, mantendo a ordem das outras
+            arrumacao = np.argsort(~na_mao, axis=1, kind='stable')
+            maos[:, idx] = np.take_along_axis(np.where(na_mao, cartas, -1), arrumacao, axis=1)
+        return maos
+
+    def determinizar(self, jogo, maos=None):
+        """ Cópia de `jogo` com as mãos ocultas trocadas por uma amostra da crença (ou pela linha `maos`). """
+        if maos is None:
+            maos = self.amostrar_maos(jogo, 1)[0]
+        copia = copy.deepcopy(jogo)
+        for idx in self.donos:
+            copia.jogadores[idx].mao = [INT_PARA_CARTA[int(c)] for c in maos[idx] if c >= 0]
+        return copia
+
+    def resumo(self):
+        e = self.estatisticas
+        return (f"crença: {e['maos']} mãos | {e['observacoes']} cartas observadas | "
+                f"{e['consertos']} consertos | {e['reamostragens']} reamostragens | "
+                f"MCMC {e['aceitas_mcmc']}/{e['propostas_mcmc']} aceitas")
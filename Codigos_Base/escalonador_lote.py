@@ -0,0 +1,258 @@
+import gc
+import time
+import copy
+import random
+import argparse
+import numpy as np
+from logica import JogoTruco2v2
+from agente_mcts import MCTSNode
+from simulador_lote import achatar_estados_lote, simular_maos_lote
+from politica_rollout import POLITICAS, validar_politica
+from calibracao import CalibracaoPorFase, fase_do_jogo, mesclar_todas
+
+# ======================================================================
+# Escalonador de rollouts em lote entre várias partidas
+# ----------------------------------------------------------------------
+# Cada partida é um gerador. Quando o bot precisa decidir, a busca MCTS
+# seleciona algumas folhas e as "entrega" (yield) ao escalonador, que junta
+# as folhas pendentes de TODAS as partidas ativas em um único lote,
+# simula tudo de uma vez (NumPy ou Numba) e devolve a taxa de vitória de
+# cada folha à sua busca. Uma rodada dessas é um "tick".
+#
+#   python escalonador_lote.py --partidas 1000 --simultaneas 256 --backend numba
+# ======================================================================
+
+class NoLote(MCTSNode):
+    """ Nó MCTS que reconhece mãos terminadas (não há jogadas a expandir depois do fim). """
+    def __init__(self, estado_jogo, parente=None, jogada=None):
+        super().__init__(estado_jogo, parente, jogada)
+        if estado_jogo.estado_jogo != "EM_ANDAMENTO":
+            self.jogadas_nao_exploradas = []
+
+    def expandir(self):
+        jogada = self.jogadas_nao_exploradas.pop()
+        novo_estado = copy.deepcopy(self.estado_jogo)
+        jogador_id = novo_estado.jogadores[novo_estado.jogador_atual_idx].id
+        novo_estado.jogar_carta(jogador_id, jogada)
+        filho = NoLote(estado_jogo=novo_estado, parente=self, jogada=jogada)
+        self.filhos.append(filho)
+        return filho
+
+    def somar_vitorias(self, resultado):
+        """ Completa uma visita já contada (perda virtual) com o resultado que chegou do lote. """
+        no_atual = self
+        while no_atual is not None:
+            no_atual.vitorias += resultado
+            no_atual = no_atual.parente
+
+
+class BuscaMCTSLote:
+    """
+    MCTS cujas folhas são avaliadas por quem conduz o gerador buscar().
+    A cada passo seleciona `folhas_por_passo` folhas (com perda virtual, para
+    não escolher sempre a mesma), pede uma taxa de vitória para cada uma e
+    retropropaga a resposta.
+    """
+    def __init__(self, n_passos=8, folhas_por_passo=8, rollouts_por_folha=64, determinizar=False):
+        self.n_passos = n_passos
+        self.folhas_por_passo = folhas_por_passo
+        self.rollouts_por_folha = rollouts_por_folha
+        self.determinizar = determinizar
+
+    def buscar(self, estado_jogo, jogador_bot):
+        """ Gerador: produz listas de estados a avaliar, recebe as taxas e retorna (jogada, taxa). """
+        time_bot_id = jogador_bot.time_id
+        raiz = NoLote(estado_jogo=estado_jogo)
+        if not raiz.jogadas_nao_exploradas:
+            return None, 0.0
+
+        for _ in range(self.n_passos):
+            folhas = []
+            for _ in range(self.folhas_por_passo):
+                no_atual = raiz
+                while not no_atual.jogadas_nao_exploradas and no_atual.filhos:
+                    no_atual = no_atual.selecionar_filho_ucb()
+                if no_atual.jogadas_nao_exploradas:
+                    no_atual = no_atual.expandir()
+                no_atual.retropropagar(0)  # perda virtual: a visita conta já, a vitória chega depois
+                folhas.append(no_atual)
+
+            pendentes = [f for f in folhas if f.estado_jogo.estado_jogo == "EM_ANDAMENTO"]
+            taxas = (yield [(f.estado_jogo, jogador_bot.id, time_bot_id) for f in pendentes]) if pendentes else []
+            for folha, taxa in zip(pendentes, taxas):
+                folha.somar_vitorias(taxa)
+            for folha in folhas:
+                if folha.estado_jogo.estado_jogo != "EM_ANDAMENTO":
+                    folha.somar_vitorias(1 if folha.estado_jogo.vencedor_mao == time_bot_id else 0)
+
+        melhor_filho = max(raiz.filhos, key=lambda c: c.visitas)
+        taxa_vitoria_estimada = melhor_filho.vitorias / melhor_filho.visitas if melhor_filho.visitas > 0 else 0.0
+        return melhor_filho.jogada, taxa_vitoria_estimada
+
+
+def partida_lote(busca, semente=None):
+    """
+    Gerador de uma partida completa: bot MCTS (jogador 1, time 1) contra jogadores
+    aleatórios, como em benchmark_runner.run_single_game. Na Mão de Onze o time do
+    bot sempre joga (como em tournament.py). Retorna o dicionário de métricas.
+    """
+    sorteio = random.Random(semente)
+    jogo = JogoTruco2v2(simulacao=True)
+    jogador_bot = jogo.jogadores[0]
+    calibracao = CalibracaoPorFase()
+    ultima_previsao = fase = None
+    decisoes = 0
+
+    while jogo.estado_jogo != "JOGO_FINALIZADO":
+        estado_atual = jogo.estado_jogo
+        if estado_atual in ["NOVA_MAO", "MAO_FINALIZADA"]:
+            if ultima_previsao is not None:
+                calibracao.registrar(ultima_previsao, 1 if jogo.vencedor_mao == jogador_bot.time_id else 0, fase)
+                ultima_previsao = None
+            jogo.iniciar_nova_mao()
+        elif estado_atual == "MAO_DE_ONZE":
+            jogo.distribuir_cartas()
+            time_em_risco = 1 if jogo.pontos_time1 >= 11 else 2
+            if time_em_risco != jogador_bot.time_id and not sorteio.choice([True, False]):
+                jogo._dar_pontos(jogador_bot.time_id, 1)
+                jogo.estado_jogo = "MAO_FINALIZADA"
+        elif estado_atual == "EM_ANDAMENTO":
+            jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
+            if not jogador_da_vez.mao:
+                jogo._checar_vencedor_da_mao()
+                continue
+            if jogador_da_vez.id == jogador_bot.id:
+                carta, ultima_previsao = yield from busca.buscar(jogo, jogador_da_vez)
+                fase = fase_do_jogo(jogo)
+                decisoes += 1
+            else:
+                carta = sorteio.choice(jogador_da_vez.mao)
+            jogo.jogar_carta(jogador_da_vez.id, carta)
+
+    if ultima_previsao is not None:
+        calibracao.registrar(ultima_previsao, 1 if jogo.vencedor_mao == jogador_bot.time_id else 0, fase)
+    return {
+        "vitoria": 1 if jogo.pontos_time1 >= 12 else 0,
+        "pontos_feitos": jogo.pontos_time1,
+        "pontos_tomados": jogo.pontos_time2,
+        "total_maos": jogo.mao_atual,
+        "decisoes": decisoes,
+        "precisao_mse": calibracao.mse,
+        "calibracao": calibracao,
+    }
+
+
+class EscalonadorLote:
+    """ Conduz muitas partidas ao mesmo tempo, avaliando as folhas de todas em um só lote por tick. """
+    def __init__(self, busca, n_simultaneas=256, backend='numpy', semente=None, politica='aleatoria'):
+        self.busca = busca
+        self.politica = validar_politica(politica)
+        self.n_simultaneas = n_simultaneas
+        self.rng = np.random.default_rng(semente)
+        self.semente = semente
+        if backend == 'numba':
+            from simulador_numba import simular_maos_numba
+            self._simular = simular_maos_numba
+        elif backend == 'numpy':
+            self._simular = simular_maos_lote
+        else:
+            raise ValueError(f"Backend desconhecido: {backend}")
+        self.backend = backend
+        self.estatisticas = {'ticks': 0, 'rollouts': 0, 'folhas': 0, 'tempo_simulacao': 0.0, 'tempo_total': 0.0}
+
+    def _avancar(self, partida, valor, ativas, resultados):
+        try:
+            ativas[partida] = partida.send(valor)
+        except StopIteration as fim:
+            ativas.pop(partida, None)
+            resultados.append(fim.value)
+
+    def _tick(self, ativas, resultados):
+        partidas = list(ativas)
+        pedidos = [ativas[p] for p in partidas]
+        folhas = [folha for pedido in pedidos for folha in pedido]
+        n_rollouts = self.busca.rollouts_por_folha
+
+        bot_ids = [bot_id for _, bot_id, _ in folhas] if self.busca.determinizar else None
+        lote = achatar_estados_lote([estado for estado, _, _ in folhas], n_rollouts, bot_ids, self.rng)
+        times_bot = np.repeat(np.array([time_id for _, _, time_id in folhas]), n_rollouts)
+
+        inicio = time.perf_counter()
+        vencedores = self._simular(lote, self.rng, self.politica)
+        self.estatisticas['tempo_simulacao'] += time.perf_counter() - inicio
+
+        taxas = (vencedores == times_bot).reshape(len(folhas), n_rollouts).mean(axis=1)
+        self.estatisticas['ticks'] += 1
+        self.estatisticas['folhas'] += len(folhas)
+        self.estatisticas['rollouts'] += len(vencedores)
+
+        pos = 0
+        for partida, pedido in zip(partidas, pedidos):
+            self._avancar(partida, taxas[pos:pos + len(pedido)].tolist(), ativas, resultados)
+            pos += len(pedido)
+
+    def executar(self, n_partidas, folhas_por_coleta=20000):
+        """
+        Roda n_partidas mantendo até n_simultaneas ativas. As árvores vivas de muitas
+        partidas tornam a coleta automática do gc cara (ela varre todos os nós a cada
+        geração), então ela fica desligada e o lixo é coletado a cada folhas_por_coleta
+        folhas avaliadas (cada folha é um nó novo).
+        """
+        inicio = time.perf_counter()
+        resultados, ativas = [], {}
+        iniciadas = 0
+        proxima_coleta = self.estatisticas['folhas'] + folhas_por_coleta
+        gc_ligado = gc.isenabled()
+        gc.disable()
+        try:
+            while iniciadas < n_partidas or ativas:
+                while len(ativas) < self.n_simultaneas and iniciadas < n_partidas:
+                    semente = None if self.semente is None else self.semente + iniciadas
+                    self._avancar(partida_lote(self.busca, semente), None, ativas, resultados)
+                    iniciadas += 1
+                if ativas:
+                    self._tick(ativas, resultados)
+                    if self.estatisticas['folhas'] >= proxima_coleta:
+                        gc.collect()
+                        proxima_coleta = self.estatisticas['folhas'] + folhas_por_coleta
+        finally:
+            if gc_ligado:
+                gc.enable()
+        self.estatisticas['tempo_total'] += time.perf_counter() - inicio
+        return resultados
+
+    def resumo(self):
+        e = self.estatisticas
+        total = e['tempo_total'] or 1e-9
+        return (f"{e['ticks']} ticks | {e['folhas'] / max(1, e['ticks']):.0f} folhas/tick | "
+                f"{e['rollouts'] / total:,.0f} rollouts/s no total "
+                f"({e['rollouts'] / max(e['tempo_simulacao'], 1e-9):,.0f} rollouts/s dentro do simulador)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roda muitas partidas com rollouts agrupados em lote.")
+    parser.add_argument('--partidas', type=int, default=200)
+    parser.add_argument('--simultaneas', type=int, default=256)
+    parser.add_argument('--backend', choices=['numpy', 'numba'], default='numpy')
+    parser.add_argument('--passos', type=int, default=8, help="Passos MCTS por decisão.")
+    parser.add_argument('--folhas', type=int, default=8, help="Folhas avaliadas por passo.")
+    parser.add_argument('--rollouts', type=int, default=64, help="Rollouts por folha.")
+    parser.add_argument('--determinizar', action='store_true', help="Sorteia as mãos ocultas em cada rollout.")
+    parser.add_argument('--politica', choices=POLITICAS, default='aleatoria', help="Política de rollout.")
+    parser.add_argument('--semente', type=int, default=None)
+    args = parser.parse_args()
+
+    busca = BuscaMCTSLote(args.passos, args.folhas, args.rollouts, args.determinizar)
+    escalonador = EscalonadorLote(busca, args.simultaneas, args.backend, args.semente, args.politica)
+    print(f"Rodando {args.partidas} partidas ({args.simultaneas} simultâneas, backend {args.backend})...")
+    resultados = escalonador.executar(args.partidas)
+
+    tempo = escalonador.estatisticas['tempo_total']
+    winrate = 100 * np.mean([r['vitoria'] for r in resultados])
+    calibracao = mesclar_todas(r['calibracao'] for r in resultados)
+    print(f"Concluído em {tempo:.1f}s ({len(resultados) / tempo:.2f} partidas/s). Winrate: {winrate:.1f}% | Brier: {calibracao.mse:.4f}")
+    print(escalonador.resumo())
+    print(f"Calibração do bot:\n{calibracao.resumo()}")
+
+if __name__ == '__main__':
+    main()
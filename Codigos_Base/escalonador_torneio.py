@@ -0,0 +1,388 @@
+import os
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Os agentes (joblib, numba.cuda) são importados só quando um competidor precisa deles
+from logica import JogoTruco2v2
+from aleatorio import ServicoAleatorio
+from classificacao import ajustar_bradley_terry, matriz_vitorias
+from metricas import ColetorMetricas, adicionar_argumentos
+
+# ======================================================================
+# Torneio sem interface: todos contra todos ou suíço, em paralelo
+# ----------------------------------------------------------------------
+# Diferente de tournament.py/tournamento.py (mata-mata, uma partida por
+# vez, com pausas para acompanhar na tela), aqui as partidas de uma
+# rodada rodam ao mesmo tempo em --processos processos, sem pausas, e a
+# classificação é um ajuste de Bradley–Terry (classificacao.py) sobre
+# todas as partidas, com intervalo de 95% para cada rating.
+#
+#   - todos: cada rodada é um turno completo (todos os pares se enfrentam);
+#   - suico: cada rodada junta quem tem pontuação parecida (vitórias,
+#     depois rating), sem repetir confrontos enquanto der, o que gasta as
+#     partidas onde a ordem ainda está indefinida.
+# Cada par joga --jogos-por-par partidas, trocando de lado a cada uma e,
+# com um número ímpar de jogos, também de uma rodada para a outra.
+#
+# Os competidores têm número fixo de simulações: com várias partidas
+# disputando os núcleos, um agente por tempo jogaria pior que o normal.
+# Cada competidor é 'nome=tipo:parametro=valor,...', com os tipos de
+# criar_agente (ver ELENCO_PADRAO). Toda partida tem a sua semente
+# (aleatorio.py), então o torneio se repete igual com a mesma semente.
+#
+# O estado (competidores, pareamentos e partidas) é gravado em --estado a
+# cada partida; rodar de novo com o mesmo arquivo retoma de onde parou, e
+# um --rodadas maior estende um torneio terminado. --ate-separar para
+# antes, quando todo vizinho na classificação já está separado do
+# seguinte com significância --alfa.
+#
+#   python escalonador_torneio.py --sistema suico --rodadas 12 --processos 8 --ate-separar
+#   python escalonador_torneio.py --competidores a=mcts:n_simulacoes=64 b=mc:n_simulacoes=20 c=aleatorio
+# ======================================================================
+
+SISTEMAS = ('todos', 'suico')
+TIPOS = ('aleatorio', 'mc', 'mcts', 'gpu')
+
+# 16 competidores de forças diferentes (só CPU, 1 núcleo por partida)
+ELENCO_PADRAO = (
+    ['Aleatorio=aleatorio']
+    + [f'MC_{n}=mc:n_simulacoes={n}' for n in (10, 40, 160)]
+    + [f'MCTS_{n}=mcts:n_simulacoes={n}' for n in (16, 32, 64, 128, 256, 512)]
+    + [f'MCTS_{n}_heur=mcts:n_simulacoes={n},politica_rollout=heuristica' for n in (16, 32, 64, 128, 256, 512)]
+)
+
+
+def _valor(texto):
+    for conversao in (int, float):
+        try:
+            return conversao(texto)
+        except ValueError:
+            pass
+    return texto
+
+
+def ler_competidor(texto):
+    """ 'nome=tipo:chave=valor,...' -> (nome, tipo, parâmetros do agente). """
+    nome, _, resto = texto.partition('=')
+    tipo, _, parametros = resto.partition(':')
+    if not nome or tipo not in TIPOS:
+        raise ValueError(f"Competidor inválido: {texto!r} (use nome=tipo:parametro=valor,..., tipo em {TIPOS})")
+    return nome, tipo, {chave: _valor(valor) for chave, _, valor in
+                        (item.partition('=') for item in parametros.split(',') if item)}
+
+
+class AgenteAleatorio:
+    """ Joga uma carta qualquer e aceita a Mão de Onze na metade das vezes; a referência de baixo. """
+
+    def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
+        return random.choice(jogador_bot.mao), None
+
+    def decidir_mao_de_onze_com_mc(self, estado_jogo, jogador_bot):
+        return random.random() < 0.5
+
+
+def criar_agente(tipo, parametros):
+    if tipo == 'aleatorio':
+        return AgenteAleatorio()
+    if tipo == 'mc':
+        from agente_mc import MonteCarloBot
+        return MonteCarloBot(**parametros)
+    if tipo == 'mcts':
+        from agente_mcts_multi import MCTSAgente
+        # Um núcleo por partida: o paralelismo vem das partidas simultâneas
+        return MCTSAgente(**{'n_jobs': 1, **parametros})
+    from agente_gpu import GPUAgenteMCTS
+    return GPUAgenteMCTS(**parametros)
+
+
+# Agentes já criados neste processo (os workers reaproveitam os seus entre as partidas)
+_AGENTES = {}
+
+
+def _agente(texto, aleatorio):
+    if texto not in _AGENTES:
+        _AGENTES[texto] = criar_agente(*ler_competidor(texto)[1:])
+    agente = _AGENTES[texto]
+    if hasattr(agente, 'aleatorio'):
+        agente.aleatorio = aleatorio
+        agente.indice_decisao = 0
+    return agente
+
+
+def jogar_partida(texto1, texto2, semente, chave, eventos=None):
+    """
+    Uma partida do torneio (roda num worker): texto1 é o time 1. A chave (rodada, par, jogo)
+    escolhe a semente da partida. Retorna (resultado, ColetorMetricas da partida).
+    """
+    nome1, nome2 = ler_competidor(texto1)[0], ler_competidor(texto2)[0]
+    coletor = ColetorMetricas(eventos, execucao='torneio', anunciar=False)
+    servico = ServicoAleatorio(semente).derivar('partida', *chave)
+    bots = {1: _agente(texto1, servico.derivar('time', 1)), 2: _agente(texto2, servico.derivar('time', 2))}
+    nomes = {1: nome1, 2: nome2}
+    # O baralho e os agentes sem ServicoAleatorio usam os geradores globais
+    servico.semear_processo('baralho')
+    inicio = time.perf_counter()
+
+    jogo = JogoTruco2v2(simulacao=True)
+    while jogo.estado_jogo != "JOGO_FINALIZADO":
+        estado_atual = jogo.estado_jogo
+        if estado_atual in ["NOVA_MAO", "MAO_FINALIZADA"]:
+            jogo.iniciar_nova_mao()
+            continue
+        elif estado_atual == "MAO_DE_ONZE":
+            jogo.distribuir_cartas()
+            time_em_risco_id = 1 if jogo.pontos_time1 >= 11 else 2
+            jogador_em_risco = jogo.jogadores[0] if time_em_risco_id == 1 else jogo.jogadores[1]
+            if not bots[time_em_risco_id].decidir_mao_de_onze_com_mc(jogo, jogador_em_risco):
+                jogo._dar_pontos(2 if time_em_risco_id == 1 else 1, 1)
+                jogo.estado_jogo = "MAO_FINALIZADA"
+            continue
+        elif estado_atual == "EM_ANDAMENTO":
+            jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
+            if not jogador_da_vez.mao:
+                jogo._checar_vencedor_da_mao()
+                continue
+            time_id = jogador_da_vez.time_id
+            carta_jogada, _ = coletor.decidir(nomes[time_id], bots[time_id], jogo, jogador_da_vez)
+            if carta_jogada:
+                jogo.jogar_carta(jogador_da_vez.id, carta_jogada)
+
+    vencedor, perdedor = (nome1, nome2) if jogo.pontos_time1 >= 12 else (nome2, nome1)
+    coletor.registrar_partida(time1=nome1, time2=nome2, vencedor=vencedor, pontos_time1=jogo.pontos_time1,
+                              pontos_time2=jogo.pontos_time2, total_maos=jogo.mao_atual)
+    coletor.fechar()
+    rodada, par, indice = chave
+    return {'rodada': rodada, 'par': par, 'jogo': indice, 'time1': nome1, 'time2': nome2,
+            'vencedor': vencedor, 'perdedor': perdedor, 'pontos_time1': jogo.pontos_time1,
+            'pontos_time2': jogo.pontos_time2, 'total_maos': jogo.mao_atual,
+            'duracao': time.perf_counter() - inicio}, coletor
+
+
+def pares_todos_contra_todos(nomes):
+    return [list(par) for par in itertools.combinations(nomes, 2)]
+
+
+def pares_suico(nomes, pontos, ratings, confrontos, folgas=()):
+    """
+    Ordena por (vitórias, rating) e junta cada um com o melhor colocado abaixo que ainda não
+    enfrentou (ou o seguinte, se já enfrentou todos). Com número ímpar, o último colocado
+    sem folga anterior fica de fora. Retorna (pares, folga).
+    """
+    ordem = sorted(nomes, key=lambda nome: (-pontos[nome], -ratings[nome], nomes.index(nome)))
+    folga = None
+    if len(ordem) % 2:
+        folga = next((nome for nome in reversed(ordem) if nome not in folgas), ordem[-1])
+        ordem.remove(folga)
+    pares = []
+    while ordem:
+        a = ordem.pop(0)
+        j = next((k for k, b in enumerate(ordem) if frozenset((a, b)) not in confrontos), 0)
+        pares.append([a, ordem.pop(j)])
+    return pares, folga
+
+
+class Torneio:
+    """ Configuração, pareamentos e partidas jogadas; é o que vai para o arquivo de estado. """
+
+    def __init__(self, competidores, sistema='todos', semente=None, jogos_por_par=2):
+        if sistema not in SISTEMAS:
+            raise ValueError(f"Sistema desconhecido: {sistema} (use um de {SISTEMAS})")
+        self.competidores = list(competidores)
+        self.lidos = [ler_competidor(texto) for texto in self.competidores]
+        self.nomes = [nome for nome, _, _ in self.lidos]
+        if len(set(self.nomes)) != len(self.nomes) or len(self.nomes) < 2:
+            raise ValueError("O torneio precisa de pelo menos 2 competidores, com nomes diferentes.")
+        self.sistema = sistema
+        self.semente = ServicoAleatorio(semente).semente
+        self.jogos_por_par = jogos_por_par
+        self.pares = []     # pares de cada rodada já pareada
+        self.folgas = []    # quem ficou de fora em cada rodada (suíço com número ímpar)
+        self.partidas = []  # resultados de jogar_partida, na ordem em que terminaram
+
+    def texto(self, nome):
+        return self.competidores[self.nomes.index(nome)]
+
+    def classificacao(self):
+        return ajustar_bradley_terry(self.nomes, matriz_vitorias(
+            self.nomes, [(p['vencedor'], p['perdedor']) for p in self.partidas]))
+
+    def pontos(self):
+        pontos = dict.fromkeys(self.nomes, 0)
+        for partida in self.partidas:
+            pontos[partida['vencedor']] += 1
+        return pontos
+
+    def parear(self, rodada):
+        """ Pareia a rodada (a próxima ainda não pareada). """
+        assert rodada == len(self.pares) + 1
+        folga = None
+        if self.sistema == 'todos':
+            pares = pares_todos_contra_todos(self.nomes)
+        else:
+            classificacao = self.classificacao()
+            ratings = dict(zip(self.nomes, classificacao.ratings))
+            confrontos = {frozenset(par) for pares_rodada in self.pares for par in pares_rodada}
+            pares, folga = pares_suico(self.nomes, self.pontos(), ratings, confrontos, self.folgas)
+        self.pares.append(pares)
+        self.folgas.append(folga)
+
+    def pendentes(self, rodada):
+        """ Partidas da rodada ainda não jogadas: (texto do time 1, texto do time 2, chave). """
+        feitas = {(p['rodada'], p['par'], p['jogo']) for p in self.partidas}
+        tarefas = []
+        for par, (a, b) in enumerate(self.pares[rodada - 1]):
+            for jogo in range(self.jogos_por_par):
+                if (rodada, par, jogo) not in feitas:
+                    # Troca de lado a cada jogo e a cada rodada (com 1 jogo por par, só a rodada troca)
+                    time1, time2 = (a, b) if (jogo + rodada) % 2 == 0 else (b, a)
+                    tarefas.append((self.texto(time1), self.texto(time2), (rodada, par, jogo)))
+        return tarefas
+
+    def como_dict(self):
+        return {'competidores': self.competidores, 'sistema': self.sistema, 'semente': self.semente,
+                'jogos_por_par': self.jogos_por_par, 'pares': self.pares, 'folgas': self.folgas,
+                'partidas': self.partidas}
+
+    @classmethod
+    def de_dict(cls, dados):
+        torneio = cls(dados['competidores'], dados['sistema'], dados['semente'], dados['jogos_por_par'])
+        torneio.pares = dados['pares']
+        torneio.folgas = dados['folgas']
+        torneio.partidas = dados['partidas']
+        return torneio
+
+    def salvar(self, caminho):
+        """ Grava o estado (arquivo temporário + os.replace: uma queda nunca deixa o arquivo pela metade). """
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.como_dict(), f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, encoding='utf-8') as f:
+            return cls.de_dict(json.load(f))
+
+
+def executar(torneio, rodadas, caminho=None, processos=1, coletor=None, eventos=None, ate_separar=False,
+             alfa=0.05, mostrar=print):
+    """
+    Joga as rodadas que faltam (até `rodadas`), gravando o estado em `caminho` a cada partida.
+    Retorna a Classificacao final.
+    """
+    coletor = coletor if coletor is not None else ColetorMetricas()
+
+    def registrar(resultado, coletor_partida):
+        torneio.partidas.append(resultado)
+        coletor.mesclar(coletor_partida)
+        if caminho:
+            torneio.salvar(caminho)
+
+    pool = None
+    if processos > 1:
+        # spawn: processos novos, sem herdar CUDA nem o estado do joblib
+        pool = ProcessPoolExecutor(processos, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        for rodada in range(1, rodadas + 1):
+            if rodada > len(torneio.pares):
+                torneio.parear(rodada)
+                if caminho:
+                    torneio.salvar(caminho)
+            tarefas = torneio.pendentes(rodada)
+            if not tarefas:
+                continue
+            inicio = time.perf_counter()
+            if pool is not None:
+                futuros = [pool.submit(jogar_partida, *tarefa[:2], torneio.semente, tarefa[2], eventos)
+                           for tarefa in tarefas]
+                registrados = set()
+                try:
+                    for futuro in as_completed(futuros):
+                        registrados.add(futuro)
+                        registrar(*futuro.result())
+                except BaseException:
+                    # Numa falha (ou Ctrl+C), as partidas ainda na fila são canceladas; as que já
+                    # estavam rodando terminam e são gravadas antes de o erro subir
+                    pool.shutdown(cancel_futures=True)
+                    for futuro in futuros:
+                        if futuro not in registrados and not futuro.cancelled() and futuro.exception() is None:
+                            registrar(*futuro.result())
+                    raise
+            else:
+                for tarefa in tarefas:
+                    registrar(*jogar_partida(*tarefa[:2], torneio.semente, tarefa[2], eventos))
+            classificacao = torneio.classificacao()
+            separados = classificacao.separados(alfa)
+            mostrar(f"Rodada {rodada}: {len(tarefas)} partidas em {time.perf_counter() - inicio:.1f}s | "
+                    f"{len(torneio.partidas)} no total | {sum(separados)}/{len(separados)} vizinhos separados")
+            if ate_separar and all(separados):
+                mostrar("Todos os vizinhos da classificação estão separados.")
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return torneio.classificacao()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneio sem interface (todos contra todos ou suíço), em paralelo.")
+    parser.add_argument('--competidores', nargs='+',
+                        help="Competidores 'nome=tipo:parametro=valor,...' (padrão: ELENCO_PADRAO, 16 bots).")
+    parser.add_argument('--sistema', choices=SISTEMAS, help="Pareamento (padrão: todos).")
+    parser.add_argument('--rodadas', type=int, default=1,
+                        help="Rodadas ao todo (um turno completo em 'todos'; a retomada pode aumentar).")
+    parser.add_argument('--jogos-por-par', type=int, help="Partidas de cada par por rodada (padrão: 2).")
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1, help="Partidas simultâneas.")
+    parser.add_argument('--semente', type=int, help="Semente do torneio (padrão: sorteada e gravada no estado).")
+    parser.add_argument('--estado', default='torneio_estado.json',
+                        help="Arquivo de estado; se já existir, o torneio é retomado.")
+    parser.add_argument('--ate-separar', action='store_true',
+                        help="Para quando todo vizinho da classificação estiver separado do seguinte.")
+    parser.add_argument('--alfa', type=float, default=0.05, help="Nível de significância da separação.")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    if args.processos < 1 or args.rodadas < 1:
+        parser.error("--processos e --rodadas precisam ser pelo menos 1.")
+
+    if os.path.exists(args.estado):
+        torneio = Torneio.carregar(args.estado)
+        # Na retomada, o que foi dado precisa bater com o torneio gravado
+        for nome, dado, gravado in (('--competidores', args.competidores, torneio.competidores),
+                                    ('--sistema', args.sistema, torneio.sistema),
+                                    ('--jogos-por-par', args.jogos_por_par, torneio.jogos_por_par),
+                                    ('--semente', args.semente, torneio.semente)):
+            if dado is not None and dado != gravado:
+                parser.error(f"{args.estado} é de um torneio com outro {nome}; use outro --estado.")
+        print(f"Retomando {args.estado}: {len(torneio.partidas)} partidas já jogadas.")
+    else:
+        try:
+            torneio = Torneio(args.competidores or ELENCO_PADRAO, args.sistema or 'todos', args.semente,
+                              args.jogos_por_par or 2)
+        except ValueError as erro:
+            parser.error(str(erro))
+    print(f"{len(torneio.nomes)} competidores | sistema {torneio.sistema} | {args.rodadas} rodada(s) | "
+          f"{args.processos} processo(s) | semente {torneio.semente}")
+
+    coletor = ColetorMetricas(args.eventos, args.prometheus, args.intervalo_snapshot, execucao='torneio')
+    coletor.evento('semente', semente=torneio.semente)
+    try:
+        classificacao = executar(torneio, args.rodadas, args.estado, args.processos, coletor, args.eventos,
+                                 args.ate_separar, args.alfa)
+    finally:
+        coletor.fechar()
+
+    tipos = {nome: tipo for nome, tipo, _ in torneio.lidos}
+    print(f"\n--- CLASSIFICAÇÃO (Bradley–Terry, escala Elo; '>' = à frente do seguinte com p < {args.alfa}) ---")
+    print(classificacao.tabela(args.alfa, tipos))
+    print("\n--- MÉTRICAS DAS DECISÕES ---")
+    print(coletor.resumo())
+
+if __name__ == '__main__':
+    main()
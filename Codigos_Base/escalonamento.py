@@ -0,0 +1,158 @@
+import io
+import os
+import csv
+import time
+import random
+import argparse
+import contextlib
+import numpy as np
+from agente_mcts_multi import MCTSAgente, run_single_mcts_search
+from politica_rollout import estados_de_teste
+
+# ======================================================================
+# Escalonamento do agente multi-core (agente_mcts_multi)
+# ----------------------------------------------------------------------
+# Varre o número de workers (n_jobs) de 1 até todos os núcleos em dois
+# modos:
+#   - forte: total de simulações fixo por decisão; o ideal é o tempo cair
+#     na proporção dos workers (speedup = T1/Tn, eficiência = speedup/n);
+#   - fraco: simulações fixas por worker (total = base * n); o ideal é o
+#     tempo ficar constante (eficiência = T1/Tn, speedup = vazão n / vazão 1).
+# Em cada ponto mede o tempo de parede por decisão, simulações por segundo
+# e a concordância da carta escolhida com uma busca de referência de
+# orçamento alto (a mesma para todos os pontos, com semente fixa por
+# estado). O pool de processos é aquecido antes de cada ponto.
+#
+#   python escalonamento.py --simulacoes 4000 --referencia 50000 --saida escalonamento.csv
+#
+# Grava o CSV e, sem --sem-grafico, escalonamento_speedup.png e
+# escalonamento_eficiencia.png. Eficiência caindo com poucos workers
+# aponta overhead do joblib (serialização do estado, subida dos pacotes);
+# caindo só perto de todos os núcleos, banda de memória ou núcleos
+# lógicos dividindo a mesma unidade.
+# ======================================================================
+
+MODOS = ('forte', 'fraco')
+CAMPOS = ('modo', 'workers', 'simulacoes', 'tempo_s', 'sims_por_s', 'speedup', 'eficiencia', 'concordancia')
+
+
+def contagens_de_workers(maximo=None):
+    """ 1, 2, 4, ... até `maximo` (todos os núcleos por padrão), sempre incluindo o próprio máximo. """
+    maximo = maximo or os.cpu_count() or 1
+    contagens = {maximo}
+    n = 1
+    while n < maximo:
+        contagens.add(n)
+        n *= 2
+    return sorted(contagens)
+
+
+def jogadas_de_referencia(estados, n_simulacoes):
+    """ Carta escolhida por uma busca longa (um processo) em cada estado, com semente = índice. """
+    referencias = []
+    for i, (jogo, _) in enumerate(estados):
+        random.seed(i)
+        jogada, _ = run_single_mcts_search(jogo, jogo.jogadores[jogo.jogador_atual_idx], n_simulacoes)
+        referencias.append(jogada)
+    return referencias
+
+
+def medir_ponto(modo, n_workers, sims_base, estados, referencias):
+    """ Uma linha do CSV (sem speedup e eficiência, que dependem do ponto com 1 worker). """
+    n_simulacoes = sims_base if modo == 'forte' else sims_base * n_workers
+    agente = MCTSAgente(n_simulacoes=n_simulacoes, n_jobs=n_workers)
+    agente.aquecer()
+    tempos, acertos = [], 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, ((jogo, _), referencia) in enumerate(zip(estados, referencias)):
+            random.seed(i)
+            inicio = time.perf_counter()
+            jogada, _ = agente.decidir_melhor_jogada(jogo, jogo.jogadores[jogo.jogador_atual_idx])
+            tempos.append(time.perf_counter() - inicio)
+            acertos += jogada == referencia
+    return {'modo': modo, 'workers': n_workers, 'simulacoes': n_simulacoes,
+            'tempo_s': float(np.median(tempos)), 'sims_por_s': n_simulacoes * len(tempos) / sum(tempos),
+            'concordancia': acertos / len(estados)}
+
+
+def calcular_metricas(linhas):
+    """ Preenche speedup e eficiência de cada linha em relação ao ponto de 1 worker do mesmo modo. """
+    for modo in MODOS:
+        do_modo = [l for l in linhas if l['modo'] == modo]
+        base = next((l for l in do_modo if l['workers'] == 1), None)
+        for l in do_modo:
+            if base is None:
+                l['speedup'] = l['eficiencia'] = float('nan')
+            elif modo == 'forte':
+                l['speedup'] = base['tempo_s'] / l['tempo_s']
+                l['eficiencia'] = l['speedup'] / l['workers']
+            else:
+                l['speedup'] = l['sims_por_s'] / base['sims_por_s']
+                l['eficiencia'] = base['tempo_s'] / l['tempo_s']
+    return linhas
+
+
+def varrer(workers, sims_base, n_estados=20, sims_referencia=50000, modos=MODOS, semente=0):
+    estados = estados_de_teste(n_estados, semente)
+    print(f"Referência: {sims_referencia} simulações em {n_estados} estados...")
+    referencias = jogadas_de_referencia(estados, sims_referencia)
+    linhas = []
+    for modo in modos:
+        for n in workers:
+            linha = medir_ponto(modo, n, sims_base, estados, referencias)
+            linhas.append(linha)
+            print(f"  {modo:<5} workers={n:<3} sims={linha['simulacoes']:<7} {linha['tempo_s'] * 1000:9.1f} ms "
+                  f"| {linha['sims_por_s']:10.0f} sims/s | concordância {linha['concordancia']:.0%}")
+    return calcular_metricas(linhas)
+
+
+def salvar_csv(linhas, caminho):
+    with open(caminho, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows({campo: l[campo] for campo in CAMPOS} for l in linhas)
+
+
+def salvar_graficos(linhas, prefixo):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    for metrica, ideal in (('speedup', None), ('eficiencia', 1.0)):
+        fig, ax = plt.subplots(figsize=(7, 5))
+        for modo in MODOS:
+            pontos = [l for l in linhas if l['modo'] == modo]
+            if pontos:
+                ax.plot([l['workers'] for l in pontos], [l[metrica] for l in pontos], marker='o', label=modo)
+        workers = sorted({l['workers'] for l in linhas})
+        ax.plot(workers, workers if ideal is None else [ideal] * len(workers), 'k--', linewidth=1, label='ideal')
+        ax.set_xlabel('Workers (n_jobs)')
+        ax.set_ylabel(metrica.capitalize())
+        ax.set_title(f'{metrica.capitalize()} do agente multi-core')
+        ax.legend()
+        fig.tight_layout()
+        fig.savefig(f'{prefixo}_{metrica}.png')
+        plt.close(fig)
+        print(f"Gráfico salvo em {prefixo}_{metrica}.png")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalonamento forte e fraco do agente multi-core.")
+    parser.add_argument('--workers', type=int, nargs='+', default=None, help="Contagens de workers (padrão: 1, 2, 4, ..., todos).")
+    parser.add_argument('--simulacoes', type=int, default=4000, help="Total (forte) ou por worker (fraco).")
+    parser.add_argument('--referencia', type=int, default=50000, help="Simulações da busca de referência.")
+    parser.add_argument('--estados', type=int, default=20)
+    parser.add_argument('--modos', nargs='+', choices=MODOS, default=list(MODOS))
+    parser.add_argument('--saida', default='escalonamento.csv')
+    parser.add_argument('--sem-grafico', action='store_true')
+    args = parser.parse_args()
+
+    linhas = varrer(args.workers or contagens_de_workers(), args.simulacoes, args.estados, args.referencia, args.modos)
+    salvar_csv(linhas, args.saida)
+    print(f"Resultados em {args.saida}")
+    for l in linhas:
+        print(f"  {l['modo']:<5} workers={l['workers']:<3} speedup {l['speedup']:5.2f} | eficiência {l['eficiencia']:5.1%}")
+    if not args.sem_grafico:
+        salvar_graficos(linhas, os.path.splitext(args.saida)[0])
+
+if __name__ == '__main__':
+    main()
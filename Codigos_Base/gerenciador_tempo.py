@@ -0,0 +1,128 @@
+import math
+
+# Peso relativo de cada rodada (turno) dentro da mão. A terceira rodada é sempre
+# uma jogada forçada (só resta uma carta), então não recebe tempo.
+PESOS_RODADA = {1: 1.0, 2: 0.6, 3: 0.0}
+
+# Peso relativo pelo número de jogadas legais (cartas na mão).
+PESOS_JOGADAS = {1: 0.0, 2: 0.7, 3: 1.0}
+
+
+class GerenciadorDeTempo:
+    """
+    Distribui um orçamento de tempo (por partida ou por mão) em alocações por jogada.
+
+    A alocação leva em conta o número de jogadas legais, a rodada atual, a importância
+    da mão (Mão de Onze, ponto de partida) e a incerteza das estatísticas da raiz.
+    Jogadas forçadas recebem tempo zero.
+    """
+    def __init__(self, orcamento_partida=None, orcamento_mao=None, tempo_minimo=0.01,
+                 fator_mao_de_onze=1.5, fator_match_point=1.3, fator_extensao_max=2.0):
+        if orcamento_partida is None and orcamento_mao is None:
+            raise ValueError("Informe orcamento_partida ou orcamento_mao.")
+        self.orcamento_partida = orcamento_partida
+        self.orcamento_mao = orcamento_mao
+        self.tempo_minimo = tempo_minimo
+        self.fator_mao_de_onze = fator_mao_de_onze
+        self.fator_match_point = fator_match_point
+        self.fator_extensao_max = fator_extensao_max
+
+        self._id_jogo = None
+        self._mao_atual = None
+        self.restante_partida = orcamento_partida
+        self.restante_mao = 0.0
+        self.ultima_alocacao = 0.0
+
+    # --- Controle de partida/mão ---
+    def iniciar_partida(self):
+        self._id_jogo = None
+        self._mao_atual = None
+        self.restante_partida = self.orcamento_partida
+
+    def _sincronizar(self, jogo):
+        """ Detecta automaticamente o início de uma nova partida ou de uma nova mão. """
+        if self._id_jogo != id(jogo) or (self._mao_atual is not None and jogo.mao_atual < self._mao_atual):
+            self.iniciar_partida()
+            self._id_jogo = id(jogo)
+        if self._mao_atual != jogo.mao_atual:
+            self._mao_atual = jogo.mao_atual
+            self.restante_mao = self._orcamento_da_nova_mao(jogo)
+
+    def _maos_restantes_estimadas(self, jogo):
+        # Heurística: cada mão vale ~1 ponto e a partida termina em 12.
+        faltam_t1 = max(0, 12 - jogo.pontos_time1)
+        faltam_t2 = max(0, 12 - jogo.pontos_time2)
+        return max(1.0, 1 + (faltam_t1 + faltam_t2) / 2)
+
+    def fator_importancia(self, jogo):
+        """ Multiplicador de tempo para mãos decisivas. """
+        fator = 1.0
+        if jogo.valor_mao >= 3 or jogo.pontos_time1 == 11 or jogo.pontos_time2 == 11:
+            fator *= self.fator_mao_de_onze
+        elif max(jogo.pontos_time1, jogo.pontos_time2) + jogo.valor_mao >= 12:
+            fator *= self.fator_match_point
+        return fator
+
+    def _orcamento_da_nova_mao(self, jogo):
+        if self.orcamento_partida is not None:
+            base = self.restante_partida / self._maos_restantes_estimadas(jogo)
+            if self.orcamento_mao is not None:
+                base = min(base, self.orcamento_mao)
+        else:
+            base = self.orcamento_mao
+        orcamento = base * self.fator_importancia(jogo)
+        if self.restante_partida is not None:
+            orcamento = min(orcamento, self.restante_partida)
+        return max(0.0, orcamento)
+
+    # --- Alocação por jogada ---
+    def alocar(self, jogo, jogador_bot):
+        """ Retorna quantos segundos o agente pode gastar na jogada atual (0 = jogada forçada). """
+        self._sincronizar(jogo)
+        n_jogadas = len(jogador_bot.mao)
+        peso_atual = PESOS_RODADA.get(jogo.rodada_atual, 0.0) * PESOS_JOGADAS.get(n_jogadas, 1.0)
+        if peso_atual <= 0.0:
+            self.ultima_alocacao = 0.0
+            return 0.0
+
+        peso_restante = sum(PESOS_RODADA[r] for r in PESOS_RODADA if r >= jogo.rodada_atual)
+        alocacao = self.restante_mao * peso_atual / peso_restante if peso_restante > 0 else self.restante_mao
+        alocacao = max(self.tempo_minimo, alocacao)
+        if self.restante_partida is not None:
+            alocacao = min(alocacao, max(self.tempo_minimo, self.restante_partida))
+        self.ultima_alocacao = alocacao
+        return alocacao
+
+    def extensao(self, estatisticas_raiz):
+        """
+        Tempo extra (em segundos) quando a raiz ainda está indecisa.
+        estatisticas_raiz: lista de (visitas, vitorias) dos filhos da raiz.
+        """
+        if self.ultima_alocacao <= 0.0 or self.fator_extensao_max <= 1.0:
+            return 0.0
+        incerteza = incerteza_raiz(estatisticas_raiz)
+        extra = self.ultima_alocacao * (self.fator_extensao_max - 1.0) * incerteza
+        if self.restante_partida is not None:
+            extra = min(extra, max(0.0, self.restante_partida - self.ultima_alocacao))
+        return max(0.0, extra)
+
+    def registrar_gasto(self, segundos):
+        self.restante_mao = max(0.0, self.restante_mao - segundos)
+        if self.restante_partida is not None:
+            self.restante_partida = max(0.0, self.restante_partida - segundos)
+
+
+def incerteza_raiz(estatisticas_raiz):
+    """
+    Mede, entre 0 e 1, o quanto as duas melhores jogadas da raiz ainda se confundem.
+    Compara a diferença das taxas de vitória com o erro padrão dessa diferença.
+    """
+    validas = sorted((s for s in estatisticas_raiz if s[0] > 0), key=lambda s: s[0], reverse=True)
+    if len(validas) < 2:
+        return 0.0 if validas else 1.0
+    (n1, w1), (n2, w2) = validas[0], validas[1]
+    p1, p2 = w1 / n1, w2 / n2
+    erro_padrao = math.sqrt(max(p1 * (1 - p1), 1e-4) / n1 + max(p2 * (1 - p2), 1e-4) / n2)
+    z = abs(p1 - p2) / erro_padrao
+    # z >= 2 (~95%) -> decisão clara; z = 0 -> incerteza máxima
+    return max(0.0, 1.0 - z / 2.0)
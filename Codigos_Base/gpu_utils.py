@@ -20,59 +20,28 @@ def criar_mapeamento_cartas():
 CARTA_PARA_INT, INT_PARA_CARTA = criar_mapeamento_cartas()
 
 
-def achatar_estado_para_gpu(jogo_atual, bot_id, n_simulacoes):
+def gpu_disponivel():
     """
-    Cria N cenários hipotéticos (determinizações) e os converte em arrays NumPy.
+    True se há uma GPU CUDA (ou o simulador, com NUMBA_ENABLE_CUDASIM=1). O numba.cuda só é
+    importado aqui dentro, para os caminhos só de CPU não pagarem a importação.
     """
-    # 1. Prepara os arrays NumPy vazios que serão preenchidos
-    maos_array = np.zeros((n_simulacoes, 4, 3), dtype=np.int32)
-    viras_array = np.zeros(n_simulacoes, dtype=np.int32)
-    jogadores_iniciais_array = np.zeros(n_simulacoes, dtype=np.int32)
-    
-    # Identifica as cartas conhecidas no estado ATUAL do jogo
-    cartas_conhecidas = set()
-    bot_mao_original = []
-    
-    for p in jogo_atual.jogadores:
-        if p.id == bot_id:
-            for c in p.mao:
-                cartas_conhecidas.add(c)
-                bot_mao_original.append(c) # Guarda a mão original do bot
-            break
+    try:
+        from numba import cuda
+    except ImportError:
+        return False
+    return cuda.is_available()
 
-    for _, carta_mesa in jogo_atual.cartas_na_mesa:
-        cartas_conhecidas.add(carta_mesa)
-    
-    if jogo_atual.vira:
-        cartas_conhecidas.add(jogo_atual.vira)
 
-    baralho_completo = [c for c in CARTA_PARA_INT.keys()]
-
-    # 2. Loop para criar N cenários diferentes
-    for i in range(n_simulacoes):
-        # Para cada simulação, cria um novo baralho de cartas desconhecidas
-        cartas_desconhecidas = [c for c in baralho_completo if c not in cartas_conhecidas]
-        random.shuffle(cartas_desconhecidas)
-        
-        # Preenche as mãos dos oponentes
-        maos_hipoteticas = [[] for _ in range(4)]
-        maos_hipoteticas[bot_id - 1] = bot_mao_original[:] # Mão do bot é fixa
-        
-        for j, p in enumerate(jogo_atual.jogadores):
-            if p.id != bot_id:
-                # O número de cartas a distribuir depende de quantas ele já jogou
-                num_cartas_a_dar = len(bot_mao_original) - len(p.mao)
-                maos_hipoteticas[j] = p.mao[:] + [cartas_desconhecidas.pop() for _ in range(num_cartas_a_dar)]
-
-        # Converte o cenário hipotético para inteiros e preenche os arrays
-        for j in range(4): # Para cada jogador
-            for k in range(3): # Para cada carta
-                if k < len(maos_hipoteticas[j]):
-                    maos_array[i, j, k] = CARTA_PARA_INT[maos_hipoteticas[j][k]]
-                else: # Se o jogador tiver menos de 3 cartas (já jogou algumas)
-                    maos_array[i, j, k] = -1 # Usa -1 para indicar ausência de carta
-
-        viras_array[i] = CARTA_PARA_INT[jogo_atual.vira]
-        jogadores_iniciais_array[i] = jogo_atual.jogador_atual_idx
-
-    return maos_array, viras_array, jogadores_iniciais_array
\ No newline at end of file
+def achatar_estado_para_gpu(jogo_atual, bot_id, n_simulacoes, crenca=None):
+    """
+    Cria N cenários hipotéticos (determinizações) e os converte em arrays NumPy:
+    (mãos (N, 4, 3), viras (N,), jogador da vez (N,)), com -1 nas posições vazias.
+    A mão do bot fica fixa; as dos outros jogadores, com o número de cartas que cada um
+    ainda tem, saem das cartas que o bot não viu (nem na mão, nem na vira, nem já jogadas)
+    ou, com uma CrencaMaos (crenca.py) já sincronizada, das partículas dela.
+    Os agentes de GPU usam o lote completo de simulador_lote.determinizar_lote, que
+    também leva a mesa e o resultado das rodadas.
+    """
+    from simulador_lote import determinizar_lote
+    lote = determinizar_lote(jogo_atual, n_simulacoes, bot_id, crenca=crenca)
+    return lote['maos'].astype(np.int32), lote['vira'], lote['jogador']
@@ -0,0 +1,133 @@
+import sys
+
+# ======================================================================
+# Instrumentação da busca
+# ----------------------------------------------------------------------
+# Cada decisão dos agentes de MCTS deixa em `agente.ultima_busca`
+# um EstatisticasBusca: iterações feitas, tempo total e, com
+# instrumentar=True, contagens e tempos acumulados de cada fase
+# (seleção, expansão, determinização, rollout e retropropagação), além do
+# tamanho e da profundidade máxima da árvore.
+#
+# Sem instrumentação o laço da busca é o mesmo de antes (os tempos das
+# fases ficam zerados e a árvore não é percorrida), então pode ficar
+# ligado em produção; com instrumentação, cada fase custa duas leituras
+# do relógio.
+#
+# Nos agentes paralelos (agente_mcts_multi, time_limit_mcts) cada worker
+# mede a própria árvore e o processo principal soma as medidas (somar):
+# os tempos das fases são segundos somados dos workers, `nos` é o total
+# das árvores e a profundidade é a maior entre elas.
+#
+# O progresso vai para um callback, não para o stdout:
+#
+#   agente = MCTSAgente(n_simulacoes=20000, instrumentar=True, progresso=barra_de_progresso)
+#   agente.decidir_melhor_jogada(jogo, jogador)
+#   print(agente.ultima_busca.resumo())
+#
+# O callback recebe o próprio EstatisticasBusca (parcial durante a busca,
+# com `concluida=False`); barra_de_progresso e imprimir_resumo reproduzem
+# a barra e os resumos que os agentes imprimiam.
+# ======================================================================
+
+FASES = ('selecao', 'expansao', 'determinizacao', 'rollout', 'retropropagacao')
+
+# Quantas vezes por busca o callback de progresso é chamado (a cada 2%)
+CHAMADAS_DE_PROGRESSO = 50
+
+
+class EstatisticasBusca:
+    """ Contadores e tempos de uma decisão; ver o cabeçalho do módulo. """
+
+    def __init__(self, agente='', total=None, instrumentada=False):
+        self.agente = agente
+        self.total = total              # iterações planejadas (None em busca por tempo)
+        self.iteracoes = 0
+        self.instrumentada = instrumentada
+        self.concluida = False
+        self.tempo_total = 0.0
+        self.tempos = dict.fromkeys(FASES, 0.0)
+        self.contagens = dict.fromkeys(FASES, 0)
+        self.nos = None                 # nós da árvore (só com instrumentação)
+        self.profundidade_maxima = None
+        self.workers = 1
+        self.tempo_workers = None       # segundos somados que os workers passaram buscando (se medido)
+
+    @property
+    def iteracoes_por_s(self):
+        return self.iteracoes / self.tempo_total if self.tempo_total > 0 else 0.0
+
+    @property
+    def utilizacao(self):
+        """ Fração do tempo dos workers gasta na busca (despacho, cópias e coleta ficam de fora); None sem medida. """
+        if self.tempo_workers is None or self.tempo_total <= 0:
+            return None
+        return self.tempo_workers / (self.workers * self.tempo_total)
+
+    def medir_arvore(self, raiz):
+        self.nos, self.profundidade_maxima = tamanho_da_arvore(raiz)
+
+    def somar(self, outra):
+        """ Acrescenta as fases e a árvore de outra busca (a de um worker) a esta. """
+        for fase in FASES:
+            self.tempos[fase] += outra.tempos[fase]
+            self.contagens[fase] += outra.contagens[fase]
+        if outra.nos is not None:
+            self.nos = (self.nos or 0) + outra.nos
+            self.profundidade_maxima = max(self.profundidade_maxima or 0, outra.profundidade_maxima)
+
+    def como_dict(self):
+        return {'agente': self.agente, 'iteracoes': self.iteracoes, 'total': self.total, 'workers': self.workers,
+                'tempo_total': self.tempo_total, 'iteracoes_por_s': self.iteracoes_por_s, 'utilizacao': self.utilizacao,
+                'tempos': dict(self.tempos), 'contagens': dict(self.contagens),
+                'nos': self.nos, 'profundidade_maxima': self.profundidade_maxima}
+
+    def resumo(self):
+        texto = f"{self.agente}: {self.iteracoes} iterações em {self.tempo_total:.3f}s ({self.iteracoes_por_s:,.0f}/s)"
+        if self.workers > 1:
+            texto += f", {self.workers} núcleos"
+            if self.utilizacao is not None:
+                texto += f" ({100 * self.utilizacao:.0f}% ocupados)"
+        if self.instrumentada:
+            soma = sum(self.tempos.values()) or 1.0
+            fases = ', '.join(f"{fase} {100 * self.tempos[fase] / soma:.0f}%" for fase in FASES if self.contagens[fase])
+            texto += f" | {fases}"
+        if self.nos is not None:
+            texto += f" | árvore: {self.nos} nós, profundidade {self.profundidade_maxima}"
+        return texto
+
+
+def tamanho_da_arvore(raiz):
+    """ (número de nós, profundidade máxima) de uma árvore de MCTSNode. """
+    nos, profundidade_maxima = 0, 0
+    pilha = [(raiz, 0)]
+    while pilha:
+        no, profundidade = pilha.pop()
+        nos += 1
+        if profundidade > profundidade_maxima:
+            profundidade_maxima = profundidade
+        pilha.extend((filho, profundidade + 1) for filho in no.filhos)
+    return nos, profundidade_maxima
+
+
+def intervalo_de_progresso(total):
+    """ Iterações entre duas chamadas do callback; nunca zero, mesmo com menos de 50 iterações. """
+    return max(1, total // CHAMADAS_DE_PROGRESSO)
+
+
+def barra_de_progresso(estatisticas):
+    """ Callback de progresso com a barra que o agente_mcts imprimia. """
+    if estatisticas.total:
+        percentual = estatisticas.iteracoes / estatisticas.total
+        blocos_cheios = int(30 * percentual)
+        barra = "█" * blocos_cheios + "░" * (30 - blocos_cheios)
+        print(f"\rAnalisando... [{barra}] {percentual:.1%}", end="", flush=True)
+    if estatisticas.concluida:
+        print()
+
+
+def imprimir_resumo(estatisticas, arquivo=None):
+    """ Callback que imprime uma linha por decisão, no fim da busca. """
+    if estatisticas.concluida:
+        print(f"    > {estatisticas.resumo()}", file=arquivo or sys.stdout)
+
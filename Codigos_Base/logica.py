@@ -54,6 +54,28 @@ class JogoTruco2v2:
         self.simulacao = simulacao 
         self.resetar_estado_da_mao()
 
+    def __deepcopy__(self, memo):
+        """
+        Cópia rápida para as simulações: as Cartas são imutáveis e o baralho completo
+        nunca é alterado, então são compartilhados; só o estado mutável é duplicado.
+        """
+        novo = self.__class__.__new__(self.__class__)
+        memo[id(self)] = novo
+        novo.__dict__.update(self.__dict__)
+        mapa_jogadores = {}
+        novo.jogadores = []
+        for jogador in self.jogadores:
+            copia = Jogador(jogador.id, jogador.time_id)
+            copia.mao = jogador.mao[:]
+            mapa_jogadores[id(jogador)] = copia
+            memo[id(jogador)] = copia
+            novo.jogadores.append(copia)
+        novo.cartas_na_mesa = [(mapa_jogadores[id(j)], c) for j, c in self.cartas_na_mesa]
+        novo.cartas_jogadas = self.cartas_jogadas[:]
+        novo.resultado_rodada = self.resultado_rodada[:]
+        novo.manilhas = dict(self.manilhas)
+        return novo
+
     def _gerar_placar_visual(self):
         """Cria uma string de placar visual com uma barra de progresso."""
         # Barra de Progresso
@@ -102,6 +124,7 @@ class JogoTruco2v2:
 
         # Anúncio da jogada é feito pelo agente ou pelo main loop, não aqui.
         self.cartas_na_mesa.append((jogador, carta))
+        self.cartas_jogadas.append(carta)
         jogador.mao.remove(carta)
         
         self.jogador_atual_idx = (self.jogador_atual_idx + 1) % 4
@@ -214,6 +237,7 @@ class JogoTruco2v2:
         self.vira = None
         self.manilhas = {}
         self.cartas_na_mesa = [] 
+        self.cartas_jogadas = [] # Todas as cartas já reveladas na mão (inclusive de rodadas anteriores)
         self.rodada_atual = 1
         self.resultado_rodada = [0, 0, 0] 
         self.jogador_atual_idx = 0
@@ -2,12 +2,14 @@ import random
 import time
 import copy
 from logica import JogoTruco2v2
+from calibracao import fase_do_jogo
 from agente_mcts import MCTSAgente
+from instrumentacao import barra_de_progresso
 
 def main():
     # Voltamos ao modo de benchmark silencioso
     start_time = time.time()
-    bot_team1 = MCTSAgente(n_simulacoes=20000) 
+    bot_team1 = MCTSAgente(n_simulacoes=20000, progresso=barra_de_progresso)
     jogo = JogoTruco2v2(simulacao=True)
 
     JOGADOR_BOT_T1_ID = 1
@@ -21,7 +23,7 @@ def main():
         if jogo.estado_jogo == "MAO_FINALIZADA":
             if ultima_previsao_t1 is not None:
                 resultado_real = 1 if jogo.vencedor_mao == TIME_BOT_T1_ID else 0
-                bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real)
+                bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real, fase_t1)
                 ultima_previsao_t1 = None
 
         estado_atual = jogo.estado_jogo
@@ -65,6 +67,7 @@ def main():
             carta_jogada = None
             if jogador_da_vez.id == JOGADOR_BOT_T1_ID:
                 carta_jogada, ultima_previsao_t1 = bot_team1.decidir_melhor_jogada(jogo, jogador_da_vez)
+                fase_t1 = fase_do_jogo(jogo)
             else:
                 carta_jogada = random.choice(jogador_da_vez.mao)
             
@@ -74,7 +77,7 @@ def main():
             if jogo.estado_jogo == "JOGO_FINALIZADO":
                 if ultima_previsao_t1 is not None:
                     resultado_real = 1 if jogo.vencedor_mao == TIME_BOT_T1_ID else 0
-                    bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real)
+                    bot_team1.registrar_resultado_da_mao(ultima_previsao_t1, resultado_real, fase_t1)
                 break
     
     end_time = time.time()
@@ -88,6 +91,8 @@ def main():
     print(f"Tempo de Execução : {tempo_execucao:.4f} segundos")
     print(f"Placar Final      : {placar_final}")
     print(f"Precisão Bot T1 (MSE) : {precisao_t1_mse:.4f} (menor = melhor)")
+    print("Calibração Bot T1 por fase:")
+    print(bot_team1.calibracao.resumo())
     print("="*30)
 
 if __name__ == '__main__':
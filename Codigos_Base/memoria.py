@@ -0,0 +1,115 @@
+import os
+import random
+import argparse
+import tracemalloc
+from joblib import Parallel, delayed
+from agente_mcts_multi import MCTSNode, MCTSAgente, expandir_arvore
+from aquecimento import jogo_de_aquecimento
+
+# ======================================================================
+# Memória da árvore de busca
+# ----------------------------------------------------------------------
+# Cada MCTSNode guarda uma cópia do JogoTruco2v2, e cada worker do joblib
+# monta a sua árvore. Este script mede, para o início de uma mão (o
+# estado com a maior árvore):
+#   - bytes por nó e tamanho da árvore (tracemalloc, só o heap do Python);
+#   - pico do tracemalloc durante a busca, que inclui as cópias dos
+#     rollouts;
+#   - RSS atual e pico de RSS de cada worker (psutil, se instalado, ou o
+#     módulo resource), que inclui o interpretador e as bibliotecas.
+# O pico de RSS é o do processo inteiro: com o pool do joblib reaproveitado,
+# é o maior já visto naquele worker.
+#
+# Com --max-nos a mesma busca roda com a árvore limitada (agente_mcts_multi:
+# max_nos / limite_memoria_mb), e a tabela mostra as podas e se a carta
+# escolhida continua a mesma da busca sem limite.
+#
+#   python memoria.py --simulacoes 2000 20000 50000 --max-nos 300 --workers 2
+# ======================================================================
+
+
+def rss_mb():
+    """ (RSS atual, pico de RSS) do processo em MB; None no que não der para medir aqui. """
+    atual = pico = None
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        atual = info.rss / 2**20
+        if hasattr(info, 'peak_wset'):  # Windows
+            pico = info.peak_wset / 2**20
+    except ImportError:
+        try:
+            with open('/proc/self/statm') as f:
+                atual = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+        except (OSError, ValueError):
+            pass
+    try:
+        import resource
+        # ru_maxrss vem em KB no Linux
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        pass
+    return atual, pico
+
+
+def medir_arvore(n_simulacoes, max_nos=None, semente=0):
+    """ Busca a partir do início de uma mão fixa e mede a árvore resultante com o tracemalloc. """
+    jogo, jogador = jogo_de_aquecimento(semente)
+    agente = MCTSAgente(n_simulacoes=n_simulacoes, n_jobs=1)
+    random.seed(semente)
+    tracemalloc.start()
+    try:
+        raiz = MCTSNode(estado_jogo=jogo)
+        antes = tracemalloc.get_traced_memory()[0]
+        nos, podas = expandir_arvore(raiz, jogador.time_id, n_simulacoes, agente._valor_folha, max_nos)
+        depois, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    melhor = max(raiz.filhos, key=lambda f: f.visitas)
+    return {'simulacoes': n_simulacoes, 'max_nos': max_nos, 'nos': nos, 'podas': podas,
+            'bytes_por_no': (depois - antes) / nos, 'arvore_mb': (depois - antes) / 2**20,
+            'pico_busca_mb': (pico - antes) / 2**20, 'jogada': str(melhor.jogada)}
+
+
+def _medir_no_worker(n_simulacoes, max_nos, semente):
+    resultado = medir_arvore(n_simulacoes, max_nos, semente)
+    resultado['pid'] = os.getpid()
+    resultado['rss_mb'], resultado['rss_pico_mb'] = rss_mb()
+    return resultado
+
+
+def medir_workers(n_workers, n_simulacoes, max_nos=None):
+    """ Uma árvore por worker, como nos pacotes do agente multi-core; um dicionário por worker. """
+    return Parallel(n_jobs=n_workers)(
+        delayed(_medir_no_worker)(n_simulacoes, max_nos, semente) for semente in range(n_workers)
+    )
+
+
+def _mb(valor):
+    return f"{valor:8.1f}" if valor is not None else "       -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a memória da árvore do MCTS e o efeito do limite de nós.")
+    parser.add_argument('--simulacoes', type=int, nargs='+', default=[2000, 20000, 50000])
+    parser.add_argument('--max-nos', type=int, default=None, help="Compara também com a árvore limitada a estes nós.")
+    parser.add_argument('--workers', type=int, default=0, help="Mede também o RSS em N workers do joblib.")
+    args = parser.parse_args()
+
+    print(f"  {'sims':>6} {'limite':>7} {'nós':>6} {'podas':>6} {'B/nó':>7} {'árvore MB':>9} {'pico MB':>8}  carta")
+    for n in args.simulacoes:
+        livre = medir_arvore(n)
+        linhas = [livre] + ([medir_arvore(n, args.max_nos)] if args.max_nos else [])
+        for r in linhas:
+            mesma = '' if r is livre else (' (mesma)' if r['jogada'] == livre['jogada'] else ' (diferente)')
+            print(f"  {n:>6} {r['max_nos'] or '-':>7} {r['nos']:>6} {r['podas']:>6} {r['bytes_por_no']:7.0f} "
+                  f"{r['arvore_mb']:9.2f} {r['pico_busca_mb']:8.2f}  {r['jogada']}{mesma}")
+
+    if args.workers:
+        print(f"\n  RSS por worker ({args.workers} workers, {max(args.simulacoes)} simulações):")
+        for r in medir_workers(args.workers, max(args.simulacoes), args.max_nos):
+            print(f"    pid {r['pid']:>7}: RSS {_mb(r['rss_mb'])} MB | pico {_mb(r['rss_pico_mb'])} MB | "
+                  f"árvore {r['arvore_mb']:.2f} MB em {r['nos']} nós")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import platform
+from calibracao import fase_do_jogo
+
+# ======================================================================
+# Métricas estruturadas das execuções
+# ----------------------------------------------------------------------
+# Os runners (benchmark_runner.py, tournament.py, tournamento.py) passam
+# cada decisão dos bots por um ColetorMetricas, que mede:
+#   - latência da decisão (medida por fora, com as cópias e o despacho)
+#     em histograma por agente e por fase (rodada da mão ou Mão de Onze);
+#   - decisões que passaram do prazo do agente (estouros);
+#   - rollouts/iterações e rollouts por segundo de busca, e a utilização
+#     dos workers (agente.ultima_busca, instrumentacao.py);
+#   - a semente da decisão, nos agentes com ServicoAleatorio (aleatorio.py),
+#     para refazê-la com reproduzir_decisao.
+# Saídas, ambas opcionais:
+#   - eventos em JSON lines (um objeto por linha, gravado na hora, dá
+#     para acompanhar com `tail -f`): 'inicio', 'decisao', 'partida' e
+#     'fim', cada um com 'ts' (epoch) e 'evento';
+#   - um snapshot no formato de texto do Prometheus, reescrito a cada
+#     `intervalo_snapshot` segundos e no fim (troca atômica do arquivo,
+#     serve para o textfile collector do node_exporter).
+# O estado é de tamanho fixo (contagens por balde), então o coletor pode
+# ficar ligado em execuções longas. Coletores de outros processos (uma
+# partida por worker) se juntam ao principal com mesclar(). O evento 'inicio' e a métrica
+# truco_info levam a máquina, para comparar hardware.
+#
+#   python tournamento.py --eventos torneio.jsonl --prometheus torneio.prom
+#   tail -f torneio.jsonl
+# ======================================================================
+
+# Limites superiores (segundos) dos baldes do histograma de latência
+BALDES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def ambiente():
+    """ Máquina em que a execução roda (vai no evento 'inicio' e em truco_info). """
+    return {'maquina': platform.node(), 'processador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count() or 1, 'python': platform.python_version(), 'plataforma': platform.platform()}
+
+
+class HistogramaLatencia:
+    """ Contagens por balde (não cumulativas), soma e total das latências. """
+    __slots__ = ('contagens', 'soma', 'n')
+
+    def __init__(self):
+        self.contagens = [0] * (len(BALDES_LATENCIA) + 1)  # o último é o +Inf
+        self.soma = 0.0
+        self.n = 0
+
+    def registrar(self, latencia):
+        i = 0
+        while i < len(BALDES_LATENCIA) and latencia > BALDES_LATENCIA[i]:
+            i += 1
+        self.contagens[i] += 1
+        self.soma += latencia
+        self.n += 1
+
+    def mesclar(self, outro):
+        for i, contagem in enumerate(outro.contagens):
+            self.contagens[i] += contagem
+        self.soma += outro.soma
+        self.n += outro.n
+
+    def cumulativas(self):
+        acumulado, saida = 0, []
+        for contagem in self.contagens:
+            acumulado += contagem
+            saida.append(acumulado)
+        return saida
+
+
+class MetricasAgente:
+    """ Totais de um agente: decisões, estouros do prazo, rollouts e tempos de busca. """
+    __slots__ = ('decisoes', 'com_prazo', 'estouros', 'rollouts', 'tempo_busca', 'tempo_workers', 'tempo_disponivel')
+
+    def __init__(self):
+        self.decisoes = 0
+        self.com_prazo = 0
+        self.estouros = 0
+        self.rollouts = 0
+        self.tempo_busca = 0.0
+        self.tempo_workers = 0.0      # só das buscas que mediram a utilização
+        self.tempo_disponivel = 0.0   # workers x tempo das mesmas buscas
+
+    def mesclar(self, outra):
+        for campo in self.__slots__:
+            setattr(self, campo, getattr(self, campo) + getattr(outra, campo))
+
+    @property
+    def rollouts_por_s(self):
+        return self.rollouts / self.tempo_busca if self.tempo_busca > 0 else 0.0
+
+    @property
+    def utilizacao(self):
+        return self.tempo_workers / self.tempo_disponivel if self.tempo_disponivel > 0 else None
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(**rotulos):
+    return '{' + ','.join(f'{k}="{_escapar(v)}"' for k, v in rotulos.items()) + '}'
+
+
+class ColetorMetricas:
+    """ Acumula as métricas das decisões e grava os eventos e o snapshot; ver o cabeçalho do módulo. """
+
+    def __init__(self, eventos=None, prometheus=None, intervalo_snapshot=5.0, execucao='', anunciar=True):
+        # anunciar=False: coletor de um worker, que grava as decisões no mesmo arquivo de eventos
+        # mas deixa os eventos 'inicio' e 'fim' para o coletor principal
+        self.anunciar = anunciar
+        self.execucao = execucao
+        self.caminho_prometheus = prometheus
+        self.intervalo_snapshot = intervalo_snapshot
+        self.arquivo_eventos = open(eventos, 'a', encoding='utf-8') if eventos else None
+        self.histogramas = {}   # (agente, fase) -> HistogramaLatencia
+        self.agentes = {}       # agente -> MetricasAgente
+        self.partidas = 0
+        self.ambiente = ambiente()
+        self._ultimo_snapshot = time.monotonic()
+        if anunciar:
+            self.evento('inicio', execucao=execucao, **self.ambiente)
+
+    def evento(self, tipo, **campos):
+        """ Grava uma linha de evento (se houver arquivo de eventos). """
+        if self.arquivo_eventos is None:
+            return
+        # Uma linha por write, em modo append: workers podem gravar no mesmo arquivo sem misturar linhas
+        self.arquivo_eventos.write(json.dumps({'ts': time.time(), 'evento': tipo, **campos}, ensure_ascii=False) + '\n')
+        self.arquivo_eventos.flush()
+
+    def decidir(self, nome, agente, jogo, jogador, alvo=None):
+        """
+        Chama agente.decidir_melhor_jogada, mede a decisão e a registra em nome do agente `nome`.
+        O prazo é o do registro de latência do agente, se ele registrou esta decisão, ou `alvo`.
+        """
+        fase = fase_do_jogo(jogo)
+        registro = getattr(agente, 'registro_latencia', None)
+        n_registros = len(registro.alvos) if registro is not None else 0
+        busca_anterior = getattr(agente, 'ultima_busca', None)
+        semente_anterior = getattr(agente, 'ultima_semente', None)
+        inicio = time.perf_counter()
+        resultado = agente.decidir_melhor_jogada(jogo, jogador)
+        latencia = time.perf_counter() - inicio
+        if registro is not None and len(registro.alvos) > n_registros:
+            alvo = registro.alvos[-1]
+        busca = getattr(agente, 'ultima_busca', None)
+        semente = getattr(agente, 'ultima_semente', None)
+        # Tabela de abertura, cache e jogadas forçadas não buscam: a ultima_busca é a da decisão anterior
+        self.registrar_decisao(nome, fase, latencia, alvo, busca if busca is not busca_anterior else None,
+                               semente if semente != semente_anterior else None)
+        return resultado
+
+    def registrar_decisao(self, nome, fase, latencia, alvo=None, busca=None, semente=None):
+        chave = (nome, fase)
+        if chave not in self.histogramas:
+            self.histogramas[chave] = HistogramaLatencia()
+        self.histogramas[chave].registrar(latencia)
+        if nome not in self.agentes:
+            self.agentes[nome] = MetricasAgente()
+        metricas = self.agentes[nome]
+        metricas.decisoes += 1
+        estouro = alvo is not None and latencia > alvo
+        if alvo is not None:
+            metricas.com_prazo += 1
+            metricas.estouros += estouro
+        campos = {'agente': nome, 'fase': fase, 'latencia': latencia, 'alvo': alvo, 'estouro': estouro}
+        if busca is not None:
+            metricas.rollouts += busca.iteracoes
+            metricas.tempo_busca += busca.tempo_total
+            campos.update(rollouts=busca.iteracoes, rollouts_por_s=busca.iteracoes_por_s, workers=busca.workers,
+                          utilizacao=busca.utilizacao)
+            if busca.utilizacao is not None:
+                metricas.tempo_workers += busca.tempo_workers
+                metricas.tempo_disponivel += busca.workers * busca.tempo_total
+        if semente is not None:
+            campos['semente'] = semente
+        self.evento('decisao', **campos)
+        self._talvez_snapshot()
+
+    def registrar_partida(self, **campos):
+        """ Fim de uma partida: conta e grava o evento com os campos dados (placar, vencedor...). """
+        self.partidas += 1
+        self.evento('partida', **campos)
+
+    def mesclar(self, outro):
+        """ Soma as contagens de outro coletor (de um worker) a este; os eventos o outro já gravou. """
+        for chave, histograma in outro.histogramas.items():
+            self.histogramas.setdefault(chave, HistogramaLatencia()).mesclar(histograma)
+        for nome, metricas in outro.agentes.items():
+            self.agentes.setdefault(nome, MetricasAgente()).mesclar(metricas)
+        self.partidas += outro.partidas
+        self._talvez_snapshot()
+
+    def _talvez_snapshot(self):
+        if self.caminho_prometheus and time.monotonic() - self._ultimo_snapshot >= self.intervalo_snapshot:
+            self.escrever_prometheus()
+
+    def texto_prometheus(self):
+        """ Todas as métricas no formato de texto do Prometheus. """
+        linhas = ['# HELP truco_info Máquina da execução.', '# TYPE truco_info gauge',
+                  f"truco_info{_rotulos(execucao=self.execucao, **self.ambiente)} 1",
+                  '# HELP truco_partidas_total Partidas terminadas.', '# TYPE truco_partidas_total counter',
+                  f"truco_partidas_total{_rotulos(execucao=self.execucao)} {self.partidas}",
+                  '# HELP truco_latencia_decisao_segundos Latência das decisões, medida pelo runner.',
+                  '# TYPE truco_latencia_decisao_segundos histogram']
+        for (nome, fase), histograma in sorted(self.histogramas.items()):
+            limites = [repr(b) for b in BALDES_LATENCIA] + ['+Inf']
+            for limite, acumulado in zip(limites, histograma.cumulativas()):
+                linhas.append(f"truco_latencia_decisao_segundos_bucket{_rotulos(agente=nome, fase=fase, le=limite)} {acumulado}")
+            linhas.append(f"truco_latencia_decisao_segundos_sum{_rotulos(agente=nome, fase=fase)} {histograma.soma!r}")
+            linhas.append(f"truco_latencia_decisao_segundos_count{_rotulos(agente=nome, fase=fase)} {histograma.n}")
+        metricas = [
+            ('truco_decisoes_total', 'counter', 'Decisões tomadas.', lambda m: m.decisoes),
+            ('truco_decisoes_com_prazo_total', 'counter', 'Decisões com prazo conhecido.', lambda m: m.com_prazo),
+            ('truco_estouros_prazo_total', 'counter', 'Decisões que passaram do prazo.', lambda m: m.estouros),
+            ('truco_rollouts_total', 'counter', 'Rollouts (iterações da busca) feitos.', lambda m: m.rollouts),
+            ('truco_busca_segundos_total', 'counter', 'Tempo de busca somado.', lambda m: m.tempo_busca),
+            ('truco_rollouts_por_segundo', 'gauge', 'Rollouts por segundo de busca, na execução toda.', lambda m: m.rollouts_por_s),
+            ('truco_utilizacao_workers', 'gauge', 'Fração do tempo dos workers gasta buscando.', lambda m: m.utilizacao),
+        ]
+        for nome_metrica, tipo, ajuda, valor in metricas:
+            linhas += [f'# HELP {nome_metrica} {ajuda}', f'# TYPE {nome_metrica} {tipo}']
+            for nome, m in sorted(self.agentes.items()):
+                v = valor(m)
+                if v is not None:
+                    linhas.append(f"{nome_metrica}{_rotulos(agente=nome)} {v!r}")
+        return '\n'.join(linhas) + '\n'
+
+    def escrever_prometheus(self):
+        """ Reescreve o snapshot (arquivo temporário + os.replace: quem lê nunca vê um arquivo pela metade). """
+        self._ultimo_snapshot = time.monotonic()
+        if not self.caminho_prometheus:
+            return
+        temporario = self.caminho_prometheus + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(self.texto_prometheus())
+        os.replace(temporario, self.caminho_prometheus)
+
+    def resumo(self):
+        """ Uma linha por agente: decisões, estouros do prazo, rollouts/s e utilização dos workers. """
+        linhas = []
+        for nome, m in sorted(self.agentes.items()):
+            texto = f"  {nome:<22} {m.decisoes} decisões | estouros {m.estouros}/{m.com_prazo}"
+            if m.tempo_busca > 0:
+                texto += f" | {m.rollouts_por_s:,.0f} rollouts/s"
+            if m.utilizacao is not None:
+                texto += f" | workers {100 * m.utilizacao:.0f}% ocupados"
+            linhas.append(texto)
+        return '\n'.join(linhas) or "  sem decisões registradas"
+
+    def fechar(self):
+        """ Grava o evento 'fim' e o snapshot final e fecha o arquivo de eventos. """
+        if self.anunciar:
+            self.evento('fim', partidas=self.partidas, decisoes=sum(m.decisoes for m in self.agentes.values()))
+        self.escrever_prometheus()
+        if self.arquivo_eventos is not None:
+            self.arquivo_eventos.close()
+            self.arquivo_eventos = None
+
+
+def adicionar_argumentos(parser):
+    """ --eventos e --prometheus, comuns aos runners. """
+    parser.add_argument('--eventos', help="Grava as métricas como eventos em JSON lines neste arquivo.")
+    parser.add_argument('--prometheus', help="Mantém neste arquivo um snapshot das métricas no formato do Prometheus.")
+    parser.add_argument('--intervalo-snapshot', type=float, default=5.0, help="Segundos entre dois snapshots.")
@@ -0,0 +1,388 @@
+import gc
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+from statistics import NormalDist
+import numpy as np
+from aquecimento import jogo_de_aquecimento
+
+# ======================================================================
+# Microbenchmarks com linhas de base
+# ----------------------------------------------------------------------
+# Medidas isoladas do caminho quente, cada uma repetida várias vezes
+# para ter uma distribuição e não um número só:
+#   deepcopy, jogar_carta, _finalizar_turno  (motor do jogo, logica.py)
+#   achatar_estado_para_gpu                  (256 determinizações)
+#   rollouts_python / _numpy / _numba        (rollouts por segundo)
+#   mcts_iteracoes                           (iterações do MCTS por segundo)
+#   latencia_decisao                         (p50/p99 de uma busca de 200
+#                                             iterações em estados fixos)
+#   importacao                               (import do benchmark_runner)
+# Cada amostra de tempo é o tempo por operação de uma rodada longa o
+# bastante para o relógio (calibrada como no timeit), com o GC desligado.
+#
+#   python microbenchmarks.py rodar --saida base.json
+#   (muda o código)
+#   python microbenchmarks.py rodar --saida novo.json
+#   python microbenchmarks.py comparar base.json novo.json
+#
+# O comparar aponta como regressão o que ficou mais lento com
+# significância estatística (Mann-Whitney unilateral; Wilcoxon pareado na
+# latência, que usa os mesmos estados e sementes) e acima do limiar
+# mínimo de variação; sai com código 1 se houver alguma.
+# ======================================================================
+
+BENCHMARKS = {}
+
+
+def benchmark(nome, descricao, por_op=1, pareado=False):
+    """ Registra uma medida: a função recebe (n, rapido) e retorna os segundos de n operações. """
+    def registrar(funcao):
+        BENCHMARKS[nome] = {'funcao': funcao, 'descricao': descricao, 'por_op': por_op, 'pareado': pareado}
+        return funcao
+    return registrar
+
+
+def _meio_da_mao(cartas_jogadas=2):
+    """ Jogo fixo com as primeiras `cartas_jogadas` cartas da mão já na mesa. """
+    jogo, _ = jogo_de_aquecimento()
+    for _ in range(cartas_jogadas):
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        jogo.jogar_carta(jogador.id, jogador.mao[0])
+    return jogo
+
+
+# --- Motor do jogo ---
+
+@benchmark('deepcopy', "copy.deepcopy de um JogoTruco2v2 no meio da mão")
+def _deepcopy(n, rapido):
+    jogo = _meio_da_mao()
+    inicio = time.perf_counter()
+    for _ in range(n):
+        copy.deepcopy(jogo)
+    return time.perf_counter() - inicio
+
+
+@benchmark('jogar_carta', "JogoTruco2v2.jogar_carta (sem fechar a rodada)")
+def _jogar_carta(n, rapido):
+    copias = [copy.deepcopy(_meio_da_mao(1)) for _ in range(n)]
+    inicio = time.perf_counter()
+    for jogo in copias:
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        jogo.jogar_carta(jogador.id, jogador.mao[0])
+    return time.perf_counter() - inicio
+
+
+@benchmark('_finalizar_turno', "JogoTruco2v2._finalizar_turno com as quatro cartas na mesa")
+def _finalizar_turno(n, rapido):
+    base = _meio_da_mao(3)
+    # A quarta carta vai para a mesa sem passar por jogar_carta, que fecharia a rodada
+    jogador = base.jogadores[base.jogador_atual_idx]
+    carta = jogador.mao.pop(0)
+    base.cartas_na_mesa.append((jogador, carta))
+    base.cartas_jogadas.append(carta)
+    base.jogador_atual_idx = (base.jogador_atual_idx + 1) % 4
+    copias = [copy.deepcopy(base) for _ in range(n)]
+    inicio = time.perf_counter()
+    for jogo in copias:
+        jogo._finalizar_turno()
+    return time.perf_counter() - inicio
+
+
+@benchmark('achatar_estado_para_gpu', "gpu_utils.achatar_estado_para_gpu com 256 determinizações", por_op=256)
+def _achatar(n, rapido):
+    from gpu_utils import achatar_estado_para_gpu
+    jogo = _meio_da_mao()
+    bot_id = jogo.jogadores[jogo.jogador_atual_idx].id
+    inicio = time.perf_counter()
+    for _ in range(n):
+        achatar_estado_para_gpu(jogo, bot_id, 256)
+    return time.perf_counter() - inicio
+
+
+# --- Rollouts e busca ---
+
+@benchmark('rollouts_python', "politica_rollout.simular_rollout (motor em Python)")
+def _rollouts_python(n, rapido):
+    from politica_rollout import simular_rollout
+    jogo = _meio_da_mao()
+    time_id = jogo.jogadores[jogo.jogador_atual_idx].time_id
+    random.seed(0)
+    inicio = time.perf_counter()
+    for _ in range(n):
+        simular_rollout(jogo, time_id)
+    return time.perf_counter() - inicio
+
+
+TAMANHO_LOTE = 4096
+
+
+def _rollouts_em_lote(simular, n):
+    from simulador_lote import achatar_estado_lote
+    jogo = _meio_da_mao()
+    rng = np.random.default_rng(0)
+    lote = achatar_estado_lote(jogo, TAMANHO_LOTE, jogo.jogadores[jogo.jogador_atual_idx].id, rng)
+    inicio = time.perf_counter()
+    for _ in range(n):
+        simular(lote, rng)
+    return time.perf_counter() - inicio
+
+
+@benchmark('rollouts_numpy', f"simulador_lote.simular_maos_lote, lotes de {TAMANHO_LOTE}", por_op=TAMANHO_LOTE)
+def _rollouts_numpy(n, rapido):
+    from simulador_lote import simular_maos_lote
+    return _rollouts_em_lote(simular_maos_lote, n)
+
+
+@benchmark('rollouts_numba', f"simulador_numba.simular_maos_numba, lotes de {TAMANHO_LOTE}", por_op=TAMANHO_LOTE)
+def _rollouts_numba(n, rapido):
+    from simulador_numba import simular_maos_numba, aquecer
+    aquecer()
+    return _rollouts_em_lote(simular_maos_numba, n)
+
+
+@benchmark('mcts_iteracoes', "agente_mcts_multi.run_single_mcts_search, 100 iterações", por_op=100)
+def _mcts_iteracoes(n, rapido):
+    from agente_mcts_multi import run_single_mcts_search
+    jogo = _meio_da_mao()
+    jogador = jogo.jogadores[jogo.jogador_atual_idx]
+    random.seed(0)
+    inicio = time.perf_counter()
+    for _ in range(n):
+        run_single_mcts_search(jogo, jogador, 100)
+    return time.perf_counter() - inicio
+
+
+@benchmark('latencia_decisao', "busca MCTS de 200 iterações, um estado fixo por amostra (semente = índice)", pareado=True)
+def _latencia_decisao(rapido):
+    """ Uma amostra por estado: a lista tem sempre os mesmos estados, na mesma ordem. """
+    from agente_mcts_multi import run_single_mcts_search
+    from politica_rollout import estados_de_teste
+    estados = estados_de_teste(10 if rapido else 40, semente=0)
+    amostras = []
+    for i, (jogo, _) in enumerate(estados):
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        random.seed(i)
+        inicio = time.perf_counter()
+        run_single_mcts_search(jogo, jogador, 200)
+        amostras.append(time.perf_counter() - inicio)
+    return amostras
+
+
+@benchmark('importacao', "python -X importtime -c 'import benchmark_runner' (processo novo)")
+def _importacao(rapido):
+    from tempo_importacao import medir_importacao
+    return [medir_importacao('benchmark_runner', 1)['total_ms'] / 1000 for _ in range(3 if rapido else 10)]
+
+
+# ======================================================================
+# Execução
+# ======================================================================
+
+def _cronometrar(funcao, n, rapido):
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        return funcao(n, rapido)
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+
+def _calibrar(funcao, rapido, tempo_minimo):
+    """ Menor n (1, 2, 5, 10, 20, ...) com o qual uma rodada dura pelo menos tempo_minimo. """
+    n = 1
+    while True:
+        for passo in (1, 2, 5):
+            if _cronometrar(funcao, n * passo, rapido) >= tempo_minimo:
+                return n * passo
+        n *= 10
+
+
+def medir(nome, repeticoes=15, rapido=False):
+    """ Amostras (segundos por operação) e resumo de um benchmark. """
+    info = BENCHMARKS[nome]
+    funcao = info['funcao']
+    if funcao.__code__.co_argcount == 1:
+        # Benchmarks que já retornam uma amostra por decisão/processo
+        amostras = list(funcao(rapido))
+    else:
+        n = _calibrar(funcao, rapido, 0.005 if rapido else 0.05)
+        amostras = [_cronometrar(funcao, n, rapido) / n for _ in range(max(3, repeticoes // 3 if rapido else repeticoes))]
+    mediana = float(np.median(amostras))
+    return {
+        'descricao': info['descricao'],
+        'unidade': 's/op',
+        'por_op': info['por_op'],
+        'pareado': info['pareado'],
+        'amostras': amostras,
+        'mediana': mediana,
+        'p50': float(np.percentile(amostras, 50)),
+        'p99': float(np.percentile(amostras, 99)),
+        'vazao': info['por_op'] / mediana,
+    }
+
+
+def _ambiente():
+    ambiente = {'python': platform.python_version(), 'numpy': np.__version__, 'maquina': platform.node(),
+                'processador': platform.processor() or platform.machine(), 'plataforma': platform.platform()}
+    try:
+        import os
+        ambiente['cpus'] = os.cpu_count()
+        ambiente['commit'] = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                            text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        pass
+    return ambiente
+
+
+def rodar(nomes=None, repeticoes=15, rapido=False):
+    resultados = {}
+    for nome in nomes or BENCHMARKS:
+        try:
+            resultados[nome] = medir(nome, repeticoes, rapido)
+        except ImportError as erro:
+            # Backend opcional ausente (numba, por exemplo): a medida fica de fora
+            print(f"  {nome:<24} pulado ({erro})")
+            continue
+        r = resultados[nome]
+        print(f"  {nome:<24} mediana {_formatar(r['mediana'])} | p99 {_formatar(r['p99'])} | "
+              f"{r['vazao']:>12,.0f} /s | {len(r['amostras'])} amostras")
+    return {'versao': 1, 'data': time.strftime('%Y-%m-%dT%H:%M:%S'), 'ambiente': _ambiente(),
+            'rapido': rapido, 'resultados': resultados}
+
+
+def _formatar(segundos):
+    for unidade, escala in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if segundos >= escala:
+            return f"{segundos / escala:7.2f} {unidade:<2}"
+    return f"{segundos / 1e-9:7.0f} ns"
+
+
+# ======================================================================
+# Comparação
+# ======================================================================
+
+def _postos(valores):
+    """ Postos (1..n) com média nos empates. """
+    ordem = np.argsort(valores, kind='mergesort')
+    postos = np.empty(len(valores))
+    ordenados = np.asarray(valores)[ordem]
+    i = 0
+    while i < len(ordenados):
+        j = i
+        while j + 1 < len(ordenados) and ordenados[j + 1] == ordenados[i]:
+            j += 1
+        postos[ordem[i:j + 1]] = (i + j) / 2 + 1
+        i = j + 1
+    return postos
+
+
+def mann_whitney_maior(base, novo):
+    """ p-valor unilateral (aproximação normal, com correção de empates) de `novo` tender a ser maior que `base`. """
+    n1, n2 = len(base), len(novo)
+    postos = _postos(np.concatenate([base, novo]))
+    u = postos[n1:].sum() - n2 * (n2 + 1) / 2
+    _, contagens = np.unique(np.concatenate([base, novo]), return_counts=True)
+    n = n1 + n2
+    variancia = n1 * n2 / 12 * ((n + 1) - (contagens ** 3 - contagens).sum() / (n * (n - 1)))
+    if variancia <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / np.sqrt(variancia)
+    return 1.0 - NormalDist().cdf(z)
+
+
+def wilcoxon_maior(base, novo):
+    """ p-valor unilateral (aproximação normal) do teste de postos sinalizados para novo > base, par a par. """
+    diferencas = np.asarray(novo) - np.asarray(base)
+    diferencas = diferencas[diferencas != 0]
+    n = len(diferencas)
+    if n == 0:
+        return 1.0
+    postos = _postos(np.abs(diferencas))
+    w = postos[diferencas > 0].sum()
+    media = n * (n + 1) / 4
+    dp = np.sqrt(n * (n + 1) * (2 * n + 1) / 24)
+    return 1.0 - NormalDist().cdf((w - media - 0.5) / dp)
+
+
+def comparar(base, novo, alfa=0.01, limiar=0.05):
+    """
+    Para cada benchmark presente nos dois: razão das medianas (novo / base), p-valores
+    de ficar mais lento e mais rápido, e o veredito ('regressao', 'melhora' ou 'igual').
+    """
+    linhas = []
+    for nome, b in base['resultados'].items():
+        n = novo['resultados'].get(nome)
+        if n is None:
+            continue
+        pareado = b['pareado'] and n['pareado'] and len(b['amostras']) == len(n['amostras'])
+        teste = wilcoxon_maior if pareado else mann_whitney_maior
+        p_lento = teste(b['amostras'], n['amostras'])
+        p_rapido = teste(n['amostras'], b['amostras'])
+        razao = n['mediana'] / b['mediana']
+        if p_lento < alfa and razao > 1 + limiar:
+            veredito = 'regressao'
+        elif p_rapido < alfa and razao < 1 - limiar:
+            veredito = 'melhora'
+        else:
+            veredito = 'igual'
+        linhas.append({'nome': nome, 'base': b['mediana'], 'novo': n['mediana'], 'razao': razao,
+                       'p_lento': p_lento, 'p_rapido': p_rapido, 'veredito': veredito, 'pareado': pareado})
+    return linhas
+
+
+def imprimir_comparacao(linhas, base, novo):
+    if base['ambiente'].get('maquina') != novo['ambiente'].get('maquina'):
+        print(f"  Atenção: máquinas diferentes ({base['ambiente'].get('maquina')} x {novo['ambiente'].get('maquina')})")
+    print(f"  {'benchmark':<24} {'base':>10} {'novo':>10} {'variação':>9} {'p(lento)':>9}  veredito")
+    for l in linhas:
+        marca = {'regressao': 'REGRESSÃO', 'melhora': 'melhora', 'igual': '~'}[l['veredito']]
+        print(f"  {l['nome']:<24} {_formatar(l['base'])} {_formatar(l['novo'])} {100 * (l['razao'] - 1):+8.1f}% "
+              f"{l['p_lento']:9.4f}  {marca}{' (pareado)' if l['pareado'] else ''}")
+
+
+def _carregar(caminho):
+    with open(caminho) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks do caminho quente, com linhas de base em JSON.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    p_rodar = comandos.add_parser('rodar', help="Roda os benchmarks e grava o JSON.")
+    p_rodar.add_argument('--saida', default='microbenchmarks.json')
+    p_rodar.add_argument('--so', nargs='+', choices=list(BENCHMARKS), help="Só estes benchmarks.")
+    p_rodar.add_argument('--repeticoes', type=int, default=15)
+    p_rodar.add_argument('--rapido', action='store_true', help="Rodadas e amostras menores (verificação rápida).")
+    p_rodar.add_argument('--comparar-com', default=None, help="Linha de base para comparar ao final.")
+    p_comparar = comandos.add_parser('comparar', help="Compara dois JSONs e aponta regressões.")
+    p_comparar.add_argument('base')
+    p_comparar.add_argument('novo')
+    for p in (p_rodar, p_comparar):
+        p.add_argument('--alfa', type=float, default=0.01, help="Nível de significância.")
+        p.add_argument('--limiar', type=float, default=0.05, help="Variação mínima da mediana (0.05 = 5%%).")
+    args = parser.parse_args()
+
+    if args.comando == 'rodar':
+        print("Microbenchmarks:")
+        novo = rodar(args.so, args.repeticoes, args.rapido)
+        with open(args.saida, 'w') as f:
+            json.dump(novo, f, indent=1)
+        print(f"Resultados em {args.saida}")
+        if args.comparar_com is None:
+            return
+        base = _carregar(args.comparar_com)
+    else:
+        base, novo = _carregar(args.base), _carregar(args.novo)
+    linhas = comparar(base, novo, args.alfa, args.limiar)
+    imprimir_comparacao(linhas, base, novo)
+    sys.exit(1 if any(l['veredito'] == 'regressao' for l in linhas) else 0)
+
+if __name__ == '__main__':
+    main()
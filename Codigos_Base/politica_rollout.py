@@ -0,0 +1,182 @@
+import copy
+import time
+import random
+import argparse
+import numpy as np
+from logica import JogoTruco2v2
+
+# ======================================================================
+# Políticas de rollout
+# ----------------------------------------------------------------------
+# 'aleatoria': cada jogador joga uma carta sorteada (o modelo original).
+# 'heuristica': rollout "pesado", barato e quase determinístico:
+#   - quem abre a rodada joga a carta mais forte;
+#   - se o parceiro já está ganhando a rodada, descarta a mais fraca
+#     (não passa o parceiro);
+#   - senão, ganha com a carta mais barata que bate a melhor do adversário;
+#   - se nenhuma bate, descarta a mais fraca.
+#   Com probabilidade `ruido` a jogada é sorteada, para os rollouts não
+#   ficarem todos iguais.
+#
+# As mesmas regras existem no motor em lote (simulador_lote.py), no kernel
+# Numba (simulador_numba.py) e no kernel CUDA (agente_gpu.py); os agentes
+# escolhem a política pelo parâmetro `politica_rollout`.
+#
+#   python politica_rollout.py --estados 200 --rollouts 2000
+# ======================================================================
+
+POLITICAS = ('aleatoria', 'heuristica')
+# 'roteiro' não é uma política de jogo: cada jogador joga a primeira carta que ainda tem, na
+# ordem da mão, e um roteiro de jogadas vira a ordem das cartas nas mãos. Só conformidade.py a usa,
+# para dar as mesmas jogadas a todos os motores: os agentes a recusam (validar_politica)
+POLITICA_ROTEIRO = 'roteiro'
+# Código inteiro de cada política, usado pelos kernels compilados
+CODIGO_POLITICA = {'aleatoria': 0, 'heuristica': 1, POLITICA_ROTEIRO: 2}
+RUIDO_PADRAO = 0.1
+
+
+def validar_politica(politica, permitir_roteiro=False):
+    """ Retorna a política, se for conhecida. 'roteiro' só passa com permitir_roteiro (os motores de simulação). """
+    if politica not in POLITICAS and not (permitir_roteiro and politica == POLITICA_ROTEIRO):
+        raise ValueError(f"Política de rollout desconhecida: {politica} (use uma de {POLITICAS})")
+    return politica
+
+
+def escolher_carta_heuristica(jogo, jogador, ruido=RUIDO_PADRAO, rng=random):
+    """ Carta da política heurística para `jogador`, que é o jogador da vez em `jogo`. """
+    mao = jogador.mao
+    if len(mao) == 1:
+        return mao[0]
+    if rng.random() < ruido:
+        return rng.choice(mao)
+    valores = [jogo.valor_da_carta(c) for c in mao]
+    if not jogo.cartas_na_mesa:
+        return mao[max(range(len(mao)), key=valores.__getitem__)]
+
+    parceiro, adversario = -1, -1
+    for dono, carta in jogo.cartas_na_mesa:
+        if dono.time_id == jogador.time_id:
+            parceiro = max(parceiro, jogo.valor_da_carta(carta))
+        else:
+            adversario = max(adversario, jogo.valor_da_carta(carta))
+    mais_fraca = min(range(len(mao)), key=valores.__getitem__)
+    if parceiro > adversario:
+        return mao[mais_fraca]
+    vencedoras = [k for k, v in enumerate(valores) if v > adversario]
+    if not vencedoras:
+        return mao[mais_fraca]
+    return mao[min(vencedoras, key=valores.__getitem__)]
+
+
+def escolher_carta(jogo, jogador, politica='aleatoria', ruido=RUIDO_PADRAO, rng=random):
+    if politica == 'aleatoria':
+        return rng.choice(jogador.mao)
+    if politica == POLITICA_ROTEIRO:
+        return jogador.mao[0]
+    return escolher_carta_heuristica(jogo, jogador, ruido, rng)
+
+
+def simular_rollout(estado_jogo, time_bot_id, politica='aleatoria', ruido=RUIDO_PADRAO, rng=random):
+    """ Joga a mão até o fim com a política dada; 1 se o time do bot venceu. rng: o módulo random ou um random.Random. """
+    jogo_simulado = copy.deepcopy(estado_jogo)
+    jogo_simulado.simulacao = True
+    while jogo_simulado.estado_jogo == "EM_ANDAMENTO":
+        jogador_da_vez = jogo_simulado.jogadores[jogo_simulado.jogador_atual_idx]
+        if not jogador_da_vez.mao:
+            jogo_simulado._checar_vencedor_da_mao(); continue
+        jogo_simulado.jogar_carta(jogador_da_vez.id, escolher_carta(jogo_simulado, jogador_da_vez, politica, ruido, rng))
+    return 1 if jogo_simulado.vencedor_mao == time_bot_id else 0
+
+
+# ======================================================================
+# Benchmark: variância das estimativas por rollout, aleatória x heurística
+# ======================================================================
+
+def estados_de_teste(n_estados, semente=0):
+    """ Estados em pontos variados da mão (0 a 6 cartas já jogadas ao acaso), com o time da vez. """
+    random.seed(semente)
+    estados = []
+    while len(estados) < n_estados:
+        jogo = JogoTruco2v2(simulacao=True)
+        jogo.jogador_iniciou_rodada_idx = random.randrange(4) - 1
+        jogo.distribuir_cartas()
+        for _ in range(random.randint(0, 6)):
+            if jogo.estado_jogo != "EM_ANDAMENTO":
+                break
+            jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
+            jogo.jogar_carta(jogador_da_vez.id, random.choice(jogador_da_vez.mao))
+        if jogo.estado_jogo == "EM_ANDAMENTO":
+            estados.append((jogo, jogo.jogadores[jogo.jogador_atual_idx].time_id))
+    return estados
+
+
+def _rollouts_python(estado, time_id, n, politica):
+    return np.array([simular_rollout(estado, time_id, politica) for _ in range(n)], dtype=np.int8)
+
+
+def _rollouts_lote(simular):
+    from simulador_lote import achatar_estado_lote
+
+    def _rodar(estado, time_id, n, politica):
+        return (simular(achatar_estado_lote(estado, n), None, politica) == time_id).astype(np.int8)
+    return _rodar
+
+
+def benchmark_variancia(n_estados=200, n_rollouts=2000, orcamento=100, backends=('python', 'numpy'), semente=0):
+    """
+    Para cada estado e política, roda n_rollouts rollouts e mede:
+      - variancia: variância de um rollout (média entre os estados);
+      - dp_estimativa: desvio padrão da média de `orcamento` rollouts, medido
+        nos blocos de `orcamento` rollouts (média entre os estados);
+      - rollouts_5pp: rollouts necessários para um IC de 95% de ±5 pontos;
+      - rollouts_por_s: vazão do backend com a política.
+    """
+    from simulador_lote import simular_maos_lote
+    rodar = {'python': _rollouts_python, 'numpy': _rollouts_lote(simular_maos_lote)}
+    if 'numba' in backends:
+        from simulador_numba import simular_maos_numba
+        rodar['numba'] = _rollouts_lote(simular_maos_numba)
+        # Compila os kernels antes de medir
+        for politica in POLITICAS:
+            rodar['numba'](*estados_de_teste(1, semente)[0], 8, politica)
+
+    estados = estados_de_teste(n_estados, semente)
+    resultados = []
+    for backend in backends:
+        # O motor em Python é ~100x mais lento: usa menos rollouts por estado
+        n = n_rollouts if backend != 'python' else max(orcamento, n_rollouts // 10)
+        for politica in POLITICAS:
+            np.random.seed(semente); random.seed(semente)
+            variancias, dps, tempo = [], [], 0.0
+            for estado, time_id in estados:
+                inicio = time.perf_counter()
+                vitorias = rodar[backend](estado, time_id, n, politica)
+                tempo += time.perf_counter() - inicio
+                variancias.append(vitorias.var())
+                blocos = vitorias[:n // orcamento * orcamento].reshape(-1, orcamento).mean(axis=1)
+                if len(blocos) > 1:
+                    dps.append(blocos.std(ddof=1))
+            variancia = float(np.mean(variancias))
+            resultados.append({'backend': backend, 'politica': politica, 'variancia': variancia,
+                               'dp_estimativa': float(np.mean(dps)) if dps else float('nan'),
+                               'rollouts_5pp': int(np.ceil(1.96 ** 2 * variancia / 0.05 ** 2)),
+                               'rollouts_por_s': n * len(estados) / tempo})
+            r = resultados[-1]
+            print(f"  {backend:<7} {politica:<10} variância {r['variancia']:.4f} | dp({orcamento}) {r['dp_estimativa']:.4f} | "
+                  f"{r['rollouts_5pp']:>4} rollouts p/ ±5pp | {r['rollouts_por_s']:>10,.0f} rollouts/s")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a variância das estimativas das políticas de rollout.")
+    parser.add_argument('--estados', type=int, default=200)
+    parser.add_argument('--rollouts', type=int, default=2000, help="Rollouts por estado (um décimo no motor em Python).")
+    parser.add_argument('--orcamento', type=int, default=100, help="Rollouts por estimativa.")
+    parser.add_argument('--backends', nargs='+', choices=['python', 'numpy', 'numba'], default=['python', 'numpy'])
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+    print(f"Variância por rollout em {args.estados} estados:")
+    benchmark_variancia(args.estados, args.rollouts, args.orcamento, args.backends, args.semente)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import time
+import numpy as np
+
+
+class Prazo:
+    """
+    Prazo absoluto medido em relógio monotônico (time.monotonic).
+
+    A checagem é amortizada: o relógio só é lido a cada `intervalo` chamadas de
+    expirou(), e o intervalo se ajusta ao custo medido por iteração para que a
+    leitura aconteça mais ou menos a cada `granularidade` segundos.
+    O valor de time.monotonic() é compartilhado entre processos da mesma máquina,
+    então um Prazo pode ser enviado para os workers do joblib.
+    """
+    def __init__(self, limite, granularidade=0.002):
+        self.limite = limite
+        self.granularidade = granularidade
+        self.intervalo = 1
+        self._contador = 0
+        self._ultima_leitura = time.monotonic()
+        self._expirado = self._ultima_leitura >= limite
+
+    @classmethod
+    def em(cls, segundos, **kwargs):
+        return cls(time.monotonic() + segundos, **kwargs)
+
+    def restante(self):
+        return self.limite - time.monotonic()
+
+    def expirou(self):
+        if self._expirado:
+            return True
+        self._contador += 1
+        if self._contador < self.intervalo:
+            return False
+        agora = time.monotonic()
+        custo_iteracao = (agora - self._ultima_leitura) / self._contador
+        self._contador = 0
+        self._ultima_leitura = agora
+        if agora >= self.limite:
+            self._expirado = True
+            return True
+        # Nunca deixa o próximo intervalo ultrapassar o prazo restante
+        janela = min(self.granularidade, (self.limite - agora) / 2)
+        self.intervalo = max(1, int(janela / custo_iteracao)) if custo_iteracao > 0 else self.intervalo * 2
+        return False
+
+    def __getstate__(self):
+        # Só o limite atravessa a fronteira do processo; o resto é recalculado no worker
+        return {'limite': self.limite, 'granularidade': self.granularidade}
+
+    def __setstate__(self, estado):
+        self.__init__(estado['limite'], estado['granularidade'])
+
+
+class EstimadorOverhead:
+    """
+    Média móvel exponencial do custo fixo de uma decisão que não é busca:
+    despacho (spawn, pickling) e coleta dos resultados.
+    A média sobe rápido (um pico de overhead estoura o prazo) e desce mais devagar,
+    o que também dilui o custo de criação do pool na primeira decisão.
+    """
+    def __init__(self, alfa_subida=0.8, alfa_queda=0.5, despacho_inicial=0.05, coleta_inicial=0.01, margem=0.005):
+        self.alfa_subida = alfa_subida
+        self.alfa_queda = alfa_queda
+        self.despacho = despacho_inicial
+        self.coleta = coleta_inicial
+        self.margem = margem
+
+    def _atualizar(self, media, amostra):
+        alfa = self.alfa_subida if amostra > media else self.alfa_queda
+        return (1 - alfa) * media + alfa * max(0.0, amostra)
+
+    def registrar(self, despacho, coleta):
+        self.despacho = self._atualizar(self.despacho, despacho)
+        self.coleta = self._atualizar(self.coleta, coleta)
+
+    def total(self):
+        return self.despacho + self.coleta + self.margem
+
+
+class RegistroLatencia:
+    """ Guarda as latências reais das decisões e as compara com o alvo configurado. """
+    def __init__(self):
+        self.latencias = []
+        self.alvos = []
+
+    def registrar(self, latencia, alvo):
+        self.latencias.append(latencia)
+        self.alvos.append(alvo)
+
+    def percentis(self):
+        if not self.latencias:
+            return {}
+        lat = np.array(self.latencias)
+        alvos = np.array(self.alvos)
+        return {
+            'n': len(lat),
+            'p50': float(np.percentile(lat, 50)),
+            'p90': float(np.percentile(lat, 90)),
+            'p99': float(np.percentile(lat, 99)),
+            'max': float(lat.max()),
+            'estouros': int(np.sum(lat > alvos)),
+            'estouro_max': float(np.max(lat - alvos)),
+        }
+
+    def resumo(self):
+        p = self.percentis()
+        if not p:
+            return "sem decisões registradas"
+        return (f"p50={p['p50']*1000:.1f}ms p90={p['p90']*1000:.1f}ms p99={p['p99']*1000:.1f}ms "
+                f"max={p['max']*1000:.1f}ms | estouros do prazo: {p['estouros']}/{p['n']} "
+                f"(pior: {p['estouro_max']*1000:+.1f}ms)")
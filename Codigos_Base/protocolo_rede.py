@@ -0,0 +1,94 @@
+import json
+import socket
+import struct
+from logica import JogoTruco2v2
+from gpu_utils import CARTA_PARA_INT, INT_PARA_CARTA
+
+# ======================================================================
+# Protocolo dos workers remotos de rollout
+# ----------------------------------------------------------------------
+# Cada mensagem é um JSON precedido pelo seu tamanho em 4 bytes (big-endian).
+# Pedido:   {"estado": <estado codificado>, "bot_id": int,
+#            "n_simulacoes": int | null, "tempo": float | null,
+#            "max_nos": int | null}  (limite de nós de cada árvore do worker)
+# Resposta: {"jogadas": [int], "visitas": [int], "vitorias": [float],
+#            "sims": int} ou {"erro": str}
+# As cartas viajam como inteiros (CARTA_PARA_INT), como no achatamento da GPU.
+# ======================================================================
+
+_CABECALHO = struct.Struct('>I')
+TAMANHO_MAXIMO = 1 << 20
+
+
+def codificar_estado(jogo):
+    """ Converte um JogoTruco2v2 em um dicionário compacto de inteiros. """
+    return {
+        'p': [jogo.pontos_time1, jogo.pontos_time2],
+        'm': jogo.mao_atual,
+        'e': jogo.estado_jogo,
+        'v': CARTA_PARA_INT[jogo.vira] if jogo.vira else -1,
+        'r': jogo.rodada_atual,
+        'res': list(jogo.resultado_rodada),
+        'vm': jogo.valor_mao,
+        'ja': jogo.jogador_atual_idx,
+        'vt': jogo.vencedor_turno_idx,
+        'ji': jogo.jogador_iniciou_rodada_idx,
+        'maos': [[CARTA_PARA_INT[c] for c in p.mao] for p in jogo.jogadores],
+        'mesa': [[jogo.jogadores.index(p), CARTA_PARA_INT[c]] for p, c in jogo.cartas_na_mesa],
+        'hist': [CARTA_PARA_INT[c] for c in jogo.cartas_jogadas],
+    }
+
+
+def decodificar_estado(dados):
+    """ Reconstrói um JogoTruco2v2 (em modo simulação) a partir de codificar_estado. """
+    jogo = JogoTruco2v2(simulacao=True)
+    jogo.pontos_time1, jogo.pontos_time2 = dados['p']
+    jogo.mao_atual = dados['m']
+    jogo.estado_jogo = dados['e']
+    jogo.rodada_atual = dados['r']
+    jogo.resultado_rodada = list(dados['res'])
+    jogo.valor_mao = dados['vm']
+    jogo.jogador_atual_idx = dados['ja']
+    jogo.vencedor_turno_idx = dados['vt']
+    jogo.jogador_iniciou_rodada_idx = dados['ji']
+    for jogador, mao in zip(jogo.jogadores, dados['maos']):
+        jogador.mao = [INT_PARA_CARTA[c] for c in mao]
+    jogo.cartas_na_mesa = [(jogo.jogadores[idx], INT_PARA_CARTA[c]) for idx, c in dados['mesa']]
+    jogo.cartas_jogadas = [INT_PARA_CARTA[c] for c in dados.get('hist', [])]
+    if dados['v'] >= 0:
+        jogo.vira = INT_PARA_CARTA[dados['v']]
+        jogo._definir_manilhas()
+    return jogo
+
+
+def enviar_mensagem(conexao, mensagem):
+    corpo = json.dumps(mensagem, separators=(',', ':')).encode('utf-8')
+    conexao.sendall(_CABECALHO.pack(len(corpo)) + corpo)
+
+
+def _receber_exato(conexao, n):
+    partes = []
+    while n > 0:
+        parte = conexao.recv(n)
+        if not parte:
+            raise ConnectionError("Conexão fechada no meio de uma mensagem.")
+        partes.append(parte)
+        n -= len(parte)
+    return b''.join(partes)
+
+
+def receber_mensagem(conexao):
+    (tamanho,) = _CABECALHO.unpack(_receber_exato(conexao, _CABECALHO.size))
+    if tamanho > TAMANHO_MAXIMO:
+        raise ValueError(f"Mensagem grande demais: {tamanho} bytes.")
+    return json.loads(_receber_exato(conexao, tamanho).decode('utf-8'))
+
+
+def consultar_worker(host, porta, pedido, timeout=None):
+    """ Envia um pedido a um worker remoto e devolve a resposta já decodificada. """
+    with socket.create_connection((host, porta), timeout=timeout) as conexao:
+        enviar_mensagem(conexao, pedido)
+        resposta = receber_mensagem(conexao)
+    if 'erro' in resposta:
+        raise RuntimeError(f"Worker {host}:{porta} falhou: {resposta['erro']}")
+    return resposta
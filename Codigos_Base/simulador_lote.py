@@ -0,0 +1,248 @@
+import random
+import numpy as np
+from gpu_utils import CARTA_PARA_INT
+from politica_rollout import POLITICA_ROTEIRO, RUIDO_PADRAO, validar_politica
+
+# ======================================================================
+# Simulador de mãos em lote (NumPy)
+# ----------------------------------------------------------------------
+# Cada linha do lote é uma mão de Truco em andamento, em qualquer ponto
+# (inclusive no meio de uma rodada). As regras seguem logica.py à risca:
+# valor_da_carta, desempate em _finalizar_turno e _checar_vencedor_da_mao.
+#
+# Um lote é um dicionário de arrays com N linhas:
+#   maos           (N, 4, 3) int8   cartas (CARTA_PARA_INT) de cada jogador, -1 = vazio
+#   mesa           (N, 4)    int8   carta jogada por cada jogador na rodada atual, -1 = ainda não jogou
+#   resultado      (N, 3)    int8   resultado_rodada (0 = empate/não jogada, 1 ou 2 = time)
+#   vira           (N,)      int32
+#   jogador        (N,)      int32  índice do jogador da vez
+#   rodada         (N,)      int32  rodada_atual (1..3)
+#   vencedor_turno (N,)      int32  vencedor_turno_idx (quem puxa após um empate)
+# ======================================================================
+
+CAMPOS_LOTE = ('maos', 'mesa', 'resultado', 'vira', 'jogador', 'rodada', 'vencedor_turno')
+
+
+def valor_cartas(cartas, rank_manilha):
+    """ Versão vetorizada de JogoTruco2v2.valor_da_carta; -1 para ausência de carta. """
+    rank = cartas // 4
+    valor = np.where(rank == rank_manilha, 10 + cartas % 4, rank)
+    return np.where(cartas < 0, -1, valor)
+
+
+def checar_vencedor_lote(resultado, rodada):
+    """ Versão vetorizada de _checar_vencedor_da_mao: 1, 2, 0 (empate) ou -1 (mão continua). """
+    t1 = (resultado == 1).sum(axis=1)
+    t2 = (resultado == 2).sum(axis=1)
+    empates = (resultado == 0).sum(axis=1)
+    terminou = rodada > 3
+    condicoes = [
+        t1 >= 2,
+        t2 >= 2,
+        terminou & (t1 == 1) & (t2 == 1),
+        terminou & (empates == 2),
+        terminou & (empates == 3),
+        (empates == 1) & (rodada > 2) & (t1 == 1),
+        (empates == 1) & (rodada > 2) & (t2 == 1),
+    ]
+    escolhas = [1, 2, resultado[:, 2], resultado[:, 2], 0, 1, 2]
+    return np.select(condicoes, escolhas, default=-1).astype(np.int8)
+
+
+def achatar_estado_lote(jogo, n, bot_id=None, rng=None):
+    """
+    Converte um JogoTruco2v2 em um lote de N linhas.
+    Sem bot_id, todas as linhas repetem o estado verdadeiro (como o MCTS de CPU faz).
+    Com bot_id, as mãos dos outros três jogadores são sorteadas de novo em cada linha,
+    entre as cartas que o bot não viu (nem na mão, nem na vira, nem já jogadas).
+    """
+    return achatar_estados_lote([jogo], n, None if bot_id is None else [bot_id], rng)
+
+
+def determinizar_lote(jogo, n, bot_id, rng=None, crenca=None):
+    """
+    Lote de n determinizações do ponto de vista do bot: as mãos ocultas saem da crença
+    (crenca.py, já sincronizada) se houver uma, ou são sorteadas entre as cartas não vistas.
+    Sem rng, usa um gerador semeado pelo módulo random.
+    """
+    rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+    if crenca is not None:
+        lote = achatar_estado_lote(jogo, n)
+        lote['maos'] = crenca.amostrar_maos(jogo, n, rng)
+        return lote
+    return achatar_estado_lote(jogo, n, bot_id, rng)
+
+
+def achatar_estados_lote(jogos, n, bot_ids=None, rng=None):
+    """
+    Versão de achatar_estado_lote para vários jogos de uma vez: o lote tem n linhas
+    seguidas para cada jogo, na ordem recebida. O sorteio das mãos ocultas (bot_ids)
+    é feito para todas as linhas juntas.
+    """
+    maos, mesas, resultados, escalares = [], [], [], []
+    for jogo in jogos:
+        mao = [[-1, -1, -1] for _ in range(4)]
+        mesa = [-1, -1, -1, -1]
+        for j, p in enumerate(jogo.jogadores):
+            for k, c in enumerate(p.mao):
+                mao[j][k] = CARTA_PARA_INT[c]
+        for p, c in jogo.cartas_na_mesa:
+            mesa[jogo.jogadores.index(p)] = CARTA_PARA_INT[c]
+        maos.append(mao)
+        mesas.append(mesa)
+        resultados.append(jogo.resultado_rodada)
+        escalares.append((CARTA_PARA_INT[jogo.vira], jogo.jogador_atual_idx, jogo.rodada_atual, jogo.vencedor_turno_idx))
+
+    escalares = np.array(escalares, dtype=np.int32).reshape(-1, 4)
+    lote = {
+        'maos': np.repeat(np.array(maos, dtype=np.int8).reshape(-1, 4, 3), n, axis=0),
+        'mesa': np.repeat(np.array(mesas, dtype=np.int8).reshape(-1, 4), n, axis=0),
+        'resultado': np.repeat(np.array(resultados, dtype=np.int8).reshape(-1, 3), n, axis=0),
+        'vira': np.repeat(escalares[:, 0], n),
+        'jogador': np.repeat(escalares[:, 1], n),
+        'rodada': np.repeat(escalares[:, 2], n),
+        'vencedor_turno': np.repeat(escalares[:, 3], n),
+    }
+    if bot_ids is not None:
+        _determinizar(lote, jogos, bot_ids, n, rng if rng is not None else np.random.default_rng())
+    return lote
+
+
+def _determinizar(lote, jogos, bot_ids, n, rng):
+    """ Sorteia, em cada linha, as cartas dos adversários/parceiro entre as que o bot não viu. """
+    conhecidas = np.zeros((len(jogos), 40), dtype=bool)
+    idx_bots = np.empty(len(jogos), dtype=np.int64)
+    for i, (jogo, bot_id) in enumerate(zip(jogos, bot_ids)):
+        idx_bot = next(j for j, p in enumerate(jogo.jogadores) if p.id == bot_id)
+        idx_bots[i] = idx_bot
+        vistas = [CARTA_PARA_INT[c] for c in jogo.jogadores[idx_bot].mao]
+        vistas.append(CARTA_PARA_INT[jogo.vira])
+        vistas.extend(CARTA_PARA_INT[c] for c in jogo.cartas_jogadas)
+        conhecidas[i, vistas] = True
+    conhecidas = np.repeat(conhecidas, n, axis=0)
+    idx_bots = np.repeat(idx_bots, n)
+
+    # Embaralha as desconhecidas de cada linha: as conhecidas ficam no fim da ordenação
+    chaves = np.where(conhecidas, 2.0, rng.random(conhecidas.shape))
+    ordem = np.argsort(chaves, axis=1).astype(np.int8)
+
+    # Os espaços ocupados dos outros jogadores recebem as desconhecidas em sequência
+    maos = lote['maos'].reshape(len(idx_bots), 12)
+    alvo = maos >= 0
+    alvo.reshape(-1, 4, 3)[np.arange(len(idx_bots)), idx_bots] = False
+    posicao = np.cumsum(alvo, axis=1) - 1
+    sorteadas = np.take_along_axis(ordem, np.maximum(posicao, 0), axis=1)
+    maos[alvo] = sorteadas[alvo]
+
+
+def concatenar_lotes(lotes):
+    return {campo: np.concatenate([l[campo] for l in lotes]) for campo in CAMPOS_LOTE}
+
+
+def posicao_heuristica(mao_jog, mesa, jog, rank_manilha):
+    """
+    Versão vetorizada (sem ruído) de politica_rollout.escolher_carta_heuristica: para
+    cada linha, a posição (0..2) da carta que o jogador `jog` joga da sua mão `mao_jog`.
+    """
+    linhas = np.arange(len(jog))
+    rank_manilha = rank_manilha[:, None]
+    valida = mao_jog >= 0
+    valores = valor_cartas(mao_jog, rank_manilha)
+    valores_mesa = valor_cartas(mesa, rank_manilha)
+    parceiro = valores_mesa[linhas, (jog + 2) % 4]
+    adversario = np.maximum(valores_mesa[linhas, (jog + 1) % 4], valores_mesa[linhas, (jog + 3) % 4])
+
+    forte = np.where(valida, valores, -2).argmax(axis=1)
+    fraca = np.where(valida, valores, 99).argmin(axis=1)
+    vencedoras = valida & (valores > adversario[:, None])
+    barata = np.where(vencedoras, valores, 99).argmin(axis=1)
+    k = np.where(parceiro > adversario, fraca, np.where(vencedoras.any(axis=1), barata, fraca))
+    return np.where((mesa < 0).all(axis=1), forte, k)
+
+
+def escolher_cartas_heuristica(mao_jog, mesa, jog, rank_manilha, rng, ruido=RUIDO_PADRAO):
+    """ posicao_heuristica com ruído: com probabilidade `ruido` a posição é sorteada. """
+    k = posicao_heuristica(mao_jog, mesa, jog, rank_manilha)
+    valida = mao_jog >= 0
+    sorteada = np.where(valida, rng.random(mao_jog.shape), -1.0).argmax(axis=1)
+    return np.where(rng.random(len(jog)) < ruido, sorteada, k)
+
+
+def simular_maos_lote(lote, rng=None, politica='aleatoria', ruido=RUIDO_PADRAO, retornar_rodadas=False):
+    """
+    Joga até o fim todas as mãos do lote, com cartas escolhidas pela política de
+    rollout ('aleatoria' ou 'heuristica', ver politica_rollout.py; 'roteiro' só em conformidade.py).
+    Retorna o time vencedor de cada linha (1, 2 ou 0 para mão empatada); com
+    retornar_rodadas=True, (vencedores, resultado de cada rodada).
+    """
+    validar_politica(politica, permitir_roteiro=True)
+    rng = rng if rng is not None else np.random.default_rng()
+    maos = lote['maos'].copy()
+    mesa = lote['mesa'].copy()
+    resultado = lote['resultado'].copy()
+    jogador = lote['jogador'].copy()
+    rodada = lote['rodada'].copy()
+    vencedor_turno = lote['vencedor_turno'].copy()
+    rank_manilha = (lote['vira'] // 4 + 1) % 10
+
+    n = len(jogador)
+    vencedor = np.full(n, -1, dtype=np.int8)
+    jogadas_restantes = int((maos >= 0).sum(axis=(1, 2)).max()) if n else 0
+
+    for _ in range(jogadas_restantes):
+        ativos = np.flatnonzero(vencedor < 0)
+        if ativos.size == 0:
+            break
+        # O jogador da vez joga uma carta (sorteada ou pela heurística) entre as que ainda tem
+        jog = jogador[ativos]
+        mao_jog = maos[ativos, jog]
+        if politica == 'heuristica':
+            k = escolher_cartas_heuristica(mao_jog, mesa[ativos], jog, rank_manilha[ativos], rng, ruido)
+        elif politica == POLITICA_ROTEIRO:
+            k = (mao_jog >= 0).argmax(axis=1)
+        else:
+            k = np.where(mao_jog >= 0, rng.random(mao_jog.shape), -1.0).argmax(axis=1)
+        _jogar_posicoes(maos, mesa, resultado, jogador, rodada, vencedor_turno, rank_manilha, vencedor, ativos, k)
+
+    if retornar_rodadas:
+        return vencedor, resultado
+    return vencedor
+
+
+def _jogar_posicoes(maos, mesa, resultado, jogador, rodada, vencedor_turno, rank_manilha, vencedor, ativos, k):
+    """ Nas linhas `ativos`, o jogador da vez joga a carta da posição k; fecha as rodadas completas. """
+    jog = jogador[ativos]
+    mesa[ativos, jog] = maos[ativos, jog, k]
+    maos[ativos, jog, k] = -1
+    jogador[ativos] = (jog + 1) % 4
+
+    c = ativos[(mesa[ativos] >= 0).all(axis=1)]
+    if c.size == 0:
+        return
+    valores = valor_cartas(mesa[c], rank_manilha[c][:, None])
+    maior = valores.max(axis=1)
+    empate = (valores == maior[:, None]).sum(axis=1) > 1
+    ganhador = valores.argmax(axis=1)
+    resultado[c, rodada[c] - 1] = np.where(empate, 0, ganhador % 2 + 1)
+    vencedor_turno[c] = np.where(empate, vencedor_turno[c], ganhador)
+    jogador[c] = vencedor_turno[c]
+    mesa[c] = -1
+    rodada[c] += 1
+    vencedor[c] = checar_vencedor_lote(resultado[c], rodada[c])
+
+
+def aplicar_jogada_lote(lote, cartas):
+    """
+    Em cada linha, o jogador da vez joga a carta `cartas[i]` (CARTA_PARA_INT), que
+    precisa estar na sua mão. Retorna (novo lote, vencedor): o vencedor é 1, 2 ou 0
+    nas linhas em que a jogada encerrou a mão e -1 nas outras, que seguem para
+    simular_maos_lote / simular_maos_numba.
+    """
+    novo = {campo: lote[campo].copy() for campo in CAMPOS_LOTE}
+    n = len(novo['jogador'])
+    linhas = np.arange(n)
+    k = (novo['maos'][linhas, novo['jogador']] == np.asarray(cartas)[:, None]).argmax(axis=1)
+    vencedor = np.full(n, -1, dtype=np.int8)
+    _jogar_posicoes(novo['maos'], novo['mesa'], novo['resultado'], novo['jogador'], novo['rodada'],
+                    novo['vencedor_turno'], (novo['vira'] // 4 + 1) % 10, vencedor, linhas, k)
+    return novo, vencedor
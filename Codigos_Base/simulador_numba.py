@@ -0,0 +1,197 @@
+import time
+import random
+import numpy as np
+from numba import njit, prange
+from politica_rollout import CODIGO_POLITICA, POLITICAS, RUIDO_PADRAO, validar_politica
+
+# ======================================================================
+# Simulador de mãos em lote compilado com Numba (CPU, multi-thread).
+# Recebe o mesmo lote de simulador_lote.py e segue as mesmas regras de
+# logica.py, mas percorre cada linha com laços escalares compilados.
+# Os kernels ficam em cache no disco (cache=True); aquecer() carrega ou
+# compila todos antes da primeira decisão.
+#
+# Os sorteios não usam o np.random do Numba: dentro do prange cada thread
+# tem o seu próprio estado, e o resultado dependeria de qual thread pegou
+# cada linha. Cada linha tem o seu gerador (splitmix64), que começa do
+# hash de (semente do lote, índice da linha): o lote dá o mesmo resultado
+# com qualquer número de threads.
+# ======================================================================
+
+# Constantes do splitmix64
+_GAMA = np.uint64(0x9E3779B97F4A7C15)
+_MISTURA1 = np.uint64(0xBF58476D1CE4E5B9)
+_MISTURA2 = np.uint64(0x94D049BB133111EB)
+
+
+@njit(cache=True)
+def _misturar(z):
+    z = (z ^ (z >> np.uint64(30))) * _MISTURA1
+    z = (z ^ (z >> np.uint64(27))) * _MISTURA2
+    return z ^ (z >> np.uint64(31))
+
+
+@njit(cache=True)
+def _sortear(estado):
+    """ Próximo número em [0, 1) do gerador da linha (estado: array uint64 de 1 posição). """
+    estado[0] += _GAMA
+    return (_misturar(estado[0]) >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+@njit(cache=True)
+def _valor_carta(carta, rank_manilha):
+    if carta < 0:
+        return -1
+    rank = carta // 4
+    if rank == rank_manilha:
+        return 10 + carta % 4
+    return rank
+
+
+@njit(cache=True)
+def _checar_vencedor(resultado, rodada):
+    """ Mesma ordem de testes de JogoTruco2v2._checar_vencedor_da_mao; -1 = mão continua. """
+    t1 = 0; t2 = 0; empates = 0
+    for t in range(3):
+        if resultado[t] == 1: t1 += 1
+        elif resultado[t] == 2: t2 += 1
+        else: empates += 1
+    if t1 >= 2: return 1
+    if t2 >= 2: return 2
+    if rodada > 3:
+        if t1 == 1 and t2 == 1: return resultado[2]
+        if empates == 2: return resultado[2]
+        if empates == 3: return 0
+    if empates == 1 and rodada > 2:
+        if t1 == 1: return 1
+        if t2 == 1: return 2
+    return -1
+
+
+@njit(cache=True)
+def _escolher_heuristica(mao, mesa, jogador, rank_manilha):
+    """ Posição da carta escolhida pela política heurística (ver politica_rollout.py). """
+    parceiro = _valor_carta(mesa[(jogador + 2) % 4], rank_manilha)
+    adversario = max(_valor_carta(mesa[(jogador + 1) % 4], rank_manilha),
+                     _valor_carta(mesa[(jogador + 3) % 4], rank_manilha))
+    abrindo = parceiro < 0 and adversario < 0 and mesa[jogador] < 0
+    forte = -1; fraca = -1; barata = -1
+    v_forte = -2; v_fraca = 99; v_barata = 99
+    for k in range(3):
+        if mao[jogador, k] < 0:
+            continue
+        v = _valor_carta(mao[jogador, k], rank_manilha)
+        if v > v_forte:
+            v_forte = v; forte = k
+        if v < v_fraca:
+            v_fraca = v; fraca = k
+        if v > adversario and v < v_barata:
+            v_barata = v; barata = k
+    if abrindo:
+        return forte
+    if parceiro > adversario or barata < 0:
+        return fraca
+    return barata
+
+
+@njit(cache=True)
+def _simular_uma_mao(mao, mesa, resultado, vira, jogador, rodada, vencedor_turno, politica, ruido, estado):
+    """ Joga uma mão até o fim (altera os arrays recebidos) e retorna o time vencedor; sorteia com _sortear(estado). """
+    rank_manilha = (vira // 4 + 1) % 10
+    while True:
+        validas = 0
+        for k in range(3):
+            if mao[jogador, k] >= 0:
+                validas += 1
+        if validas == 0:
+            return 0
+        if politica == 1 and _sortear(estado) >= ruido:
+            k = _escolher_heuristica(mao, mesa, jogador, rank_manilha)
+            mesa[jogador] = mao[jogador, k]
+            mao[jogador, k] = -1
+        elif politica == 2:
+            # Roteiro (conformidade.py): a primeira carta que resta na mão
+            k = 0
+            while mao[jogador, k] < 0:
+                k += 1
+            mesa[jogador] = mao[jogador, k]
+            mao[jogador, k] = -1
+        else:
+            escolha = int(_sortear(estado) * validas)
+            vistas = 0
+            for k in range(3):
+                if mao[jogador, k] >= 0:
+                    if vistas == escolha:
+                        mesa[jogador] = mao[jogador, k]
+                        mao[jogador, k] = -1
+                        break
+                    vistas += 1
+        jogador = (jogador + 1) % 4
+
+        completa = True
+        for j in range(4):
+            if mesa[j] < 0:
+                completa = False
+        if not completa:
+            continue
+
+        maior = -1; ganhador = -1; contagem = 0
+        for j in range(4):
+            v = _valor_carta(mesa[j], rank_manilha)
+            if v > maior:
+                maior = v; ganhador = j; contagem = 1
+            elif v == maior:
+                contagem += 1
+        if contagem > 1:
+            resultado[rodada - 1] = 0
+        else:
+            resultado[rodada - 1] = ganhador % 2 + 1
+            vencedor_turno = ganhador
+        jogador = vencedor_turno
+        for j in range(4):
+            mesa[j] = -1
+        rodada += 1
+        vencedor = _checar_vencedor(resultado, rodada)
+        if vencedor >= 0:
+            return vencedor
+
+
+@njit(parallel=True, cache=True)
+def _simular_lote(maos, mesa, resultado, vira, jogador, rodada, vencedor_turno, politica, ruido, semente):
+    n = maos.shape[0]
+    vencedores = np.empty(n, dtype=np.int8)
+    # Cada linha joga sobre a sua linha desta cópia, que termina com o resultado de cada rodada
+    rodadas = resultado.copy()
+    for i in prange(n):
+        estado = np.empty(1, dtype=np.uint64)
+        estado[0] = _misturar(semente + np.uint64(i) * _GAMA)
+        vencedores[i] = _simular_uma_mao(maos[i].copy(), mesa[i].copy(), rodadas[i], vira[i], jogador[i],
+                                         rodada[i], vencedor_turno[i], politica, ruido, estado)
+    return vencedores, rodadas
+
+
+def simular_maos_numba(lote, rng=None, politica='aleatoria', ruido=RUIDO_PADRAO, retornar_rodadas=False):
+    """
+    Mesma interface de simulador_lote.simular_maos_lote, usando o kernel compilado. A semente
+    do lote sai de `rng` (ou do random global); o resultado não depende do número de threads.
+    """
+    codigo = CODIGO_POLITICA[validar_politica(politica, permitir_roteiro=True)]
+    semente = int(rng.integers(2**63)) if rng is not None else random.getrandbits(63)
+    vencedores, rodadas = _simular_lote(lote['maos'], lote['mesa'], lote['resultado'], lote['vira'],
+                                        lote['jogador'], lote['rodada'], lote['vencedor_turno'], codigo, float(ruido),
+                                        np.uint64(semente))
+    return (vencedores, rodadas) if retornar_rodadas else vencedores
+
+
+def aquecer():
+    """
+    Compila (ou carrega do cache em disco) e executa os kernels com os tipos do lote de
+    simulador_lote.py, nas duas políticas de rollout. Retorna os segundos gastos.
+    """
+    from simulador_lote import achatar_estado_lote
+    from aquecimento import jogo_de_aquecimento
+    inicio = time.perf_counter()
+    jogo, jogador = jogo_de_aquecimento()
+    lote = achatar_estado_lote(jogo, 8, jogador.id, np.random.default_rng(0))
+    for politica in POLITICAS:
+        simular_maos_numba(lote, np.random.default_rng(0), politica)
+    return time.perf_counter() - inicio
@@ -0,0 +1,271 @@
+import os
+import time
+import argparse
+import itertools
+from functools import lru_cache
+import numpy as np
+from joblib import Parallel, delayed
+from canonizacao import rank_da_manilha, codigo_canonico
+from simulador_lote import simular_maos_lote
+
+# ======================================================================
+# Tabela de equidade e de carta de abertura
+# ----------------------------------------------------------------------
+# Antes da primeira carta da mão, tudo o que o bot sabe é a própria mão,
+# a vira e o seu assento em relação a quem começa. Depois da canonização
+# de naipes (canonizacao.py) sobram ~16 mil casos (10 manilhas x 4 assentos
+# x ~400 mãos), que este script simula em massa, offline:
+#   - vitoria / empate: probabilidade de o time do bot ganhar / empatar a
+#     mão com jogo aleatório (o mesmo modelo dos rollouts dos agentes);
+#   - taxa_carta: para o bot que abre a mão (assento 0), a taxa de vitória
+#     de cada carta da mão canônica como primeira jogada, com as mesmas
+#     distribuições para as três (números aleatórios comuns);
+#   - ic / ic_carta: meia largura do intervalo de 95% de cada estimativa.
+#
+# A geração é feita em partes (uma por manilha x assento), em paralelo, e
+# cada parte pronta fica gravada: rodar de novo continua de onde parou.
+#
+#   python tabela_abertura.py --rollouts 20000
+#
+# O resultado é um .npy estruturado, aberto com mmap pelos agentes.
+# ======================================================================
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tabela_abertura.npy')
+
+DTYPE_TABELA = np.dtype([
+    ('manilha', 'i1'),         # rank (índice em Carta.RANKS) da manilha
+    ('assento', 'i1'),         # posição do bot a partir de quem começa a mão (0 = abre)
+    ('mao', 'i1', (3,)),       # códigos canônicos da mão, ordenados
+    ('n', 'i4'),               # rollouts por estimativa
+    ('vitoria', 'f4'),
+    ('empate', 'f4'),
+    ('ic', 'f4'),
+    ('taxa_carta', 'f4', (3,)),  # só no assento 0; NaN nos outros
+    ('ic_carta', 'f4', (3,)),
+    ('melhor', 'i1'),          # índice em 'mao' da melhor abertura (-1 fora do assento 0)
+])
+
+Z_95 = 1.96
+
+
+def maos_canonicas(rank_manilha):
+    """ Todas as mãos canônicas possíveis (tuplas ordenadas de códigos) para uma manilha. """
+    rank_vira = (rank_manilha - 1) % 10
+    disponiveis = {}
+    for rank in range(10):
+        if rank == rank_manilha:
+            for naipe in range(4):
+                disponiveis[rank * 4 + naipe] = 1
+        else:
+            disponiveis[rank * 4] = 3 if rank == rank_vira else 4
+    maos = []
+    for mao in itertools.combinations_with_replacement(sorted(disponiveis), 3):
+        if all(mao.count(c) <= disponiveis[c] for c in set(mao)):
+            maos.append(mao)
+    return maos
+
+
+def _cartas_concretas(mao, rank_manilha):
+    """ Escolhe naipes reais para uma mão canônica; a vira é sempre o Ouros do rank anterior. """
+    vira = ((rank_manilha - 1) % 10) * 4
+    usadas = {vira}
+    cartas = []
+    for codigo in mao:
+        carta = codigo
+        while carta in usadas:
+            carta += 1  # próximo naipe do mesmo rank (só acontece com cartas comuns)
+        usadas.add(carta)
+        cartas.append(carta)
+    return np.array(cartas, dtype=np.int8), vira
+
+
+def _meia_largura(p, n):
+    return Z_95 * np.sqrt(p * (1 - p) / n)
+
+
+def _gerar_parte(rank_manilha, assento, n_rollouts, semente, backend):
+    """ Simula todas as mãos de uma (manilha, assento) e retorna as linhas da tabela. """
+    if backend == 'numba':
+        from simulador_numba import simular_maos_numba as simular
+    else:
+        simular = simular_maos_lote
+    rng = np.random.default_rng([semente, rank_manilha, assento])
+    time_bot = assento % 2 + 1
+    maos = maos_canonicas(rank_manilha)
+    linhas = np.zeros(len(maos), dtype=DTYPE_TABELA)
+
+    for i, mao in enumerate(maos):
+        cartas, vira = _cartas_concretas(mao, rank_manilha)
+        resto = np.array([c for c in range(40) if c != vira and c not in cartas], dtype=np.int8)
+        outras = rng.permuted(np.tile(resto, (n_rollouts, 1)), axis=1)[:, :9].reshape(n_rollouts, 3, 3)
+
+        maos_lote = np.empty((n_rollouts, 4, 3), dtype=np.int8)
+        maos_lote[:, [j for j in range(4) if j != assento]] = outras
+        maos_lote[:, assento] = cartas
+        lote = {
+            'maos': maos_lote,
+            'mesa': np.full((n_rollouts, 4), -1, dtype=np.int8),
+            'resultado': np.zeros((n_rollouts, 3), dtype=np.int8),
+            'vira': np.full(n_rollouts, vira, dtype=np.int32),
+            'jogador': np.zeros(n_rollouts, dtype=np.int32),
+            'rodada': np.ones(n_rollouts, dtype=np.int32),
+            'vencedor_turno': np.zeros(n_rollouts, dtype=np.int32),
+        }
+        vencedores = simular(lote, rng)
+        p = float((vencedores == time_bot).mean())
+        linha = linhas[i]
+        linha['manilha'], linha['assento'], linha['mao'], linha['n'] = rank_manilha, assento, mao, n_rollouts
+        linha['vitoria'], linha['empate'], linha['ic'] = p, float((vencedores == 0).mean()), _meia_largura(p, n_rollouts)
+        linha['taxa_carta'] = np.nan
+        linha['ic_carta'] = np.nan
+        linha['melhor'] = -1
+
+        if assento == 0:
+            # O bot abre: força cada carta como primeira jogada sobre as mesmas distribuições
+            taxas = np.full(3, np.nan)
+            for k in range(3):
+                if k > 0 and mao[k] == mao[k - 1]:
+                    taxas[k] = taxas[k - 1]
+                    continue
+                aberto = {campo: valor.copy() for campo, valor in lote.items()}
+                aberto['mesa'][:, 0] = cartas[k]
+                aberto['maos'][:, 0, k] = -1
+                aberto['jogador'][:] = 1
+                taxas[k] = float((simular(aberto, rng) == time_bot).mean())
+            linha['taxa_carta'] = taxas
+            linha['ic_carta'] = _meia_largura(taxas, n_rollouts)
+            linha['melhor'] = int(np.argmax(taxas))
+    return linhas
+
+
+def backend_mais_rapido():
+    try:
+        import simulador_numba  # noqa: F401
+        return 'numba'
+    except ImportError:
+        return 'numpy'
+
+
+def _gerar_e_gravar(caminho, rank_manilha, assento, n_rollouts, semente, backend):
+    linhas = _gerar_parte(rank_manilha, assento, n_rollouts, semente, backend)
+    temporario = caminho + '.tmp.npy'
+    np.save(temporario, linhas)
+    os.replace(temporario, caminho)  # a parte só "existe" quando está completa
+    return len(linhas)
+
+
+def gerar_tabela(saida=ARQUIVO_PADRAO, n_rollouts=20000, n_jobs=1, semente=0, backend=None):
+    """ Gera (ou completa) a tabela. As partes prontas ficam em <saida>.partes/. """
+    backend = backend or backend_mais_rapido()
+    pasta = saida + '.partes'
+    os.makedirs(pasta, exist_ok=True)
+    partes = {(m, a): os.path.join(pasta, f"m{m}_a{a}_n{n_rollouts}_s{semente}.npy")
+              for m in range(10) for a in range(4)}
+    faltando = [parte for parte, caminho in partes.items() if not os.path.exists(caminho)]
+    print(f"{len(partes) - len(faltando)}/{len(partes)} partes já prontas; backend {backend}, {n_jobs} processo(s).")
+
+    inicio = time.perf_counter()
+    Parallel(n_jobs=n_jobs, verbose=5 if faltando else 0)(
+        delayed(_gerar_e_gravar)(partes[(m, a)], m, a, n_rollouts, semente, backend) for m, a in faltando
+    )
+    tabela = np.concatenate([np.load(caminho) for caminho in partes.values()])
+    np.save(saida, tabela)
+    print(f"{len(tabela)} casos gravados em {saida} ({time.perf_counter() - inicio:.1f}s).")
+    return tabela
+
+
+def resumo_intervalos(tabela):
+    abre = tabela[tabela['assento'] == 0]
+    ordenadas = np.sort(abre['taxa_carta'], axis=1)
+    # Diferença entre a melhor e a segunda melhor abertura, quando as cartas diferem
+    margem = ordenadas[:, 2] - ordenadas[:, 1]
+    return (f"IC 95% da equidade: médio ±{tabela['ic'].mean():.4f}, máximo ±{tabela['ic'].max():.4f} | "
+            f"aberturas com margem menor que o IC: {(margem < abre['ic_carta'].max(axis=1)).mean():.1%}")
+
+
+@lru_cache(maxsize=None)
+def prob_vitoria_partida(nos, eles):
+    """
+    Chance de vencer a partida a partir do placar (antes da próxima mão), com mãos
+    equilibradas e decisões ótimas na Mão de Onze. Empates só repetem a mão, então
+    não mudam a conta.
+    """
+    if nos >= 12: return 1.0
+    if eles >= 12: return 0.0
+    if nos == 11 and eles == 11:
+        return 0.5
+    if eles == 11:
+        return 1.0 - prob_vitoria_partida(eles, nos)
+    if nos == 11:
+        jogar = 0.5 + 0.5 * prob_vitoria_partida(11, eles + 3)
+        correr = prob_vitoria_partida(11, eles + 1)
+        return max(jogar, correr)
+    return 0.5 * prob_vitoria_partida(nos + 1, eles) + 0.5 * prob_vitoria_partida(nos, eles + 1)
+
+
+class TabelaAbertura:
+    """ Consulta O(1) à tabela gerada (aberta com mmap; o índice é montado uma vez). """
+    def __init__(self, caminho=ARQUIVO_PADRAO):
+        self.caminho = caminho
+        self.tabela = np.load(caminho, mmap_mode='r')
+        self.indice = {
+            (int(m), int(a), tuple(int(c) for c in mao)): i
+            for i, (m, a, mao) in enumerate(zip(self.tabela['manilha'], self.tabela['assento'], self.tabela['mao']))
+        }
+
+    def consultar(self, jogo, jogador_bot):
+        """ Linha do caso atual, ou None se a mão já começou ou o bot não tem 3 cartas. """
+        if jogo.cartas_jogadas or len(jogador_bot.mao) != 3:
+            return None
+        idx_bot = next(i for i, p in enumerate(jogo.jogadores) if p.id == jogador_bot.id)
+        rank_manilha = rank_da_manilha(jogo)
+        mao = tuple(sorted(codigo_canonico(c, rank_manilha) for c in jogador_bot.mao))
+        i = self.indice.get((rank_manilha, (idx_bot - jogo.jogador_iniciou_rodada_idx) % 4, mao))
+        return None if i is None else self.tabela[i]
+
+    def jogada_de_abertura(self, jogo, jogador_bot):
+        """ (carta, taxa) se o bot abre a mão e o caso está na tabela; senão None. """
+        linha = self.consultar(jogo, jogador_bot)
+        if linha is None or linha['melhor'] < 0:
+            return None
+        rank_manilha = rank_da_manilha(jogo)
+        codigo = int(linha['mao'][linha['melhor']])
+        carta = next(c for c in jogador_bot.mao if codigo_canonico(c, rank_manilha) == codigo)
+        return carta, float(linha['taxa_carta'][linha['melhor']])
+
+    def aceitar_mao_de_onze(self, jogo, jogador_bot):
+        """ Joga a Mão de Onze se isso der mais chance de vencer a partida do que correr; None se fora da tabela. """
+        linha = self.consultar(jogo, jogador_bot)
+        if linha is None:
+            return None
+        eles = jogo.pontos_time2 if jogador_bot.time_id == 1 else jogo.pontos_time1
+        vitoria, empate = float(linha['vitoria']), float(linha['empate'])
+        jogar = vitoria + (1 - vitoria - empate) * prob_vitoria_partida(11, eles + 3) + empate * prob_vitoria_partida(11, eles)
+        return jogar >= prob_vitoria_partida(11, eles + 1)
+
+
+def carregar_tabela(caminho=None):
+    """ TabelaAbertura do arquivo padrão (ou de TRUCO_TABELA), ou None se ainda não foi gerada. """
+    caminho = caminho or os.environ.get('TRUCO_TABELA', ARQUIVO_PADRAO)
+    return TabelaAbertura(caminho) if os.path.exists(caminho) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera a tabela de equidade e de abertura (retomável).")
+    parser.add_argument('--rollouts', type=int, default=20000, help="Rollouts por estimativa.")
+    parser.add_argument('--n-jobs', type=int, default=None,
+                        help="Processos (padrão: 1 com Numba, que já usa todos os núcleos; todos com NumPy).")
+    parser.add_argument('--backend', choices=['numpy', 'numba'], default=None)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default=ARQUIVO_PADRAO)
+    args = parser.parse_args()
+
+    backend = args.backend or backend_mais_rapido()
+    n_jobs = args.n_jobs
+    if n_jobs is None:
+        n_jobs = 1 if backend == 'numba' else -1
+    tabela = gerar_tabela(args.saida, args.rollouts, n_jobs, args.semente, backend)
+    print(resumo_intervalos(tabela))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# ======================================================================
+# Tempo de importação dos pontos de entrada
+# ----------------------------------------------------------------------
+# Roda `python -X importtime -c "import <módulo>"` em um processo novo
+# para cada módulo e lê o relatório do interpretador (stderr):
+#   - total_ms: tempo acumulado da importação do módulo;
+#   - pesados: bibliotecas pesadas que vieram junto (numba.cuda, pandas,
+#     matplotlib, seaborn), que só devem carregar quando um agente de GPU
+#     ou um relatório precisa delas;
+#   - mais_lentos: os módulos com maior tempo próprio.
+# O menor tempo entre as repetições é o que conta (caches do disco quentes).
+#
+#   python tempo_importacao.py --limite-ms 800 --json importacao.json
+#
+# Sai com código 1 se algum módulo carregar uma biblioteca pesada ou passar
+# do limite, para pegar regressões de inicialização.
+# ======================================================================
+
+MODULOS = ('logica', 'agente_mc', 'agente_mcts_multi', 'time_limit_mcts',
+           'tournament', 'tournamento', 'benchmark_runner')
+PESADOS = ('numba.cuda', 'pandas', 'matplotlib', 'seaborn')
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def _ler_relatorio(saida):
+    """ [(nome, próprio_us, acumulado_us)] das linhas 'import time:' do -X importtime. """
+    linhas = []
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|')
+        linhas.append((nome.strip(), int(proprio), int(acumulado)))
+    return linhas
+
+
+def medir_importacao(modulo, repeticoes=3):
+    """ Mede a importação de `modulo` em processos novos; ver o cabeçalho. """
+    melhor = None
+    for _ in range(repeticoes):
+        processo = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                                  cwd=DIRETORIO, capture_output=True, text=True)
+        if processo.returncode != 0:
+            erro = processo.stderr.strip().splitlines()[-1] if processo.stderr.strip() else ''
+            return {'modulo': modulo, 'erro': erro}
+        linhas = _ler_relatorio(processo.stderr)
+        total = next(acumulado for nome, _, acumulado in reversed(linhas) if nome == modulo)
+        if melhor is None or total < melhor[0]:
+            melhor = (total, linhas)
+
+    total, linhas = melhor
+    nomes = {nome for nome, _, _ in linhas}
+    return {
+        'modulo': modulo,
+        'total_ms': total / 1000,
+        'pesados': sorted(p for p in PESADOS if any(n == p or n.startswith(p + '.') for n in nomes)),
+        'mais_lentos': [(nome, proprio / 1000) for nome, proprio, _ in sorted(linhas, key=lambda l: -l[1])[:5]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação dos pontos de entrada.")
+    parser.add_argument('modulos', nargs='*', default=list(MODULOS))
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--limite-ms', type=float, default=None, help="Falha se algum módulo passar deste tempo.")
+    parser.add_argument('--json', default=None, help="Grava os resultados neste arquivo.")
+    args = parser.parse_args()
+
+    resultados, falhou = [], False
+    for modulo in args.modulos:
+        r = medir_importacao(modulo, args.repeticoes)
+        resultados.append(r)
+        if 'erro' in r:
+            falhou = True
+            print(f"  {modulo:<18} ERRO: {r['erro']}")
+            continue
+        lentos = ', '.join(f"{nome} {ms:.0f}" for nome, ms in r['mais_lentos'][:3])
+        print(f"  {modulo:<18} {r['total_ms']:8.1f} ms | pesados: {', '.join(r['pesados']) or '-'} | mais lentos (ms): {lentos}")
+        if r['pesados'] or (args.limite_ms is not None and r['total_ms'] > args.limite_ms):
+            falhou = True
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(resultados, f, indent=2)
+    sys.exit(1 if falhou else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 import unittest
 import copy
+import random
 from logica import JogoTruco2v2, Jogador, Carta
-from agente_mc import MonteCarloBot
+from agente_mc import MonteCarloBot, MOTORES
 
 class TestAgenteMonteCarlo(unittest.TestCase):
 
@@ -40,5 +41,77 @@ class TestAgenteMonteCarlo(unittest.TestCase):
         print("--- Teste concluído com sucesso! ---")
 
 
+class TestAvaliacaoPareada(unittest.TestCase):
+
+    def setUp(self):
+        self.jogo = JogoTruco2v2(simulacao=True)
+        self.jogo.distribuir_cartas()
+        self.jogo.vira = Carta('4', 'Ouros')  # manilha = 5
+        self.jogo._definir_manilhas()
+        self.jogador_bot = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+        # Duas cartas de mesmo valor: 7 comum de naipes diferentes
+        self.jogador_bot.mao = [Carta('7', 'Copas'), Carta('7', 'Espadas'), Carta('K', 'Paus')]
+        resto = [c for c in self.jogo.baralho_completo if c not in self.jogador_bot.mao and c != self.jogo.vira]
+        for jogador in self.jogo.jogadores:
+            if jogador is not self.jogador_bot:
+                jogador.mao = [resto.pop() for _ in range(3)]
+
+    def test_cartas_equivalentes_tem_diferenca_zero(self):
+        bot = MonteCarloBot(n_simulacoes=50, pareado=True)
+        resultados = bot.matriz_resultados(self.jogo, self.jogador_bot, self.jogador_bot.mao[:2], 50)
+        self.assertTrue((resultados[:, 0] == resultados[:, 1]).all())
+
+    def test_decisao_pareada(self):
+        bot = MonteCarloBot(n_simulacoes=30, pareado=True)
+        carta, taxa = bot.decidir_melhor_jogada(self.jogo, self.jogador_bot)
+        self.assertIn(carta, self.jogador_bot.mao)
+        self.assertTrue(0.0 <= taxa <= 1.0)
+        self.assertEqual(len(bot.ultima_comparacao), 3)
+
+    def test_alocacao_adaptativa_para_cedo_com_cartas_equivalentes(self):
+        # Três 7 comuns: as cartas são equivalentes, as diferenças pareadas são todas zero
+        self.jogador_bot.mao[2] = Carta('7', 'Paus')
+        for jogador in self.jogo.jogadores:
+            if jogador is not self.jogador_bot and Carta('7', 'Paus') in jogador.mao:
+                jogador.mao[jogador.mao.index(Carta('7', 'Paus'))] = Carta('K', 'Paus')
+        for alocacao in ('halving', 'lucb'):
+            bot = MonteCarloBot(n_simulacoes=1000, alocacao=alocacao)
+            carta, taxa = bot.decidir_melhor_jogada(self.jogo, self.jogador_bot)
+            self.assertIn(carta, self.jogador_bot.mao)
+            self.assertEqual(bot.ultima_alocacao['parada'], 'confianca')
+            self.assertLess(bot.ultima_alocacao['simulacoes'], 3000)
+
+    def test_motores_em_lote(self):
+        for motor in ('numpy', 'numba'):
+            bot = MonteCarloBot(n_simulacoes=50, motor=motor)
+            carta, taxa = bot.decidir_melhor_jogada(self.jogo, self.jogador_bot)
+            self.assertIn(carta, self.jogador_bot.mao)
+            self.assertTrue(0.0 <= taxa <= 1.0)
+            self.assertEqual(bot.matriz_resultados(self.jogo, self.jogador_bot, self.jogador_bot.mao[:2], 20).shape, (20, 2))
+
+    def test_ultima_carta_da_mao_no_lote(self):
+        # Joga 11 cartas: a última decide a mão e não deixa nada para o simulador
+        random.seed(3)
+        while True:
+            jogo = JogoTruco2v2(simulacao=True)
+            jogo.distribuir_cartas()
+            for _ in range(11):
+                jogador = jogo.jogadores[jogo.jogador_atual_idx]
+                jogo.jogar_carta(jogador.id, random.choice(jogador.mao))
+            if jogo.estado_jogo == "EM_ANDAMENTO":
+                break
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        copia = copy.deepcopy(jogo)
+        copia.jogar_carta(jogador.id, jogador.mao[0])
+        esperado = int(copia.vencedor_mao == jogador.time_id)
+        for motor in MOTORES:
+            resultados = MonteCarloBot(motor=motor).matriz_resultados(jogo, jogador, jogador.mao[:], 10)
+            self.assertTrue((resultados == esperado).all(), motor)
+
+    def test_alocacao_desconhecida(self):
+        with self.assertRaises(ValueError):
+            MonteCarloBot(alocacao='ucb')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
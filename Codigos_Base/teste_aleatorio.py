@@ -0,0 +1,56 @@
+import os
+import sys
+import subprocess
+import unittest
+from aleatorio import ServicoAleatorio, reproduzir_decisao
+from aquecimento import jogo_de_aquecimento
+from agente_mcts_multi import MCTSAgente
+
+
+class TestServicoAleatorio(unittest.TestCase):
+
+    def test_mesma_chave_mesmo_fluxo(self):
+        servico = ServicoAleatorio(1234)
+        self.assertEqual(list(servico.gerador('partida', 3).integers(1000, size=5)),
+                         list(ServicoAleatorio(1234).derivar('partida').gerador(3).integers(1000, size=5)))
+        self.assertEqual(servico.inteiro(7, 'cuda'), ServicoAleatorio(1234).inteiro(7, 'cuda'))
+        self.assertLess(servico.inteiro(0), 2 ** 63)
+
+    def test_chaves_diferentes_fluxos_diferentes(self):
+        servico = ServicoAleatorio(1234)
+        sementes = {servico.inteiro(k, j) for k in range(20) for j in range(4)}
+        self.assertEqual(len(sementes), 80)
+        self.assertNotEqual(servico.inteiro('multi', 0), ServicoAleatorio(1235).inteiro('multi', 0))
+
+    def test_reproduz_a_decisao(self):
+        jogo, jogador = jogo_de_aquecimento()
+        agente = MCTSAgente(n_simulacoes=300, n_jobs=1, aleatorio=ServicoAleatorio(7))
+        agente.decidir_melhor_jogada(jogo, jogador)
+        carta, taxa = agente.decidir_melhor_jogada(jogo, jogador)
+        identificador = agente.ultima_semente
+        self.assertEqual(identificador, [7, [1]])
+        refeita = reproduzir_decisao(MCTSAgente(n_simulacoes=300, n_jobs=1), jogo, jogador, identificador)
+        self.assertEqual(refeita, (carta, taxa))
+
+    def test_lote_numba_nao_depende_das_threads(self):
+        # Num processo novo: NUMBA_NUM_THREADS só vale antes de o Numba ser importado. A camada
+        # workqueue sobe as threads mesmo com um núcleo só (a do TBB se limita aos núcleos livres)
+        codigo = (
+            "import numba, numpy as np\n"
+            "from politica_rollout import estados_de_teste\n"
+            "from simulador_lote import achatar_estado_lote, concatenar_lotes\n"
+            "from simulador_numba import simular_maos_numba\n"
+            "lote = concatenar_lotes([achatar_estado_lote(e, 64, t, np.random.default_rng(0))"
+            " for e, t in estados_de_teste(8, semente=2)])\n"
+            "saidas = []\n"
+            "for threads in (1, 4):\n"
+            "    numba.set_num_threads(threads)\n"
+            "    saidas.append(simular_maos_numba(lote, np.random.default_rng(5), 'heuristica').tobytes())\n"
+            "print(saidas[0] == saidas[1])\n")
+        ambiente = dict(os.environ, NUMBA_NUM_THREADS='4', NUMBA_THREADING_LAYER='workqueue')
+        saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, env=ambiente,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), timeout=600)
+        self.assertEqual(saida.stdout.strip(), 'True', saida.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
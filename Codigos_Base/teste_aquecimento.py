@@ -0,0 +1,49 @@
+import unittest
+from unittest import mock
+from aquecimento import aquecer_agente, jogo_de_aquecimento
+from agente_mc import MonteCarloBot
+from agente_mcts import MCTSAgente
+import agente_mcts_multi
+import time_limit_mcts
+
+
+class ParallelContado:
+    """ Substitui o joblib.Parallel: só conta as tarefas recebidas, sem rodá-las. """
+    tarefas = 0
+
+    def __init__(self, n_jobs=None, **kwargs):
+        pass
+
+    def __call__(self, tarefas):
+        ParallelContado.tarefas = len(list(tarefas))
+        return []
+
+
+class TestAquecimento(unittest.TestCase):
+
+    def test_jogo_de_aquecimento_e_fixo(self):
+        jogo1, jogador1 = jogo_de_aquecimento()
+        jogo2, jogador2 = jogo_de_aquecimento()
+        self.assertEqual(jogador1.mao, jogador2.mao)
+        self.assertEqual(jogo1.vira, jogo2.vira)
+
+    def test_agente_sem_aquecer(self):
+        self.assertEqual(aquecer_agente(MCTSAgente(n_simulacoes=10)), 0.0)
+
+    def test_aquecer_nao_mexe_na_crenca(self):
+        bot = MonteCarloBot(n_simulacoes=10, n_particulas=32, motor='numba')
+        self.assertGreaterEqual(aquecer_agente(bot), 0.0)
+        self.assertIsNone(bot.crenca._identidade)
+
+    def test_aquecer_respeita_n_jobs(self):
+        # Numa máquina de 64 núcleos, um agente com n_jobs=2 aquece só 2 buscas, e um com n_jobs=-1, 64
+        for n_jobs, esperadas in ((2, 2), (-1, 64)):
+            for modulo, agente in ((agente_mcts_multi, agente_mcts_multi.MCTSAgente(n_simulacoes=10, n_jobs=n_jobs)),
+                                   (time_limit_mcts, time_limit_mcts.MCTSAgente(time_limit_por_jogada=0.01, n_jobs=n_jobs))):
+                with mock.patch.object(modulo, 'Parallel', ParallelContado), mock.patch('os.cpu_count', return_value=64):
+                    ParallelContado.tarefas = 0
+                    agente.aquecer()
+                    self.assertEqual(ParallelContado.tarefas, esperadas)
+
+if __name__ == '__main__':
+    unittest.main()
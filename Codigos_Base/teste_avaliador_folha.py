@@ -0,0 +1,55 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from logica import JogoTruco2v2
+from avaliador_folha import AvaliadorFolha, gerar_logs, treinar, simular_com_avaliador, NOMES_CARACTERISTICAS
+from agente_mcts_multi import run_single_mcts_search
+
+
+class TestAvaliadorFolha(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        X, y = gerar_logs(300, semente=0)
+        cls.X, cls.y = X, y
+        cls.avaliador = treinar(X, y)
+
+    def setUp(self):
+        random.seed(1)
+        self.jogo = JogoTruco2v2(simulacao=True)
+        self.jogo.iniciar_nova_mao()
+        self.bot = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+
+    def test_logs_tem_uma_linha_por_time_e_estado(self):
+        self.assertEqual(self.X.shape, (len(self.y), len(NOMES_CARACTERISTICAS)))
+        # Em cada par (time 1, time 2) no máximo um dos dois ganha a mão
+        self.assertTrue(np.all(self.y[0::2] + self.y[1::2] <= 1))
+
+    def test_treino_melhora_a_previsao_constante(self):
+        p = self.avaliador.probabilidades(self.X)
+        self.assertLess(np.mean((p - self.y) ** 2), np.mean((self.y.mean() - self.y) ** 2))
+
+    def test_pesos_salvos_e_carregados(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'pesos.npz')
+            self.avaliador.salvar(caminho)
+            carregado = AvaliadorFolha.carregar(caminho)
+        a = self.avaliador.avaliar(self.jogo, 1)
+        self.assertAlmostEqual(a, carregado.avaliar(self.jogo, 1), places=4)
+        self.assertAlmostEqual(a + self.avaliador.avaliar(self.jogo, 2), 1.0, delta=0.3)
+
+    def test_rollout_truncado_nao_altera_o_estado(self):
+        antes = [p.mao[:] for p in self.jogo.jogadores]
+        valor = simular_com_avaliador(self.jogo, self.bot.time_id, self.avaliador, 4)
+        self.assertTrue(0.0 <= valor <= 1.0)
+        self.assertEqual(antes, [p.mao for p in self.jogo.jogadores])
+
+    def test_mcts_com_avaliador_devolve_jogada_valida(self):
+        carta, taxa = run_single_mcts_search(self.jogo, self.bot, 30, self.avaliador, 0)
+        self.assertIn(carta, self.bot.mao)
+        self.assertTrue(0.0 <= taxa <= 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from benchmark_runner import anexar_resultado, carregar_resultados, executar, jogar_partida
+from metricas import ColetorMetricas
+
+
+class TestBenchmarkRetomavel(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'resultados.csv')
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_partida_repete_com_a_semente(self):
+        primeira, coletor = jogar_partida('single', 3, 50, 1, 9)
+        segunda, _ = jogar_partida('single', 3, 50, 1, 9)
+        for coluna in ('pontos_feitos', 'pontos_tomados', 'total_maos', 'calibracao'):
+            self.assertEqual(primeira[coluna], segunda[coluna])
+        self.assertEqual(coletor.partidas, 1)
+
+    def test_linha_pela_metade_e_cortada(self):
+        resultado, _ = jogar_partida('single', 0, 50, 1, 9)
+        anexar_resultado(self.caminho, resultado)
+        anexar_resultado(self.caminho, resultado)
+        with open(self.caminho, 'rb+') as f:
+            f.truncate(os.path.getsize(self.caminho) - 10)  # a execução caiu escrevendo a segunda
+        linhas = carregar_resultados(self.caminho)
+        self.assertEqual(len(linhas), 1)
+        self.assertEqual(linhas[0]['pontos_feitos'], resultado['pontos_feitos'])
+        anexar_resultado(self.caminho, resultado)
+        self.assertEqual(len(carregar_resultados(self.caminho)), 2)
+
+    def test_executar_grava_cada_partida(self):
+        coletor = ColetorMetricas()
+        executar([('single', 0), ('single', 1)], 50, 1, 9, 1, self.caminho, coletor)
+        self.assertEqual(sorted(r['partida'] for r in carregar_resultados(self.caminho)), [0, 1])
+        self.assertEqual(coletor.partidas, 2)
+
+    def test_falha_grava_as_partidas_terminadas(self):
+        modelo, coletor_modelo = jogar_partida('single', 0, 50, 1, 9)
+
+        def jogar(tipo, partida, *args):
+            if partida == 1:
+                raise ValueError('partida 1 caiu')
+            time.sleep(0.2)  # termina depois da falha
+            return dict(modelo, partida=partida), coletor_modelo
+
+        coletor = ColetorMetricas()
+        with mock.patch('benchmark_runner.jogar_partida', jogar), \
+                mock.patch('benchmark_runner.ProcessPoolExecutor',
+                           lambda processos, mp_context: ThreadPoolExecutor(processos)):
+            with self.assertRaises(ValueError):
+                executar([('single', i) for i in range(6)], 50, 1, 9, 2, self.caminho, coletor)
+        partidas = [r['partida'] for r in carregar_resultados(self.caminho)]
+        self.assertIn(0, partidas)
+        self.assertNotIn(1, partidas)
+        self.assertLess(len(partidas), 5)  # as da fila foram canceladas
+        self.assertEqual(coletor.partidas, len(partidas))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from logica import JogoTruco2v2, Carta
+from canonizacao import chave_canonica
+from cache_decisoes import CacheDecisoes, AgenteComCache
+
+
+def _preparar(mao_bot, vira, idx_bot=0):
+    """ Jogo no início da mão, com o bot (jogador idx_bot) começando e a mão dada. """
+    jogo = JogoTruco2v2(simulacao=True)
+    jogo.estado_jogo = "EM_ANDAMENTO"
+    jogo.vira = vira
+    jogo._definir_manilhas()
+    jogo.jogador_iniciou_rodada_idx = idx_bot
+    jogo.jogador_atual_idx = idx_bot
+    jogo.vencedor_turno_idx = idx_bot
+    jogo.jogadores[idx_bot].mao = mao_bot
+    return jogo, jogo.jogadores[idx_bot]
+
+
+class AgenteContador:
+    """ Agente falso: sempre joga a primeira carta e conta quantas vezes foi chamado. """
+    def __init__(self):
+        self.chamadas = 0
+        self.maos_vistas = []
+
+    def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
+        self.chamadas += 1
+        self.maos_vistas.append([j.mao[:] for j in estado_jogo.jogadores])
+        return jogador_bot.mao[0], 0.75
+
+
+class TestCanonizacao(unittest.TestCase):
+
+    def setUp(self):
+        self.vira = Carta('4', 'Ouros')  # manilha = 5
+
+    def test_naipe_comum_e_ordem_da_mao_nao_importam(self):
+        a = _preparar([Carta('K', 'Copas'), Carta('7', 'Ouros'), Carta('5', 'Paus')], self.vira)
+        b = _preparar([Carta('7', 'Espadas'), Carta('5', 'Paus'), Carta('K', 'Ouros')], self.vira)
+        self.assertEqual(chave_canonica(*a), chave_canonica(*b))
+
+    def test_naipe_da_manilha_importa(self):
+        a = _preparar([Carta('5', 'Paus')], self.vira)
+        b = _preparar([Carta('5', 'Ouros')], self.vira)
+        self.assertNotEqual(chave_canonica(*a), chave_canonica(*b))
+
+    def test_assento_e_relativo_ao_bot(self):
+        a = _preparar([Carta('K', 'Copas'), Carta('A', 'Ouros')], self.vira, idx_bot=0)
+        b = _preparar([Carta('K', 'Copas'), Carta('A', 'Ouros')], self.vira, idx_bot=1)
+        self.assertEqual(chave_canonica(*a), chave_canonica(*b))
+
+
+class TestCacheDecisoes(unittest.TestCase):
+
+    def test_lru_despeja_a_entrada_mais_antiga(self):
+        cache = CacheDecisoes(capacidade=2)
+        cache.somar('a', {0: (1, 1)})
+        cache.somar('b', {0: (1, 1)})
+        cache.obter('a')
+        cache.somar('c', {0: (1, 1)})
+        self.assertIsNone(cache.obter('b'))
+        self.assertIsNotNone(cache.obter('a'))
+        self.assertEqual(cache.estatisticas['despejos'], 1)
+
+    def test_camada_em_disco_persiste(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'decisoes.sqlite')
+            cache = CacheDecisoes(capacidade=1, caminho_disco=caminho)
+            cache.somar((1, 2, (3,)), {8: (10, 7)})
+            cache.fechar()
+            reaberto = CacheDecisoes(caminho_disco=caminho)
+            self.assertEqual(reaberto.obter((1, 2, (3,))), {'buscas': 1, 'jogadas': {8: [10, 7]}})
+            reaberto.fechar()
+
+    def test_posicao_equivalente_vem_do_cache(self):
+        vira = Carta('4', 'Ouros')
+        contador = AgenteContador()
+        agente = AgenteComCache(contador, buscas_minimas=1)
+        jogo_a, bot_a = _preparar([Carta('K', 'Copas'), Carta('7', 'Ouros')], vira)
+        jogo_b, bot_b = _preparar([Carta('7', 'Espadas'), Carta('K', 'Ouros')], vira, idx_bot=2)
+        carta_a, _ = agente.decidir_melhor_jogada(jogo_a, bot_a)
+        carta_b, taxa_b = agente.decidir_melhor_jogada(jogo_b, bot_b)
+        self.assertEqual(contador.chamadas, 1)
+        self.assertEqual(carta_a.rank, carta_b.rank)
+        self.assertIn(carta_b, bot_b.mao)
+        self.assertAlmostEqual(taxa_b, 0.75)
+
+    def test_distribuicoes_diferentes_sao_buscadas(self):
+        # Mesma chave canônica, cartas escondidas diferentes: as primeiras buscas_minimas
+        # posições são buscadas (a busca vê as mãos verdadeiras), só depois vem o cache
+        vira = Carta('4', 'Ouros')
+        contador = AgenteContador()
+        agente = AgenteComCache(contador, buscas_minimas=2)
+        maos_escondidas = ([Carta('A', 'Espadas'), Carta('2', 'Copas')],
+                           [Carta('3', 'Copas'), Carta('Q', 'Paus')],
+                           [Carta('J', 'Ouros'), Carta('6', 'Espadas')])
+        for escondida in maos_escondidas:
+            jogo, bot = _preparar([Carta('K', 'Copas'), Carta('7', 'Ouros')], vira)
+            jogo.jogadores[1].mao = escondida
+            self.assertEqual(chave_canonica(jogo, bot), chave_canonica(*_preparar([Carta('K', 'Copas'), Carta('7', 'Ouros')], vira)))
+            agente.decidir_melhor_jogada(jogo, bot)
+        self.assertEqual(contador.chamadas, 2)
+        self.assertEqual([m[1] for m in contador.maos_vistas], list(maos_escondidas[:2]))
+        self.assertEqual(agente.cache.obter(chave_canonica(jogo, bot))['buscas'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
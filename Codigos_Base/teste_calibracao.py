@@ -0,0 +1,58 @@
+import math
+import pickle
+import unittest
+import numpy as np
+from calibracao import Calibracao, CalibracaoPorFase, fase_do_jogo, mesclar_todas
+from aquecimento import jogo_de_aquecimento
+from agente_mcts import MCTSAgente
+
+
+class TestCalibracao(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.previsoes = rng.random(500)
+        self.resultados = (rng.random(500) < self.previsoes).astype(int)
+
+    def test_metricas_iguais_as_da_lista(self):
+        calibracao = Calibracao()
+        for p, r in zip(self.previsoes, self.resultados):
+            calibracao.registrar(p, r)
+        self.assertAlmostEqual(calibracao.brier, np.mean((self.previsoes - self.resultados) ** 2))
+        log_loss = -np.mean(self.resultados * np.log(self.previsoes) + (1 - self.resultados) * np.log(1 - self.previsoes))
+        self.assertAlmostEqual(calibracao.log_loss, log_loss)
+        self.assertEqual(sum(n for _, _, n, _, _ in calibracao.curva_confiabilidade()), 500)
+
+    def test_previsao_certa_que_erra_tem_log_loss_finito(self):
+        calibracao = Calibracao()
+        calibracao.registrar(1.0, 0)
+        self.assertTrue(math.isfinite(calibracao.log_loss))
+        self.assertEqual(calibracao.curva_confiabilidade()[0][:3], (0.9, 1.0, 1))
+
+    def test_mesclar_equivale_a_registrar_tudo_junto(self):
+        junto, partes = CalibracaoPorFase(), [CalibracaoPorFase() for _ in range(3)]
+        for i, (p, r) in enumerate(zip(self.previsoes, self.resultados)):
+            fase = f'rodada_{i % 3 + 1}'
+            junto.registrar(p, r, fase)
+            partes[i % 3].registrar(p, r, fase)
+        # Como chegaria de outros processos: pickle ou como_dict
+        mesclada = mesclar_todas([pickle.loads(pickle.dumps(partes[0])), partes[1].como_dict(), partes[2]])
+        self.assertEqual(mesclada.n, junto.n)
+        self.assertAlmostEqual(mesclada.mse, junto.mse)
+        self.assertEqual(mesclada.fases.keys(), junto.fases.keys())
+        self.assertEqual(mesclada.fases['rodada_2'].contagens, junto.fases['rodada_2'].contagens)
+        self.assertAlmostEqual((partes[0] + partes[1] + partes[2]).total.log_loss, junto.total.log_loss)
+
+    def test_agente_registra_por_fase(self):
+        jogo, jogador = jogo_de_aquecimento()
+        agente = MCTSAgente(n_simulacoes=1)
+        self.assertEqual(fase_do_jogo(jogo), 'rodada_1')
+        agente.registrar_resultado_da_mao(0.8, 1, fase_do_jogo(jogo))
+        agente.registrar_resultado_da_mao(None, 0)
+        agente.registrar_resultado_da_mao(0.6, 0, 'mao_de_onze')
+        self.assertEqual(agente.calibracao.n, 2)
+        self.assertAlmostEqual(agente.calcular_precisao_mse(), (0.2 ** 2 + 0.6 ** 2) / 2)
+        self.assertEqual(sorted(agente.calibracao.fases), ['mao_de_onze', 'rodada_1'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+import autotuning
+from config_desempenho import PADROES, caminho_config, carregar_config, salvar_config
+
+
+class TestConfigDesempenho(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'config.json')
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def _gravar(self, dados):
+        with open(self.caminho, 'w', encoding='utf-8') as f:
+            json.dump(dados, f)
+
+    def test_sem_arquivo_usa_os_padroes(self):
+        self.assertEqual(carregar_config(self.caminho), PADROES)
+
+    def test_arquivo_parcial_completa_com_os_padroes(self):
+        self._gravar({'parametros': {'n_jobs': 3, 'parametro_antigo': 7}})
+        config = carregar_config(self.caminho)
+        self.assertEqual(config['n_jobs'], 3)
+        self.assertNotIn('parametro_antigo', config)
+        for chave in PADROES:
+            if chave != 'n_jobs':
+                self.assertEqual(config[chave], PADROES[chave])
+
+    def test_copia_nao_altera_o_cache_e_salvar_o_invalida(self):
+        config = carregar_config(self.caminho)
+        config['n_jobs'] = 99
+        self.assertEqual(carregar_config(self.caminho)['n_jobs'], PADROES['n_jobs'])
+        salvar_config({'threads_por_bloco': 256}, caminho=self.caminho)
+        self.assertEqual(carregar_config(self.caminho)['threads_por_bloco'], 256)
+        with self.assertRaises(ValueError):
+            salvar_config({'desconhecido': 1}, caminho=self.caminho)
+
+    def test_variavel_de_ambiente_troca_o_arquivo(self):
+        self._gravar({'parametros': {'pacotes_por_nucleo': 2}})
+        with mock.patch.dict(os.environ, {'TRUCO_CONFIG': self.caminho}):
+            self.assertEqual(caminho_config(), self.caminho)
+            self.assertEqual(carregar_config()['pacotes_por_nucleo'], 2)
+
+    def test_saida_do_autotuning(self):
+        # A medição é trocada por uma vazão fixa: o melhor é n_jobs=2 com 4 pacotes por núcleo
+        def medir_cpu(n_jobs, pacotes_por_nucleo, n_simulacoes, repeticoes):
+            return 1000.0 * (n_jobs if n_jobs <= 2 else 1) + pacotes_por_nucleo * (pacotes_por_nucleo <= 4)
+
+        argv = ['autotuning.py', '--sem-gpu', '--saida', self.caminho]
+        with mock.patch.object(autotuning, 'medir_cpu', medir_cpu), \
+                mock.patch.object(autotuning, '_candidatos_workers', lambda: [1, 2, 4]), \
+                mock.patch.object(sys, 'argv', argv), mock.patch('sys.stdout'):
+            autotuning.main()
+
+        with open(self.caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        self.assertEqual(set(dados['parametros']), set(PADROES))
+        self.assertEqual(dados['parametros']['n_jobs'], 2)
+        self.assertEqual(dados['parametros']['pacotes_por_nucleo'], 4)
+        self.assertEqual(len(dados['medicoes']['cpu']), 3 * 4)
+        self.assertEqual(set(dados['medicoes']['cpu'][0]), {'n_jobs', 'pacotes_por_nucleo', 'sims_por_s'})
+        self.assertEqual(dados['medicoes']['gpu'], [])
+        self.assertEqual(carregar_config(self.caminho), dados['parametros'])
+
+if __name__ == '__main__':
+    unittest.main()
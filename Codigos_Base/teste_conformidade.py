@@ -0,0 +1,31 @@
+import os
+import sys
+import unittest
+import subprocess
+from conformidade import CONFERENCIAS, casos_de_teste, jogar_python, conferir, rodar
+
+
+class TestConformidade(unittest.TestCase):
+
+    def test_motores_de_cpu_seguem_a_logica(self):
+        casos = casos_de_teste(40, roteiros=3, semente=2)
+        for politica in CONFERENCIAS:
+            referencia = jogar_python(casos, politica)
+            for motor in ('numpy', 'numba'):
+                self.assertEqual(conferir(motor, casos, referencia, politica), [], (motor, politica))
+
+    def test_relatorio(self):
+        relatorio = rodar(('python', 'numpy'), n_estados=5, roteiros=2, n_aleatorio=50, n_vazao=256)
+        self.assertTrue(relatorio['numpy']['conforme'])
+        self.assertGreater(relatorio['numpy']['rollouts_por_s'], 0)
+
+    def test_kernel_cuda_no_simulador(self):
+        # O simulador precisa ser ligado antes de importar o numba: roda em outro processo
+        processo = subprocess.run([sys.executable, 'conformidade.py', '--motores', 'cuda', '--estados', '6',
+                                   '--roteiros', '2', '--rollouts', '20', '--vazao', '32', '--simulador-cuda'],
+                                  cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+        self.assertEqual(processo.returncode, 0, processo.stdout + processo.stderr)
+        self.assertIn('12/12', processo.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
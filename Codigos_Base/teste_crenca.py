@@ -0,0 +1,66 @@
+import random
+import unittest
+import numpy as np
+from logica import JogoTruco2v2
+from gpu_utils import CARTA_PARA_INT
+from crenca import CrencaMaos, historico_da_mao
+
+
+def _jogar(jogo, n_cartas):
+    """ Joga n_cartas ao acaso e devolve quem jogou cada uma. """
+    donos = []
+    for _ in range(n_cartas):
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        donos.append(jogo.jogador_atual_idx)
+        jogo.jogar_carta(jogador.id, random.choice(jogador.mao))
+    return donos
+
+
+class TestCrenca(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        self.jogo = JogoTruco2v2(simulacao=True)
+        self.jogo.distribuir_cartas()
+        self.bot = self.jogo.jogadores[0]
+
+    def test_historico_reconstroi_os_donos(self):
+        donos = _jogar(self.jogo, 6)
+        historico = historico_da_mao(self.jogo)
+        self.assertEqual([idx for idx, _, _ in historico], donos)
+        self.assertEqual(historico[0][2], (-1, -1, -1, -1))
+
+    def test_amostras_sao_consistentes(self):
+        crenca = CrencaMaos(n_particulas=128, semente=0)
+        for _ in range(3):
+            _jogar(self.jogo, 3)
+            if self.jogo.estado_jogo != "EM_ANDAMENTO":
+                break
+            crenca.sincronizar(self.jogo, self.bot)
+            maos = crenca.amostrar_maos(self.jogo, 200)
+            proibidas = {CARTA_PARA_INT[c] for c in self.jogo.cartas_jogadas + self.bot.mao + [self.jogo.vira]}
+            for idx, jogador in enumerate(self.jogo.jogadores):
+                self.assertTrue(((maos[:, idx] >= 0).sum(axis=1) == len(jogador.mao)).all())
+                if jogador is not self.bot:
+                    self.assertFalse(np.isin(maos[:, idx], list(proibidas)).any())
+            self.assertEqual(sorted(maos[0, 0][maos[0, 0] >= 0]), sorted(CARTA_PARA_INT[c] for c in self.bot.mao))
+        # A crença avançou carta a carta, sem recomeçar
+        self.assertEqual(crenca.estatisticas['maos'], 1)
+
+    def test_nova_mao_reinicia(self):
+        crenca = CrencaMaos(n_particulas=32, semente=0)
+        crenca.sincronizar(self.jogo, self.bot)
+        self.jogo.resetar_estado_da_mao()
+        self.jogo.distribuir_cartas()
+        crenca.sincronizar(self.jogo, self.bot)
+        self.assertEqual(crenca.estatisticas['maos'], 2)
+
+    def test_determinizar_troca_so_as_maos_ocultas(self):
+        crenca = CrencaMaos(n_particulas=32, semente=0)
+        crenca.sincronizar(self.jogo, self.bot)
+        copia = crenca.determinizar(self.jogo)
+        self.assertEqual(copia.jogadores[0].mao, self.bot.mao)
+        self.assertEqual(len({c for j in copia.jogadores for c in j.mao}), 12)
+
+if __name__ == '__main__':
+    unittest.main()
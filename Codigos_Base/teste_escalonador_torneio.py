@@ -0,0 +1,109 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from classificacao import ajustar_bradley_terry, matriz_vitorias
+from escalonador_torneio import Torneio, executar, ler_competidor, pares_suico
+from metricas import ColetorMetricas
+
+
+class TestClassificacao(unittest.TestCase):
+
+    def test_recupera_as_forcas(self):
+        rng = np.random.default_rng(0)
+        forcas = np.array([300.0, 100.0, -100.0, -300.0])
+        nomes = ['a', 'b', 'c', 'd']
+        partidas = []
+        for _ in range(150):
+            for i in range(4):
+                for j in range(i + 1, 4):
+                    vence_i = rng.random() < 1 / (1 + 10 ** ((forcas[j] - forcas[i]) / 400))
+                    partidas.append((nomes[i], nomes[j]) if vence_i else (nomes[j], nomes[i]))
+        classificacao = ajustar_bradley_terry(nomes, matriz_vitorias(nomes, partidas))
+        self.assertEqual(classificacao.ordem(), [0, 1, 2, 3])
+        self.assertEqual(classificacao.separados(), [True, True, True])
+        for i in range(4):
+            self.assertLess(abs(classificacao.ratings[i] - forcas[i]), classificacao.intervalo(i))
+
+    def test_sem_derrotas_tem_rating_finito(self):
+        classificacao = ajustar_bradley_terry(['a', 'b'], [[0, 3], [0, 0]])
+        self.assertTrue(np.all(np.isfinite(classificacao.ratings)))
+        self.assertGreater(classificacao.ratings[0], 0)
+        self.assertGreater(classificacao.diferenca(0, 1)[1], 0.05)  # 3 partidas não bastam
+
+
+class TestEscalonadorTorneio(unittest.TestCase):
+
+    COMPETIDORES = ['r=aleatorio', 'm=mcts:n_simulacoes=8', 'c=mc:n_simulacoes=4']
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.estado = os.path.join(self.pasta.name, 'torneio.json')
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_ler_competidor(self):
+        self.assertEqual(ler_competidor('h=mcts:n_simulacoes=64,politica_rollout=heuristica'),
+                         ('h', 'mcts', {'n_simulacoes': 64, 'politica_rollout': 'heuristica'}))
+        with self.assertRaises(ValueError):
+            ler_competidor('x=desconhecido')
+
+    def test_suico_evita_revanche(self):
+        pontos = {'a': 2, 'b': 2, 'c': 1, 'd': 0}
+        ratings = dict.fromkeys(pontos, 0.0)
+        pares, folga = pares_suico(list(pontos), pontos, ratings, {frozenset(('a', 'b'))})
+        self.assertEqual(pares, [['a', 'c'], ['b', 'd']])
+        self.assertIsNone(folga)
+
+    def test_retoma_e_repete(self):
+        torneio = Torneio(self.COMPETIDORES, 'todos', semente=3, jogos_por_par=2)
+        executar(torneio, 1, self.estado, mostrar=lambda texto: None)
+        self.assertEqual(len(torneio.partidas), 6)
+        # Uma queda no meio da segunda rodada: o estado gravado tem a rodada pareada e uma partida
+        retomado = Torneio.carregar(self.estado)
+        retomado.parear(2)
+        retomado.partidas.append(dict(torneio.partidas[0], rodada=2))
+        retomado.salvar(self.estado)
+        self.assertEqual(len(Torneio.carregar(self.estado).pendentes(2)), 5)
+        executar(Torneio.carregar(self.estado), 2, self.estado, mostrar=lambda texto: None)
+        self.assertEqual(len(Torneio.carregar(self.estado).partidas), 12)
+        # Mesma semente, mesmas partidas
+        de_novo = Torneio(self.COMPETIDORES, 'todos', semente=3, jogos_por_par=2)
+        executar(de_novo, 1, mostrar=lambda texto: None)
+        chave = lambda p: (p['par'], p['jogo'], p['vencedor'], p['pontos_time1'], p['pontos_time2'])
+        self.assertEqual(sorted(map(chave, de_novo.partidas)), sorted(map(chave, torneio.partidas)))
+
+    def test_lados_trocam_a_cada_rodada(self):
+        torneio = Torneio(self.COMPETIDORES[:2], 'todos', semente=3, jogos_por_par=1)
+        torneio.parear(1)
+        torneio.parear(2)
+        primeira, segunda = torneio.pendentes(1)[0], torneio.pendentes(2)[0]
+        self.assertEqual(primeira[:2], segunda[1::-1])
+
+    def test_falha_grava_as_partidas_terminadas(self):
+        torneio = Torneio(self.COMPETIDORES, 'todos', semente=3, jogos_por_par=4)
+        modelo = {'vencedor': 'r', 'perdedor': 'm', 'pontos_time1': 12, 'pontos_time2': 0}
+
+        def jogar(texto1, texto2, semente, chave, eventos=None):
+            rodada, par, jogo = chave
+            if (par, jogo) == (0, 1):
+                raise ValueError('partida caiu')
+            time.sleep(0.2)  # termina depois da falha
+            return dict(modelo, rodada=rodada, par=par, jogo=jogo), ColetorMetricas()
+
+        with mock.patch('escalonador_torneio.jogar_partida', jogar), \
+                mock.patch('escalonador_torneio.ProcessPoolExecutor',
+                           lambda processos, mp_context: ThreadPoolExecutor(processos)):
+            with self.assertRaises(ValueError):
+                executar(torneio, 1, self.estado, processos=2, mostrar=lambda texto: None)
+        gravadas = [(p['par'], p['jogo']) for p in Torneio.carregar(self.estado).partidas]
+        self.assertIn((0, 0), gravadas)
+        self.assertNotIn((0, 1), gravadas)
+        self.assertLess(len(gravadas), 11)  # as da fila foram canceladas
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import csv
+import tempfile
+import unittest
+from escalonamento import contagens_de_workers, calcular_metricas, varrer, salvar_csv
+
+
+class TestEscalonamento(unittest.TestCase):
+
+    def test_contagens_de_workers(self):
+        self.assertEqual(contagens_de_workers(6), [1, 2, 4, 6])
+        self.assertEqual(contagens_de_workers(1), [1])
+
+    def test_metricas_forte_e_fraco(self):
+        linhas = calcular_metricas([
+            {'modo': 'forte', 'workers': 1, 'tempo_s': 1.0, 'sims_por_s': 100.0},
+            {'modo': 'forte', 'workers': 4, 'tempo_s': 0.5, 'sims_por_s': 200.0},
+            {'modo': 'fraco', 'workers': 1, 'tempo_s': 1.0, 'sims_por_s': 100.0},
+            {'modo': 'fraco', 'workers': 4, 'tempo_s': 1.25, 'sims_por_s': 320.0},
+        ])
+        self.assertAlmostEqual(linhas[1]['speedup'], 2.0)
+        self.assertAlmostEqual(linhas[1]['eficiencia'], 0.5)
+        self.assertAlmostEqual(linhas[3]['speedup'], 3.2)
+        self.assertAlmostEqual(linhas[3]['eficiencia'], 0.8)
+
+    def test_varredura_curta_gera_csv(self):
+        linhas = varrer([1], 40, n_estados=2, sims_referencia=100)
+        self.assertEqual([l['modo'] for l in linhas], ['forte', 'fraco'])
+        self.assertEqual(linhas[0]['eficiencia'], 1.0)
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'escalonamento.csv')
+            salvar_csv(linhas, caminho)
+            with open(caminho) as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from logica import JogoTruco2v2
+from gerenciador_tempo import GerenciadorDeTempo, incerteza_raiz
+
+class TestGerenciadorDeTempo(unittest.TestCase):
+
+    def setUp(self):
+        self.jogo = JogoTruco2v2(simulacao=True)
+        self.jogo.iniciar_nova_mao()
+        self.jogador = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+
+    def test_jogada_forcada_nao_gasta_tempo(self):
+        gerenciador = GerenciadorDeTempo(orcamento_mao=1.0)
+        self.jogador.mao = self.jogador.mao[:1]
+        self.assertEqual(gerenciador.alocar(self.jogo, self.jogador), 0.0)
+
+    def test_primeira_carta_recebe_mais_tempo(self):
+        gerenciador = GerenciadorDeTempo(orcamento_mao=1.0)
+        primeira = gerenciador.alocar(self.jogo, self.jogador)
+        gerenciador.registrar_gasto(primeira)
+        self.jogo.rodada_atual = 2
+        self.jogador.mao = self.jogador.mao[:2]
+        segunda = gerenciador.alocar(self.jogo, self.jogador)
+        self.assertGreater(primeira, segunda)
+        self.assertLessEqual(primeira + segunda, 1.0 + 1e-9)
+
+    def test_mao_de_onze_recebe_mais_tempo(self):
+        normal = GerenciadorDeTempo(orcamento_partida=30.0).alocar(self.jogo, self.jogador)
+        self.jogo.pontos_time1 = 11
+        self.jogo.mao_atual += 1
+        decisiva = GerenciadorDeTempo(orcamento_partida=30.0).alocar(self.jogo, self.jogador)
+        self.assertGreater(decisiva, normal)
+
+    def test_orcamento_da_partida_nao_estoura(self):
+        gerenciador = GerenciadorDeTempo(orcamento_partida=2.0)
+        gasto = 0.0
+        for mao in range(1, 40):
+            self.jogo.mao_atual = mao
+            t = gerenciador.alocar(self.jogo, self.jogador)
+            gerenciador.registrar_gasto(t)
+            gasto += t
+        self.assertLessEqual(gasto, 2.0 + 1e-9)
+
+    def test_incerteza_raiz(self):
+        self.assertGreater(incerteza_raiz([(100, 50), (100, 49)]), 0.9)
+        self.assertEqual(incerteza_raiz([(1000, 900), (1000, 100)]), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
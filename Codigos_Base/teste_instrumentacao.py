@@ -0,0 +1,76 @@
+import random
+import unittest
+from agente_mcts import MCTSAgente
+import agente_mcts_multi
+import time_limit_mcts
+from aquecimento import jogo_de_aquecimento
+from instrumentacao import FASES, intervalo_de_progresso
+
+
+class TestInstrumentacao(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        self.jogo, self.jogador = jogo_de_aquecimento()
+
+    def test_poucas_simulacoes_com_progresso(self):
+        # n_simulacoes < 50 dividia por zero na barra de progresso antiga
+        chamadas = []
+        agente = MCTSAgente(n_simulacoes=10, progresso=lambda e: chamadas.append((e.iteracoes, e.concluida)))
+        jogada, _ = agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        self.assertIn(jogada, self.jogador.mao)
+        self.assertEqual(chamadas, [(i, False) for i in range(1, 10)] + [(10, True)])
+        self.assertEqual(intervalo_de_progresso(10), 1)
+
+    def test_estatisticas_instrumentadas(self):
+        agente = MCTSAgente(n_simulacoes=200, instrumentar=True)
+        agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        busca = agente.ultima_busca
+        self.assertEqual(busca.iteracoes, 200)
+        for fase in ('selecao', 'determinizacao', 'rollout', 'retropropagacao'):
+            self.assertEqual(busca.contagens[fase], 200)
+        # Cada expansão cria um nó, além da raiz
+        self.assertEqual(busca.nos, busca.contagens['expansao'] + 1)
+        self.assertGreaterEqual(busca.profundidade_maxima, 2)
+        self.assertGreater(busca.tempos['rollout'], 0.0)
+        self.assertLessEqual(sum(busca.tempos.values()), busca.tempo_total)
+
+    def test_sem_instrumentacao_nao_mede_fases(self):
+        agente = MCTSAgente(n_simulacoes=50)
+        agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        busca = agente.ultima_busca
+        self.assertEqual(busca.iteracoes, 50)
+        self.assertTrue(all(busca.tempos[fase] == 0.0 for fase in FASES))
+        self.assertIsNone(busca.nos)
+
+    def test_multi_soma_as_fases_dos_pacotes(self):
+        agente = agente_mcts_multi.MCTSAgente(n_simulacoes=120, n_jobs=2, instrumentar=True)
+        agente.pacotes_por_nucleo = 3
+        jogada, _ = agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        self.assertIn(jogada, self.jogador.mao)
+        busca = agente.ultima_busca
+        self.assertEqual(busca.iteracoes, 120)
+        for fase in ('selecao', 'rollout', 'retropropagacao'):
+            self.assertEqual(busca.contagens[fase], 120)
+        # Seis árvores independentes (2 núcleos x 3 pacotes), cada uma com a sua raiz
+        self.assertEqual(busca.nos, busca.contagens['expansao'] + 6)
+        self.assertGreaterEqual(busca.profundidade_maxima, 2)
+        self.assertGreater(busca.tempos['rollout'], 0.0)
+        self.assertIn('árvore', busca.resumo())
+
+    def test_multi_sem_instrumentacao_nao_mede_fases(self):
+        agente = agente_mcts_multi.MCTSAgente(n_simulacoes=40, n_jobs=1)
+        agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        self.assertTrue(all(agente.ultima_busca.contagens[fase] == 0 for fase in FASES))
+        self.assertIsNone(agente.ultima_busca.nos)
+
+    def test_tempo_limitado_soma_as_fases_dos_workers(self):
+        agente = time_limit_mcts.MCTSAgente(time_limit_por_jogada=0.05, n_jobs=2, instrumentar=True)
+        agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        busca = agente.ultima_busca
+        self.assertGreater(busca.iteracoes, 0)
+        self.assertEqual(busca.contagens['rollout'], busca.iteracoes)
+        self.assertEqual(busca.nos, busca.contagens['expansao'] + 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+from agente_mcts_multi import MCTSNode, MCTSAgente, BYTES_POR_NO, expandir_arvore, run_single_mcts_search
+from aquecimento import jogo_de_aquecimento
+from instrumentacao import tamanho_da_arvore
+from memoria import medir_arvore
+from prazo import Prazo
+import time_limit_mcts
+
+
+class TestArvoreLimitada(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(5)
+        self.jogo, self.jogador = jogo_de_aquecimento()
+        self.agente = MCTSAgente(n_simulacoes=1, n_jobs=1)
+
+    def test_arvore_nao_passa_do_limite(self):
+        raiz = MCTSNode(estado_jogo=self.jogo)
+        nos, podas = expandir_arvore(raiz, self.jogador.time_id, 3000, self.agente._valor_folha, max_nos=100)
+        self.assertGreater(podas, 0)
+        self.assertLessEqual(nos, 100)
+        # A contagem incremental bate com a árvore de verdade
+        self.assertEqual(tamanho_da_arvore(raiz)[0], nos)
+        # As visitas das subárvores colapsadas continuam na raiz
+        self.assertEqual(raiz.visitas, 3000)
+
+    def test_busca_limitada_retorna_carta_valida(self):
+        jogada, taxa = run_single_mcts_search(self.jogo, self.jogador, 2000, max_nos=32)
+        self.assertIn(jogada, self.jogador.mao)
+        self.assertTrue(0.0 <= taxa <= 1.0)
+
+    def test_arvore_por_tempo_nao_passa_do_limite(self):
+        raiz = MCTSNode(estado_jogo=self.jogo)
+        nos, podas = expandir_arvore(raiz, self.jogador.time_id, None, self.agente._valor_folha, max_nos=50,
+                                     prazo=Prazo.em(0.3))
+        self.assertGreater(podas, 0)
+        self.assertLessEqual(nos, 50)
+        self.assertEqual(tamanho_da_arvore(raiz)[0], nos)
+
+    def test_agente_por_tempo_passa_o_limite_aos_workers(self):
+        agente = time_limit_mcts.MCTSAgente(time_limit_por_jogada=0.2, n_jobs=1, max_nos=40, instrumentar=True)
+        jogada, _ = agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        self.assertIn(jogada, self.jogador.mao)
+        self.assertLessEqual(agente.ultima_busca.nos, 40)
+        self.assertGreater(agente.ultima_busca.contagens['expansao'], 40)  # podou no caminho
+        self.assertEqual(time_limit_mcts.MCTSAgente(limite_memoria_mb=1).max_nos, 2**20 // BYTES_POR_NO)
+
+    def test_limite_em_megabytes(self):
+        agente = MCTSAgente(n_simulacoes=1, n_jobs=1, limite_memoria_mb=1)
+        self.assertEqual(agente.max_nos, 2**20 // BYTES_POR_NO)
+
+    def test_medicao_da_arvore(self):
+        r = medir_arvore(300)
+        self.assertEqual(r['podas'], 0)
+        self.assertGreater(r['bytes_por_no'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import json
+import tempfile
+import unittest
+from metricas import BALDES_LATENCIA, ColetorMetricas, HistogramaLatencia
+from aquecimento import jogo_de_aquecimento
+from instrumentacao import EstatisticasBusca
+from time_limit_mcts import MCTSAgente
+
+
+class TestColetorMetricas(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.eventos = os.path.join(self.pasta.name, 'eventos.jsonl')
+        self.prometheus = os.path.join(self.pasta.name, 'metricas.prom')
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_histograma_cumulativo(self):
+        histograma = HistogramaLatencia()
+        for latencia in (0.001, 0.005, 0.02, 100.0):
+            histograma.registrar(latencia)
+        cumulativas = histograma.cumulativas()
+        self.assertEqual(cumulativas[0], 2)  # o limite do balde é inclusivo
+        self.assertEqual(cumulativas[BALDES_LATENCIA.index(0.025)], 3)
+        self.assertEqual(cumulativas[-1], 4)
+
+    def test_eventos_e_snapshot(self):
+        coletor = ColetorMetricas(self.eventos, self.prometheus, execucao='teste')
+        busca = EstatisticasBusca('x')
+        busca.iteracoes, busca.tempo_total, busca.workers, busca.tempo_workers = 1000, 0.5, 2, 0.8
+        coletor.registrar_decisao('bot', 'rodada_1', 0.2, alvo=0.1, busca=busca)
+        coletor.registrar_decisao('bot', 'rodada_2', 0.05, alvo=0.1)
+        coletor.registrar_partida(vencedor='bot')
+        coletor.fechar()
+
+        with open(self.eventos, encoding='utf-8') as f:
+            eventos = [json.loads(linha) for linha in f]
+        self.assertEqual([e['evento'] for e in eventos], ['inicio', 'decisao', 'decisao', 'partida', 'fim'])
+        self.assertTrue(eventos[1]['estouro'])
+        self.assertEqual(eventos[1]['rollouts_por_s'], 2000)
+
+        with open(self.prometheus, encoding='utf-8') as f:
+            texto = f.read()
+        self.assertIn('truco_estouros_prazo_total{agente="bot"} 1', texto)
+        self.assertIn('truco_latencia_decisao_segundos_bucket{agente="bot",fase="rodada_1",le="+Inf"} 1', texto)
+        self.assertIn('truco_utilizacao_workers{agente="bot"} 0.8', texto)
+        self.assertIn('truco_partidas_total{execucao="teste"} 1', texto)
+
+    def test_decidir_usa_o_prazo_do_agente(self):
+        jogo, jogador = jogo_de_aquecimento()
+        agente = MCTSAgente(time_limit_por_jogada=0.02, n_jobs=1)
+        coletor = ColetorMetricas()
+        carta, taxa = coletor.decidir('cpu', agente, jogo, jogador)
+        self.assertIn(carta, jogador.mao)
+        metricas = coletor.agentes['cpu']
+        self.assertEqual((metricas.decisoes, metricas.com_prazo), (1, 1))
+        self.assertGreater(metricas.rollouts, 0)
+        self.assertIsNotNone(metricas.utilizacao)
+        self.assertEqual(list(coletor.histogramas), [('cpu', 'rodada_1')])
+
+if __name__ == '__main__':
+    unittest.main()
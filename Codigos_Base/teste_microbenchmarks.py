@@ -0,0 +1,40 @@
+import json
+import unittest
+import numpy as np
+from microbenchmarks import rodar, comparar
+
+
+def _resultado(amostras, pareado=False):
+    return {'amostras': list(amostras), 'mediana': float(np.median(amostras)), 'pareado': pareado}
+
+
+class TestMicrobenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.amostras = 1e-5 * (1 + 0.02 * rng.standard_normal(15))
+        self.base = {'ambiente': {}, 'resultados': {'x': _resultado(self.amostras)}}
+
+    def test_aponta_regressao_de_20_por_cento(self):
+        novo = {'ambiente': {}, 'resultados': {'x': _resultado(self.amostras * 1.2)}}
+        self.assertEqual(comparar(self.base, novo)[0]['veredito'], 'regressao')
+        self.assertEqual(comparar(novo, self.base)[0]['veredito'], 'melhora')
+
+    def test_mesmas_amostras_nao_sao_regressao(self):
+        self.assertEqual(comparar(self.base, self.base)[0]['veredito'], 'igual')
+
+    def test_latencia_pareada(self):
+        base = {'ambiente': {}, 'resultados': {'x': _resultado(self.amostras, pareado=True)}}
+        novo = {'ambiente': {}, 'resultados': {'x': _resultado(self.amostras * 1.1, pareado=True)}}
+        linha = comparar(base, novo)[0]
+        self.assertTrue(linha['pareado'])
+        self.assertEqual(linha['veredito'], 'regressao')
+
+    def test_rodada_rapida_gera_json(self):
+        resultado = json.loads(json.dumps(rodar(['jogar_carta'], rapido=True)))
+        r = resultado['resultados']['jogar_carta']
+        self.assertGreaterEqual(len(r['amostras']), 3)
+        self.assertGreater(r['vazao'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from logica import JogoTruco2v2, Carta
+from politica_rollout import POLITICA_ROTEIRO, escolher_carta_heuristica, estados_de_teste, simular_rollout, validar_politica
+from simulador_lote import achatar_estado_lote, concatenar_lotes, simular_maos_lote
+from simulador_numba import simular_maos_numba
+
+
+def _preparar(mao, mesa):
+    """ Jogo com vira 4 de Ouros (manilha 5), as cartas de `mesa` já jogadas a partir do jogador 1. """
+    jogo = JogoTruco2v2(simulacao=True)
+    jogo.estado_jogo = "EM_ANDAMENTO"
+    jogo.vira = Carta('4', 'Ouros')
+    jogo._definir_manilhas()
+    for idx, carta in enumerate(mesa):
+        jogo.cartas_na_mesa.append((jogo.jogadores[idx], carta))
+    jogo.jogador_atual_idx = len(mesa)
+    jogador = jogo.jogadores[len(mesa)]
+    jogador.mao = mao
+    return jogo, jogador
+
+
+class TestPoliticaHeuristica(unittest.TestCase):
+
+    def setUp(self):
+        self.mao = [Carta('K', 'Copas'), Carta('7', 'Ouros'), Carta('3', 'Paus')]
+
+    def test_abre_com_a_mais_forte(self):
+        jogo, jogador = _preparar(self.mao, [])
+        self.assertEqual(escolher_carta_heuristica(jogo, jogador, ruido=0.0), Carta('3', 'Paus'))
+
+    def test_ganha_com_a_mais_barata(self):
+        jogo, jogador = _preparar(self.mao, [Carta('Q', 'Ouros')])
+        self.assertEqual(escolher_carta_heuristica(jogo, jogador, ruido=0.0), Carta('K', 'Copas'))
+
+    def test_nao_passa_o_parceiro(self):
+        # Jogador 3 (idx 2): o parceiro (idx 0) jogou um A, o adversário um Q
+        jogo, jogador = _preparar(self.mao, [Carta('A', 'Ouros'), Carta('Q', 'Espadas')])
+        self.assertEqual(escolher_carta_heuristica(jogo, jogador, ruido=0.0), Carta('7', 'Ouros'))
+
+    def test_descarta_a_mais_fraca_quando_nao_ganha(self):
+        jogo, jogador = _preparar(self.mao, [Carta('5', 'Paus')])
+        self.assertEqual(escolher_carta_heuristica(jogo, jogador, ruido=0.0), Carta('7', 'Ouros'))
+
+    def test_roteiro_so_nos_motores(self):
+        from agente_mcts_multi import MCTSAgente
+        with self.assertRaises(ValueError):
+            validar_politica(POLITICA_ROTEIRO)
+        with self.assertRaises(ValueError):
+            MCTSAgente(n_simulacoes=10, politica_rollout=POLITICA_ROTEIRO)
+        self.assertEqual(validar_politica(POLITICA_ROTEIRO, permitir_roteiro=True), POLITICA_ROTEIRO)
+
+    def test_backends_concordam_sem_ruido(self):
+        estados = estados_de_teste(100, semente=1)
+        times = np.array([t for _, t in estados])
+        esperado = np.array([simular_rollout(e, t, 'heuristica', ruido=0.0) for e, t in estados])
+        lote = concatenar_lotes([achatar_estado_lote(e, 1) for e, _ in estados])
+        for simular in (simular_maos_lote, simular_maos_numba):
+            vitorias = simular(lote, None, 'heuristica', 0.0) == times
+            np.testing.assert_array_equal(vitorias.astype(int), esperado)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import time
+import pickle
+import threading
+import unittest
+from unittest import mock
+from logica import JogoTruco2v2
+from prazo import Prazo, EstimadorOverhead, RegistroLatencia
+import time_limit_mcts
+from time_limit_mcts import MCTSAgente
+
+
+class ParallelTravado:
+    """ Substituto do joblib.Parallel que só roda as tarefas depois de `liberar` (um pool ocupado). """
+    chamadas = 0
+    liberar = threading.Event()
+
+    def __init__(self, n_jobs=None):
+        pass
+
+    def __call__(self, tarefas):
+        ParallelTravado.chamadas += 1
+        ParallelTravado.liberar.wait()
+        return [funcao(*args, **kwargs) for funcao, args, kwargs in tarefas]
+
+
+class TestPrazo(unittest.TestCase):
+
+    def test_expira_no_limite(self):
+        prazo = Prazo.em(0.05)
+        self.assertFalse(prazo.expirou())
+        self.assertGreater(prazo.restante(), 0.0)
+        inicio = time.monotonic()
+        while not prazo.expirou():
+            pass
+        # A checagem amortizada não passa do prazo por mais que a granularidade
+        self.assertLess(time.monotonic() - inicio, 0.05 + 0.02)
+        self.assertTrue(prazo.expirou())
+        self.assertTrue(Prazo.em(0.0).expirou())
+
+    def test_atravessa_processos_pelo_limite(self):
+        prazo = Prazo.em(10.0, granularidade=0.01)
+        for _ in range(100):
+            prazo.expirou()
+        copia = pickle.loads(pickle.dumps(prazo))
+        self.assertEqual((copia.limite, copia.granularidade), (prazo.limite, 0.01))
+        self.assertEqual(copia.intervalo, 1)
+
+
+class TestEstimadorOverhead(unittest.TestCase):
+
+    def test_sobe_rapido_e_desce_devagar(self):
+        estimador = EstimadorOverhead(despacho_inicial=0.1, coleta_inicial=0.1, margem=0.005)
+        self.assertAlmostEqual(estimador.total(), 0.205)
+        estimador.registrar(0.6, 0.1)
+        self.assertAlmostEqual(estimador.despacho, 0.2 * 0.1 + 0.8 * 0.6)
+        estimador.registrar(0.0, -1.0)  # amostras negativas contam como zero
+        self.assertAlmostEqual(estimador.despacho, 0.5 * (0.2 * 0.1 + 0.8 * 0.6))
+        self.assertAlmostEqual(estimador.coleta, 0.05)
+        self.assertAlmostEqual(estimador.total(), estimador.despacho + estimador.coleta + 0.005)
+
+
+class TestRegistroLatencia(unittest.TestCase):
+
+    def test_percentis_e_estouros(self):
+        registro = RegistroLatencia()
+        self.assertEqual(registro.resumo(), "sem decisões registradas")
+        for latencia in (0.08, 0.09, 0.12):
+            registro.registrar(latencia, 0.1)
+        p = registro.percentis()
+        self.assertEqual((p['n'], p['estouros']), (3, 1))
+        self.assertAlmostEqual(p['max'], 0.12)
+        self.assertAlmostEqual(p['estouro_max'], 0.02)
+        self.assertIn("estouros do prazo: 1/3", registro.resumo())
+
+
+class TestPrazoRigido(unittest.TestCase):
+
+    def setUp(self):
+        self.jogo = JogoTruco2v2(simulacao=True)
+        self.jogo.iniciar_nova_mao()
+        self.jogador = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+
+    def test_decisao_respeita_o_prazo(self):
+        agente = MCTSAgente(time_limit_por_jogada=0.1, n_jobs=1, prazo_rigido=True)
+        inicio = time.monotonic()
+        carta, taxa = agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        self.assertLess(time.monotonic() - inicio, 0.1 + 0.02)
+        self.assertIn(carta, self.jogador.mao)
+        self.assertGreater(agente.ultima_busca.iteracoes, 0)
+        self.assertEqual(agente.rodadas_abandonadas, 0)
+
+    def test_rodada_abandonada_segura_a_proxima(self):
+        ParallelTravado.chamadas = 0
+        ParallelTravado.liberar.clear()
+        agente = MCTSAgente(time_limit_por_jogada=0.05, n_jobs=1, prazo_rigido=True)
+        despacho = agente.estimador_overhead.despacho
+        with mock.patch.object(time_limit_mcts, 'Parallel', ParallelTravado):
+            try:
+                # O pool não responde: a decisão sai no prazo, sem os workers
+                inicio = time.monotonic()
+                carta, _ = agente.decidir_melhor_jogada(self.jogo, self.jogador)
+                self.assertLess(time.monotonic() - inicio, 0.05 + 0.02)
+                self.assertIn(carta, self.jogador.mao)
+                self.assertEqual(agente.rodadas_abandonadas, 1)
+                # Com a rodada anterior ainda no pool, a próxima decisão não despacha outra
+                agente.decidir_melhor_jogada(self.jogo, self.jogador)
+                self.assertEqual(ParallelTravado.chamadas, 1)
+                self.assertEqual(agente.rodadas_abandonadas, 2)
+                self.assertEqual(agente.estimador_overhead.despacho, despacho)
+            finally:
+                ParallelTravado.liberar.set()
+            # A rodada abandonada terminou: é recolhida (o estimador aprende com o atraso) e a nova roda
+            agente._rodada_pendente[0].join()
+            self.assertTrue(agente._recolher_rodada_pendente(time.monotonic()))
+            self.assertGreater(agente.estimador_overhead.despacho, despacho)
+            agente.decidir_melhor_jogada(self.jogo, self.jogador)
+        self.assertEqual(ParallelTravado.chamadas, 2)
+        self.assertEqual(agente.rodadas_abandonadas, 2)
+        self.assertIsNone(agente._rodada_pendente)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import copy
+import random
+import unittest
+from logica import JogoTruco2v2, Carta
+from politica_rollout import escolher_carta_heuristica, estados_de_teste
+from simulador_lote import achatar_estado_lote, concatenar_lotes, simular_maos_lote
+from simulador_numba import simular_maos_numba
+from escalonador_lote import BuscaMCTSLote, EscalonadorLote
+
+
+def _jogar_python(estado):
+    """ Joga a mão até o fim com a heurística sem ruído; retorna (vencedor, resultado de cada rodada). """
+    jogo = copy.deepcopy(estado)
+    while jogo.estado_jogo == "EM_ANDAMENTO":
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        if not jogador.mao:
+            jogo._checar_vencedor_da_mao(); continue
+        jogo.jogar_carta(jogador.id, escolher_carta_heuristica(jogo, jogador, ruido=0.0))
+    return jogo.vencedor_mao, jogo.resultado_rodada
+
+
+class TestMotoresConcordam(unittest.TestCase):
+
+    def test_mesmo_vencedor_e_rodadas(self):
+        # Mãos fixas (estados sorteados com semente): sem ruído a heurística é determinística,
+        # então os três motores têm de jogar exatamente as mesmas cartas
+        estados = [e for e, _ in estados_de_teste(60, semente=4)]
+        esperado = [_jogar_python(e) for e in estados]
+        lote = concatenar_lotes([achatar_estado_lote(e, 1) for e in estados])
+        for simular in (simular_maos_lote, simular_maos_numba):
+            vencedores, rodadas = simular(lote, None, 'heuristica', 0.0, retornar_rodadas=True)
+            self.assertEqual(vencedores.tolist(), [v for v, _ in esperado], simular.__name__)
+            self.assertEqual(rodadas.tolist(), [list(r) for _, r in esperado], simular.__name__)
+
+
+class TestEscalonadorLote(unittest.TestCase):
+
+    def test_busca_pede_no_maximo_as_folhas_do_passo(self):
+        jogo = JogoTruco2v2(simulacao=True)
+        jogo.distribuir_cartas()
+        jogador = jogo.jogadores[jogo.jogador_atual_idx]
+        busca = BuscaMCTSLote(n_passos=5, folhas_por_passo=4, rollouts_por_folha=8)
+        gerador = busca.buscar(jogo, jogador)
+        pedidos = []
+        try:
+            pedido = next(gerador)
+            while True:
+                pedidos.append(pedido)
+                pedido = gerador.send([0.5] * len(pedido))
+        except StopIteration as fim:
+            carta, taxa = fim.value
+        self.assertLessEqual(len(pedidos), 5)
+        self.assertTrue(all(0 < len(p) <= 4 for p in pedidos))
+        self.assertIn(carta, jogador.mao)
+        self.assertTrue(0.0 <= taxa <= 1.0)
+
+    def test_partidas_simultaneas_limitadas_e_todas_terminam(self):
+        busca = BuscaMCTSLote(n_passos=2, folhas_por_passo=2, rollouts_por_folha=4)
+        escalonador = EscalonadorLote(busca, n_simultaneas=3, semente=1)
+        ativas_por_tick = []
+        tick = escalonador._tick
+        escalonador._tick = lambda ativas, resultados: (ativas_por_tick.append(len(ativas)), tick(ativas, resultados))
+        resultados = escalonador.executar(5)
+
+        self.assertEqual(len(resultados), 5)
+        self.assertLessEqual(max(ativas_por_tick), 3)
+        self.assertEqual(ativas_por_tick[0], 3)
+        for r in resultados:
+            self.assertTrue(r['pontos_feitos'] >= 12 or r['pontos_tomados'] >= 12)
+            self.assertGreater(r['decisoes'], 0)
+        e = escalonador.estatisticas
+        self.assertEqual(e['ticks'], len(ativas_por_tick))
+        self.assertEqual(e['rollouts'], e['folhas'] * busca.rollouts_por_folha)
+
+    def test_mesma_semente_mesmas_partidas(self):
+        placares = []
+        for _ in range(2):
+            random.seed(7)  # distribuir_cartas embaralha com o módulo random
+            escalonador = EscalonadorLote(BuscaMCTSLote(2, 2, 4), n_simultaneas=2, semente=7)
+            placares.append(sorted((r['pontos_feitos'], r['pontos_tomados'], r['total_maos'])
+                                   for r in escalonador.executar(3)))
+        self.assertEqual(placares[0], placares[1])
+
+
+class TestCopiaDoJogo(unittest.TestCase):
+
+    def test_copia_independente(self):
+        jogo = JogoTruco2v2(simulacao=True)
+        jogo.vira = Carta('4', 'Ouros')
+        jogo._definir_manilhas()
+        jogo.estado_jogo = "EM_ANDAMENTO"
+        jogo.jogadores[0].mao = [Carta('K', 'Copas'), Carta('7', 'Ouros'), Carta('3', 'Paus')]
+        jogo.jogadores[1].mao = [Carta('A', 'Ouros'), Carta('Q', 'Espadas'), Carta('5', 'Paus')]
+        jogo.jogador_atual_idx = 0
+        jogo.jogar_carta(1, Carta('K', 'Copas'))
+        original = (jogo.jogadores[0].mao[:], jogo.jogadores[1].mao[:], list(jogo.cartas_na_mesa),
+                    jogo.resultado_rodada[:], jogo.pontos_time1, dict(jogo.manilhas))
+
+        copia = copy.deepcopy(jogo)
+        # Os jogadores da mesa da cópia são os jogadores da cópia
+        self.assertIs(copia.cartas_na_mesa[0][0], copia.jogadores[0])
+        copia.jogar_carta(2, Carta('A', 'Ouros'))
+        copia.jogadores[0].mao.pop()
+        copia.resultado_rodada[0] = 2
+        copia.pontos_time1 += 3
+        copia.manilhas.clear()
+
+        self.assertEqual((jogo.jogadores[0].mao, jogo.jogadores[1].mao, jogo.cartas_na_mesa,
+                          jogo.resultado_rodada, jogo.pontos_time1, jogo.manilhas), original)
+        self.assertIs(jogo.cartas_na_mesa[0][0], jogo.jogadores[0])
+
+if __name__ == '__main__':
+    unittest.main()
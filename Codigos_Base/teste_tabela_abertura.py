@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from logica import JogoTruco2v2, Carta
+from tabela_abertura import maos_canonicas, _gerar_parte, TabelaAbertura, prob_vitoria_partida
+
+
+class TestTabelaAbertura(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Só a parte da manilha 5 (vira 4) com o bot abrindo, para o teste ser rápido
+        cls.pasta = tempfile.TemporaryDirectory()
+        cls.caminho = os.path.join(cls.pasta.name, 'tabela.npy')
+        np.save(cls.caminho, _gerar_parte(1, 0, 400, semente=0, backend='numpy'))
+        cls.tabela = TabelaAbertura(cls.caminho)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pasta.cleanup()
+
+    def _jogo(self, mao):
+        jogo = JogoTruco2v2(simulacao=True)
+        jogo.iniciar_nova_mao()
+        jogo.vira = Carta('4', 'Ouros')
+        jogo._definir_manilhas()
+        bot = jogo.jogadores[jogo.jogador_iniciou_rodada_idx]
+        bot.mao = mao
+        return jogo, bot
+
+    def test_maos_canonicas_sao_unicas_e_validas(self):
+        maos = maos_canonicas(1)
+        self.assertEqual(len(maos), len(set(maos)))
+        self.assertNotIn((4, 4, 8), maos)  # a mesma manilha (5 de Ouros) duas vezes
+        self.assertIn((5, 6, 7), maos)     # três manilhas diferentes
+        self.assertIn((0, 0, 0), maos)     # três 4 (sobram três, porque a vira é um 4)
+
+    def test_consulta_e_abertura(self):
+        jogo, bot = self._jogo([Carta('5', 'Paus'), Carta('5', 'Copas'), Carta('4', 'Espadas')])
+        linha = self.tabela.consultar(jogo, bot)
+        self.assertIsNotNone(linha)
+        self.assertGreater(linha['vitoria'], 0.8)
+        carta, taxa = self.tabela.jogada_de_abertura(jogo, bot)
+        self.assertIn(carta, bot.mao)
+        self.assertAlmostEqual(taxa, float(np.nanmax(linha['taxa_carta'])), places=5)
+
+    def test_fora_da_tabela_depois_da_primeira_carta(self):
+        jogo, bot = self._jogo([Carta('5', 'Paus'), Carta('K', 'Copas'), Carta('7', 'Espadas')])
+        jogo.cartas_jogadas.append(Carta('A', 'Ouros'))
+        self.assertIsNone(self.tabela.consultar(jogo, bot))
+
+    def test_mao_de_onze(self):
+        self.assertAlmostEqual(prob_vitoria_partida(5, 5), 0.5)
+        self.assertAlmostEqual(prob_vitoria_partida(3, 8), 1 - prob_vitoria_partida(8, 3))
+        jogo, bot = self._jogo([Carta('5', 'Paus'), Carta('5', 'Copas'), Carta('5', 'Espadas')])
+        jogo.pontos_time1, jogo.pontos_time2 = (11, 0) if bot.time_id == 1 else (0, 11)
+        self.assertTrue(self.tabela.aceitar_mao_de_onze(jogo, bot))
+
+if __name__ == '__main__':
+    unittest.main()
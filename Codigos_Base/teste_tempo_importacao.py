@@ -0,0 +1,20 @@
+import unittest
+from tempo_importacao import medir_importacao
+
+
+class TestTempoImportacao(unittest.TestCase):
+
+    def test_pontos_de_entrada_nao_carregam_bibliotecas_pesadas(self):
+        for modulo in ('tournament', 'tournamento', 'benchmark_runner'):
+            resultado = medir_importacao(modulo, repeticoes=1)
+            self.assertNotIn('erro', resultado, modulo)
+            self.assertEqual(resultado['pesados'], [], modulo)
+
+    def test_detecta_biblioteca_pesada(self):
+        resultado = medir_importacao('agente_gpu', repeticoes=1)
+        if 'erro' in resultado:
+            self.skipTest(f"numba indisponível: {resultado['erro']}")
+        self.assertIn('numba.cuda', resultado['pesados'])
+
+if __name__ == '__main__':
+    unittest.main()
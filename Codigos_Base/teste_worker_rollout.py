@@ -0,0 +1,75 @@
+import unittest
+import threading
+from logica import JogoTruco2v2
+from protocolo_rede import codificar_estado, decodificar_estado
+from unittest import mock
+import agente_mcts_multi
+from worker_rollout import ServidorRollout, buscar_estatisticas
+from agente_mcts_distribuido import MCTSAgenteDistribuido
+
+class TestWorkersRemotos(unittest.TestCase):
+
+    def setUp(self):
+        """Sobe dois workers em portas livres do localhost."""
+        self.servidores = []
+        for _ in range(2):
+            servidor = ServidorRollout(('127.0.0.1', 0), n_jobs=1)
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            self.servidores.append(servidor)
+        self.hosts = [('127.0.0.1', s.server_address[1]) for s in self.servidores]
+
+        self.jogo = JogoTruco2v2(simulacao=True)
+        self.jogo.iniciar_nova_mao()
+
+    def tearDown(self):
+        for servidor in self.servidores:
+            servidor.shutdown()
+            servidor.server_close()
+
+    def test_codificacao_ida_e_volta(self):
+        jogador = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+        self.jogo.jogar_carta(jogador.id, jogador.mao[0])
+        copia = decodificar_estado(codificar_estado(self.jogo))
+        self.assertEqual(codificar_estado(copia), codificar_estado(self.jogo))
+        self.assertEqual(copia.manilhas, self.jogo.manilhas)
+
+    def test_agente_distribuido_escolhe_carta_da_mao(self):
+        agente = MCTSAgenteDistribuido(self.hosts, n_simulacoes=40)
+        jogador_bot = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+        carta, taxa = agente.decidir_melhor_jogada(self.jogo, jogador_bot)
+        self.assertIn(carta, jogador_bot.mao)
+        self.assertTrue(0.0 <= taxa <= 1.0)
+        self.assertEqual(agente.ultimas_sims, 40)
+
+    def test_worker_indisponivel_e_ignorado(self):
+        agente = MCTSAgenteDistribuido(self.hosts + [('127.0.0.1', 1)], n_simulacoes=30, timeout=5)
+        jogador_bot = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+        carta, _ = agente.decidir_melhor_jogada(self.jogo, jogador_bot)
+        self.assertIn(carta, jogador_bot.mao)
+
+    def test_orcamento_dividido_sem_perder_o_resto(self):
+        # 50 simulações em 3 árvores: 17 + 17 + 16, não 3 x 16
+        jogador_bot = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+        pedido = {'estado': codificar_estado(self.jogo), 'bot_id': jogador_bot.id, 'n_simulacoes': 50}
+        self.assertEqual(buscar_estatisticas(pedido, n_jobs=3)['sims'], 50)
+
+    def test_max_nos_chega_ao_worker_e_poda(self):
+        agente = MCTSAgenteDistribuido(self.hosts, n_simulacoes=300, max_nos=20)
+        jogador_bot = self.jogo.jogadores[self.jogo.jogador_atual_idx]
+        self.assertTrue(all(p['max_nos'] == 20 for p in agente._pedidos(self.jogo, jogador_bot)))
+
+        podar = agente_mcts_multi.podar_arvore
+        tamanhos = []
+        def podar_contando(raiz, n_nos, alvo):
+            tamanhos.append(n_nos)
+            return podar(raiz, n_nos, alvo)
+        pedido = {'estado': codificar_estado(self.jogo), 'bot_id': jogador_bot.id, 'n_simulacoes': 300, 'max_nos': 20}
+        with mock.patch('agente_mcts_multi.podar_arvore', podar_contando):
+            resposta = buscar_estatisticas(pedido, n_jobs=1)
+        self.assertEqual(resposta['sims'], 300)
+        self.assertTrue(tamanhos)
+        self.assertTrue(all(n <= 20 for n in tamanhos))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,113 +1,22 @@
 import numpy as np
-from numba import cuda, types
 import math
 import random
 import time
 import copy
 from logica import JogoTruco2v2, Carta
-from gpu_utils import achatar_estado_para_gpu 
-from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_uniform_float32
+from simulador_lote import determinizar_lote
+from prazo import RegistroLatencia
+from config_desempenho import carregar_config
+from politica_rollout import RUIDO_PADRAO, validar_politica
+from crenca import CrencaMaos
+from aquecimento import jogo_de_aquecimento
+from instrumentacao import EstatisticasBusca
+from calibracao import CalibracaoPorFase
+# O kernel (e suas funções de dispositivo) é o mesmo do agente por número de simulações
+from agente_gpu import EstadosRNG, simular_maos_cuda
 
 # ======================================================================
-# Seção 1: Lógica da GPU (Kernel e Funções de Dispositivo)
-# ======================================================================
-
-@cuda.jit(device=True)
-def valor_da_carta_gpu(carta_int, rank_manilha):
-    """Calcula o valor de uma carta para fins de comparação (roda na GPU)."""
-    if carta_int == -1:
-        return -1
-    rank_carta = carta_int // 4
-    if rank_carta == rank_manilha:
-        naipe = carta_int % 4
-        return 10 + (3 - naipe)
-    else:
-        return rank_carta
-
-@cuda.jit
-def simular_rollouts_gpu(
-    maos_iniciais,
-    viras,
-    jogadores_iniciais,
-    rng_states,
-    resultados
-):
-    """Kernel CUDA: Simula uma mão completa de Truco para cada thread."""
-    i = cuda.grid(1)
-    if i >= maos_iniciais.shape[0]:
-        return
-
-    mao_thread = cuda.local.array((4, 3), dtype=types.int8)
-    for j in range(4):
-        for k in range(3):
-            mao_thread[j, k] = maos_iniciais[i, j, k]
-
-    vira = viras[i]
-    jogador_atual = jogadores_iniciais[i]
-    rank_manilha = (vira // 4 + 1) % 10
-    vitorias_turno = cuda.local.array(3, dtype=types.int8)
-    vencedor_primeiro_turno = -1
-    
-    for turno in range(3):
-        mesa = cuda.local.array(4, dtype=types.int8)
-        jogadores_na_mesa = cuda.local.array(4, dtype=types.int8)
-        for j in range(4):
-            jogador_idx = (jogador_atual + j) % 4
-            cartas_validas_count = 0
-            for k in range(3):
-                if mao_thread[jogador_idx, k] != -1:
-                    cartas_validas_count += 1
-            if cartas_validas_count > 0:
-                rand_float = xoroshiro128p_uniform_float32(rng_states, i)
-                escolha_aleatoria = int(rand_float * cartas_validas_count)
-                cartas_vistas = 0
-                for k in range(3):
-                    if mao_thread[jogador_idx, k] != -1:
-                        if cartas_vistas == escolha_aleatoria:
-                            mesa[j] = mao_thread[jogador_idx, k]
-                            mao_thread[jogador_idx, k] = -1
-                            break
-                        cartas_vistas += 1
-            else:
-                mesa[j] = -1
-            jogadores_na_mesa[j] = jogador_idx
-        
-        maior_valor = -1; vencedor_temp_idx = -1
-        for j in range(4):
-            valor_carta = valor_da_carta_gpu(mesa[j], rank_manilha)
-            if valor_carta > maior_valor:
-                maior_valor = valor_carta; vencedor_temp_idx = jogadores_na_mesa[j]
-        empate = False
-        if maior_valor > -1:
-            contagem_maior_valor = 0
-            for j in range(4):
-                if valor_da_carta_gpu(mesa[j], rank_manilha) == maior_valor:
-                    contagem_maior_valor += 1
-            if contagem_maior_valor > 1: empate = True
-        if empate:
-            vitorias_turno[turno] = 0
-        else:
-            time_vencedor = (vencedor_temp_idx % 2) + 1; vitorias_turno[turno] = time_vencedor
-            jogador_atual = vencedor_temp_idx
-            if turno == 0: vencedor_primeiro_turno = time_vencedor
-
-    vitorias_time_1 = 0; vitorias_time_2 = 0
-    for t in range(3):
-        if vitorias_turno[t] == 1: vitorias_time_1 += 1
-        elif vitorias_turno[t] == 2: vitorias_time_2 += 1
-    vencedor_final = 0
-    if vitorias_time_1 == 1 and vitorias_time_2 == 0 and vitorias_turno[0] == 0: vencedor_final = 1
-    elif vitorias_time_2 == 1 and vitorias_time_1 == 0 and vitorias_turno[0] == 0: vencedor_final = 2
-    elif vitorias_time_1 >= 2: vencedor_final = 1
-    elif vitorias_time_2 >= 2: vencedor_final = 2
-    elif vitorias_time_1 == 1 and vitorias_time_2 == 1:
-        if vitorias_turno[0] != 0: vencedor_final = vitorias_turno[0]
-
-    if vencedor_final == 1: resultados[i] = 1
-    else: resultados[i] = 0
-
-# ======================================================================
-# Seção 2: Estruturas de Dados para o MCTS (executado na CPU)
+# Seção 1: Estruturas de Dados para o MCTS (executado na CPU)
 # ======================================================================
 
 class MCTSNode:
@@ -147,77 +56,192 @@ class MCTSNode:
             no_atual = no_atual.parente
 
 # ======================================================================
-# Seção 3: A Classe Principal do Agente Híbrido CPU+GPU
+# Seção 2: A Classe Principal do Agente Híbrido CPU+GPU
 # ======================================================================
 
 class GPUAgenteMCTS:
-    def __init__(self, time_limit_por_jogada=1.0):
+    def __init__(self, time_limit_por_jogada=1.0, gerenciador_tempo=None, prazo_rigido=False, tabela_abertura=None,
+                 politica_rollout='aleatoria', n_particulas=None, progresso=None, instrumentar=False):
+        config = carregar_config()
+        # 'aleatoria' ou 'heuristica' (politica_rollout.py), aplicada dentro do kernel
+        self.politica_rollout = validar_politica(politica_rollout)
+        # Opcional: crença com n_particulas (crenca.py) sobre as mãos ocultas, mantida pela mão inteira
+        self.crenca = CrencaMaos(n_particulas) if n_particulas else None
+        # Opcional: TabelaAbertura (tabela_abertura.py) para a primeira carta e a Mão de Onze
+        self.tabela_abertura = tabela_abertura
         self.time_limit = time_limit_por_jogada
-        self.n_rollouts_por_decisao = 16384 
-        self.log_previsoes = []
+        self.n_rollouts_por_decisao = config['rollouts_por_lote_gpu_tempo']
+        self.threads_por_bloco = config['threads_por_bloco']
+        self.calibracao = CalibracaoPorFase()
+        # Rollouts e tempo da última decisão (instrumentacao.py); o callback de progresso é chamado
+        # uma vez, no fim da busca (imprimir_resumo reproduz o resumo que era impresso)
+        self.progresso = progresso
+        self.ultima_busca = None
+        # Tempos por fase (a determinização é a do lote, o rollout é o kernel) e tamanho da árvore
+        self.instrumentar = instrumentar
+        # Opcional: GerenciadorDeTempo que substitui o time_limit fixo por alocações por jogada
+        self.gerenciador_tempo = gerenciador_tempo
+        self._ultima_previsao = 0.5
+        # Modo de prazo rígido: só lança um lote se ele couber no tempo restante
+        self.prazo_rigido = prazo_rigido
+        self._segundos_por_rollout = None  # média móvel do custo de um rollout (CPU + GPU)
+        self.registro_latencia = RegistroLatencia()
+        # Estados do gerador da GPU, criados no primeiro lote e reaproveitados (agente_gpu.EstadosRNG)
+        self._estados_rng = None
 
     def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
         """Executa MCTS na CPU, com rollouts na GPU, por um tempo limitado."""
         raiz = MCTSNode(estado_jogo=estado_jogo)
         if not raiz.jogadas_nao_exploradas:
             return None, 0.0
+        if self.tabela_abertura is not None:
+            # Primeira carta da mão: resposta pré-computada, sem busca
+            abertura = self.tabela_abertura.jogada_de_abertura(estado_jogo, jogador_bot)
+            if abertura is not None:
+                return abertura
+        if self.crenca is not None:
+            self.crenca.sincronizar(estado_jogo, jogador_bot)
+
+        time_limit = self.time_limit
+        if self.gerenciador_tempo is not None:
+            time_limit = self.gerenciador_tempo.alocar(estado_jogo, jogador_bot)
+            if time_limit <= 0.0:
+                # Jogada forçada: não gasta tempo nenhum
+                return jogador_bot.mao[0], self._ultima_previsao
 
-        start_time = time.time()
+        start_time = time.monotonic()
         rollouts_realizados = 0
+        extensao_avaliada = self.gerenciador_tempo is None
+        estatisticas = EstatisticasBusca(self.__class__.__name__, instrumentada=self.instrumentar)
+        # Um lote de rollouts por iteração: duas leituras do relógio por fase não pesam
+        fases = estatisticas if self.instrumentar else None
         
         # Loop principal do MCTS baseado no tempo
-        while time.time() - start_time < self.time_limit:
+        while True:
+            restante = time_limit - (time.monotonic() - start_time)
+            if restante <= 0:
+                if extensao_avaliada:
+                    break
+                # Ao fim do tempo base, a raiz ainda indecisa pode ganhar uma extensão
+                extensao_avaliada = True
+                time_limit += self.gerenciador_tempo.extensao([(f.visitas, f.vitorias) for f in raiz.filhos])
+                continue
+
+            n_rollouts = self.n_rollouts_por_decisao
+            if self.prazo_rigido and self._segundos_por_rollout is not None:
+                # Encolhe o lote para caber no tempo restante; se nem o menor lote cabe, para aqui
+                cabem = int(restante / self._segundos_por_rollout) // self.threads_por_bloco * self.threads_por_bloco
+                n_rollouts = min(n_rollouts, cabem)
+                if n_rollouts < self.threads_por_bloco:
+                    if extensao_avaliada: break
+                    extensao_avaliada = True
+                    time_limit += self.gerenciador_tempo.extensao([(f.visitas, f.vitorias) for f in raiz.filhos])
+                    continue
+
+            t0 = time.perf_counter()
             no_atual = raiz
             while not no_atual.jogadas_nao_exploradas and no_atual.filhos:
                 no_atual = no_atual.selecionar_filho_ucb()
+            t1 = time.perf_counter()
             if no_atual.jogadas_nao_exploradas:
                 no_atual = no_atual.expandir()
-            
+                if fases is not None:
+                    t2 = time.perf_counter()
+                    self._medir_fase(fases, 'expansao', t2 - t1)
+                    t1 = t2
+            if fases is not None:
+                self._medir_fase(fases, 'selecao', t1 - t0)
+
             if no_atual:
-                taxa_vitoria = self._gpu_rollout(no_atual.estado_jogo, jogador_bot.id)
+                t_lote = time.monotonic()
+                taxa_vitoria = self._gpu_rollout(no_atual.estado_jogo, jogador_bot.id, n_rollouts, fases)
+                self._atualizar_custo_rollout((time.monotonic() - t_lote) / n_rollouts)
+                t3 = time.perf_counter()
                 no_atual.retropropagar(taxa_vitoria)
-                rollouts_realizados += self.n_rollouts_por_decisao
+                if fases is not None:
+                    self._medir_fase(fases, 'retropropagacao', time.perf_counter() - t3)
+                rollouts_realizados += n_rollouts
+
+        latencia = time.monotonic() - start_time
+        self.registro_latencia.registrar(latencia, time_limit)
+        if self.gerenciador_tempo is not None:
+            self.gerenciador_tempo.registrar_gasto(latencia)
         
-        print(f"    > {self.__class__.__name__} pensou por ~{self.time_limit:.1f}s e realizou {rollouts_realizados} rollouts.")
+        estatisticas.iteracoes = rollouts_realizados
+        estatisticas.tempo_total = latencia
+        if self.instrumentar:
+            estatisticas.medir_arvore(raiz)
+        estatisticas.concluida = True
+        self.ultima_busca = estatisticas
+        if self.progresso is not None:
+            self.progresso(estatisticas)
 
         if not raiz.filhos:
             return random.choice(jogador_bot.mao), 0.5
 
         melhor_filho = max(raiz.filhos, key=lambda c: c.visitas)
         taxa_vitoria_estimada = melhor_filho.vitorias / melhor_filho.visitas if melhor_filho.visitas > 0 else 0.0
+        self._ultima_previsao = taxa_vitoria_estimada
         return melhor_filho.jogada, taxa_vitoria_estimada
 
-    def _gpu_rollout(self, estado_jogo: JogoTruco2v2, bot_id: int):
-        """Orquestra a execução dos rollouts na GPU."""
-        maos_iniciais, viras, jogadores_iniciais = achatar_estado_para_gpu(
-            estado_jogo, bot_id, self.n_rollouts_por_decisao)
-        rng_states = create_xoroshiro128p_states(self.n_rollouts_por_decisao, seed=random.randint(0, 2**32-1))
+    def _atualizar_custo_rollout(self, segundos_por_rollout, alfa=0.3):
+        if self._segundos_por_rollout is None:
+            self._segundos_por_rollout = segundos_por_rollout
+        else:
+            # Usa o maior entre a média e a última medida: subestimar o custo estoura o prazo
+            media = (1 - alfa) * self._segundos_por_rollout + alfa * segundos_por_rollout
+            self._segundos_por_rollout = max(media, segundos_por_rollout) if self.prazo_rigido else media
 
-        d_maos = cuda.to_device(maos_iniciais)
-        d_viras = cuda.to_device(viras)
-        d_jogadores = cuda.to_device(jogadores_iniciais)
-        d_rng_states = cuda.to_device(rng_states)
-        d_resultados = cuda.device_array(self.n_rollouts_por_decisao, dtype=np.int8)
+    @staticmethod
+    def _medir_fase(estatisticas, fase, segundos):
+        estatisticas.tempos[fase] += segundos
+        estatisticas.contagens[fase] += 1
 
-        threads_por_bloco = 128
-        blocos_por_grid = math.ceil(self.n_rollouts_por_decisao / threads_por_bloco)
-        
-        simular_rollouts_gpu[blocos_por_grid, threads_por_bloco](
-            d_maos, d_viras, d_jogadores, d_rng_states, d_resultados)
-        cuda.synchronize() 
+    def _gpu_rollout(self, estado_jogo: JogoTruco2v2, bot_id: int, n_rollouts=None, estatisticas=None):
+        """Orquestra a execução dos rollouts na GPU. Com estatisticas, mede a determinização e o kernel."""
+        if n_rollouts is None:
+            n_rollouts = self.n_rollouts_por_decisao
+        t0 = time.perf_counter()
+        lote = determinizar_lote(estado_jogo, n_rollouts, bot_id, crenca=self.crenca)
+        if self._estados_rng is None:
+            self._estados_rng = EstadosRNG(self.n_rollouts_por_decisao)
+        t1 = time.perf_counter()
+        vencedores = simular_maos_cuda(lote, None, self.politica_rollout, RUIDO_PADRAO, self.threads_por_bloco,
+                                       estados_rng=self._estados_rng)
+        if estatisticas is not None:
+            self._medir_fase(estatisticas, 'determinizacao', t1 - t0)
+            self._medir_fase(estatisticas, 'rollout', time.perf_counter() - t1)
+        # Taxa de vitória do time do bot (o kernel retorna o time vencedor de cada rollout)
+        time_bot = next(p.time_id for p in estado_jogo.jogadores if p.id == bot_id)
+        return np.mean(vencedores == time_bot)
 
-        resultados_host = d_resultados.copy_to_host()
-        return np.mean(resultados_host)
+    def aquecer(self):
+        """
+        Compila (ou carrega do cache em disco) o kernel rodando um lote e mede um segundo lote,
+        já sem compilação, para o prazo rígido começar com o custo real de um rollout.
+        Retorna os segundos gastos.
+        """
+        inicio = time.perf_counter()
+        jogo, jogador = jogo_de_aquecimento()
+        # Sem a crença: ela acompanha a mão real e não deve ver o jogo de aquecimento
+        crenca, self.crenca = self.crenca, None
+        try:
+            self._gpu_rollout(jogo, jogador.id)
+            t_lote = time.monotonic()
+            self._gpu_rollout(jogo, jogador.id)
+            self._atualizar_custo_rollout((time.monotonic() - t_lote) / self.n_rollouts_por_decisao)
+        finally:
+            self.crenca = crenca
+        return time.perf_counter() - inicio
 
-    def registrar_resultado_da_mao(self, previsao, resultado_real):
+    def registrar_resultado_da_mao(self, previsao, resultado_real, fase=None):
+        """ Acumula a previsão e o resultado real da mão (fase: calibracao.fase_do_jogo na hora da previsão). """
         if previsao is not None:
-            self.log_previsoes.append((previsao, resultado_real))
+            self.calibracao.registrar(previsao, resultado_real, fase)
 
     def calcular_precisao_mse(self):
-        if not self.log_previsoes: return 0.0
-        previsoes = np.array([p[0] for p in self.log_previsoes])
-        resultados_reais = np.array([p[1] for p in self.log_previsoes])
-        return np.mean((previsoes - resultados_reais)**2)
+        """ Brier (MSE) das previsões registradas; 0 sem registros. Ver self.calibracao para o resto. """
+        return self.calibracao.mse
 
     def _simular_jogo_completo(self, estado_jogo):
         jogo_simulado = copy.deepcopy(estado_jogo); jogo_simulado.simulacao = True
@@ -237,6 +261,10 @@ class GPUAgenteMCTS:
         else: return 0
 
     def decidir_mao_de_onze_com_mc(self, estado_jogo_inicial, jogador_bot, n_simulacoes_mao_onze=200):
+        if self.tabela_abertura is not None:
+            aceitar = self.tabela_abertura.aceitar_mao_de_onze(estado_jogo_inicial, jogador_bot)
+            if aceitar is not None:
+                return aceitar
         time_bot_id = jogador_bot.time_id; vitorias_se_jogar = 0
         for _ in range(n_simulacoes_mao_onze):
             jogo_para_simular_A = copy.deepcopy(estado_jogo_inicial); jogo_para_simular_A.simulacao = True
@@ -1,102 +1,166 @@
 import random
-import math
 import copy
-import numpy as np
 import os
 import time # <<< Importar time
+import threading
 from collections import Counter
 from joblib import Parallel, delayed
 from logica import JogoTruco2v2
+from prazo import Prazo, EstimadorOverhead, RegistroLatencia
+from config_desempenho import carregar_config
+from avaliador_folha import simular_com_avaliador
+from politica_rollout import simular_rollout, validar_politica
+from aquecimento import jogo_de_aquecimento
+from instrumentacao import EstatisticasBusca
+from agente_mcts_multi import BYTES_POR_NO, MCTSNode, expandir_arvore
+from calibracao import CalibracaoPorFase
 
-# MCTSNode não muda
-class MCTSNode:
-    # ... (código inalterado) ...
-    def __init__(self, estado_jogo, parente=None, jogada=None):
-        self.estado_jogo = estado_jogo
-        self.parente = parente
-        self.jogada = jogada
-        self.filhos = []
-        self.vitorias = 0
-        self.visitas = 0
-        self.jogadas_nao_exploradas = self.estado_jogo.jogadores[self.estado_jogo.jogador_atual_idx].mao[:]
-    def selecionar_filho_ucb(self):
-        C = math.sqrt(2); log_visitas_pai = math.log(self.visitas)
-        melhor_score = -1; melhor_filho = None
-        for filho in self.filhos:
-            epsilon = 1e-6
-            ucb_score = (filho.vitorias / (filho.visitas + epsilon)) + C * math.sqrt(log_visitas_pai / (filho.visitas + epsilon))
-            if ucb_score > melhor_score: melhor_score = ucb_score; melhor_filho = filho
-        return melhor_filho
-    def expandir(self):
-        jogada = self.jogadas_nao_exploradas.pop(); novo_estado = copy.deepcopy(self.estado_jogo)
-        jogador_id = novo_estado.jogadores[novo_estado.jogador_atual_idx].id
-        novo_estado.jogar_carta(jogador_id, jogada)
-        filho = MCTSNode(estado_jogo=novo_estado, parente=self, jogada=jogada); self.filhos.append(filho)
-        return filho
-    def retropropagar(self, resultado):
-        no_atual = self
-        while no_atual is not None:
-            no_atual.visitas += 1; no_atual.vitorias += resultado; no_atual = no_atual.parente
-
+# O nó (com colapsar, para a poda por max_nos) e o laço da busca são os do agente multi-core
 # ### ATUALIZADO: Função de trabalho agora usa limite de tempo ###
-def run_single_mcts_search_timed(estado_jogo, jogador_bot, time_limit):
+def run_single_mcts_search_timed(estado_jogo, jogador_bot, time_limit, prazo=None, avaliador=None, profundidade_rollout=0,
+                                 politica_rollout='aleatoria', max_nos=None, instrumentar=False):
     """
     Executa uma busca MCTS independente pelo tempo determinado.
+    Se um Prazo absoluto for passado, ele tem precedência sobre time_limit.
+    Com max_nos, a árvore é podada como em agente_mcts_multi.expandir_arvore: por tempo, é o
+    único limite da memória da busca.
+    Com instrumentar, o último elemento do retorno é o EstatisticasBusca da busca (senão, None).
     """
-    start_time = time.time()
-    sims_realizadas = 0
+    t_inicio = time.monotonic()
+    if prazo is None:
+        prazo = Prazo.em(time_limit)
+    estatisticas = EstatisticasBusca(instrumentada=True) if instrumentar else None
     
-    agente_temporario = MCTSAgente() # Apenas para acessar o _simular_rollout
+    agente_temporario = MCTSAgente(avaliador=avaliador, profundidade_rollout=profundidade_rollout,
+                                   politica_rollout=politica_rollout) # Apenas para acessar o _valor_folha
     time_bot_id = jogador_bot.time_id
     raiz = MCTSNode(estado_jogo=estado_jogo)
 
     if not raiz.jogadas_nao_exploradas:
-        return None, 0.0, 0
-
-    # O loop agora é baseado em tempo
-    while time.time() - start_time < time_limit:
-        no_atual = raiz
-        while not no_atual.jogadas_nao_exploradas and no_atual.filhos:
-            no_atual = no_atual.selecionar_filho_ucb()
-        if no_atual.jogadas_nao_exploradas:
-            no_atual = no_atual.expandir()
-        if no_atual is not None:
-            resultado_rollout = agente_temporario._simular_rollout(no_atual.estado_jogo, time_bot_id)
-            no_atual.retropropagar(resultado_rollout)
-        sims_realizadas += 1
+        return None, 0.0, 0, [], t_inicio, time.monotonic(), estatisticas
+
+    # O loop agora é baseado em tempo (relógio monotônico, checagem amortizada)
+    expandir_arvore(raiz, time_bot_id, None, agente_temporario._valor_folha, max_nos, estatisticas, prazo)
+    sims_realizadas = raiz.visitas
 
     if not raiz.filhos:
-        return random.choice(estado_jogo.jogadores[estado_jogo.jogador_atual_idx].mao), 0.5, sims_realizadas
+        return (random.choice(estado_jogo.jogadores[estado_jogo.jogador_atual_idx].mao), 0.5, sims_realizadas, [],
+                t_inicio, time.monotonic(), estatisticas)
     
     melhor_filho = max(raiz.filhos, key=lambda c: c.visitas)
     taxa_vitoria_estimada = melhor_filho.vitorias / melhor_filho.visitas if melhor_filho.visitas > 0 else 0.0
+    estatisticas_raiz = [(f.jogada, f.visitas, f.vitorias) for f in raiz.filhos]
     
-    # Retorna também o número de simulações que conseguiu fazer
-    return melhor_filho.jogada, taxa_vitoria_estimada, sims_realizadas
+    # Retorna também o número de simulações, as estatísticas da raiz, os instantes de início/fim e as fases
+    return (melhor_filho.jogada, taxa_vitoria_estimada, sims_realizadas, estatisticas_raiz, t_inicio, time.monotonic(),
+            estatisticas)
+
+def _somar_estatisticas(resultados_paralelos):
+    """ Soma (visitas, vitorias) por jogada da raiz entre todos os workers. """
+    somas = {}
+    for res in resultados_paralelos:
+        if not res: continue
+        for jogada, visitas, vitorias in res[3]:
+            v, w = somas.get(jogada, (0, 0))
+            somas[jogada] = (v + visitas, w + vitorias)
+    return list(somas.values())
 
 class MCTSAgente:
     # ### ATUALIZADO: __init__ agora recebe time_limit ###
-    def __init__(self, time_limit_por_jogada=1.0, n_jobs=-1):
+    def __init__(self, time_limit_por_jogada=1.0, n_jobs=-1, gerenciador_tempo=None, prazo_rigido=False,
+                 tabela_abertura=None, avaliador=None, profundidade_rollout=0, politica_rollout='aleatoria',
+                 progresso=None, instrumentar=False, max_nos=None, limite_memoria_mb=None):
         self.time_limit = time_limit_por_jogada
-        self.log_previsoes = []
-        self.n_jobs = n_jobs
+        # Como os jogadores escolhem as cartas nos rollouts: 'aleatoria' ou 'heuristica' (politica_rollout.py)
+        self.politica_rollout = validar_politica(politica_rollout)
+        # Opcional: AvaliadorFolha (avaliador_folha.py) no lugar dos rollouts completos;
+        # as folhas jogam profundidade_rollout cartas ao acaso e o avaliador estima o resto
+        self.avaliador = avaliador
+        self.profundidade_rollout = profundidade_rollout
+        # Opcional: TabelaAbertura (tabela_abertura.py) para a primeira carta e a Mão de Onze
+        self.tabela_abertura = tabela_abertura
+        self.calibracao = CalibracaoPorFase()
+        # "-1" (todos os núcleos) vira o número de workers medido pelo autotuning, se houver
+        self.n_jobs = carregar_config()['n_jobs'] if n_jobs == -1 else n_jobs
+        # Opcional: GerenciadorDeTempo que substitui o time_limit fixo por alocações por jogada
+        self.gerenciador_tempo = gerenciador_tempo
+        self._ultima_previsao = 0.5
+        # Modo de prazo rígido: desconta o overhead do joblib e sempre retorna até o prazo
+        self.prazo_rigido = prazo_rigido
+        self.estimador_overhead = EstimadorOverhead()
+        self.registro_latencia = RegistroLatencia()
+        self.rodadas_abandonadas = 0
+        # (thread, saída) da última rodada de prazo rígido ainda não recolhida: enquanto ela roda,
+        # os workers do joblib estão ocupados e nenhuma rodada nova é despachada
+        self._rodada_pendente = None
+        # Estatísticas somadas da raiz na última decisão: [(jogada, visitas, vitorias)]
+        self.ultimas_estatisticas = None
+        # Simulações, núcleos e tempo da última decisão (instrumentacao.py); o callback de progresso
+        # é chamado uma vez, no fim da busca (imprimir_resumo reproduz o resumo que era impresso)
+        self.progresso = progresso
+        self.ultima_busca = None
+        # Tempos por fase e tamanho das árvores (somados entre os workers) em ultima_busca
+        self.instrumentar = instrumentar
+        # Opcional: limite de nós da árvore de cada worker, como no agente multi-core
+        if limite_memoria_mb is not None:
+            max_nos = max(64, int(limite_memoria_mb * 2**20 / BYTES_POR_NO))
+        self.max_nos = max_nos
 
     # ### ATUALIZADO: Orquestração paralela de workers baseados em tempo ###
     def decidir_melhor_jogada(self, estado_jogo, jogador_bot):
         if not jogador_bot.mao:
             return None, 0.0
+        if self.tabela_abertura is not None:
+            # Primeira carta da mão: resposta pré-computada, sem busca
+            abertura = self.tabela_abertura.jogada_de_abertura(estado_jogo, jogador_bot)
+            if abertura is not None:
+                return abertura
+
+        n_cores = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+
+        time_limit = self.time_limit
+        if self.gerenciador_tempo is not None:
+            time_limit = self.gerenciador_tempo.alocar(estado_jogo, jogador_bot)
+            if time_limit <= 0.0:
+                # Jogada forçada: não gasta tempo nenhum
+                return jogador_bot.mao[0], self._ultima_previsao
+        inicio = time.monotonic()
+        prazo_final = inicio + time_limit
 
-        n_cores = os.cpu_count() or 1 if self.n_jobs == -1 else self.n_jobs
-        
         # Cada núcleo rodará pelo tempo limite
-        resultados_paralelos = Parallel(n_jobs=self.n_jobs)(
-            delayed(run_single_mcts_search_timed)(copy.deepcopy(estado_jogo), jogador_bot, self.time_limit) for _ in range(n_cores)
-        )
+        resultados_paralelos = self._rodada_paralela(estado_jogo, jogador_bot, time_limit, n_cores, prazo_final)
+
+        if self.gerenciador_tempo is not None:
+            extra = self.gerenciador_tempo.extensao(_somar_estatisticas(resultados_paralelos))
+            if extra > 0.0:
+                prazo_final += extra
+                resultados_paralelos += self._rodada_paralela(estado_jogo, jogador_bot, extra, n_cores, prazo_final)
+                time_limit += extra
+            self.gerenciador_tempo.registrar_gasto(time.monotonic() - inicio)
+        self.registro_latencia.registrar(time.monotonic() - inicio, time_limit)
+
+        somas = {}
+        for res in resultados_paralelos:
+            for jogada, visitas, vitorias in (res[3] if res else []):
+                v, w = somas.get(jogada, (0, 0))
+                somas[jogada] = (v + visitas, w + vitorias)
+        self.ultimas_estatisticas = [(jogada, v, w) for jogada, (v, w) in somas.items()]
 
         jogadas_recomendadas = [res[0] for res in resultados_paralelos if res and res[0]]
         total_sims_realizadas = sum(res[2] for res in resultados_paralelos if res)
         
-        print(f"    > {self.__class__.__name__} ({n_cores} núcleos) pensou por ~{self.time_limit:.1f}s e realizou {total_sims_realizadas} simulações.")
+        estatisticas = EstatisticasBusca(self.__class__.__name__, instrumentada=self.instrumentar)
+        estatisticas.iteracoes = total_sims_realizadas
+        estatisticas.tempo_total = time.monotonic() - inicio
+        estatisticas.workers = n_cores
+        estatisticas.tempo_workers = sum(res[5] - res[4] for res in resultados_paralelos if res)
+        for res in resultados_paralelos:
+            if res and res[6] is not None:
+                estatisticas.somar(res[6])
+        estatisticas.concluida = True
+        self.ultima_busca = estatisticas
+        if self.progresso is not None:
+            self.progresso(estatisticas)
         
         if not jogadas_recomendadas:
             return random.choice(jogador_bot.mao), 0.5
@@ -105,26 +169,103 @@ class MCTSAgente:
         melhor_jogada = votos.most_common(1)[0][0]
         taxa_vitoria_estimada = next((res[1] for res in resultados_paralelos if res and res[0] == melhor_jogada), 0.5)
 
+        self._ultima_previsao = taxa_vitoria_estimada
         return melhor_jogada, taxa_vitoria_estimada
+
+    def _rodada_paralela(self, estado_jogo, jogador_bot, time_limit, n_cores, prazo_final):
+        if not self.prazo_rigido:
+            return Parallel(n_jobs=self.n_jobs)(
+                delayed(run_single_mcts_search_timed)(copy.deepcopy(estado_jogo), jogador_bot, time_limit, None,
+                                                   self.avaliador, self.profundidade_rollout, self.politica_rollout,
+                                                   self.max_nos, self.instrumentar)
+                for _ in range(n_cores)
+            )
+
+        # Uma rodada abandonada ainda ocupa os workers: uma nova só é despachada depois dela
+        if not self._recolher_rodada_pendente(prazo_final):
+            self.rodadas_abandonadas += 1
+            return []
+
+        # Os workers param antes do prazo final, descontando o overhead estimado de despacho e coleta
+        prazo_workers = Prazo(prazo_final - self.estimador_overhead.total())
+        saida = {}
+
+        def _executar():
+            # Só escreve em `saida`: o estado do agente é atualizado por quem recolhe a rodada
+            t_despacho = time.monotonic()
+            resultados = Parallel(n_jobs=self.n_jobs)(
+                delayed(run_single_mcts_search_timed)(copy.deepcopy(estado_jogo), jogador_bot, time_limit, prazo_workers,
+                                                   self.avaliador, self.profundidade_rollout, self.politica_rollout,
+                                                   self.max_nos, self.instrumentar)
+                for _ in range(n_cores)
+            )
+            t_coleta = time.monotonic()
+            validos = [r for r in resultados if r]
+            if validos:
+                saida['overhead'] = (max(r[4] for r in validos) - t_despacho, t_coleta - max(r[5] for r in validos))
+            saida['resultados'] = resultados
+
+        executor = threading.Thread(target=_executar, daemon=True)
+        executor.start()
+        self._rodada_pendente = (executor, saida)
+        if not self._recolher_rodada_pendente(prazo_final):
+            # Os workers não voltaram a tempo: a decisão sai sem eles
+            self.rodadas_abandonadas += 1
+            return []
+        return saida.get('resultados', [])
+
+    def _recolher_rodada_pendente(self, prazo_final):
+        """
+        Espera a rodada pendente até o prazo (descontada a margem). Se ela terminou, alimenta o
+        estimador de overhead com ela (mesmo uma rodada abandonada corrige o estimador) e retorna
+        True; se ainda está rodando, retorna False.
+        """
+        if self._rodada_pendente is None:
+            return True
+        executor, saida = self._rodada_pendente
+        executor.join(timeout=max(0.0, prazo_final - time.monotonic() - self.estimador_overhead.margem))
+        if executor.is_alive():
+            return False
+        self._rodada_pendente = None
+        if 'overhead' in saida:
+            self.estimador_overhead.registrar(*saida['overhead'])
+        return True
         
     # O resto da classe (métodos de simulação e logging) permanece igual
+    def _valor_folha(self, estado_jogo, time_bot_id):
+        """ Rollout completo ou, com um avaliador, rollout truncado em profundidade_rollout jogadas. """
+        if self.avaliador is None:
+            return self._simular_rollout(estado_jogo, time_bot_id)
+        return simular_com_avaliador(estado_jogo, time_bot_id, self.avaliador, self.profundidade_rollout,
+                                     self.politica_rollout)
+
     def _simular_rollout(self, estado_jogo, time_bot_id):
-        # ... (código inalterado)
-        jogo_simulado = copy.deepcopy(estado_jogo); jogo_simulado.simulacao = True
-        while jogo_simulado.estado_jogo == "EM_ANDAMENTO":
-            jogador_da_vez = jogo_simulado.jogadores[jogo_simulado.jogador_atual_idx]
-            if not jogador_da_vez.mao: jogo_simulado._checar_vencedor_da_mao(); continue
-            carta_aleatoria = random.choice(jogador_da_vez.mao)
-            jogo_simulado.jogar_carta(jogador_da_vez.id, carta_aleatoria)
-        return 1 if jogo_simulado.vencedor_mao == time_bot_id else 0
-    def registrar_resultado_da_mao(self, previsao, resultado_real):
-        # ... (código inalterado)
-        if previsao is not None: self.log_previsoes.append((previsao, resultado_real))
+        return simular_rollout(estado_jogo, time_bot_id, self.politica_rollout)
+
+    def aquecer(self):
+        """
+        Sobe o pool de processos do joblib e importa os módulos nos workers com uma busca
+        curta, fora do registro de latência e do gerenciador de tempo. Retorna os segundos gastos.
+        """
+        inicio = time.perf_counter()
+        jogo, jogador = jogo_de_aquecimento()
+        n_cores = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        Parallel(n_jobs=self.n_jobs)(
+            delayed(run_single_mcts_search_timed)(copy.deepcopy(jogo), jogador, 0.01, None, self.avaliador,
+                                                  self.profundidade_rollout, self.politica_rollout)
+            for _ in range(n_cores)
+        )
+        return time.perf_counter() - inicio
+
+    def registrar_resultado_da_mao(self, previsao, resultado_real, fase=None):
+        """ Acumula a previsão e o resultado real da mão (fase: calibracao.fase_do_jogo na hora da previsão). """
+        if previsao is not None:
+            self.calibracao.registrar(previsao, resultado_real, fase)
+
     def calcular_precisao_mse(self):
-        # ... (código inalterado)
-        if not self.log_previsoes: return 0.0
-        previsoes = np.array([p[0] for p in self.log_previsoes]); resultados_reais = np.array([p[1] for p in self.log_previsoes])
-        return np.mean((previsoes - resultados_reais)**2)
+        """ Brier (MSE) das previsões registradas; 0 sem registros. Ver self.calibracao para o resto. """
+        return self.calibracao.mse
+
     def _simular_jogo_completo(self, estado_jogo):
         # ... (código inalterado)
         jogo_simulado = copy.deepcopy(estado_jogo); jogo_simulado.simulacao = True
@@ -144,6 +285,10 @@ class MCTSAgente:
         else: return 0
     def decidir_mao_de_onze_com_mc(self, estado_jogo_inicial, jogador_bot, n_simulacoes_mao_onze=200):
         # ... (código inalterado)
+        if self.tabela_abertura is not None:
+            aceitar = self.tabela_abertura.aceitar_mao_de_onze(estado_jogo_inicial, jogador_bot)
+            if aceitar is not None:
+                return aceitar
         time_bot_id = jogador_bot.time_id; vitorias_se_jogar = 0
         for _ in range(n_simulacoes_mao_onze):
             jogo_para_simular_A = copy.deepcopy(estado_jogo_inicial); jogo_para_simular_A.simulacao = True
@@ -1,13 +1,14 @@
 import random
 import time
 import math
-import pandas as pd
 import copy
+import argparse
 
-# Importa nossas classes de Agente e a Lógica do Jogo
+# Os agentes (joblib, numba.cuda) e o pandas são importados só quando usados
 from logica import JogoTruco2v2
-from agente_mcts_multi import MCTSAgente as AgenteCPU
-from agente_gpu import GPUAgenteMCTS as AgenteGPU
+from aquecimento import aquecer_agente
+from config_desempenho import carregar_config
+from metricas import ColetorMetricas, adicionar_argumentos
 
 # --- CLASSE PARA REPRESENTAR NOSSOS COMPETIDORES ---
 class Competidor:
@@ -15,6 +16,8 @@ class Competidor:
         self.nome = nome
         self.tipo_agente = tipo_agente
         self.agente = self._criar_agente()
+        # Compila os kernels e sobe os workers antes da primeira jogada cronometrada
+        self.tempo_aquecimento = aquecer_agente(self.agente)
         
         # Estatísticas do torneio
         self.vitorias = 0
@@ -24,12 +27,12 @@ class Competidor:
 
     def _criar_agente(self):
         """Instancia a classe de agente correta com base no tipo."""
-        if self.tipo_agente == 'single':
-            return AgenteCPU(n_simulacoes=10000, n_jobs=1)
-        elif self.tipo_agente == 'multi':
-            return AgenteCPU(n_simulacoes=10000, n_jobs=-1)
+        if self.tipo_agente in ('single', 'multi'):
+            from agente_mcts_multi import MCTSAgente as AgenteCPU
+            return AgenteCPU(n_simulacoes=10000, n_jobs=1 if self.tipo_agente == 'single' else -1)
         elif self.tipo_agente == 'gpu':
-            n_mcts_steps = 100000 // 4096 or 1
+            from agente_gpu import GPUAgenteMCTS as AgenteGPU
+            n_mcts_steps = 100000 // carregar_config()['rollouts_por_lote_gpu'] or 1
             return AgenteGPU(n_simulacoes=n_mcts_steps)
         return None
 
@@ -37,10 +40,12 @@ class Competidor:
         return self.nome
 
 # --- FUNÇÃO PARA EXECUTAR UMA PARTIDA ---
-def run_match(competidor1, competidor2):
+def run_match(competidor1, competidor2, coletor=None):
     """
     Executa uma partida de Truco entre dois competidores, com interface visual.
+    As decisões passam pelo ColetorMetricas dado (metricas.py), se houver.
     """
+    coletor = coletor if coletor is not None else ColetorMetricas()
     print(f"  > Iniciando partida: {competidor1.nome} (Time 1) vs {competidor2.nome} (Time 2)")
     
     jogo = JogoTruco2v2(simulacao=True) # Silencioso na lógica, nós controlamos o print
@@ -71,13 +76,14 @@ def run_match(competidor1, competidor2):
         elif estado_atual == "EM_ANDAMENTO":
             jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
             bot_da_vez = bot_t1 if jogador_da_vez.time_id == 1 else bot_t2
+            competidor_da_vez = competidor1 if jogador_da_vez.time_id == 1 else competidor2
             
             if not jogador_da_vez.mao:
                 jogo._checar_vencedor_da_mao()
                 if jogo.estado_jogo == "JOGO_FINALIZADO": break
                 continue
 
-            carta_jogada, _ = bot_da_vez.decidir_melhor_jogada(jogo, jogador_da_vez)
+            carta_jogada, _ = coletor.decidir(competidor_da_vez.nome, bot_da_vez, jogo, jogador_da_vez)
             if carta_jogada:
                 jogo.jogar_carta(jogador_da_vez.id, carta_jogada)
             if jogo.estado_jogo == "JOGO_FINALIZADO":
@@ -98,6 +104,8 @@ def run_match(competidor1, competidor2):
     competidor1.pontos_tomados += jogo.pontos_time2
     competidor2.pontos_feitos += jogo.pontos_time2
     competidor2.pontos_tomados += jogo.pontos_time1
+    coletor.registrar_partida(time1=competidor1.nome, time2=competidor2.nome, vencedor=vencedor.nome,
+                              pontos_time1=jogo.pontos_time1, pontos_time2=jogo.pontos_time2, total_maos=jogo.mao_atual)
     
     print(f"\r    FIM DE JOGO! Placar final: {competidor1.nome} {jogo.pontos_time1} x {jogo.pontos_time2} {competidor2.nome}")
     print(f"    Vencedor: {vencedor.nome}\n")
@@ -116,6 +124,10 @@ def print_bracket(competidores, nome_fase):
 
 # --- FUNÇÃO PRINCIPAL DO TORNEIO ---
 def main():
+    parser = argparse.ArgumentParser(description="Torneio eliminatório entre os bots.")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    coletor = ColetorMetricas(args.eventos, args.prometheus, args.intervalo_snapshot, execucao='tournament')
     print("🏆 BEM-VINDO AO GRANDE TORNEIO DE IAs DE TRUCO! 🏆")
 
     # 1. Criação dos 16 Competidores
@@ -143,7 +155,7 @@ def main():
         
         vencedores_da_rodada = []
         for i in range(0, len(competidores_na_rodada), 2):
-            vencedor = run_match(competidores_na_rodada[i], competidores_na_rodada[i+1])
+            vencedor = run_match(competidores_na_rodada[i], competidores_na_rodada[i+1], coletor)
             vencedores_da_rodada.append(vencedor)
             
         competidores_na_rodada = vencedores_da_rodada
@@ -154,6 +166,9 @@ def main():
     print(f"O GRANDE CAMPEÃO DO TORNEIO É: {campeao.nome.upper()} !!!")
     print("👑"*50 + "\n")
 
+    # Snapshot final gravado antes dos relatórios
+    coletor.fechar()
+
     # 5. Exibição das Estatísticas Finais
     print("--- ESTATÍSTICAS FINAIS DO TORNEIO ---")
     stats_data = []
@@ -164,13 +179,18 @@ def main():
             "Vitorias": c.vitorias,
             "Derrotas": c.derrotas,
             "Pontos Feitos": c.pontos_feitos,
-            "Pontos Tomados": c.pontos_tomados
+            "Pontos Tomados": c.pontos_tomados,
+            "Aquecimento (s)": round(c.tempo_aquecimento, 2)
         })
     
+    import pandas as pd
     df_stats = pd.DataFrame(stats_data)
     print(df_stats.to_string())
 
+    print("\n--- MÉTRICAS DAS DECISÕES ---")
+    print(coletor.resumo())
+
 if __name__ == '__main__':
-    # Nota: A primeira vez que os agentes GPU rodam, pode haver um tempo de compilação.
-    # As partidas seguintes serão mais rápidas.
+    # A compilação dos kernels acontece no aquecimento de cada competidor, antes das partidas,
+    # e fica em cache no disco para as próximas execuções.
     main()
\ No newline at end of file
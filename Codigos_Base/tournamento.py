@@ -1,21 +1,37 @@
 # tournament.py
 import random
 import time
-import pandas as pd
 import copy
+import argparse
 
-# Importa a lógica do jogo e as nossas classes de Agente dos arquivos corretos
+# Os agentes (joblib, numba.cuda) e o pandas são importados só quando usados
 from logica import JogoTruco2v2
-from time_limit_mcts import MCTSAgente as AgenteCPU
-from time_limit_gpu import GPUAgenteMCTS as AgenteGPU
+from aquecimento import aquecer_agente
+from gerenciador_tempo import GerenciadorDeTempo
+from cache_decisoes import CacheDecisoes, AgenteComCache
+from calibracao import fase_do_jogo, mesclar_todas
+from metricas import ColetorMetricas, adicionar_argumentos
 
 # --- CLASSE PARA REPRESENTAR NOSSOS COMPETIDORES ---
 class Competidor:
-    def __init__(self, nome, tipo_agente, time_limit=0.1):
+    def __init__(self, nome, tipo_agente, time_limit=0.1, orcamento_partida=None, prazo_rigido=False, cache=None,
+                 tabela_abertura=None):
         self.nome = nome
         self.tipo_agente = tipo_agente
         self.time_limit = time_limit
+        # Se definido, o agente distribui esse orçamento (em segundos) pela partida
+        self.orcamento_partida = orcamento_partida
+        # Se True, o agente sempre responde dentro do prazo (descontando o overhead)
+        self.prazo_rigido = prazo_rigido
+        # Se definido, posições equivalentes já vistas no torneio são respondidas pelo cache
+        self.cache = cache
+        # Se definida, a primeira carta e a Mão de Onze saem da tabela pré-computada
+        self.tabela_abertura = tabela_abertura
         self.agente = self._criar_agente()
+        # Compila os kernels e sobe os workers antes da primeira jogada cronometrada
+        self.tempo_aquecimento = aquecer_agente(self.agente)
+        if self.cache is not None and self.agente is not None:
+            self.agente = AgenteComCache(self.agente, self.cache)
         
         # Estatísticas do torneio
         self.vitorias = 0
@@ -26,31 +42,43 @@ class Competidor:
     def _criar_agente(self):
         """Instancia a classe de agente correta com base no tipo."""
         print(f"Criando competidor: {self.nome} (Tipo: {self.tipo_agente})...")
-        if self.tipo_agente == 'single':
-            return AgenteCPU(time_limit_por_jogada=self.time_limit, n_jobs=1)
-        elif self.tipo_agente == 'multi':
-            return AgenteCPU(time_limit_por_jogada=self.time_limit, n_jobs=-1)
+        gerenciador = None
+        if self.orcamento_partida is not None:
+            gerenciador = GerenciadorDeTempo(orcamento_partida=self.orcamento_partida)
+        if self.tipo_agente in ('single', 'multi'):
+            from time_limit_mcts import MCTSAgente as AgenteCPU
+            return AgenteCPU(time_limit_por_jogada=self.time_limit, n_jobs=1 if self.tipo_agente == 'single' else -1,
+                             gerenciador_tempo=gerenciador, prazo_rigido=self.prazo_rigido,
+                             tabela_abertura=self.tabela_abertura)
         elif self.tipo_agente == 'gpu':
-            return AgenteGPU(time_limit_por_jogada=self.time_limit)
+            from time_limit_gpu import GPUAgenteMCTS as AgenteGPU
+            return AgenteGPU(time_limit_por_jogada=self.time_limit, gerenciador_tempo=gerenciador,
+                             prazo_rigido=self.prazo_rigido, tabela_abertura=self.tabela_abertura)
         return None
 
     def __repr__(self):
         return self.nome
 
 # --- FUNÇÃO PARA EXECUTAR UMA PARTIDA ---
-def run_match(competidor1, competidor2):
+def run_match(competidor1, competidor2, coletor=None):
     """
     Executa uma partida de Truco entre dois competidores, com interface visual.
+    As decisões passam pelo ColetorMetricas dado (metricas.py), se houver.
     """
+    coletor = coletor if coletor is not None else ColetorMetricas()
     print(f"  > Iniciando partida: {competidor1.nome} (Time 1) vs {competidor2.nome} (Time 2)")
     
     jogo = JogoTruco2v2(simulacao=True) # Silencioso na lógica, nós controlamos o print
     bot_t1 = competidor1.agente
     bot_t2 = competidor2.agente
+    bots = {1: bot_t1, 2: bot_t2}
+    # Última (previsão, fase) de cada time na mão, conferida com o resultado quando a mão acaba
+    previsoes = {1: None, 2: None}
 
     # O loop do jogo foi copiado para cá
     while jogo.estado_jogo != "JOGO_FINALIZADO":
         if jogo.estado_jogo == "MAO_FINALIZADA":
+            registrar_previsoes(jogo, bots, previsoes)
             print(f"\r    Placar da Mão: {competidor1.nome} {jogo.pontos_time1} x {jogo.pontos_time2} {competidor2.nome}   ", end="", flush=True)
             time.sleep(0.5)
 
@@ -75,16 +103,21 @@ def run_match(competidor1, competidor2):
         elif estado_atual == "EM_ANDAMENTO":
             jogador_da_vez = jogo.jogadores[jogo.jogador_atual_idx]
             bot_da_vez = bot_t1 if jogador_da_vez.time_id == 1 else bot_t2
+            competidor_da_vez = competidor1 if jogador_da_vez.time_id == 1 else competidor2
             
             if not jogador_da_vez.mao:
                 jogo._checar_vencedor_da_mao()
                 if jogo.estado_jogo == "JOGO_FINALIZADO": break
                 continue
 
-            carta_jogada, _ = bot_da_vez.decidir_melhor_jogada(jogo, jogador_da_vez)
+            carta_jogada, previsao = coletor.decidir(competidor_da_vez.nome, bot_da_vez, jogo, jogador_da_vez,
+                                                     competidor_da_vez.time_limit)
+            if previsao is not None:
+                previsoes[jogador_da_vez.time_id] = (previsao, fase_do_jogo(jogo))
             if carta_jogada:
                 jogo.jogar_carta(jogador_da_vez.id, carta_jogada)
             if jogo.estado_jogo == "JOGO_FINALIZADO":
+                registrar_previsoes(jogo, bots, previsoes)
                 break
     
     # Atualiza e exibe as estatísticas
@@ -102,11 +135,20 @@ def run_match(competidor1, competidor2):
     competidor1.pontos_tomados += jogo.pontos_time2
     competidor2.pontos_feitos += jogo.pontos_time2
     competidor2.pontos_tomados += jogo.pontos_time1
+    coletor.registrar_partida(time1=competidor1.nome, time2=competidor2.nome, vencedor=vencedor.nome,
+                              pontos_time1=jogo.pontos_time1, pontos_time2=jogo.pontos_time2, total_maos=jogo.mao_atual)
     
     print(f"\r    FIM DE JOGO! Placar final: {competidor1.nome} {jogo.pontos_time1} x {jogo.pontos_time2} {competidor2.nome}")
     print(f"    Vencedor: {vencedor.nome}\n")
     return vencedor
 
+def registrar_previsoes(jogo, bots, previsoes):
+    """ Entrega a cada bot o resultado da mão que acabou de terminar para a sua última previsão nela. """
+    for time_id, previsao in previsoes.items():
+        if previsao is not None:
+            bots[time_id].registrar_resultado_da_mao(previsao[0], 1 if jogo.vencedor_mao == time_id else 0, previsao[1])
+            previsoes[time_id] = None
+
 # --- FUNÇÃO PARA IMPRIMIR A CHAVE DO TORNEIO ---
 def print_bracket(competidores, nome_fase):
     print("\n" + "="*50)
@@ -121,12 +163,25 @@ def print_bracket(competidores, nome_fase):
 
 # --- FUNÇÃO PRINCIPAL DO TORNEIO ---
 def main():
+    parser = argparse.ArgumentParser(description="Torneio eliminatório entre os bots.")
+    parser.add_argument('--cache', action='store_true',
+                        help="Responde posições equivalentes pelo cache de decisões (cache_decisoes.py), "
+                             "depois de algumas buscas de cada uma.")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    coletor = ColetorMetricas(args.eventos, args.prometheus, args.intervalo_snapshot, execucao='tournamento')
     print("🏆 BEM-VINDO AO GRANDE TORNEIO DE IAs DE TRUCO! 🏆\n")
 
+    tipos = ('single', 'multi', 'gpu')
+    # Bots do mesmo tipo são iguais, então dividem um cache de decisões (só com --cache)
+    caches = {tipo: CacheDecisoes() if args.cache else None for tipo in tipos}
+    # Gerada offline por tabela_abertura.py; sem o arquivo, todos buscam desde a primeira carta
+    from tabela_abertura import carregar_tabela
+    tabela = carregar_tabela()
     competidores = []
-    for i in range(5): competidores.append(Competidor(f"SingleCore_Bot_{i+1}", 'single'))
-    for i in range(5): competidores.append(Competidor(f"MultiCore_Bot_{i+1}", 'multi'))
-    for i in range(6): competidores.append(Competidor(f"GPU_Bot_{i+1}", 'gpu'))
+    for i in range(5): competidores.append(Competidor(f"SingleCore_Bot_{i+1}", 'single', cache=caches['single'], tabela_abertura=tabela))
+    for i in range(5): competidores.append(Competidor(f"MultiCore_Bot_{i+1}", 'multi', cache=caches['multi'], tabela_abertura=tabela))
+    for i in range(6): competidores.append(Competidor(f"GPU_Bot_{i+1}", 'gpu', cache=caches['gpu'], tabela_abertura=tabela))
 
     random.shuffle(competidores)
     
@@ -139,7 +194,7 @@ def main():
         
         vencedores_da_rodada = []
         for i in range(0, len(competidores_na_rodada), 2):
-            vencedor = run_match(competidores_na_rodada[i], competidores_na_rodada[i+1])
+            vencedor = run_match(competidores_na_rodada[i], competidores_na_rodada[i+1], coletor)
             vencedores_da_rodada.append(vencedor)
             
         competidores_na_rodada = vencedores_da_rodada
@@ -149,6 +204,9 @@ def main():
     print(f"O GRANDE CAMPEÃO DO TORNEIO É: {campeao.nome.upper()} !!!")
     print("👑"*50 + "\n")
 
+    # Snapshot final gravado antes dos relatórios
+    coletor.fechar()
+
     print("--- ESTATÍSTICAS FINAIS DO TORNEIO ---")
     stats_data = []
     for c in sorted(competidores, key=lambda x: (x.vitorias, x.pontos_feitos - x.pontos_tomados), reverse=True):
@@ -159,14 +217,34 @@ def main():
             "Derrotas": c.derrotas,
             "Pontos Feitos": c.pontos_feitos,
             "Pontos Tomados": c.pontos_tomados,
-            "Saldo": c.pontos_feitos - c.pontos_tomados
+            "Saldo": c.pontos_feitos - c.pontos_tomados,
+            "Brier": round(c.agente.calibracao.mse, 4),
+            "Log-loss": round(c.agente.calibracao.total.log_loss, 4),
+            "Aquecimento (s)": round(c.tempo_aquecimento, 2)
         })
     
+    import pandas as pd
     df_stats = pd.DataFrame(stats_data)
     pd.set_option('display.max_rows', None)
     pd.set_option('display.max_columns', None)
     pd.set_option('display.width', 1000)
     print(df_stats)
 
+    print("\n--- LATÊNCIA REAL DAS DECISÕES (vs. prazo configurado) ---")
+    for c in competidores:
+        print(f"  {c.nome:<22} {c.agente.registro_latencia.resumo()}")
+
+    print("\n--- CALIBRAÇÃO DAS PREVISÕES (por tipo de bot, todas as mãos) ---")
+    for tipo in tipos:
+        print(f"  {tipo}:\n{mesclar_todas(c.agente.calibracao for c in competidores if c.tipo_agente == tipo).resumo()}")
+
+    if args.cache:
+        print("\n--- CACHE DE DECISÕES ---")
+        for tipo, cache in caches.items():
+            print(f"  {tipo:<8} {cache.resumo()}")
+
+    print("\n--- MÉTRICAS DAS DECISÕES (medidas pelo torneio) ---")
+    print(coletor.resumo())
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
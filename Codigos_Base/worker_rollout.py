@@ -0,0 +1,86 @@
+import os
+import argparse
+import socketserver
+from joblib import Parallel, delayed
+from agente_mcts_multi import run_single_mcts_search_estatisticas
+from protocolo_rede import decodificar_estado, enviar_mensagem, receber_mensagem
+from gpu_utils import CARTA_PARA_INT
+
+# ======================================================================
+# Daemon de rollouts: recebe um estado codificado e um orçamento (simulações
+# ou tempo), roda MCTS root-parallel nos núcleos locais e devolve as visitas e
+# vitórias de cada filho da raiz. Vários daemons (em uma ou em várias máquinas)
+# são combinados pelo MCTSAgenteDistribuido.
+#
+#   python worker_rollout.py --porta 5555 --n-jobs -1
+# ======================================================================
+
+def buscar_estatisticas(pedido, n_jobs=-1):
+    """ Executa o pedido localmente e monta a resposta do protocolo. """
+    estado_jogo = decodificar_estado(pedido['estado'])
+    jogador_bot = next(p for p in estado_jogo.jogadores if p.id == pedido['bot_id'])
+    n_simulacoes = pedido.get('n_simulacoes')
+    tempo = pedido.get('tempo')
+    max_nos = pedido.get('max_nos')
+
+    n_cores = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    if n_simulacoes is None:
+        sims_por_arvore = [None] * n_cores
+    else:
+        # Uma árvore por núcleo (nunca mais árvores que simulações); o resto da divisão vai para
+        # as primeiras, para a soma ser exatamente o orçamento pedido
+        n_arvores = max(1, min(n_cores, n_simulacoes))
+        base, resto = divmod(n_simulacoes, n_arvores)
+        sims_por_arvore = [base + (i < resto) for i in range(n_arvores)]
+
+    resultados = Parallel(n_jobs=n_jobs)(
+        delayed(run_single_mcts_search_estatisticas)(estado_jogo, jogador_bot, sims, tempo, max_nos)
+        for sims in sims_por_arvore
+    )
+
+    somas = {}
+    for estatisticas in resultados:
+        for jogada, visitas, vitorias in estatisticas:
+            v, w = somas.get(CARTA_PARA_INT[jogada], (0, 0))
+            somas[CARTA_PARA_INT[jogada]] = (v + visitas, w + vitorias)
+    jogadas = sorted(somas)
+    return {
+        'jogadas': jogadas,
+        'visitas': [somas[j][0] for j in jogadas],
+        'vitorias': [somas[j][1] for j in jogadas],
+        'sims': sum(somas[j][0] for j in jogadas),
+    }
+
+
+class _TratadorPedido(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            pedido = receber_mensagem(self.request)
+            resposta = buscar_estatisticas(pedido, self.server.n_jobs)
+        except Exception as e:
+            resposta = {'erro': f"{type(e).__name__}: {e}"}
+        enviar_mensagem(self.request, resposta)
+
+
+class ServidorRollout(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, endereco, n_jobs=-1):
+        super().__init__(endereco, _TratadorPedido)
+        self.n_jobs = n_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker remoto de rollouts MCTS para o Truco.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--porta', type=int, default=5555)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Núcleos locais usados por pedido (-1 = todos).")
+    args = parser.parse_args()
+
+    with ServidorRollout((args.host, args.porta), n_jobs=args.n_jobs) as servidor:
+        print(f"Worker de rollout ouvindo em {args.host}:{servidor.server_address[1]} (n_jobs={args.n_jobs})")
+        servidor.serve_forever()
+
+if __name__ == '__main__':
+    main()